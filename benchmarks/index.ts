@@ -44,14 +44,41 @@ export const BENCHMARK_CONFIGS: BenchmarkConfig[] = [
   { samples: 5000, features: 128, centers: 8, label: 'hdbscan_n5000_d128' },
 ];
 
+export type BenchmarkAlgorithm =
+  | 'kmeans'
+  | 'spectral'
+  | 'spectral_sparse'
+  | 'agglomerative'
+  | 'som'
+  | 'hdbscan';
+
+export const BENCHMARK_ALGORITHMS: BenchmarkAlgorithm[] = [
+  'kmeans',
+  'spectral',
+  'spectral_sparse',
+  'agglomerative',
+  'som',
+  'hdbscan',
+];
+
+/**
+ * Why `algorithm` is not run on `config`, or null. HDBSCAN builds dense O(n²)
+ * distance / mutual-reachability matrices, so it is benchmarked only up to its
+ * documented ~5k-sample ceiling; larger datasets are skipped (and logged)
+ * rather than OOM the run.
+ */
+export function skip_reason(
+  algorithm: BenchmarkAlgorithm,
+  config: BenchmarkConfig,
+): string | null {
+  if (algorithm === 'hdbscan' && config.samples > 5000) {
+    return `n=${config.samples} exceeds the dense O(n²) ceiling`;
+  }
+  return null;
+}
+
 export async function benchmark_algorithm(
-  algorithm:
-    | 'kmeans'
-    | 'spectral'
-    | 'spectral_sparse'
-    | 'agglomerative'
-    | 'som'
-    | 'hdbscan',
+  algorithm: BenchmarkAlgorithm,
   config: BenchmarkConfig,
   backend: string,
 ): Promise<BenchmarkResult> {
@@ -189,33 +216,17 @@ export async function get_available_backends(): Promise<string[]> {
 export async function run_benchmark_suite(): Promise<BenchmarkResult[]> {
   const results: BenchmarkResult[] = [];
   const backends = await get_available_backends();
-  const algorithms: Array<
-    | 'kmeans'
-    | 'spectral'
-    | 'spectral_sparse'
-    | 'agglomerative'
-    | 'som'
-    | 'hdbscan'
-  > = [
-    'kmeans',
-    'spectral',
-    'spectral_sparse',
-    'agglomerative',
-    'som',
-    'hdbscan',
-  ];
+  const algorithms = BENCHMARK_ALGORITHMS;
 
   console.log(`Available backends: ${backends.join(', ')}`);
 
   for (const backend of backends) {
     for (const algorithm of algorithms) {
       for (const config of BENCHMARK_CONFIGS) {
-        // HDBSCAN builds dense O(n²) distance / mutual-reachability matrices, so
-        // it is benchmarked only up to its documented ~5k-sample ceiling; larger
-        // datasets are skipped (and logged) rather than OOM the run.
-        if (algorithm === 'hdbscan' && config.samples > 5000) {
+        const reason = skip_reason(algorithm, config);
+        if (reason !== null) {
           console.log(
-            `Skipping hdbscan on ${config.label} dataset (n=${config.samples} exceeds the dense O(n²) ceiling).`,
+            `Skipping ${algorithm} on ${config.label} dataset (${reason}).`,
           );
           continue;
         }
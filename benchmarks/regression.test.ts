@@ -0,0 +1,135 @@
+import {
+  compare_to_baseline,
+  empty_baseline,
+  format_gate_report,
+  mann_whitney_u,
+  median,
+  update_baseline,
+  SampleSet,
+} from './regression';
+
+function sample_set(samples_ms: number[], label = 'small'): SampleSet {
+  return {
+    algorithm: 'kmeans',
+    backend: 'cpu',
+    label,
+    dataset_size: 100,
+    features: 10,
+    samples_ms,
+  };
+}
+
+// Deterministic jitter around `center`, spread ±10%.
+function noisy(center: number, n: number, phase = 0): number[] {
+  return Array.from(
+    { length: n },
+    (_, i) => center * (1 + 0.1 * Math.sin(i * 2.399 + phase)),
+  );
+}
+
+describe('mann_whitney_u', () => {
+  it('matches the asymptotic test with continuity correction', () => {
+    const result = mann_whitney_u([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]);
+    expect(result.u).toBe(0);
+    expect(result.effect_size).toBe(-1);
+    // scipy.stats.mannwhitneyu(..., alternative='less', method='asymptotic')
+    expect(result.p_less).toBeCloseTo(0.00609, 4);
+    expect(result.p_greater).toBeGreaterThan(0.99);
+  });
+
+  it('averages the ranks of ties', () => {
+    const result = mann_whitney_u([1, 2, 2], [2, 3]);
+    expect(result.u).toBe(1);
+    const tied = mann_whitney_u([4, 4], [4, 4, 4]);
+    expect(tied).toEqual({ u: 3, p_greater: 1, p_less: 1, effect_size: 0 });
+  });
+
+  it('rejects an empty side', () => {
+    expect(() => mann_whitney_u([], [1])).toThrow('at least one sample');
+  });
+});
+
+describe('compare_to_baseline', () => {
+  const baseline = update_baseline(
+    update_baseline(empty_baseline(), [sample_set(noisy(10, 10))], 't1'),
+    [sample_set(noisy(10, 10, 1))],
+    't2',
+  );
+
+  it('fails a significant slowdown and reports its effect size', () => {
+    const [result] = compare_to_baseline(
+      [sample_set(noisy(13, 10, 2))],
+      baseline,
+    );
+    expect(result.status).toBe('regression');
+    expect(result.passed).toBe(false);
+    expect(result.baseline_samples).toBe(20);
+    expect(result.median_ratio!).toBeGreaterThan(1.2);
+    expect(result.effect_size!).toBeGreaterThan(0.8);
+    expect(result.p_value!).toBeLessThan(0.01);
+  });
+
+  it('passes noise and small shifts', () => {
+    const [same, small] = compare_to_baseline(
+      [sample_set(noisy(10, 10, 3)), sample_set(noisy(10.5, 10, 4))],
+      baseline,
+    );
+    expect(same.status).toBe('unchanged');
+    // Significant or not, a 5% shift is under min_effect.
+    expect(small.status).toBe('unchanged');
+    expect(small.passed).toBe(true);
+  });
+
+  it('reports improvements and configurations without a baseline', () => {
+    const [faster, fresh] = compare_to_baseline(
+      [sample_set(noisy(6, 10)), sample_set([1, 2], 'medium')],
+      baseline,
+    );
+    expect(faster).toMatchObject({ status: 'improvement', passed: true });
+    expect(fresh).toMatchObject({
+      status: 'new',
+      passed: true,
+      baseline_median_ms: null,
+      current_median_ms: 1.5,
+    });
+  });
+
+  it('formats a pass/fail row per configuration', () => {
+    const report = format_gate_report(
+      compare_to_baseline(
+        [sample_set(noisy(13, 10)), sample_set([1, 2], 'medium')],
+        baseline,
+      ),
+    );
+    expect(report).toContain(
+      '| **FAIL** (regression) | kmeans | cpu | small |',
+    );
+    expect(report).toContain('| pass (new) | kmeans | cpu | medium |');
+    expect(report).toContain('1 of 2 configurations regressed.');
+  });
+});
+
+describe('update_baseline', () => {
+  it('keeps the most recent runs within the window', () => {
+    let baseline = empty_baseline(2);
+    for (const t of ['t1', 't2', 't3']) {
+      baseline = update_baseline(baseline, [sample_set([1, 2])], t, 'abc');
+    }
+    const runs = baseline.entries['kmeans/cpu/small'].runs;
+    expect(runs.map((r) => r.recorded_at)).toEqual(['t2', 't3']);
+    expect(runs[0].commit).toBe('abc');
+  });
+
+  it('leaves the input baseline untouched', () => {
+    const before = empty_baseline();
+    update_baseline(before, [sample_set([1])], 't1');
+    expect(before.entries).toEqual({});
+  });
+});
+
+describe('median', () => {
+  it('averages the middle pair of an even sample', () => {
+    expect(median([4, 1, 3, 2])).toBe(2.5);
+    expect(median([3, 1, 2])).toBe(2);
+  });
+});
@@ -0,0 +1,306 @@
+import {
+  benchmark_algorithm,
+  BenchmarkAlgorithm,
+  BenchmarkConfig,
+} from './';
+
+/**
+ * Statistical regression gate. Each configuration is timed several times
+ * after warm-up, and the raw samples are compared against a rolling baseline
+ * of recent runs with a one-sided Mann-Whitney U test. A slowdown fails the
+ * gate only when it is both significant and larger than `min_effect`: shared
+ * CI runners are too noisy for single-run, point-by-point diffs.
+ */
+
+export interface SampleSet {
+  algorithm: BenchmarkAlgorithm;
+  backend: string;
+  label: string;
+  dataset_size: number;
+  features: number;
+  samples_ms: number[];
+}
+
+export interface BaselineRun {
+  recorded_at: string;
+  commit?: string;
+  samples_ms: number[];
+}
+
+export interface BaselineEntry {
+  algorithm: BenchmarkAlgorithm;
+  backend: string;
+  label: string;
+  runs: BaselineRun[];
+}
+
+export interface BaselineFile {
+  version: 1;
+  /** Runs kept per configuration; older runs drop out as new ones land. */
+  window: number;
+  entries: Record<string, BaselineEntry>;
+}
+
+export interface MannWhitneyResult {
+  /** U statistic of the first sample. */
+  u: number;
+  /** One-sided p-value that the first sample tends to be larger. */
+  p_greater: number;
+  /** One-sided p-value that the first sample tends to be smaller. */
+  p_less: number;
+  /** Rank-biserial correlation in [-1, 1]; positive if the first is larger. */
+  effect_size: number;
+}
+
+export type GateStatus = 'regression' | 'improvement' | 'unchanged' | 'new';
+
+export interface GateResult {
+  key: string;
+  algorithm: BenchmarkAlgorithm;
+  backend: string;
+  label: string;
+  status: GateStatus;
+  passed: boolean;
+  current_median_ms: number;
+  baseline_median_ms: number | null;
+  /** Current median over baseline median; null without a baseline. */
+  median_ratio: number | null;
+  /** Rank-biserial correlation; positive when the current run is slower. */
+  effect_size: number | null;
+  /** One-sided p-value in the direction of the observed change. */
+  p_value: number | null;
+  current_samples: number;
+  baseline_samples: number;
+}
+
+export interface GateOptions {
+  /** Significance level of the one-sided tests. Default 0.01. */
+  alpha?: number;
+  /** Smallest median change that counts, as a fraction. Default 0.1. */
+  min_effect?: number;
+}
+
+export const DEFAULT_BASELINE_WINDOW = 5;
+
+export function sample_key(
+  s: Pick<SampleSet, 'algorithm' | 'backend' | 'label'>,
+): string {
+  return `${s.algorithm}/${s.backend}/${s.label}`;
+}
+
+export function median(values: number[]): number {
+  const sorted = [...values].sort((a, b) => a - b);
+  const mid = Math.floor(sorted.length / 2);
+  return sorted.length % 2 === 0
+    ? (sorted[mid - 1] + sorted[mid]) / 2
+    : sorted[mid];
+}
+
+/** Standard normal CDF (Abramowitz & Stegun 7.1.26, |error| < 1.5e-7). */
+function normal_cdf(z: number): number {
+  const x = Math.abs(z) / Math.SQRT2;
+  const t = 1 / (1 + 0.3275911 * x);
+  const coefficients = [
+    1.061405429, -1.453152027, 1.421413741, -0.284496736, 0.254829592,
+  ];
+  const poly = coefficients.reduce((acc, c) => acc * t + c, 0) * t;
+  const erf = 1 - poly * Math.exp(-x * x);
+  return z >= 0 ? (1 + erf) / 2 : (1 - erf) / 2;
+}
+
+/**
+ * Mann-Whitney U test with average ranks for ties, the tie-corrected
+ * variance and a continuity correction (normal approximation; adequate from
+ * about eight samples per side).
+ */
+export function mann_whitney_u(a: number[], b: number[]): MannWhitneyResult {
+  const n1 = a.length;
+  const n2 = b.length;
+  if (n1 === 0 || n2 === 0) {
+    throw new Error('mann_whitney_u needs at least one sample on each side.');
+  }
+  const pooled = [
+    ...a.map((value) => ({ value, first: true })),
+    ...b.map((value) => ({ value, first: false })),
+  ].sort((x, y) => x.value - y.value);
+
+  const n = n1 + n2;
+  let rank_sum = 0;
+  let tie_term = 0;
+  for (let i = 0; i < n; ) {
+    let j = i;
+    while (j + 1 < n && pooled[j + 1].value === pooled[i].value) j++;
+    const rank = (i + j) / 2 + 1;
+    for (let k = i; k <= j; k++) {
+      if (pooled[k].first) rank_sum += rank;
+    }
+    const t = j - i + 1;
+    tie_term += t * t * t - t;
+    i = j + 1;
+  }
+
+  const u = rank_sum - (n1 * (n1 + 1)) / 2;
+  const mean = (n1 * n2) / 2;
+  const variance = ((n1 * n2) / 12) * (n + 1 - tie_term / (n * (n - 1)));
+  const effect_size = (2 * u) / (n1 * n2) - 1;
+  if (variance <= 0) {
+    // Every value is tied: no evidence either way.
+    return { u, p_greater: 1, p_less: 1, effect_size };
+  }
+  const sd = Math.sqrt(variance);
+  return {
+    u,
+    p_greater: 1 - normal_cdf((u - mean - 0.5) / sd),
+    p_less: normal_cdf((u - mean + 0.5) / sd),
+    effect_size,
+  };
+}
+
+/**
+ * Times `algorithm` on `config` `repeats` times after `warmup` discarded
+ * runs, so JIT compilation and backend kernel setup stay out of the samples.
+ */
+export async function collect_samples(
+  algorithm: BenchmarkAlgorithm,
+  config: BenchmarkConfig,
+  backend: string,
+  { warmup = 2, repeats = 10 }: { warmup?: number; repeats?: number } = {},
+): Promise<SampleSet> {
+  for (let i = 0; i < warmup; i++) {
+    await benchmark_algorithm(algorithm, config, backend);
+  }
+  const samples_ms: number[] = [];
+  for (let i = 0; i < repeats; i++) {
+    const result = await benchmark_algorithm(algorithm, config, backend);
+    samples_ms.push(result.execution_time);
+  }
+  return {
+    algorithm,
+    backend,
+    label: config.label,
+    dataset_size: config.samples,
+    features: config.features,
+    samples_ms,
+  };
+}
+
+/** The pooled samples of the baseline's recent runs, or null if none. */
+export function baseline_samples(
+  baseline: BaselineFile,
+  key: string,
+): number[] | null {
+  const entry = baseline.entries[key];
+  if (!entry || entry.runs.length === 0) return null;
+  return entry.runs.flatMap((run) => run.samples_ms);
+}
+
+export function compare_to_baseline(
+  current: SampleSet[],
+  baseline: BaselineFile,
+  { alpha = 0.01, min_effect = 0.1 }: GateOptions = {},
+): GateResult[] {
+  return current.map((set): GateResult => {
+    const key = sample_key(set);
+    const current_median_ms = median(set.samples_ms);
+    const base = baseline_samples(baseline, key);
+    const common = {
+      key,
+      algorithm: set.algorithm,
+      backend: set.backend,
+      label: set.label,
+      current_median_ms,
+      current_samples: set.samples_ms.length,
+    };
+    if (base === null) {
+      return {
+        ...common,
+        status: 'new',
+        passed: true,
+        baseline_median_ms: null,
+        median_ratio: null,
+        effect_size: null,
+        p_value: null,
+        baseline_samples: 0,
+      };
+    }
+
+    const baseline_median_ms = median(base);
+    const median_ratio = current_median_ms / baseline_median_ms;
+    const test = mann_whitney_u(set.samples_ms, base);
+    let status: GateStatus = 'unchanged';
+    let p_value = Math.min(test.p_greater, test.p_less);
+    if (test.p_greater < alpha && median_ratio > 1 + min_effect) {
+      status = 'regression';
+      p_value = test.p_greater;
+    } else if (test.p_less < alpha && median_ratio < 1 - min_effect) {
+      status = 'improvement';
+      p_value = test.p_less;
+    }
+    return {
+      ...common,
+      status,
+      passed: status !== 'regression',
+      baseline_median_ms,
+      median_ratio,
+      effect_size: test.effect_size,
+      p_value,
+      baseline_samples: base.length,
+    };
+  });
+}
+
+export function empty_baseline(
+  window: number = DEFAULT_BASELINE_WINDOW,
+): BaselineFile {
+  return { version: 1, window, entries: {} };
+}
+
+/**
+ * Appends `current` as the newest run of each configuration, keeping the
+ * last `baseline.window` runs. Returns a new file; `baseline` is unchanged.
+ */
+export function update_baseline(
+  baseline: BaselineFile,
+  current: SampleSet[],
+  recorded_at: string,
+  commit?: string,
+): BaselineFile {
+  const entries = { ...baseline.entries };
+  for (const set of current) {
+    const key = sample_key(set);
+    const run: BaselineRun = { recorded_at, samples_ms: set.samples_ms };
+    if (commit !== undefined) run.commit = commit;
+    const runs = [...(entries[key]?.runs ?? []), run];
+    entries[key] = {
+      algorithm: set.algorithm,
+      backend: set.backend,
+      label: set.label,
+      runs: runs.slice(-baseline.window),
+    };
+  }
+  return { ...baseline, entries };
+}
+
+export function format_gate_report(results: GateResult[]): string {
+  const fmt = (v: number | null, digits: number) =>
+    v === null ? '–' : v.toFixed(digits);
+  let output = '# Benchmark Regression Gate\n\n';
+  output +=
+    '| Result | Algorithm | Backend | Config | Median (ms) | Baseline (ms) | Ratio | Effect size | p |\n';
+  output +=
+    '|--------|-----------|---------|--------|-------------|---------------|-------|-------------|---|\n';
+  for (const r of results) {
+    const result = r.passed ? `pass (${r.status})` : '**FAIL** (regression)';
+    output +=
+      `| ${result} | ${r.algorithm} | ${r.backend} | ${r.label} | ` +
+      `${r.current_median_ms.toFixed(2)} | ${fmt(r.baseline_median_ms, 2)} | ` +
+      `${fmt(r.median_ratio, 3)} | ${fmt(r.effect_size, 2)} | ` +
+      `${r.p_value === null ? '–' : r.p_value.toExponential(1)} |\n`;
+  }
+  const failed = results.filter((r) => !r.passed).length;
+  output +=
+    failed === 0
+      ? `\nAll ${results.length} configurations passed.\n`
+      : `\n${failed} of ${results.length} configurations regressed.\n`;
+  return output;
+}
@@ -0,0 +1,197 @@
+#!/usr/bin/env node
+/**
+ * Statistical benchmark regression gate.
+ *
+ * Runs every configuration from BENCHMARK_CONFIGS (narrowed by --configs and
+ * --algorithms) with warm-up and repeated timings, stores the raw samples, and
+ * compares them against the rolling baseline with a one-sided Mann-Whitney U
+ * test (see benchmarks/regression.ts). Exits non-zero when any configuration
+ * regresses. --update-baseline appends the run to the baseline instead of
+ * gating on it; CI does that on pushes to main.
+ *
+ * Output:
+ *   benchmarks/history/samples-<timestamp>.json  raw samples of this run
+ *   benchmarks/history/gate-report.md            pass/fail table
+ *   benchmarks/history/baseline.json             rolling baseline (updated)
+ *
+ * Run with: `npm run benchmark:gate -- [--repeats 10] [--warmup 2]
+ *   [--configs small,medium] [--algorithms kmeans,hdbscan] [--backend cpu]
+ *   [--alpha 0.01] [--min-effect 0.1] [--window 5] [--baseline <path>]
+ *   [--update-baseline] [--commit <sha>]`
+ */
+import { existsSync, mkdirSync, readFileSync, writeFileSync } from 'fs';
+import { dirname, join } from 'path';
+
+import {
+  BENCHMARK_ALGORITHMS,
+  BENCHMARK_CONFIGS,
+  BenchmarkAlgorithm,
+  skip_reason,
+} from '../benchmarks';
+import {
+  BaselineFile,
+  collect_samples,
+  compare_to_baseline,
+  DEFAULT_BASELINE_WINDOW,
+  empty_baseline,
+  format_gate_report,
+  SampleSet,
+  update_baseline,
+} from '../benchmarks/regression';
+
+function parse_args(argv: string[]): Map<string, string | true> {
+  const args = new Map<string, string | true>();
+  for (let i = 0; i < argv.length; i++) {
+    const arg = argv[i];
+    if (!arg.startsWith('--')) {
+      throw new Error(`Unexpected argument: ${arg}`);
+    }
+    const next = argv[i + 1];
+    if (next !== undefined && !next.startsWith('--')) {
+      args.set(arg.slice(2), next);
+      i++;
+    } else {
+      args.set(arg.slice(2), true);
+    }
+  }
+  return args;
+}
+
+function number_arg(
+  args: Map<string, string | true>,
+  name: string,
+  fallback: number,
+): number {
+  const raw = args.get(name);
+  if (raw === undefined) return fallback;
+  const value = Number(raw);
+  if (raw === true || !Number.isFinite(value) || value < 0) {
+    throw new Error(`--${name} must be a non-negative number.`);
+  }
+  return value;
+}
+
+function list_arg(
+  args: Map<string, string | true>,
+  name: string,
+  allowed: string[],
+): string[] {
+  const raw = args.get(name);
+  if (raw === undefined) return allowed;
+  if (raw === true) throw new Error(`--${name} needs a comma-separated list.`);
+  const values = raw.split(',').map((v) => v.trim());
+  const unknown = values.filter((v) => !allowed.includes(v));
+  if (unknown.length > 0) {
+    throw new Error(
+      `Unknown --${name} value(s): ${unknown.join(', ')}. Expected one of: ${allowed.join(', ')}.`,
+    );
+  }
+  return values;
+}
+
+function load_baseline(path: string, window: number): BaselineFile {
+  if (!existsSync(path)) return empty_baseline(window);
+  const baseline = JSON.parse(readFileSync(path, 'utf8')) as BaselineFile;
+  if (baseline.version !== 1) {
+    throw new Error(`Unsupported baseline version in ${path}.`);
+  }
+  return { ...baseline, window };
+}
+
+async function main(): Promise<void> {
+  const args = parse_args(process.argv.slice(2));
+  const history_dir = join(process.cwd(), 'benchmarks', 'history');
+  const baseline_path =
+    (args.get('baseline') as string | undefined) ??
+    join(history_dir, 'baseline.json');
+  const backend = (args.get('backend') as string | undefined) ?? 'cpu';
+  const repeats = number_arg(args, 'repeats', 10);
+  const warmup = number_arg(args, 'warmup', 2);
+  const window = number_arg(args, 'window', DEFAULT_BASELINE_WINDOW);
+  const alpha = number_arg(args, 'alpha', 0.01);
+  const min_effect = number_arg(args, 'min-effect', 0.1);
+  const updating = args.get('update-baseline') === true;
+  const commit = args.get('commit') as string | undefined;
+  if (repeats < 2) {
+    throw new Error('--repeats must be at least 2.');
+  }
+
+  const labels = list_arg(
+    args,
+    'configs',
+    BENCHMARK_CONFIGS.map((c) => c.label),
+  );
+  const algorithms = list_arg(
+    args,
+    'algorithms',
+    BENCHMARK_ALGORITHMS,
+  ) as BenchmarkAlgorithm[];
+  const configs = BENCHMARK_CONFIGS.filter((c) => labels.includes(c.label));
+
+  console.log(
+    `Benchmark gate on '${backend}': ${warmup} warm-up + ${repeats} timed runs per configuration.\n`,
+  );
+  const samples: SampleSet[] = [];
+  for (const algorithm of algorithms) {
+    for (const config of configs) {
+      const reason = skip_reason(algorithm, config);
+      if (reason !== null) {
+        console.log(`Skipping ${algorithm} on ${config.label} (${reason}).`);
+        continue;
+      }
+      const set = await collect_samples(algorithm, config, backend, {
+        warmup,
+        repeats,
+      });
+      samples.push(set);
+      const sorted = [...set.samples_ms].sort((a, b) => a - b);
+      console.log(
+        `  ${algorithm}/${config.label}: ` +
+          `${sorted[0].toFixed(2)}–${sorted[sorted.length - 1].toFixed(2)}ms`,
+      );
+    }
+  }
+
+  mkdirSync(history_dir, { recursive: true });
+  const recorded_at = new Date().toISOString();
+  const samples_path = join(
+    history_dir,
+    `samples-${recorded_at.replace(/[:.]/g, '-')}.json`,
+  );
+  writeFileSync(
+    samples_path,
+    JSON.stringify({ recorded_at, commit, backend, warmup, samples }, null, 2),
+  );
+  console.log(`\nRaw samples saved to: ${samples_path}`);
+
+  const baseline = load_baseline(baseline_path, window);
+  const results = compare_to_baseline(samples, baseline, {
+    alpha,
+    min_effect,
+  });
+  const report = format_gate_report(results);
+  console.log(`\n${report}`);
+  writeFileSync(join(history_dir, 'gate-report.md'), report);
+
+  if (updating) {
+    mkdirSync(dirname(baseline_path), { recursive: true });
+    writeFileSync(
+      baseline_path,
+      JSON.stringify(
+        update_baseline(baseline, samples, recorded_at, commit),
+        null,
+        2,
+      ),
+    );
+    console.log(`Baseline updated: ${baseline_path}`);
+    return;
+  }
+  if (results.some((r) => !r.passed)) {
+    process.exitCode = 1;
+  }
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
@@ -53,6 +53,16 @@ describe('tf-adapter lazy wrappers', () => {
     });
   });
 
+  it('provides unsorted_segment_sum for on-device group reductions', () => {
+    const result = tf.tidy(() => {
+      const x = tf.tensor2d([[1, 2], [3, 4], [5, 6]]);
+      const ids = tf.tensor1d([1, 0, 1], 'int32');
+      return tf.unsorted_segment_sum(x, ids, 2);
+    });
+    expect(result.arraySync()).toEqual([[3, 4], [6, 8]]);
+    result.dispose();
+  });
+
   it('default export works as namespace', () => {
     const result = tf.default.tidy(() => {
       return tf.default.scalar(42);
@@ -40,6 +40,7 @@ export const arg_min: typeof tf_types.argMin = (...args) => ensure_backend().arg
 export const gather: typeof tf_types.gather = (...args) => ensure_backend().gather(...args);
 export const topk: typeof tf_types.topk = (...args) => ensure_backend().topk(...args);
 export const scatter_nd: typeof tf_types.scatterND = (...args) => ensure_backend().scatterND(...args);
+export const unsorted_segment_sum: typeof tf_types.unsortedSegmentSum = (...args) => ensure_backend().unsortedSegmentSum(...args);
 export const slice: typeof tf_types.slice = (...args) => ensure_backend().slice(...args);
 export const concat: typeof tf_types.concat = (...args) => ensure_backend().concat(...args);
 export const stack: typeof tf_types.stack = (...args) => ensure_backend().stack(...args);
@@ -76,7 +77,8 @@ const tf: typeof tf_types = new Proxy({} as typeof tf_types, {
     const named_exports: Record<string, unknown> = {
       tensor, tensor1d, tensor2d, tensor3d, scalar, zeros, ones, ones_like,
       fill, eye, linspace, buffer, one_hot, add, sub, pow, sqrt, square,
-      maximum, mat_mul, sum, arg_min, gather, topk, scatter_nd, slice, concat,
+      maximum, mat_mul, sum, arg_min, gather, topk, scatter_nd,
+      unsorted_segment_sum, slice, concat,
       stack, cast, expand_dims, where, tidy, keep, clone, dispose,
       random_uniform, random_normal, set_backend, ready, memory, get_backend,
       env, engine, dispose_variables, linalg,
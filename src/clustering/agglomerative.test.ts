@@ -379,55 +379,6 @@ describe("AgglomerativeClustering – transductive: no predict or JSON serializa
   });
 });
 
-describe("AgglomerativeClustering – compute_distance_matrix algebraic properties", () => {
-  // White-box access to the private static via bracket notation (TypeScript's
-  // private check does not apply to string-literal bracket access).
-  const compute_distance_matrix = AgglomerativeClustering[
-    "compute_distance_matrix"
-  ] as (data: number[][], metric: "euclidean" | "manhattan" | "cosine") => Float64Array;
-
-  const EUCLIDEAN_FIXTURE = JSON.parse(
-    fs.readFileSync(
-      path.join(COSINE_FIXTURE_DIR, "blobs_n3_ward_euclidean.json"),
-      "utf-8",
-    ),
-  ) as { X: number[][] };
-
-  const COSINE_FIXTURE = JSON.parse(
-    fs.readFileSync(
-      path.join(COSINE_FIXTURE_DIR, "blobs_n3_average_cosine.json"),
-      "utf-8",
-    ),
-  ) as { X: number[][] };
-
-  // compute_distance_matrix accepts euclidean | manhattan | cosine only.
-  // 'precomputed' is excluded because it bypasses this function — the caller
-  // supplies the distance matrix directly.
-  const CASES: { metric: "euclidean" | "manhattan" | "cosine"; X: number[][] }[] = [
-    { metric: "euclidean", X: EUCLIDEAN_FIXTURE.X },
-    // Manhattan uses the same 2D point data (only X coordinates matter for this algebraic test).
-    { metric: "manhattan", X: EUCLIDEAN_FIXTURE.X },
-    { metric: "cosine", X: COSINE_FIXTURE.X },
-  ];
-
-  for (const { metric, X } of CASES) {
-    it(`${metric}: |D − Dᵀ|_max < 1e-10 and diag(D) = 0`, () => {
-      const n = X.length;
-      const D = compute_distance_matrix(X, metric);
-
-      let max_asymmetry = 0;
-      for (let i = 0; i < n; i++) {
-        expect(D[i * n + i]).toBe(0);
-        for (let j = i + 1; j < n; j++) {
-          const diff = Math.abs(D[i * n + j] - D[j * n + i]);
-          if (diff > max_asymmetry) max_asymmetry = diff;
-        }
-      }
-      expect(max_asymmetry).toBeLessThan(1e-10);
-    });
-  }
-});
-
 describe("AgglomerativeClustering – n_clusters > n_samples", () => {
   it("throws when n_clusters exceeds the number of samples", async () => {
     const model = new AgglomerativeClustering({ n_clusters: 5, linkage: "ward" });
@@ -2,12 +2,27 @@ import type {
   DataMatrix,
   AgglomerativeClusteringParams,
   BaseClustering,
+  FitPredictOptions,
 } from './types';
-import * as tf from '../backend/adapter';
-import { is_tensor } from '../tensor/tensor_guards';
+import {
+  format_labels,
+  is_flat_matrix,
+  matrix_shape,
+  to_float64,
+} from '../tensor/data_matrix';
 import { MergeRecord, nn_chain_cluster } from './linkage';
 import type { ClusterRepresentations } from './representations';
 import { select_medoids } from './medoid_selection';
+import { pairwise_distances_f64 } from '../distance/float64_distance';
+import {
+  choose_memory_path,
+  agglomerative_memory_paths,
+  plan_for_fit,
+  type MemoryBudget,
+  type MemoryPlan,
+  type MemoryPlannable,
+} from './memory_plan';
+import { profile_stage } from './profiler';
 
 /**
  * Agglomerative (hierarchical) clustering using nearest-neighbor chain merges
@@ -33,7 +48,8 @@ import { select_medoids } from './medoid_selection';
 export class AgglomerativeClustering
   implements
     BaseClustering<AgglomerativeClusteringParams>,
-    ClusterRepresentations
+    ClusterRepresentations,
+    MemoryPlannable
 {
   public readonly params: AgglomerativeClusteringParams;
 
@@ -65,6 +81,9 @@ export class AgglomerativeClustering
 
   public n_leaves_: number | null = null;
 
+  /** Agglomerative has only the dense path; a plan makes `fit` fail fast. */
+  public memory_plan_: MemoryPlan | null = null;
+
   private static readonly VALID_LINKAGES = [
     'ward',
     'complete',
@@ -84,7 +103,17 @@ export class AgglomerativeClustering
     AgglomerativeClustering.validate_params(this.params);
   }
 
+  plan_memory(shape: [number, number], budget: MemoryBudget): MemoryPlan {
+    return choose_memory_path(
+      'AgglomerativeClustering',
+      shape,
+      budget,
+      agglomerative_memory_paths(this.params, shape),
+    );
+  }
+
   async fit(_X: DataMatrix): Promise<void> {
+    plan_for_fit(this, _X);
     const { metric = 'euclidean', linkage = 'ward' } = this.params;
     const use_threshold = this.params.distance_threshold != null;
 
@@ -92,33 +121,34 @@ export class AgglomerativeClustering
     let n_samples: number;
 
     if (metric === 'precomputed') {
-      const raw = is_tensor(_X) ? await (_X as tf.Tensor2D).array() : _X;
-      AgglomerativeClustering.validate_precomputed(raw);
-      n_samples = raw.length;
-      D = new Float64Array(n_samples * n_samples);
-      for (let i = 0; i < n_samples; i++) {
-        const row = raw[i];
-        for (let j = 0; j < n_samples; j++) {
-          D[i * n_samples + j] = row[j];
-        }
-      }
+      n_samples = AgglomerativeClustering.validate_precomputed_shape(_X);
+      // nn_chain_cluster mutates D, so caller-owned float64 data is copied.
+      const values = await to_float64(_X);
+      D =
+        is_flat_matrix(_X) && values === _X.data ? values.slice() : values;
+      AgglomerativeClustering.validate_precomputed(D, n_samples);
     } else {
       // Materialize the coordinates as a float64 array and compute pairwise
       // distances directly. scikit-learn computes distances in float64;
       // matching that precision (instead of the tfjs float32 backend) is what
       // lets ward/complete/average ties resolve identically to sklearn on
       // degenerate data such as integer grids or duplicate points.
-      const data: number[][] = is_tensor(_X)
-        ? ((await (_X as tf.Tensor2D).array()) as number[][])
-        : (_X as number[][]);
-
-      n_samples = data.length;
+      //
+      // The shared kernel's default `'exact'` euclidean method sums squared
+      // coordinate differences per pair in feature order, exactly as scipy's
+      // `pdist` does; the Gram-matrix shortcut would perturb the last ulp and
+      // with it the merge order on tied distances.
+      let n_features: number;
+      [n_samples, n_features] = matrix_shape(_X);
+      const data = await to_float64(_X);
 
       if (n_samples === 0) {
         throw new Error('Input X must contain at least one sample.');
       }
 
-      D = AgglomerativeClustering.compute_distance_matrix(data, metric);
+      D = profile_stage('AgglomerativeClustering', 'distance', () =>
+        pairwise_distances_f64(data, n_samples, n_features, metric),
+      );
     }
 
     if (!use_threshold && this.params.n_clusters! > n_samples) {
@@ -135,7 +165,9 @@ export class AgglomerativeClustering
 
     // NN-chain is exact for the reducible linkages supported here: single,
     // complete, average, and Ward. It must build the full tree before cutting.
-    const all_merges = nn_chain_cluster(D, n_samples, linkage);
+    const all_merges = profile_stage('AgglomerativeClustering', 'linkage', () =>
+      nn_chain_cluster(D, n_samples, linkage),
+    );
     const merges = use_threshold
       ? all_merges.filter((m) => m.distance < this.params.distance_threshold!)
       : all_merges.slice(0, n_samples - this.params.n_clusters!);
@@ -179,9 +211,20 @@ export class AgglomerativeClustering
     this.n_leaves_ = n_samples;
   }
 
-  async fit_predict(_X: DataMatrix): Promise<number[]> {
-    await this.fit(_X);
-    return this.labels_!;
+  fit_predict(
+    X: DataMatrix,
+    options?: FitPredictOptions & { int32_labels?: false },
+  ): Promise<number[]>;
+  fit_predict(
+    X: DataMatrix,
+    options: FitPredictOptions & { int32_labels: true },
+  ): Promise<Int32Array>;
+  async fit_predict(
+    X: DataMatrix,
+    options?: FitPredictOptions,
+  ): Promise<number[] | Int32Array> {
+    await this.fit(X);
+    return format_labels(this.labels_!, options);
   }
 
   /**
@@ -261,90 +304,6 @@ export class AgglomerativeClustering
     }
   }
 
-  /**
-   * Computes the full `n×n` pairwise distance matrix in float64, laid out
-   * row-major (`i*n+j`) to match the NN-chain engine.
-   *
-   * **Symmetry**: for every `(i, j)` pair the same scalar `dist` is assigned
-   * to both `D[i*n+j]` and `D[j*n+i]`, so `D[i,j] ≡ D[j,i]` exactly —
-   * not approximately.  `(D+Dᵀ)/2` symmetrisation is unnecessary here
-   * because asymmetry cannot arise from this mirror pattern.
-   *
-   * **Zero diagonal**: `Float64Array` zero-initialises; the inner loop
-   * iterates `j > i` and never writes `D[i*n+i]`.
-   *
-   * **float64 only**: `pairwise_distance_matrix` in `distance/pairwise_distance.ts`
-   * operates on float32 TensorFlow tensors and applies Gram-matrix shortcuts
-   * that require clamping and explicit symmetrisation.  This method uses
-   * direct scalar arithmetic at float64 precision, which the NN-chain
-   * tie-resolution requires to reproduce sklearn's merge order exactly.
-   * Delegating to the tensor path would silently degrade precision.
-   *
-   * Distances use the same definitions as scikit-learn's `pairwise_distances`,
-   * so results are bit-identical to sklearn for the same coordinates.
-   */
-  private static compute_distance_matrix(
-    data: number[][],
-    metric: 'euclidean' | 'manhattan' | 'cosine',
-  ): Float64Array {
-    const n = data.length;
-    const dim = n > 0 ? data[0].length : 0;
-    const D = new Float64Array(n * n);
-
-    if (metric === 'euclidean') {
-      for (let i = 0; i < n; i++) {
-        const ri = data[i];
-        for (let j = i + 1; j < n; j++) {
-          const rj = data[j];
-          let sum = 0;
-          for (let k = 0; k < dim; k++) {
-            const diff = ri[k] - rj[k];
-            sum += diff * diff;
-          }
-          const dist = Math.sqrt(sum);
-          D[i * n + j] = dist;
-          D[j * n + i] = dist;
-        }
-      }
-    } else if (metric === 'manhattan') {
-      for (let i = 0; i < n; i++) {
-        const ri = data[i];
-        for (let j = i + 1; j < n; j++) {
-          const rj = data[j];
-          let sum = 0;
-          for (let k = 0; k < dim; k++) {
-            sum += Math.abs(ri[k] - rj[k]);
-          }
-          D[i * n + j] = sum;
-          D[j * n + i] = sum;
-        }
-      }
-    } else {
-      // cosine: 1 − (xᵢ·xⱼ) / (‖xᵢ‖·‖xⱼ‖); a zero-norm vector yields distance 0.
-      const norms = new Float64Array(n);
-      for (let i = 0; i < n; i++) {
-        const ri = data[i];
-        let sq = 0;
-        for (let k = 0; k < dim; k++) sq += ri[k] * ri[k];
-        norms[i] = Math.sqrt(sq);
-      }
-      for (let i = 0; i < n; i++) {
-        const ri = data[i];
-        for (let j = i + 1; j < n; j++) {
-          const rj = data[j];
-          let dot = 0;
-          for (let k = 0; k < dim; k++) dot += ri[k] * rj[k];
-          const denom = norms[i] * norms[j];
-          const dist = denom === 0 ? 0 : 1 - dot / denom;
-          D[i * n + j] = dist;
-          D[j * n + i] = dist;
-        }
-      }
-    }
-
-    return D;
-  }
-
   /**
    * Converts raw active-slot merge records into sklearn/scipy-style children
    * node ids (`0..n-1` leaves, `n..` internal nodes).
@@ -381,31 +340,34 @@ export class AgglomerativeClustering
     return children;
   }
 
-  private static validate_precomputed(D: number[][]): void {
-    const n = D.length;
+  /** Returns n for a non-empty square matrix. */
+  private static validate_precomputed_shape(X: DataMatrix): number {
+    const [n, n_cols] = matrix_shape(X);
     if (n === 0) {
       throw new Error(
         'Precomputed distance matrix must contain at least one row.',
       );
     }
 
-    for (let i = 0; i < n; i++) {
-      if (!Array.isArray(D[i]) || D[i].length !== n) {
-        throw new Error(
-          `Precomputed distance matrix must be square (${n}x${n}).`,
-        );
-      }
+    const square = Array.isArray(X)
+      ? X.every((row) => Array.isArray(row) && row.length === n)
+      : n_cols === n;
+    if (!square) {
+      throw new Error(`Precomputed distance matrix must be square (${n}x${n}).`);
     }
+    return n;
+  }
 
+  private static validate_precomputed(D: Float64Array, n: number): void {
     const tol = 1e-8;
     for (let i = 0; i < n; i++) {
-      if (Math.abs(D[i][i]) > tol) {
+      if (Math.abs(D[i * n + i]) > tol) {
         throw new Error(
           'Precomputed distance matrix must have a zero diagonal.',
         );
       }
       for (let j = i + 1; j < n; j++) {
-        if (Math.abs(D[i][j] - D[j][i]) > tol) {
+        if (Math.abs(D[i * n + j] - D[j * n + i]) > tol) {
           throw new Error('Precomputed distance matrix must be symmetric.');
         }
       }
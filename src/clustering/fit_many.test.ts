@@ -0,0 +1,97 @@
+import { KMeans } from './kmeans';
+import { HDBSCAN } from './hdbscan';
+import { make_random_stream } from '../random';
+import * as tf from '../../test_support/tensorflow_helper';
+
+function blobs(n_per: number, centers: number[][], seed: number): number[][] {
+  const rng = make_random_stream(seed);
+  const out: number[][] = [];
+  for (let i = 0; i < n_per; i++) {
+    for (const c of centers) {
+      out.push(c.map((v) => v + (rng.rand() - 0.5)));
+    }
+  }
+  return out;
+}
+
+// Ragged sizes across two padding batches, plus a different feature count.
+const datasets: number[][][] = [
+  blobs(20, [[0, 0], [5, 0], [0, 5]], 1),
+  blobs(8, [[0, 0], [5, 5], [10, 0]], 2),
+  blobs(35, [[1, 1], [6, 6], [1, 8]], 3),
+  blobs(12, [[0, 0, 0], [4, 4, 4], [8, 0, 8]], 4),
+  blobs(60, [[0, 0], [3, 9], [9, 3]], 5),
+];
+
+describe('KMeans.fit_many', () => {
+  it('matches fitting each dataset on its own', async () => {
+    const params = { n_clusters: 3, random_state: 0 };
+    const models = await KMeans.fit_many(datasets, params);
+    expect(models).toHaveLength(datasets.length);
+
+    for (let i = 0; i < datasets.length; i++) {
+      const single = new KMeans(params);
+      await single.fit(datasets[i]);
+      expect(models[i].labels_).toEqual(single.labels_);
+      expect(models[i].inertia_!).toBeCloseTo(single.inertia_!, 3);
+      expect(await models[i].predict(datasets[i])).toEqual(single.labels_);
+      single.dispose();
+      models[i].dispose();
+    }
+  });
+
+  it('accepts tensors and frees its working tensors', async () => {
+    const inputs = datasets.slice(0, 3).map((d) => tf.tensor2d(d));
+    const before = tf.memory().numTensors;
+    const models = await KMeans.fit_many(inputs, {
+      n_clusters: 3,
+      random_state: 1,
+      n_init: 3,
+    });
+    // One centroid tensor per model.
+    expect(tf.memory().numTensors).toBe(before + models.length);
+    models.forEach((m) => m.dispose());
+    tf.dispose(inputs);
+  });
+
+  it('falls back to per-dataset fits for the cosine metric', async () => {
+    const params = {
+      n_clusters: 2,
+      random_state: 0,
+      metric: 'cosine' as const,
+    };
+    const models = await KMeans.fit_many(datasets.slice(0, 2), params);
+    const single = new KMeans(params);
+    await single.fit(datasets[1]);
+    expect(models[1].labels_).toEqual(single.labels_);
+    single.dispose();
+    models.forEach((m) => m.dispose());
+  });
+
+  it('rejects a dataset smaller than n_clusters', async () => {
+    await expect(
+      KMeans.fit_many([datasets[0], [[0, 0]]], { n_clusters: 2 }),
+    ).rejects.toThrow('n_clusters cannot exceed number of samples.');
+  });
+});
+
+describe('HDBSCAN.fit_many', () => {
+  it('matches fitting each dataset on its own', async () => {
+    const inputs = [...datasets, [[1, 2]]];
+    const models = await HDBSCAN.fit_many(inputs, { min_cluster_size: 5 });
+    for (let i = 0; i < inputs.length; i++) {
+      const single = new HDBSCAN({ min_cluster_size: 5 });
+      await single.fit(inputs[i]);
+      expect(models[i].labels_).toEqual(single.labels_);
+      expect(models[i].probabilities_).toEqual(single.probabilities_);
+    }
+  });
+
+  it('leaves no tensors behind when a dataset is invalid', async () => {
+    const before = tf.memory().numTensors;
+    await expect(HDBSCAN.fit_many([datasets[0], []])).rejects.toThrow(
+      'at least one sample',
+    );
+    expect(tf.memory().numTensors).toBe(before);
+  });
+});
@@ -1,14 +1,59 @@
-import type { BaseClustering, DataMatrix, HDBSCANParams } from './types';
+import type {
+  BaseClustering,
+  DataMatrix,
+  FitPredictOptions,
+  HDBSCANParams,
+} from './types';
 import type { ClusterRepresentations } from './representations';
 import * as tf from '../backend/adapter';
 import { is_tensor } from '../tensor/tensor_guards';
+import {
+  format_labels,
+  is_flat_matrix,
+  matrix_shape,
+  to_float64,
+  to_tensor2d,
+} from '../tensor/data_matrix';
 import { pairwise_distance_matrix } from '../distance/pairwise_distance';
-import { minimum_spanning_tree } from '../graph/minimum_spanning_tree';
+import {
+  minimum_spanning_tree,
+  minimum_spanning_tree_from_rows,
+  type MstEdge,
+} from '../graph/minimum_spanning_tree';
 import {
   build_condensation_tree,
   excess_of_mass,
   extract_labels,
 } from '../graph/condensation_tree';
+import {
+  choose_memory_path,
+  hdbscan_memory_paths,
+  plan_for_fit,
+  type MemoryBudget,
+  type MemoryPlan,
+  type MemoryPlannable,
+} from './memory_plan';
+import { profile_stage } from './profiler';
+
+/** The `k`-th smallest of `values` (1-based); `scratch` holds at least `k`. */
+function kth_smallest(
+  values: ArrayLike<number>,
+  k: number,
+  scratch: Float64Array,
+): number {
+  let size = 0;
+  for (let j = 0; j < values.length; j++) {
+    const v = values[j];
+    if (size === k && v >= scratch[k - 1]) continue;
+    let p = size < k ? size++ : k - 1;
+    while (p > 0 && scratch[p - 1] > v) {
+      scratch[p] = scratch[p - 1];
+      p--;
+    }
+    scratch[p] = v;
+  }
+  return scratch[k - 1];
+}
 
 /**
  * HDBSCAN — hierarchical density-based clustering.
@@ -37,7 +82,10 @@ import {
  * `condensation_tree.test.ts`).
  */
 export class HDBSCAN
-  implements BaseClustering<HDBSCANParams>, ClusterRepresentations
+  implements
+    BaseClustering<HDBSCANParams>,
+    ClusterRepresentations,
+    MemoryPlannable
 {
   public readonly params: HDBSCANParams;
 
@@ -57,6 +105,12 @@ export class HDBSCAN
    */
   public exemplar_indices_: Map<number, number> | null = null;
 
+  /**
+   * A plan with path `'blocked'` fits without the `(n, n)` matrices, from
+   * distance rows recomputed on the CPU.
+   */
+  public memory_plan_: MemoryPlan | null = null;
+
   private static readonly DEFAULT_MIN_CLUSTER_SIZE = 5;
 
   constructor(params: Partial<HDBSCANParams> = {}) {
@@ -116,9 +170,7 @@ export class HDBSCAN
     // Reject empty input before any tensor allocation (tf.tensor2d cannot
     // infer a shape from `[]`) and before fit() reaches dispose(), so a failed
     // re-fit leaves prior fitted state intact.
-    const n = is_tensor(X)
-      ? (X as tf.Tensor2D).shape[0]
-      : (X as number[][]).length;
+    const [n, n_cols] = matrix_shape(X);
     if (n === 0) {
       throw new Error('Input data must contain at least one sample.');
     }
@@ -133,6 +185,14 @@ export class HDBSCAN
         }
         return matrix.clone();
       }
+      if (is_flat_matrix(X)) {
+        if (n_cols !== n) {
+          throw new Error(
+            'precomputed metric requires a square (n, n) distance matrix.',
+          );
+        }
+        return to_tensor2d(X);
+      }
       const rows = X as number[][];
       for (const row of rows) {
         if (row.length !== n) {
@@ -148,13 +208,13 @@ export class HDBSCAN
       return pairwise_distance_matrix(X as tf.Tensor2D, metric);
     }
 
-    const rows = X as number[][];
-    const d = rows[0].length;
-    for (const row of rows) {
-      if (row.length !== d) {
-        throw new Error(
-          'Input data must be rectangular: every sample needs the same feature count.',
-        );
+    if (Array.isArray(X)) {
+      for (const row of X) {
+        if (row.length !== n_cols) {
+          throw new Error(
+            'Input data must be rectangular: every sample needs the same feature count.',
+          );
+        }
       }
     }
     // For the euclidean metric, distances come from pairwise_euclidean_matrix,
@@ -163,7 +223,7 @@ export class HDBSCAN
     // the helper pins them to zero. Labels are verified robust to the resulting
     // float32 drift — hdbscan.test.ts matches the scikit-learn oracle exactly
     // under the task-54.2 tolerances.
-    const points = tf.tensor2d(rows);
+    const points = to_tensor2d(X);
     try {
       return pairwise_distance_matrix(points, metric);
     } finally {
@@ -198,82 +258,256 @@ export class HDBSCAN
     }) as tf.Tensor1D; // tf.tidy widens to Tensor<Rank>; body is always rank-1
   }
 
+  private min_samples(n: number): number {
+    const min_cluster_size =
+      this.params.min_cluster_size ?? HDBSCAN.DEFAULT_MIN_CLUSTER_SIZE;
+    // min_samples defaults to min_cluster_size, clamped to the sample count.
+    // Intentional deviation from scikit-learn, which raises when
+    // min_samples > n_samples; the clamp keeps small inputs usable.
+    return Math.min(this.params.min_samples ?? min_cluster_size, n);
+  }
+
+  /**
+   * Core distances and mutual reachability, fused on-tensor in a single
+   * tf.tidy; the core vector, its two reshaped views, and the intermediate
+   * tf.maximum are freed on exit. M[i,j] = max(core[i], core[j], D[i,j]) via
+   * broadcast tf.maximum. The returned tensor is owned by the caller.
+   */
+  private mutual_reachability(D_tensor: tf.Tensor2D): tf.Tensor2D {
+    const n = D_tensor.shape[0];
+    const min_samples = this.min_samples(n);
+    return tf.tidy(() => {
+      const core = this.core_distances(D_tensor, min_samples);
+      return tf.maximum(
+        tf.maximum(core.reshape([n, 1]), core.reshape([1, n])),
+        D_tensor,
+      );
+    }) as tf.Tensor2D;
+  }
+
+  /**
+   * The plain-JS back half: MST, condensed tree and cluster selection over
+   * the flat row-major mutual-reachability matrix. `null` marks the lone-sample
+   * case.
+   */
+  private fit_reachability(mreach_flat: Float32Array | null, n: number): void {
+    // Intentional deviation from scikit-learn (which raises for n_samples=1):
+    // a lone sample is trivially noise, so degrade gracefully.
+    if (mreach_flat === null) {
+      this.labels_ = [-1];
+      this.probabilities_ = [0];
+      this.exemplar_indices_ = this.params.store_exemplars ? new Map() : null;
+      return;
+    }
+
+    const mst = profile_stage('HDBSCAN', 'mst', () =>
+      minimum_spanning_tree(mreach_flat, n),
+    );
+    this.fit_tree(mst, n);
+  }
+
+  /** Condensed tree and cluster selection from the mutual-reachability MST. */
+  private fit_tree(mst: MstEdge[], n: number): void {
+    profile_stage('HDBSCAN', 'condense', () => this.condense(mst, n));
+  }
+
+  private condense(mst: MstEdge[], n: number): void {
+    const min_cluster_size =
+      this.params.min_cluster_size ?? HDBSCAN.DEFAULT_MIN_CLUSTER_SIZE;
+    const tree = build_condensation_tree(mst, n, min_cluster_size);
+
+    const selected = excess_of_mass(tree, n, {
+      cluster_selection_method: this.params.cluster_selection_method ?? 'eom',
+      cluster_selection_epsilon: this.params.cluster_selection_epsilon ?? 0,
+    });
+
+    const { labels, probabilities, exemplar_indices } = extract_labels(
+      tree,
+      selected,
+      n,
+    );
+
+    this.labels_ = labels;
+    this.probabilities_ = probabilities;
+    this.exemplar_indices_ = this.params.store_exemplars
+      ? exemplar_indices
+      : null;
+  }
+
   async fit(X: DataMatrix): Promise<void> {
+    if (plan_for_fit(this, X)?.path === 'blocked') {
+      await this.fit_blocked(X);
+      return;
+    }
     // distance_matrix validates input shape and rejects empty input, all
     // before dispose() so a failed re-fit leaves prior fitted state intact. It
     // returns an (n, n) Tensor2D this method owns and disposes exactly once.
-    const D_tensor = this.distance_matrix(X);
-    let M_tensor: tf.Tensor2D | null = null;
+    const D_tensor = profile_stage('HDBSCAN', 'distance', () =>
+      this.distance_matrix(X),
+    );
     try {
       const n = D_tensor.shape[0];
 
       this.dispose();
-      // Intentional deviation from scikit-learn (which raises for n_samples=1):
-      // a lone sample is trivially noise, so degrade gracefully.
       if (n === 1) {
-        this.labels_ = [-1];
-        this.probabilities_ = [0];
-        this.exemplar_indices_ = this.params.store_exemplars ? new Map() : null;
+        this.fit_reachability(null, n);
         return;
       }
 
-      const min_cluster_size =
-        this.params.min_cluster_size ?? HDBSCAN.DEFAULT_MIN_CLUSTER_SIZE;
-      // min_samples defaults to min_cluster_size, clamped to the sample count.
-      // Intentional deviation from scikit-learn, which raises when
-      // min_samples > n_samples; the clamp keeps small inputs usable.
-      const min_samples = Math.min(
-        this.params.min_samples ?? min_cluster_size,
-        n,
+      const mreach_flat = await profile_stage(
+        'HDBSCAN',
+        'core_distances',
+        async () => {
+          const M_tensor = this.mutual_reachability(D_tensor);
+          try {
+            // Single GPU→CPU readback: flat row-major Float32Array of n*n.
+            return (await M_tensor.data()) as Float32Array;
+          } finally {
+            M_tensor.dispose();
+          }
+        },
       );
 
-      // Fuse core distances and mutual-reachability on-tensor in a single
-      // tf.tidy; the core vector, its two reshaped views, and the intermediate
-      // tf.maximum are freed on exit; M_tensor is the sole output.
-      // M[i,j] = max(core[i], core[j], D[i,j]) via broadcast tf.maximum.
-      M_tensor = tf.tidy(() => {
-        const core = this.core_distances(D_tensor, min_samples);
-        return tf.maximum(
-          tf.maximum(core.reshape([n, 1]), core.reshape([1, n])),
-          D_tensor,
-        );
-      }) as tf.Tensor2D;
-
-      // Single GPU→CPU readback: flat row-major Float32Array of length n*n.
-      const mreach_flat = (await M_tensor.data()) as Float32Array;
-      M_tensor.dispose();
-      M_tensor = null;
-
-      const mst = minimum_spanning_tree(mreach_flat, n);
-      const tree = build_condensation_tree(mst, n, min_cluster_size);
-
-      const selected = excess_of_mass(tree, n, {
-        cluster_selection_method: this.params.cluster_selection_method ?? 'eom',
-        cluster_selection_epsilon: this.params.cluster_selection_epsilon ?? 0,
-      });
+      this.fit_reachability(mreach_flat, n);
+    } finally {
+      D_tensor.dispose();
+    }
+  }
 
-      const { labels, probabilities, exemplar_indices } = extract_labels(
-        tree,
-        selected,
-        n,
-      );
+  /**
+   * The blocked path: core distances and mutual-reachability rows are
+   * recomputed in float64 on the CPU, one row at a time, so nothing larger
+   * than the data is held. Every distance is computed twice (once for the
+   * core distances, once as Prim visits the row). The distances are exact
+   * rather than the dense path's float32 gram identity, so tied boundary
+   * points may resolve differently.
+   */
+  private async fit_blocked(X: DataMatrix): Promise<void> {
+    const [n, d] = matrix_shape(X);
+    if (n === 0) {
+      throw new Error('Input data must contain at least one sample.');
+    }
+    const points = await to_float64(X);
+
+    this.dispose();
+    if (n === 1) {
+      this.fit_reachability(null, n);
+      return;
+    }
+
+    const manhattan = this.params.metric === 'manhattan';
+    const out = new Float64Array(n);
+    const distances = (i: number): Float64Array => {
+      const oi = i * d;
+      for (let j = 0; j < n; j++) {
+        const oj = j * d;
+        let v = 0;
+        if (manhattan) {
+          for (let k = 0; k < d; k++) {
+            v += Math.abs(points[oi + k] - points[oj + k]);
+          }
+        } else {
+          for (let k = 0; k < d; k++) {
+            const diff = points[oi + k] - points[oj + k];
+            v += diff * diff;
+          }
+          v = Math.sqrt(v);
+        }
+        out[j] = v;
+      }
+      return out;
+    };
 
-      this.labels_ = labels;
-      this.probabilities_ = probabilities;
-      this.exemplar_indices_ = this.params.store_exemplars
-        ? exemplar_indices
-        : null;
+    // Self (distance 0) counts as neighbour 0, as on the dense path.
+    const min_samples = this.min_samples(n);
+    const core = new Float64Array(n);
+    const scratch = new Float64Array(min_samples);
+    profile_stage('HDBSCAN', 'core_distances', () => {
+      for (let i = 0; i < n; i++) {
+        core[i] = kth_smallest(distances(i), min_samples, scratch);
+      }
+    });
+
+    const mst = profile_stage('HDBSCAN', 'mst', () =>
+      minimum_spanning_tree_from_rows(n, (u) => {
+        const row = distances(u);
+        for (let v = 0; v < n; v++) {
+          row[v] = Math.max(core[u], core[v], row[v]);
+        }
+        return row;
+      }),
+    );
+    this.fit_tree(mst, n);
+  }
+
+  plan_memory(shape: [number, number], budget: MemoryBudget): MemoryPlan {
+    return choose_memory_path(
+      'HDBSCAN',
+      shape,
+      budget,
+      hdbscan_memory_paths(this.params, shape, this.min_samples(shape[0])),
+    );
+  }
+
+  /**
+   * Fits one model per dataset with shared `params`. Every dataset's tensor
+   * front half is dispatched before the first readback, so the backend
+   * pipelines them and many small fits wait on one round trip instead of one
+   * each. The plain-JS back half then runs per dataset.
+   *
+   * @throws {Error} If any dataset is invalid; no model is fitted in that case.
+   */
+  static async fit_many(
+    datasets: DataMatrix[],
+    params: Partial<HDBSCANParams> = {},
+  ): Promise<HDBSCAN[]> {
+    const models = datasets.map(() => new HDBSCAN(params));
+    const reachability: Array<tf.Tensor2D | null> = [];
+    try {
+      for (let i = 0; i < datasets.length; i++) {
+        const D_tensor = models[i].distance_matrix(datasets[i]);
+        try {
+          reachability.push(
+            D_tensor.shape[0] === 1
+              ? null
+              : models[i].mutual_reachability(D_tensor),
+          );
+        } finally {
+          D_tensor.dispose();
+        }
+      }
+
+      const flats = await Promise.all(
+        reachability.map((M) =>
+          M === null ? null : (M.data() as Promise<Float32Array>),
+        ),
+      );
+      models.forEach((model, i) => {
+        const M = reachability[i];
+        model.fit_reachability(flats[i], M === null ? 1 : M.shape[0]);
+      });
+      return models;
     } finally {
-      M_tensor?.dispose();
-      D_tensor.dispose();
+      for (const M of reachability) M?.dispose();
     }
   }
 
-  async fit_predict(X: DataMatrix): Promise<number[]> {
+  fit_predict(
+    X: DataMatrix,
+    options?: FitPredictOptions & { int32_labels?: false },
+  ): Promise<number[]>;
+  fit_predict(
+    X: DataMatrix,
+    options: FitPredictOptions & { int32_labels: true },
+  ): Promise<Int32Array>;
+  async fit_predict(
+    X: DataMatrix,
+    options?: FitPredictOptions,
+  ): Promise<number[] | Int32Array> {
     await this.fit(X);
     if (this.labels_ == null) {
       throw new Error('HDBSCAN.fit did not compute labels.');
     }
-    return this.labels_;
+    return format_labels(this.labels_, options);
   }
 }
@@ -1,5 +1,6 @@
 import { Clustering } from './init';
 import { KMeans } from './kmeans';
+import { MiniBatchKMeans } from './minibatch_kmeans';
 import { SpectralClustering } from './spectral';
 import { AgglomerativeClustering } from './agglomerative';
 import { HDBSCAN } from './hdbscan';
@@ -9,6 +10,7 @@ import { is_initialized } from '../backend/backend';
 describe('Clustering static properties', () => {
   it('exposes the correct algorithm classes', () => {
     expect(Clustering.KMeans).toBe(KMeans);
+    expect(Clustering.MiniBatchKMeans).toBe(MiniBatchKMeans);
     expect(Clustering.SpectralClustering).toBe(SpectralClustering);
     expect(Clustering.AgglomerativeClustering).toBe(AgglomerativeClustering);
     expect(Clustering.HDBSCAN).toBe(HDBSCAN);
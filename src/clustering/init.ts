@@ -1,14 +1,38 @@
 import { initialize_backend, reset_backend, BackendConfig } from '../backend/backend';
 import { KMeans } from './kmeans';
+import { MiniBatchKMeans } from './minibatch_kmeans';
 import { SpectralClustering } from './spectral';
 import { AgglomerativeClustering } from './agglomerative';
 import { HDBSCAN } from './hdbscan';
 import { SOM } from './som';
 import type { Platform, PlatformFeatures } from '../backend/platform_types';
 import { get_platform } from '../backend/platform';
+import type { DataMatrix } from './types';
+import { matrix_shape } from '../tensor/data_matrix';
+import type {
+  MemoryBudget,
+  MemoryPlan,
+  MemoryPlannable,
+} from './memory_plan';
+import {
+  set_profiler,
+  to_chrome_trace,
+  type ProfilerListener,
+  type StageEvent,
+} from './profiler';
 
 let init_promise: Promise<void> | null = null;
 let init_config_key: string | null = null;
+let init_config: BackendConfig | null = null;
+
+/**
+ * The config of the current (or in-flight) `Clustering.init()` call, or
+ * `null` when the backend was loaded implicitly. Worker threads replay it so
+ * they run on the same backend as the main thread.
+ */
+export function current_init_config(): BackendConfig | null {
+  return init_config;
+}
 
 function is_plain_object(v: unknown): v is Record<string, unknown> {
   return typeof v === 'object' && v !== null && !Array.isArray(v);
@@ -137,12 +161,14 @@ export const Clustering = {
     }
 
     init_config_key = key;
+    init_config = strip_empty(config);
     init_promise = initialize_backend(config).then(
       () => {},
       (err: unknown) => {
         // Reset on failure to allow retry
         init_promise = null;
         init_config_key = null;
+        init_config = null;
         throw err;
       },
     );
@@ -158,9 +184,70 @@ export const Clustering = {
     reset_backend();
     init_promise = null;
     init_config_key = null;
+    init_config = null;
+  },
+
+  /**
+   * Estimates the peak memory of fitting `estimator` on `X` (or on an
+   * `[n_samples, n_features]` shape) and picks the first of its dense,
+   * blocked, sparse or approximate paths that fits `budget`. The plan is
+   * recorded as `estimator.memory_plan_`; `fit` follows it and re-plans
+   * against the same budget when its input has another shape. Set
+   * `memory_plan_` to `null` to fit without one.
+   *
+   * @throws {Error} If no path fits; the message names each path's peak
+   * stage and size. The estimator's previous plan is kept.
+   *
+   * @example
+   * ```typescript
+   * const hdbscan = new HDBSCAN({ min_cluster_size: 10 });
+   * const plan = Clustering.plan(hdbscan, X, { bytes: 512 * 2 ** 20 });
+   * plan.path; // 'blocked' when the n×n matrices would not fit
+   * await hdbscan.fit(X);
+   * ```
+   */
+  plan(
+    estimator: MemoryPlannable,
+    X: DataMatrix | [number, number],
+    budget: MemoryBudget,
+  ): MemoryPlan {
+    const shape: [number, number] =
+      Array.isArray(X) && X.length === 2 && typeof X[0] === 'number'
+        ? (X as [number, number])
+        : matrix_shape(X as DataMatrix);
+    const plan = estimator.plan_memory(shape, budget);
+    estimator.memory_plan_ = plan;
+    return plan;
+  },
+
+  /**
+   * Receives a `'begin'` and an `'end'` event for every named stage of every
+   * estimator's fit (`'distance'`, `'mst'`, `'eigensolve'`, `'bmu'`, ...).
+   * End events carry the stage's wall time, the change in live tensors and
+   * tensor bytes, the bytes read back from the backend, and the JS heap
+   * delta. Pass `null` to stop. Returns the previous listener.
+   *
+   * @example
+   * ```typescript
+   * const events: StageEvent[] = [];
+   * Clustering.set_profiler((e) => events.push(e));
+   * await new HDBSCAN().fit(X);
+   * Clustering.set_profiler(null);
+   * const trace = Clustering.to_chrome_trace(events);
+   * fs.writeFileSync('trace.json', JSON.stringify(trace));
+   * ```
+   */
+  set_profiler(listener: ProfilerListener | null): ProfilerListener | null {
+    return set_profiler(listener);
+  },
+
+  /** Chrome trace-event JSON of events recorded via `set_profiler`. */
+  to_chrome_trace(events: StageEvent[]) {
+    return to_chrome_trace(events);
   },
 
   KMeans: KMeans,
+  MiniBatchKMeans: MiniBatchKMeans,
   SpectralClustering: SpectralClustering,
   AgglomerativeClustering: AgglomerativeClustering,
   HDBSCAN: HDBSCAN,
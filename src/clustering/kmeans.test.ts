@@ -29,6 +29,17 @@ describe("KMeans – parameter validation", () => {
   it("throws for n_init < 1", () => {
     expect(() => new KMeans({ n_clusters: 2, n_init: 0 })).toThrow("n_init");
   });
+
+  it("throws for unknown algorithm", () => {
+    // @ts-expect-error - invalid algorithm value; testing runtime validation
+    expect(() => new KMeans({ n_clusters: 2, algorithm: "full" })).toThrow("algorithm");
+  });
+
+  it("throws for a bounded algorithm with the cosine metric", () => {
+    expect(
+      () => new KMeans({ n_clusters: 2, algorithm: "elkan", metric: "cosine" }),
+    ).toThrow("euclidean");
+  });
 });
 
 describe("KMeans – fit error paths", () => {
@@ -277,6 +288,47 @@ describe("KMeans", () => {
   });
 });
 
+describe("KMeans – batched restarts", () => {
+  const rng = make_random_stream(7);
+  const data: number[][] = Array.from({ length: 150 }, () => [rng.rand() * 10, rng.rand() * 10]);
+
+  it("picks the same run as fitting each restart on its own", async () => {
+    const n_init = 6;
+    let best: KMeans | null = null;
+    for (let run = 0; run < n_init; run++) {
+      const single = new KMeans({ n_clusters: 5, random_state: 3 + run, n_init: 1 });
+      await single.fit(data);
+      if (best === null || single.inertia_! < best.inertia_!) {
+        best?.dispose();
+        best = single;
+      } else {
+        single.dispose();
+      }
+    }
+
+    const batched = new KMeans({ n_clusters: 5, random_state: 3, n_init });
+    await batched.fit(data);
+    expect(batched.labels_).toEqual(best!.labels_);
+    expect(batched.inertia_).toBe(best!.inertia_);
+    expect(batched.get_centroids()).toEqual(best!.get_centroids());
+    batched.dispose();
+    best!.dispose();
+  });
+
+  it("is deterministic and leak-free across repeated fits", async () => {
+    const before = tf.memory().numTensors;
+    const a = new KMeans({ n_clusters: 4, random_state: 0 });
+    const b = new KMeans({ n_clusters: 4, random_state: 0 });
+    await a.fit(data);
+    await b.fit(data);
+    expect(b.labels_).toEqual(a.labels_);
+    expect(b.inertia_).toBe(a.inertia_);
+    a.dispose();
+    b.dispose();
+    expect(tf.memory().numTensors).toBe(before);
+  });
+});
+
 describe("KMeans – centroids & predict parity with scikit-learn", () => {
   const FIXTURE_DIR = path.join(process.cwd(), "__fixtures__", "kmeans");
 
@@ -369,6 +421,48 @@ describe("KMeans – centroids & predict parity with scikit-learn", () => {
     });
   }
 
+  it("keeps fit precision on large n with a large offset", async () => {
+    const fixture = JSON.parse(
+      fs.readFileSync(path.join(FIXTURE_DIR, "blobs_n3.json"), "utf-8"),
+    ) as {
+      params: { n_clusters: number; random_state: number };
+      X: number[][];
+      labels: number[];
+      cluster_centers_: number[][];
+      inertia_: number;
+    };
+    // 50 copies of every point, shifted by 1e4: the optimal centroids shift
+    // with the data, the partition tiles and the inertia scales by 50.
+    const copies = 50;
+    const offset = 1e4;
+    const shifted = fixture.X.map((row) => row.map((v) => v + offset));
+    const X: number[][] = [];
+    const labels: number[] = [];
+    for (let c = 0; c < copies; c++) {
+      X.push(...shifted);
+      labels.push(...fixture.labels);
+    }
+
+    const model = new KMeans({
+      n_clusters: fixture.params.n_clusters,
+      random_state: fixture.params.random_state,
+      n_init: 10,
+    });
+    await model.fit(X);
+
+    const centers = fixture.cluster_centers_.map((row) =>
+      row.map((v) => v + offset),
+    );
+    expect(centroids_match(model.get_centroids(), centers, 1e-2)).toBe(true);
+    expect(labelings_equivalent(model.labels_!, labels)).toBe(true);
+    const expected_inertia = copies * fixture.inertia_;
+    expect(
+      Math.abs(model.inertia_! - expected_inertia) / expected_inertia,
+    ).toBeLessThan(1e-3);
+
+    model.dispose();
+  });
+
   it("predict throws before fit", async () => {
     const model = new KMeans({ n_clusters: 2 });
     await expect(model.predict([[0, 0]])).rejects.toThrow();
@@ -445,3 +539,35 @@ describe("KMeans – JSON serialization", () => {
     expect(() => model.to_json()).toThrow();
   });
 });
+
+describe("KMeans – triangle-inequality algorithms", () => {
+  const rng = make_random_stream(11);
+  const data = Array.from({ length: 120 }, (_, i) => {
+    const c = i % 4;
+    return [c * 6 + rng.rand(), (c % 2) * 6 + rng.rand(), rng.rand()];
+  });
+
+  it("elkan and hamerly return the same model", async () => {
+    const elkan = new KMeans({ n_clusters: 4, random_state: 0, algorithm: "elkan" });
+    const hamerly = new KMeans({ n_clusters: 4, random_state: 0, algorithm: "hamerly" });
+    await elkan.fit(data);
+    await hamerly.fit(data);
+    expect(hamerly.labels_).toEqual(elkan.labels_);
+    expect(hamerly.inertia_).toBe(elkan.inertia_);
+    expect(hamerly.get_centroids()).toEqual(elkan.get_centroids());
+    elkan.dispose();
+    hamerly.dispose();
+  });
+
+  it("agrees with the tensor Lloyd path", async () => {
+    const lloyd = new KMeans({ n_clusters: 4, random_state: 0 });
+    const elkan = new KMeans({ n_clusters: 4, random_state: 0, algorithm: "elkan" });
+    await lloyd.fit(data);
+    await elkan.fit(tf.tensor2d(data));
+    expect(elkan.labels_).toEqual(lloyd.labels_);
+    expect(elkan.inertia_!).toBeCloseTo(lloyd.inertia_!, 3);
+    expect(await elkan.predict(data)).toEqual(elkan.labels_);
+    lloyd.dispose();
+    elkan.dispose();
+  });
+});
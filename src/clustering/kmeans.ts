@@ -1,12 +1,31 @@
 import type {
   BaseClustering,
   DataMatrix,
+  FitPredictOptions,
   KMeansParams,
 } from './types';
 import * as tf from '../backend/adapter';
-import { is_tensor } from '../tensor/tensor_guards';
+import {
+  format_labels,
+  matrix_shape,
+  to_float64,
+  to_rows,
+  to_tensor2d,
+} from '../tensor/data_matrix';
 import { make_random_stream } from '../random';
 import { pairwise_distance_matrix } from '../distance/pairwise_distance';
+import { bounded_kmeans } from './kmeans_bounded';
+import { kmeans_plus_plus } from './kmeans_seeding';
+import { lloyd_many, type LloydProblem } from './kmeans_many';
+import {
+  choose_memory_path,
+  kmeans_memory_paths,
+  plan_for_fit,
+  type MemoryBudget,
+  type MemoryPlan,
+  type MemoryPlannable,
+} from './memory_plan';
+import { profile_stage } from './profiler';
 
 export interface KMeansJSON {
   params: KMeansParams;
@@ -31,7 +50,7 @@ function l2_normalize_rows(rows: number[][]): number[][] {
  * Supports multiple random initializations (`n_init`) and selects the solution
  * with the lowest inertia, matching scikit-learn's default behavior.
  */
-export class KMeans implements BaseClustering<KMeansParams> {
+export class KMeans implements BaseClustering<KMeansParams>, MemoryPlannable {
   public readonly params: KMeansParams;
 
   public labels_: number[] | null = null;
@@ -40,6 +59,8 @@ export class KMeans implements BaseClustering<KMeansParams> {
 
   public inertia_: number | null = null;
 
+  public memory_plan_: MemoryPlan | null = null;
+
   private static readonly DEFAULT_MAX_ITER = 300;
   private static readonly DEFAULT_TOL = 1e-4;
   // scikit-learn defaults to 10 initialisations which results in more
@@ -47,18 +68,53 @@ export class KMeans implements BaseClustering<KMeansParams> {
   // the reference implementation improves parity for downstream spectral
   // clustering tests.
   private static readonly DEFAULT_N_INIT = 10;
+  // Cap on the n × (R·K) distance matrix of a restart batch (float32, 64 MB).
+  private static readonly BATCHED_RESTART_MAX_ENTRIES = 1 << 24;
 
   constructor(params: KMeansParams) {
     this.params = { ...params };
     KMeans.validate_params(this.params);
   }
 
+  /** Restarts per Lloyd batch when no memory plan sets one. */
+  private static default_restart_batch(
+    n_samples: number,
+    K: number,
+    n_init: number,
+  ): number {
+    return Math.max(
+      1,
+      Math.min(
+        n_init,
+        Math.floor(KMeans.BATCHED_RESTART_MAX_ENTRIES / (n_samples * K)),
+      ),
+    );
+  }
+
+  plan_memory(shape: [number, number], budget: MemoryBudget): MemoryPlan {
+    const n_init = this.params.n_init ?? KMeans.DEFAULT_N_INIT;
+    return choose_memory_path(
+      'KMeans',
+      shape,
+      budget,
+      kmeans_memory_paths(
+        this.params,
+        shape,
+        KMeans.default_restart_batch(
+          Math.max(shape[0], 1),
+          this.params.n_clusters,
+          n_init,
+        ),
+      ),
+    );
+  }
+
   private static make_random_stream(seed?: number) {
     return make_random_stream(seed);
   }
 
   private static validate_params(params: KMeansParams): void {
-    const { n_clusters, max_iter, tol, n_init, metric } = params;
+    const { n_clusters, max_iter, tol, n_init, metric, algorithm } = params;
 
     if (!Number.isInteger(n_clusters) || n_clusters < 1) {
       throw new Error('n_clusters must be a positive integer (>= 1).');
@@ -78,6 +134,22 @@ export class KMeans implements BaseClustering<KMeansParams> {
     if (n_init !== undefined && (!Number.isInteger(n_init) || n_init < 1)) {
       throw new Error('n_init must be a positive integer (>= 1) when given.');
     }
+
+    if (
+      algorithm !== undefined &&
+      algorithm !== 'lloyd' &&
+      algorithm !== 'elkan' &&
+      algorithm !== 'hamerly'
+    ) {
+      throw new Error(
+        "algorithm must be 'lloyd', 'elkan' or 'hamerly' when given.",
+      );
+    }
+    if (algorithm !== undefined && algorithm !== 'lloyd' && metric === 'cosine') {
+      throw new Error(
+        `algorithm '${algorithm}' requires the euclidean metric.`,
+      );
+    }
   }
 
   public dispose(): void {
@@ -91,6 +163,7 @@ export class KMeans implements BaseClustering<KMeansParams> {
 
   /**
    * @throws {Error} If input data is empty or n_clusters exceeds n_samples.
+   * @throws {Error} If a recorded `memory_plan_` has no path that fits `X`.
    *
    * @example
    * ```typescript
@@ -100,13 +173,19 @@ export class KMeans implements BaseClustering<KMeansParams> {
    * ```
    */
   async fit(X: DataMatrix): Promise<void> {
+    const plan = plan_for_fit(this, X);
     if (this.params.metric === 'cosine') {
       await this.fit_cosine(X);
       return;
     }
+    const algorithm = this.params.algorithm ?? 'lloyd';
+    if (algorithm !== 'lloyd') {
+      await this.fit_bounded(X, algorithm);
+      return;
+    }
 
     // Validate input dimensions before creating tensors to avoid leaks on throw.
-    const n_samples = is_tensor(X) ? (X as tf.Tensor2D).shape[0] : (X as number[][]).length;
+    const [n_samples, n_features] = matrix_shape(X);
     if (n_samples === 0) {
       throw new Error('Input data must contain at least one sample.');
     }
@@ -117,258 +196,429 @@ export class KMeans implements BaseClustering<KMeansParams> {
 
     this.dispose();
 
-    // When X is already a tensor we clone to avoid mutating the caller's data.
-    // When X is a plain array, tf.tensor2d already creates a new tensor.
-    const x_tensor: tf.Tensor2D = is_tensor(X)
-      ? (X as tf.Tensor2D).clone()
-      : tf.tensor2d(X as number[][], undefined, 'float32');
-
-    const [, n_features] = x_tensor.shape;
-
     const n_init = this.params.n_init ?? KMeans.DEFAULT_N_INIT;
 
-    // Use full-precision original data to avoid float32 rounding in k-means++ probabilities.
-    const points_arr: number[][] = Array.isArray(X)
-      ? (X as number[][])
-      : ((await x_tensor.array()) as number[][]);
-
-    let best_inertia = Number.POSITIVE_INFINITY;
-    let best_labels: Int32Array | null = null;
-    let best_centroids: tf.Tensor2D | null = null;
+    // Full-precision data: k-means++ probabilities, centroid means and inertia
+    // are all computed in float64 on the host.
+    const points = await to_float64(X);
 
     const max_iter = this.params.max_iter ?? KMeans.DEFAULT_MAX_ITER;
     const tol = this.params.tol ?? KMeans.DEFAULT_TOL;
 
     const base_seed = this.params.random_state;
 
-    const run_once = async (
-      seed_offset: number,
-    ): Promise<{
-      inertia: number;
-      labels: Int32Array;
-      centroids: tf.Tensor2D;
-    }> => {
-      const rand_stream = KMeans.make_random_stream(
-        base_seed !== undefined ? base_seed + seed_offset : undefined,
-      );
-
-      const rand = rand_stream.rand;
-
-      const centroid_idxs: number[] = [];
-      const centroid_set = new Set<number>();
-      const first_idx = rand_stream.rand_int(n_samples);
-      centroid_idxs.push(first_idx);
-      centroid_set.add(first_idx);
-
-      while (centroid_idxs.length < K) {
-        const distances: number[] = points_arr.map((p, idx) => {
-          if (centroid_set.has(idx)) return 0;
-          let min_d2 = Number.POSITIVE_INFINITY;
-          for (const c_idx of centroid_idxs) {
-            const c = points_arr[c_idx];
-            let d2 = 0;
-            for (let j = 0; j < n_features; j++) {
-              const diff = p[j] - c[j];
-              d2 += diff * diff;
-            }
-            if (d2 < min_d2) min_d2 = d2;
-          }
-          return min_d2;
-        });
-
-        const current_pot = distances.reduce((a, b) => a + b, 0);
-        if (current_pot === 0) {
-          for (let i = 0; i < n_samples; i++) {
-            if (!centroid_set.has(i)) {
-              centroid_idxs.push(i);
-              centroid_set.add(i);
-              break;
-            }
-          }
-          continue;
-        }
-
-        const local_trials = 2 + Math.floor(Math.log(K));
-        const cumulative_distances: number[] = [];
-        let cum_sum = 0;
-        for (const d of distances) {
-          cum_sum += d;
-          cumulative_distances.push(cum_sum);
-        }
+    // The device only assigns points. It works on column-centred data so the
+    // float32 norm identity does not cancel on data with a large offset;
+    // distances, and therefore assignments, are translation invariant.
+    const mean = new Float64Array(n_features);
+    for (let i = 0; i < n_samples; i++) {
+      for (let f = 0; f < n_features; f++) {
+        mean[f] += points[i * n_features + f];
+      }
+    }
+    for (let f = 0; f < n_features; f++) mean[f] /= n_samples;
+    const centred = new Float32Array(points.length);
+    for (let i = 0; i < points.length; i++) {
+      centred[i] = points[i] - mean[i % n_features];
+    }
 
-        const candidates: number[] = [];
-        for (let t = 0; t < local_trials; t++) {
-          const r = rand() * current_pot;
-          let lo = 0;
-          let hi = n_samples - 1;
-          while (lo < hi) {
-            const mid = Math.floor((lo + hi) / 2);
-            if (r <= cumulative_distances[mid]) {
-              hi = mid;
-            } else {
-              lo = mid + 1;
-            }
-          }
-          candidates.push(lo);
+    const x_tensor = tf.tensor2d(centred, [n_samples, n_features], 'float32');
+    let x_norm: tf.Tensor2D | null = null;
+    try {
+      // Loop-invariant operand of the assignment step, shared by every
+      // restart.
+      x_norm = tf.tidy(() =>
+        x_tensor.square().sum(1).reshape([n_samples, 1]),
+      ) as tf.Tensor2D;
+
+      // Seeding only depends on each restart's own stream, so every restart
+      // is seeded up front and the Lloyd iterations run batched.
+      const seeds: Float64Array[] = [];
+      profile_stage('KMeans', 'seeding', () => {
+        for (let run = 0; run < n_init; run++) {
+          const rand_stream = KMeans.make_random_stream(
+            base_seed !== undefined ? base_seed + run : undefined,
+          );
+          const centroid_idxs = kmeans_plus_plus(
+            points,
+            n_samples,
+            n_features,
+            K,
+            rand_stream,
+          );
+          const seed = new Float64Array(K * n_features);
+          centroid_idxs.forEach((idx, c) =>
+            seed.set(
+              points.subarray(idx * n_features, (idx + 1) * n_features),
+              c * n_features,
+            ),
+          );
+          seeds.push(seed);
         }
+      });
 
-        let best_candidate = candidates[0];
-        let best_potential = Number.POSITIVE_INFINITY;
-
-        for (const cand of candidates) {
-          let pot = 0;
-          const cand_point = points_arr[cand];
-          for (let i = 0; i < n_samples; i++) {
-            const p = points_arr[i];
-            let d2 = 0;
-            for (let j = 0; j < n_features; j++) {
-              const diff = p[j] - cand_point[j];
-              d2 += diff * diff;
-            }
-            const min_d2 = Math.min(distances[i], d2);
-            pot += min_d2;
-          }
-          if (pot < best_potential) {
-            best_potential = pot;
-            best_candidate = cand;
+      const batch_size =
+        plan?.settings.restart_batch ??
+        KMeans.default_restart_batch(n_samples, K, n_init);
+
+      let best_inertia = Number.POSITIVE_INFINITY;
+      let best_labels: Int32Array | null = null;
+      let best_centroids: Float64Array | null = null;
+
+      // Batches run in restart order and ties keep the earlier restart, so
+      // the selected run is the one a one-at-a-time loop would pick.
+      for (let start = 0; start < n_init; start += batch_size) {
+        const runs = await profile_stage('KMeans', 'update', () =>
+          KMeans.lloyd_batch(
+            x_tensor,
+            x_norm!,
+            points,
+            mean,
+            seeds.slice(start, start + batch_size),
+            K,
+            max_iter,
+            tol,
+          ),
+        );
+        for (const { inertia, labels, centroids } of runs) {
+          if (inertia < best_inertia) {
+            best_inertia = inertia;
+            best_labels = labels;
+            best_centroids = centroids;
           }
         }
-
-        centroid_idxs.push(best_candidate);
-        centroid_set.add(best_candidate);
       }
 
-      let centroids = tf.tensor2d(
-        centroid_idxs.map((i) => points_arr[i]),
+      this.centroids_ = tf.tensor2d(
+        best_centroids!,
         [K, n_features],
         'float32',
       );
+      this.labels_ = Array.from(best_labels!);
+      this.inertia_ = best_inertia;
+    } finally {
+      x_norm?.dispose();
+      x_tensor.dispose();
+    }
+  }
 
-      let prev_inertia = Number.POSITIVE_INFINITY;
-      let labels: Int32Array = new Int32Array(n_samples);
-
-      for (let iter = 0; iter < max_iter; iter++) {
-        const distances = tf.tidy(() => {
-          const x_norm = x_tensor.square().sum(1).reshape([n_samples, 1]);
-          const c_norm = centroids.square().sum(1).reshape([1, K]);
-          const cross = tf.mat_mul(x_tensor, centroids.transpose());
-          const dist_sq = x_norm.add(c_norm).sub(cross.mul(2));
-          return tf.maximum(dist_sq, tf.scalar(0, 'float32'));
-        });
-
-        const arg_min_tensor = distances.argMin(1);
-        labels = (await arg_min_tensor.data()) as Int32Array;
-        arg_min_tensor.dispose();
-
-        const min_tensor = distances.min(1);
-        const min_dist_sq = await min_tensor.data();
-        min_tensor.dispose();
-        const inertia = Array.from(min_dist_sq as Float32Array).reduce(
-          (a, b) => a + b,
-          0,
-        );
-        distances.dispose();
-
-        const new_centroids_arr: number[][] = Array.from({ length: K }, () =>
-          Array(n_features).fill(0),
-        );
-        const counts: number[] = Array(K).fill(0);
-
+  /**
+   * Lloyd iterations for R restarts at once. Their centred centroids are
+   * stacked into one (R·K)×d matrix, so assignment costs one distance matmul
+   * and one label readback for all of them. Centroid means, inertia, shift
+   * and empty-cluster relocation then run in float64 on the host, as a lone
+   * run does. Each restart keeps its own convergence test and is frozen once
+   * it passes, ending exactly where a lone run from the same seed would.
+   */
+  private static async lloyd_batch(
+    x_tensor: tf.Tensor2D,
+    x_norm: tf.Tensor2D,
+    points: Float64Array,
+    mean: Float64Array,
+    seeds: Float64Array[],
+    K: number,
+    max_iter: number,
+    tol: number,
+  ): Promise<
+    Array<{ inertia: number; labels: Int32Array; centroids: Float64Array }>
+  > {
+    const [n_samples, n_features] = x_tensor.shape;
+    const R = seeds.length;
+    const block_size = K * n_features;
+    const centroids = seeds.map((seed) => Float64Array.from(seed));
+    const labels = seeds.map(() => new Int32Array(n_samples));
+
+    const active = new Array<boolean>(R).fill(true);
+    const prev_inertia = new Array<number>(R).fill(Number.POSITIVE_INFINITY);
+    const dist_sq = new Float64Array(n_samples);
+    const sums = new Float64Array(block_size);
+    const counts = new Int32Array(K);
+
+    for (let iter = 0; iter < max_iter && active.includes(true); iter++) {
+      const stacked = new Float32Array(R * block_size);
+      for (let r = 0; r < R; r++) {
+        for (let j = 0; j < block_size; j++) {
+          stacked[r * block_size + j] =
+            centroids[r][j] - mean[j % n_features];
+        }
+      }
+      const assigned = tf.tidy(() => {
+        const c = tf.tensor2d(stacked, [R * K, n_features], 'float32');
+        const c_norm = c.square().sum(1).reshape([1, R * K]);
+        const cross = tf.mat_mul(x_tensor, c, false, true);
+        return tf
+          .maximum(x_norm.add(c_norm).sub(cross.mul(2)), tf.scalar(0))
+          .reshape([n_samples, R, K])
+          .argMin(2);
+      });
+      // Row-major (n × R): restart r's label for sample i is at i * R + r.
+      const all_labels = await assigned.data();
+      assigned.dispose();
+
+      for (let r = 0; r < R; r++) {
+        if (!active[r]) continue;
+        const current = centroids[r];
+        const labels_r = labels[r];
+        sums.fill(0);
+        counts.fill(0);
+        let inertia = 0;
         for (let i = 0; i < n_samples; i++) {
-          const label = labels[i];
-          counts[label]++;
-          const row = points_arr[i];
-          for (let j = 0; j < n_features; j++) {
-            new_centroids_arr[label][j] += row[j];
+          const k = all_labels[i * R + r];
+          labels_r[i] = k;
+          counts[k]++;
+          let d2 = 0;
+          for (let f = 0; f < n_features; f++) {
+            const v = points[i * n_features + f];
+            const diff = v - current[k * n_features + f];
+            d2 += diff * diff;
+            sums[k * n_features + f] += v;
           }
+          dist_sq[i] = d2;
+          inertia += d2;
         }
 
-        const empty_clusters: number[] = [];
-        for (let k_idx = 0; k_idx < K; k_idx++) {
-          if (counts[k_idx] === 0) {
-            empty_clusters.push(k_idx);
-            const slice_tensor = centroids.slice([k_idx, 0], [1, n_features]);
-            new_centroids_arr[k_idx] = Array.from(
-              await slice_tensor.array(),
-            )[0] as number[];
-            slice_tensor.dispose();
+        // Empty clusters are re-seeded with the points farthest from their
+        // centroid (scikit-learn's relocation rule).
+        const next = new Float64Array(block_size);
+        const empty: number[] = [];
+        for (let k = 0; k < K; k++) {
+          const row = k * n_features;
+          if (counts[k] === 0) {
+            empty.push(k);
+            next.set(current.subarray(row, row + n_features), row);
           } else {
-            for (let j = 0; j < n_features; j++) {
-              new_centroids_arr[k_idx][j] /= counts[k_idx];
+            for (let f = 0; f < n_features; f++) {
+              next[row + f] = sums[row + f] / counts[k];
             }
           }
         }
-
-        if (empty_clusters.length > 0) {
-          const dist_to_nearest = new Float32Array(n_samples);
-          for (let i = 0; i < n_samples; i++) {
-            dist_to_nearest[i] = min_dist_sq[i];
+        if (empty.length > 0) {
+          const order = Array.from({ length: n_samples }, (_, i) => i);
+          order.sort((a, b) => dist_sq[b] - dist_sq[a]);
+          for (let e = 0; e < empty.length && e < n_samples; e++) {
+            const src = order[e] * n_features;
+            next.set(
+              points.subarray(src, src + n_features),
+              empty[e] * n_features,
+            );
           }
+        }
 
-          const indices = Array.from({ length: n_samples }, (_, i) => i);
-          indices.sort((a, b) => dist_to_nearest[b] - dist_to_nearest[a]);
+        let shift = 0;
+        for (let j = 0; j < block_size; j++) {
+          const diff = Math.abs(current[j] - next[j]);
+          if (diff > shift) shift = diff;
+        }
+        centroids[r] = next;
 
-          for (let i = 0; i < empty_clusters.length && i < n_samples; i++) {
-            const farthest_idx = indices[i];
-            const empty_cluster_idx = empty_clusters[i];
-            new_centroids_arr[empty_cluster_idx] = [...points_arr[farthest_idx]];
-          }
+        const relative_diff =
+          Math.abs(prev_inertia[r] - inertia) / (prev_inertia[r] || 1);
+        prev_inertia[r] = inertia;
+        if (relative_diff <= tol || shift <= tol) {
+          active[r] = false;
         }
+      }
+    }
 
-        const new_centroids = tf.tensor2d(
-          new_centroids_arr,
-          [K, n_features],
-          'float32',
-        );
+    return Array.from({ length: R }, (_, r) => ({
+      inertia: prev_inertia[r],
+      labels: labels[r],
+      centroids: centroids[r],
+    }));
+  }
 
-        const shift_tensor = tf.tidy(() => centroids.sub(new_centroids).abs().max());
-        const centroid_shift = (await shift_tensor.data())[0];
-        shift_tensor.dispose();
+  /**
+   * Triangle-inequality accelerated fit (`algorithm: 'elkan' | 'hamerly'`).
+   * Seeding and restart selection match the tensor path; the Lloyd
+   * iterations run in float64 on the CPU via {@link bounded_kmeans}.
+   */
+  private async fit_bounded(
+    X: DataMatrix,
+    algorithm: 'elkan' | 'hamerly',
+  ): Promise<void> {
+    const [n_samples, n_features] = matrix_shape(X);
+    if (n_samples === 0) {
+      throw new Error('Input data must contain at least one sample.');
+    }
+    const K = this.params.n_clusters;
+    if (K > n_samples) {
+      throw new Error('n_clusters cannot exceed number of samples.');
+    }
 
-        centroids.dispose();
-        centroids = new_centroids;
+    this.dispose();
 
-        const relative_diff =
-          Math.abs(prev_inertia - inertia) / (prev_inertia || 1);
-        if (relative_diff <= tol || centroid_shift <= tol) {
-          prev_inertia = inertia;
-          break;
-        }
-        prev_inertia = inertia;
-      }
+    const data = await to_float64(X);
+    const max_iter = this.params.max_iter ?? KMeans.DEFAULT_MAX_ITER;
+    const tol = this.params.tol ?? KMeans.DEFAULT_TOL;
+    const n_init = this.params.n_init ?? KMeans.DEFAULT_N_INIT;
+    const base_seed = this.params.random_state;
 
-      return { inertia: prev_inertia, labels, centroids };
-    };
+    let best_inertia = Number.POSITIVE_INFINITY;
+    let best_labels: Int32Array | null = null;
+    let best_centroids: Float64Array | null = null;
 
     for (let run = 0; run < n_init; run++) {
-      const { inertia, labels, centroids } = await run_once(run);
-      if (inertia < best_inertia) {
-        if (best_centroids) best_centroids.dispose();
-        best_inertia = inertia;
-        best_labels = labels;
-        best_centroids = centroids;
-      } else {
-        // dispose unused centroids to avoid leaks
-        centroids.dispose();
+      const rand_stream = KMeans.make_random_stream(
+        base_seed !== undefined ? base_seed + run : undefined,
+      );
+      const idxs = profile_stage('KMeans', 'seeding', () =>
+        kmeans_plus_plus(data, n_samples, n_features, K, rand_stream),
+      );
+      const init = new Float64Array(K * n_features);
+      idxs.forEach((idx, c) =>
+        init.set(
+          data.subarray(idx * n_features, (idx + 1) * n_features),
+          c * n_features,
+        ),
+      );
+
+      const result = profile_stage('KMeans', 'update', () =>
+        bounded_kmeans(data, n_samples, n_features, init, {
+          algorithm,
+          max_iter,
+          tol,
+        }),
+      );
+      if (result.inertia < best_inertia) {
+        best_inertia = result.inertia;
+        best_labels = result.labels;
+        best_centroids = result.centroids;
       }
     }
 
-    this.centroids_ = best_centroids!;
+    this.centroids_ = tf.tensor2d(
+      Float32Array.from(best_centroids!),
+      [K, n_features],
+      'float32',
+    );
     this.labels_ = Array.from(best_labels!);
     this.inertia_ = best_inertia;
-
-    x_tensor.dispose();
   }
 
   /**
    * @throws {Error} If input data is empty or n_clusters exceeds n_samples.
    */
-  async fit_predict(X: DataMatrix): Promise<number[]> {
+  fit_predict(
+    X: DataMatrix,
+    options?: FitPredictOptions & { int32_labels?: false },
+  ): Promise<number[]>;
+  fit_predict(
+    X: DataMatrix,
+    options: FitPredictOptions & { int32_labels: true },
+  ): Promise<Int32Array>;
+  async fit_predict(
+    X: DataMatrix,
+    options?: FitPredictOptions,
+  ): Promise<number[] | Int32Array> {
     await this.fit(X);
     if (this.labels_ == null) {
       throw new Error('KMeans.fit did not compute labels.');
     }
-    return this.labels_;
+    return format_labels(this.labels_, options);
+  }
+
+  /**
+   * Fits one model per dataset with shared `params`, for workloads of many
+   * small datasets where per-`fit` dispatch and readbacks would dominate.
+   * Datasets with the same feature count and comparable size (within 2× rows)
+   * run their Lloyd iterations together in one padded batch via
+   * {@link lloyd_many}, each with the same seeding, restarts and convergence
+   * rule as `fit`. The cosine metric and the bounded algorithms fit each
+   * dataset in turn.
+   *
+   * @throws {Error} If any dataset is empty or has fewer samples than
+   * n_clusters; no model is fitted in that case.
+   */
+  static async fit_many(
+    datasets: DataMatrix[],
+    params: KMeansParams,
+  ): Promise<KMeans[]> {
+    const models = datasets.map(() => new KMeans(params));
+    if (
+      params.metric === 'cosine' ||
+      (params.algorithm ?? 'lloyd') !== 'lloyd'
+    ) {
+      for (let i = 0; i < datasets.length; i++) {
+        await models[i].fit(datasets[i]);
+      }
+      return models;
+    }
+
+    const K = params.n_clusters;
+    const n_init = params.n_init ?? KMeans.DEFAULT_N_INIT;
+    const max_iter = params.max_iter ?? KMeans.DEFAULT_MAX_ITER;
+    const tol = params.tol ?? KMeans.DEFAULT_TOL;
+    const base_seed = params.random_state;
+
+    const problems: Array<LloydProblem & { d: number }> = [];
+    for (const X of datasets) {
+      const [n, d] = matrix_shape(X);
+      if (n === 0) {
+        throw new Error('Input data must contain at least one sample.');
+      }
+      if (K > n) {
+        throw new Error('n_clusters cannot exceed number of samples.');
+      }
+      const points = await to_float64(X);
+      const seeds: Float32Array[] = [];
+      for (let run = 0; run < n_init; run++) {
+        const rand_stream = KMeans.make_random_stream(
+          base_seed !== undefined ? base_seed + run : undefined,
+        );
+        const idxs = kmeans_plus_plus(points, n, d, K, rand_stream);
+        const seed = new Float32Array(K * d);
+        idxs.forEach((idx, c) =>
+          seed.set(points.subarray(idx * d, (idx + 1) * d), c * d),
+        );
+        seeds.push(seed);
+      }
+      problems.push({ points, n, d, seeds });
+    }
+
+    // Sorting by (d, n) keeps padding under 2× within a batch.
+    const order = problems
+      .map((_, i) => i)
+      .sort(
+        (a, b) =>
+          problems[a].d - problems[b].d || problems[a].n - problems[b].n,
+      );
+    let start = 0;
+    while (start < order.length) {
+      const first = problems[order[start]];
+      let end = start + 1;
+      while (end < order.length) {
+        const next = problems[order[end]];
+        if (
+          next.d !== first.d ||
+          next.n > 2 * first.n ||
+          (end - start + 1) * next.n * n_init * K >
+            KMeans.BATCHED_RESTART_MAX_ENTRIES
+        ) {
+          break;
+        }
+        end++;
+      }
+
+      const batch = order.slice(start, end);
+      const runs = await lloyd_many(
+        batch.map((i) => problems[i]),
+        first.d,
+        K,
+        max_iter,
+        tol,
+      );
+      batch.forEach((i, b) => {
+        let best = runs[b][0];
+        for (const run of runs[b]) {
+          if (run.inertia < best.inertia) best = run;
+        }
+        models[i].centroids_ = tf.tensor2d(best.centroids, [K, first.d]);
+        models[i].labels_ = Array.from(best.labels);
+        models[i].inertia_ = best.inertia;
+      });
+      start = end;
+    }
+    return models;
   }
 
   /**
@@ -383,44 +633,36 @@ export class KMeans implements BaseClustering<KMeansParams> {
     }
 
     const metric = this.params.metric ?? 'euclidean';
-    const points_raw: number[][] = is_tensor(X)
-      ? ((await (X as tf.Tensor2D).array()) as number[][])
-      : (X as number[][]);
-
-    if (points_raw.length === 0) {
+    const [n, n_features] = matrix_shape(X);
+    if (n === 0) {
       return [];
     }
 
     const points =
-      metric === 'cosine' ? l2_normalize_rows(points_raw) : points_raw;
-    const n = points.length;
-    const n_features = points[0].length;
-
-    return tf.tidy(() => {
-      const centroid_rows = this.centroids_!.arraySync() as number[][];
-      const k = centroid_rows.length;
-      const combined = tf.tensor2d(
-        [...points, ...centroid_rows],
-        [n + k, n_features],
-        'float32',
-      );
-      const full = pairwise_distance_matrix(combined, metric).arraySync() as number[][];
-
-      const labels: number[] = new Array<number>(n);
-      for (let i = 0; i < n; i++) {
-        let best = 0;
-        let best_d = full[i][n];
-        for (let j = 1; j < k; j++) {
-          const d = full[i][n + j];
-          if (d < best_d) {
-            best_d = d;
-            best = j;
-          }
-        }
-        labels[i] = best;
-      }
-      return labels;
-    });
+      metric === 'cosine'
+        ? tf.tensor2d(
+            l2_normalize_rows(await to_rows(X)),
+            [n, n_features],
+            'float32',
+          )
+        : to_tensor2d(X);
+    try {
+      const labels = tf.tidy(() => {
+        const k = this.centroids_!.shape[0];
+        const combined = tf.concat([
+          tf.cast(points, 'float32') as tf.Tensor2D,
+          this.centroids_!,
+        ]);
+        const full = pairwise_distance_matrix(combined, metric);
+        // argMin keeps the first minimum, i.e. the lowest centroid index.
+        return tf.slice(full, [0, n], [n, k]).argMin(1);
+      });
+      const out = Array.from(await labels.data());
+      labels.dispose();
+      return out;
+    } finally {
+      if (points !== X) points.dispose();
+    }
   }
 
   /**
@@ -468,9 +710,7 @@ export class KMeans implements BaseClustering<KMeansParams> {
    * vectors, matching the `normalize(X)` + KMeans reference convention.
    */
   private async fit_cosine(X: DataMatrix): Promise<void> {
-    const points_raw: number[][] = is_tensor(X)
-      ? ((await (X as tf.Tensor2D).array()) as number[][])
-      : (X as number[][]);
+    const points_raw = await to_rows(X);
 
     const n_samples = points_raw.length;
     if (n_samples === 0) {
@@ -491,10 +731,12 @@ export class KMeans implements BaseClustering<KMeansParams> {
     const n_init = this.params.n_init ?? KMeans.DEFAULT_N_INIT;
     const base_seed = this.params.random_state;
 
-    const d_cos: number[][] = tf.tidy(() => {
-      const x = tf.tensor2d(points, [n_samples, n_features], 'float32');
-      return pairwise_distance_matrix(x, 'cosine').arraySync() as number[][];
-    });
+    const d_cos: number[][] = profile_stage('KMeans', 'distance', () =>
+      tf.tidy(() => {
+        const x = tf.tensor2d(points, [n_samples, n_features], 'float32');
+        return pairwise_distance_matrix(x, 'cosine').arraySync() as number[][];
+      }),
+    );
 
     const cross_cosine = (centroids: number[][]): number[][] => {
       return tf.tidy(() => {
@@ -520,139 +762,150 @@ export class KMeans implements BaseClustering<KMeansParams> {
       );
       const rand = rand_stream.rand;
 
-      const centroid_idxs: number[] = [];
-      const centroid_set = new Set<number>();
-      const first_idx = rand_stream.rand_int(n_samples);
-      centroid_idxs.push(first_idx);
-      centroid_set.add(first_idx);
-
-      while (centroid_idxs.length < K) {
-        const distances: number[] = points.map((_p, idx) => {
-          if (centroid_set.has(idx)) return 0;
-          let min_d = Number.POSITIVE_INFINITY;
-          for (const c_idx of centroid_idxs) {
-            const d = d_cos[idx][c_idx];
-            if (d < min_d) min_d = d;
-          }
-          return min_d * min_d;
-        });
-
-        const current_pot = distances.reduce((a, b) => a + b, 0);
-        if (current_pot === 0) {
-          for (let i = 0; i < n_samples; i++) {
-            if (!centroid_set.has(i)) {
-              centroid_idxs.push(i);
-              centroid_set.add(i);
-              break;
+      const seed_idxs = profile_stage('KMeans', 'seeding', () => {
+        const centroid_idxs: number[] = [];
+        const centroid_set = new Set<number>();
+        const first_idx = rand_stream.rand_int(n_samples);
+        centroid_idxs.push(first_idx);
+        centroid_set.add(first_idx);
+
+        while (centroid_idxs.length < K) {
+          const distances: number[] = points.map((_p, idx) => {
+            if (centroid_set.has(idx)) return 0;
+            let min_d = Number.POSITIVE_INFINITY;
+            for (const c_idx of centroid_idxs) {
+              const d = d_cos[idx][c_idx];
+              if (d < min_d) min_d = d;
+            }
+            return min_d * min_d;
+          });
+
+          const current_pot = distances.reduce((a, b) => a + b, 0);
+          if (current_pot === 0) {
+            for (let i = 0; i < n_samples; i++) {
+              if (!centroid_set.has(i)) {
+                centroid_idxs.push(i);
+                centroid_set.add(i);
+                break;
+              }
             }
+            continue;
           }
-          continue;
-        }
 
-        const local_trials = 2 + Math.floor(Math.log(K));
-        const cumulative: number[] = [];
-        let cum = 0;
-        for (const d of distances) {
-          cum += d;
-          cumulative.push(cum);
-        }
-
-        const candidates: number[] = [];
-        for (let t = 0; t < local_trials; t++) {
-          const r = rand() * current_pot;
-          let lo = 0;
-          let hi = n_samples - 1;
-          while (lo < hi) {
-            const mid = Math.floor((lo + hi) / 2);
-            if (r <= cumulative[mid]) hi = mid;
-            else lo = mid + 1;
+          const local_trials = 2 + Math.floor(Math.log(K));
+          const cumulative: number[] = [];
+          let cum = 0;
+          for (const d of distances) {
+            cum += d;
+            cumulative.push(cum);
           }
-          candidates.push(lo);
-        }
 
-        let best_candidate = candidates[0];
-        let best_potential = Number.POSITIVE_INFINITY;
-        for (const cand of candidates) {
-          let pot = 0;
-          for (let i = 0; i < n_samples; i++) {
-            const d = d_cos[i][cand];
-            pot += Math.min(distances[i], d * d);
+          const candidates: number[] = [];
+          for (let t = 0; t < local_trials; t++) {
+            const r = rand() * current_pot;
+            let lo = 0;
+            let hi = n_samples - 1;
+            while (lo < hi) {
+              const mid = Math.floor((lo + hi) / 2);
+              if (r <= cumulative[mid]) hi = mid;
+              else lo = mid + 1;
+            }
+            candidates.push(lo);
           }
-          if (pot < best_potential) {
-            best_potential = pot;
-            best_candidate = cand;
+
+          let best_candidate = candidates[0];
+          let best_potential = Number.POSITIVE_INFINITY;
+          for (const cand of candidates) {
+            let pot = 0;
+            for (let i = 0; i < n_samples; i++) {
+              const d = d_cos[i][cand];
+              pot += Math.min(distances[i], d * d);
+            }
+            if (pot < best_potential) {
+              best_potential = pot;
+              best_candidate = cand;
+            }
           }
-        }
 
-        centroid_idxs.push(best_candidate);
-        centroid_set.add(best_candidate);
-      }
+          centroid_idxs.push(best_candidate);
+          centroid_set.add(best_candidate);
+        }
+        return centroid_idxs;
+      });
 
-      let centroids: number[][] = centroid_idxs.map((i) => points[i].slice());
-      let prev_inertia = Number.POSITIVE_INFINITY;
+      let centroids: number[][] = seed_idxs.map((i) => points[i].slice());
       const labels = new Int32Array(n_samples);
 
-      for (let iter = 0; iter < max_iter; iter++) {
-        const dist_pc = cross_cosine(centroids);
-        let inertia = 0;
-        const new_centroids: number[][] = Array.from({ length: K }, () =>
-          new Array<number>(n_features).fill(0),
-        );
-        const counts: number[] = new Array<number>(K).fill(0);
-        const min_dist: number[] = new Array<number>(n_samples).fill(0);
+      const inertia = profile_stage('KMeans', 'update', () => {
+        let prev_inertia = Number.POSITIVE_INFINITY;
+        for (let iter = 0; iter < max_iter; iter++) {
+          const dist_pc = cross_cosine(centroids);
+          let inertia = 0;
+          const new_centroids: number[][] = Array.from({ length: K }, () =>
+            new Array<number>(n_features).fill(0),
+          );
+          const counts: number[] = new Array<number>(K).fill(0);
+          const min_dist: number[] = new Array<number>(n_samples).fill(0);
 
-        for (let i = 0; i < n_samples; i++) {
-          let best = 0;
-          let best_d = dist_pc[i][0];
-          for (let j = 1; j < K; j++) {
-            if (dist_pc[i][j] < best_d) {
-              best_d = dist_pc[i][j];
-              best = j;
+          for (let i = 0; i < n_samples; i++) {
+            let best = 0;
+            let best_d = dist_pc[i][0];
+            for (let j = 1; j < K; j++) {
+              if (dist_pc[i][j] < best_d) {
+                best_d = dist_pc[i][j];
+                best = j;
+              }
+            }
+            labels[i] = best;
+            min_dist[i] = best_d;
+            inertia += best_d * best_d;
+            counts[best]++;
+            const row = points[i];
+            for (let f = 0; f < n_features; f++) {
+              new_centroids[best][f] += row[f];
             }
           }
-          labels[i] = best;
-          min_dist[i] = best_d;
-          inertia += best_d * best_d;
-          counts[best]++;
-          const row = points[i];
-          for (let f = 0; f < n_features; f++) new_centroids[best][f] += row[f];
-        }
 
-        const empty: number[] = [];
-        for (let j = 0; j < K; j++) {
-          if (counts[j] === 0) {
-            empty.push(j);
-            new_centroids[j] = centroids[j].slice();
-          } else {
-            for (let f = 0; f < n_features; f++) new_centroids[j][f] /= counts[j];
+          const empty: number[] = [];
+          for (let j = 0; j < K; j++) {
+            if (counts[j] === 0) {
+              empty.push(j);
+              new_centroids[j] = centroids[j].slice();
+            } else {
+              for (let f = 0; f < n_features; f++) {
+                new_centroids[j][f] /= counts[j];
+              }
+            }
           }
-        }
-        if (empty.length > 0) {
-          const order = Array.from({ length: n_samples }, (_v, i) => i);
-          order.sort((a, b) => min_dist[b] - min_dist[a]);
-          for (let e = 0; e < empty.length && e < n_samples; e++) {
-            new_centroids[empty[e]] = points[order[e]].slice();
+          if (empty.length > 0) {
+            const order = Array.from({ length: n_samples }, (_v, i) => i);
+            order.sort((a, b) => min_dist[b] - min_dist[a]);
+            for (let e = 0; e < empty.length && e < n_samples; e++) {
+              new_centroids[empty[e]] = points[order[e]].slice();
+            }
           }
-        }
 
-        let shift = 0;
-        for (let j = 0; j < K; j++) {
-          for (let f = 0; f < n_features; f++) {
-            const diff = Math.abs(centroids[j][f] - new_centroids[j][f]);
-            if (diff > shift) shift = diff;
+          let shift = 0;
+          for (let j = 0; j < K; j++) {
+            for (let f = 0; f < n_features; f++) {
+              const diff = Math.abs(centroids[j][f] - new_centroids[j][f]);
+              if (diff > shift) shift = diff;
+            }
           }
-        }
-        centroids = new_centroids;
+          centroids = new_centroids;
 
-        const rel = Math.abs(prev_inertia - inertia) / (prev_inertia || 1);
-        if (rel <= tol || shift <= tol) {
+          const rel = Math.abs(prev_inertia - inertia) / (prev_inertia || 1);
+          if (rel <= tol || shift <= tol) {
+            prev_inertia = inertia;
+            break;
+          }
           prev_inertia = inertia;
-          break;
         }
-        prev_inertia = inertia;
-      }
 
-      return { inertia: prev_inertia, labels, centroids };
+        return prev_inertia;
+      });
+
+      return { inertia, labels, centroids };
     };
 
     let best_inertia = Number.POSITIVE_INFINITY;
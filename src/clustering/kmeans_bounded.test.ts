@@ -0,0 +1,87 @@
+import { bounded_kmeans } from "./kmeans_bounded";
+import type { BoundedKMeansAlgorithm } from "./kmeans_bounded";
+import { make_random_stream } from "../random";
+
+function make_problem(n: number, d: number, K: number, seed: number, grid = false) {
+  const rng = make_random_stream(seed);
+  const data = new Float64Array(n * d);
+  for (let i = 0; i < n; i++) {
+    const blob = rng.rand_int(12);
+    for (let f = 0; f < d; f++) {
+      // Integer grid coordinates produce many exact distance ties.
+      data[i * d + f] = grid
+        ? rng.rand_int(5)
+        : ((blob * (f + 3)) % 7) + rng.rand();
+    }
+  }
+  const init = new Float64Array(K * d);
+  for (let c = 0; c < K; c++) {
+    const idx = rng.rand_int(n);
+    init.set(data.subarray(idx * d, idx * d + d), c * d);
+  }
+  return { data, init };
+}
+
+function run(
+  algorithm: BoundedKMeansAlgorithm,
+  data: Float64Array,
+  n: number,
+  d: number,
+  init: Float64Array,
+) {
+  return bounded_kmeans(data, n, d, init, { algorithm, max_iter: 300, tol: 1e-4 });
+}
+
+describe("bounded_kmeans", () => {
+  const cases: Array<[string, number, number, number, boolean]> = [
+    ["blobs, K=40", 800, 6, 40, false],
+    ["low-dimensional, K=25", 600, 2, 25, false],
+    ["integer grid with ties", 300, 2, 15, true],
+  ];
+
+  for (const [name, n, d, K, grid] of cases) {
+    for (const algorithm of ["elkan", "hamerly"] as const) {
+      it(`${algorithm} reproduces the full Lloyd sweep exactly (${name})`, () => {
+        const { data, init } = make_problem(n, d, K, 7, grid);
+        const lloyd = run("lloyd", data, n, d, init);
+        const pruned = run(algorithm, data, n, d, init);
+
+        expect(Array.from(pruned.labels)).toEqual(Array.from(lloyd.labels));
+        expect(Array.from(pruned.centroids)).toEqual(Array.from(lloyd.centroids));
+        expect(pruned.inertia).toBe(lloyd.inertia);
+        expect(pruned.n_iter).toBe(lloyd.n_iter);
+        expect(pruned.n_distance_evals).toBeLessThan(lloyd.n_distance_evals);
+      });
+    }
+  }
+
+  it("elkan prunes the bulk of distance evaluations for large K", () => {
+    const n = 1000;
+    const d = 8;
+    const K = 100;
+    const { data, init } = make_problem(n, d, K, 3);
+    const lloyd = run("lloyd", data, n, d, init);
+    const elkan = run("elkan", data, n, d, init);
+    expect(elkan.n_distance_evals).toBeLessThan(lloyd.n_distance_evals / 4);
+  });
+
+  it("relocates empty clusters identically across algorithms", () => {
+    // Two seeds on the same point leave one cluster empty after the first step.
+    const data = Float64Array.from([0, 0, 0.1, 0, 5, 5, 5.1, 5, 9, 0]);
+    const init = Float64Array.from([0, 0, 0, 0, 5, 5]);
+    const lloyd = run("lloyd", data, 5, 2, init);
+    for (const algorithm of ["elkan", "hamerly"] as const) {
+      const pruned = run(algorithm, data, 5, 2, init);
+      expect(Array.from(pruned.labels)).toEqual(Array.from(lloyd.labels));
+      expect(pruned.inertia).toBe(lloyd.inertia);
+    }
+    expect(new Set(lloyd.labels).size).toBe(3);
+  });
+
+  it("does not mutate the initial centroids", () => {
+    const { data, init } = make_problem(100, 3, 5, 1);
+    const copy = Float64Array.from(init);
+    run("elkan", data, 100, 3, init);
+    expect(init).toEqual(copy);
+  });
+});
@@ -0,0 +1,254 @@
+/**
+ * Float64 Lloyd iteration with optional triangle-inequality pruning.
+ *
+ * `'elkan'` keeps one lower bound per (point, centroid) pair, `'hamerly'` a
+ * single lower bound on the second-closest centroid. Both skip only
+ * distance evaluations the bounds prove to be *strictly* larger than the
+ * current best, so the assignment (including lowest-index tie-breaking), the
+ * centroid update and the convergence rule are identical to `'lloyd'`, the
+ * unpruned sweep over the same float64 data.
+ *
+ * Upper bounds are re-tightened to the exact distance every iteration: that
+ * costs one evaluation per point but yields the exact per-iteration inertia
+ * that the KMeans convergence rule needs.
+ */
+
+export type BoundedKMeansAlgorithm = 'lloyd' | 'elkan' | 'hamerly';
+
+export interface BoundedKMeansOptions {
+  algorithm: BoundedKMeansAlgorithm;
+  max_iter: number;
+  tol: number;
+}
+
+export interface BoundedKMeansResult {
+  labels: Int32Array;
+  /** Row-major `K×d`. */
+  centroids: Float64Array;
+  inertia: number;
+  n_iter: number;
+  /** Point-to-centroid distance evaluations, the cost the bounds prune. */
+  n_distance_evals: number;
+}
+
+/**
+ * Lower bounds are decremented by floating-point centroid movements; scaling
+ * them down by a few ulps keeps them valid against the rounded distances they
+ * are compared with, so pruning never discards a true tie.
+ */
+const BOUND_SLACK = 1 - 1e-12;
+
+/**
+ * @param data Row-major samples, length `n·d`.
+ * @param init_centroids Row-major `K×d` seeds; copied, not mutated.
+ */
+export function bounded_kmeans(
+  data: Float64Array,
+  n: number,
+  d: number,
+  init_centroids: Float64Array,
+  options: BoundedKMeansOptions,
+): BoundedKMeansResult {
+  const { algorithm, max_iter, tol } = options;
+  const K = init_centroids.length / d;
+
+  let centroids = Float64Array.from(init_centroids);
+  let next = new Float64Array(K * d);
+  const labels = new Int32Array(n);
+  const upper_sq = new Float64Array(n);
+  // Elkan: n×K; Hamerly: n. Zero is a valid (uninformative) lower bound, so
+  // the first iteration degenerates to a full sweep.
+  const lower = new Float64Array(
+    algorithm === 'elkan' ? n * K : algorithm === 'hamerly' ? n : 0,
+  );
+  const half_cc = new Float64Array(K * K);
+  const half_sep = new Float64Array(K);
+  const movement = new Float64Array(K);
+  const counts = new Int32Array(K);
+
+  let n_distance_evals = 0;
+  const dist_sq = (i: number, c: Float64Array, j: number): number => {
+    n_distance_evals++;
+    const oi = i * d;
+    const oj = j * d;
+    let sum = 0;
+    for (let f = 0; f < d; f++) {
+      const diff = data[oi + f] - c[oj + f];
+      sum += diff * diff;
+    }
+    return sum;
+  };
+
+  // Full scan for point i; seeds Elkan's per-centroid bounds and returns the
+  // second-smallest distance for Hamerly.
+  const assign_full = (i: number): number => {
+    const seed_bounds = algorithm === 'elkan';
+    let best = 0;
+    let best_sq = dist_sq(i, centroids, 0);
+    if (seed_bounds) lower[i * K] = Math.sqrt(best_sq);
+    let second_sq = Number.POSITIVE_INFINITY;
+    for (let j = 1; j < K; j++) {
+      const sq = dist_sq(i, centroids, j);
+      if (seed_bounds) lower[i * K + j] = Math.sqrt(sq);
+      if (sq < best_sq) {
+        second_sq = best_sq;
+        best_sq = sq;
+        best = j;
+      } else if (sq < second_sq) {
+        second_sq = sq;
+      }
+    }
+    labels[i] = best;
+    upper_sq[i] = best_sq;
+    return Math.sqrt(second_sq);
+  };
+
+  let prev_inertia = Number.POSITIVE_INFINITY;
+  let n_iter = 0;
+
+  for (let iter = 0; iter < max_iter; iter++) {
+    n_iter = iter + 1;
+
+    if (algorithm !== 'lloyd') {
+      half_sep.fill(Number.POSITIVE_INFINITY);
+      for (let a = 0; a < K; a++) {
+        for (let b = a + 1; b < K; b++) {
+          let sq = 0;
+          for (let f = 0; f < d; f++) {
+            const diff = centroids[a * d + f] - centroids[b * d + f];
+            sq += diff * diff;
+          }
+          const h = 0.5 * Math.sqrt(sq) * BOUND_SLACK;
+          half_cc[a * K + b] = h;
+          half_cc[b * K + a] = h;
+          if (h < half_sep[a]) half_sep[a] = h;
+          if (h < half_sep[b]) half_sep[b] = h;
+        }
+      }
+    }
+
+    let inertia = 0;
+    for (let i = 0; i < n; i++) {
+      if (algorithm === 'lloyd' || iter === 0) {
+        const second = assign_full(i);
+        if (algorithm === 'hamerly') lower[i] = second;
+        inertia += upper_sq[i];
+        continue;
+      }
+
+      let a = labels[i];
+      let u_sq = dist_sq(i, centroids, a);
+      let u = Math.sqrt(u_sq);
+
+      if (algorithm === 'hamerly') {
+        if (u < half_sep[a] || u < lower[i]) {
+          upper_sq[i] = u_sq;
+          inertia += u_sq;
+          continue;
+        }
+        lower[i] = assign_full(i);
+        inertia += upper_sq[i];
+        continue;
+      }
+
+      // Elkan
+      if (u < half_sep[a]) {
+        upper_sq[i] = u_sq;
+        inertia += u_sq;
+        continue;
+      }
+      const row = i * K;
+      lower[row + a] = u;
+      for (let j = 0; j < K; j++) {
+        if (j === a) continue;
+        if (u < lower[row + j] || u < half_cc[a * K + j]) continue;
+        const sq = dist_sq(i, centroids, j);
+        lower[row + j] = Math.sqrt(sq);
+        if (sq < u_sq || (sq === u_sq && j < a)) {
+          a = j;
+          u_sq = sq;
+          u = lower[row + j];
+        }
+      }
+      labels[i] = a;
+      upper_sq[i] = u_sq;
+      inertia += u_sq;
+    }
+
+    // Centroid update, accumulated in sample order for every algorithm.
+    next.fill(0);
+    counts.fill(0);
+    for (let i = 0; i < n; i++) {
+      const c = labels[i];
+      counts[c]++;
+      const oi = i * d;
+      const oc = c * d;
+      for (let f = 0; f < d; f++) next[oc + f] += data[oi + f];
+    }
+    const empty: number[] = [];
+    for (let j = 0; j < K; j++) {
+      const oc = j * d;
+      if (counts[j] === 0) {
+        empty.push(j);
+        for (let f = 0; f < d; f++) next[oc + f] = centroids[oc + f];
+      } else {
+        for (let f = 0; f < d; f++) next[oc + f] /= counts[j];
+      }
+    }
+    if (empty.length > 0) {
+      // Same relocation rule as the tensor path: farthest points first.
+      const order = Array.from({ length: n }, (_, i) => i);
+      order.sort((p, q) => upper_sq[q] - upper_sq[p]);
+      for (let e = 0; e < empty.length && e < n; e++) {
+        next.set(data.subarray(order[e] * d, order[e] * d + d), empty[e] * d);
+      }
+    }
+
+    let shift = 0;
+    for (let j = 0; j < K; j++) {
+      let sq = 0;
+      for (let f = 0; f < d; f++) {
+        const diff = next[j * d + f] - centroids[j * d + f];
+        const abs = Math.abs(diff);
+        if (abs > shift) shift = abs;
+        sq += diff * diff;
+      }
+      movement[j] = Math.sqrt(sq);
+    }
+    [centroids, next] = [next, centroids];
+
+    const relative_diff = Math.abs(prev_inertia - inertia) / (prev_inertia || 1);
+    prev_inertia = inertia;
+    if (relative_diff <= tol || shift <= tol) break;
+
+    if (algorithm === 'elkan') {
+      for (let i = 0; i < n; i++) {
+        const row = i * K;
+        for (let j = 0; j < K; j++) {
+          const l = lower[row + j] - movement[j];
+          lower[row + j] = l > 0 ? l * BOUND_SLACK : 0;
+        }
+      }
+    } else if (algorithm === 'hamerly') {
+      let max_j = 0;
+      for (let j = 1; j < K; j++) if (movement[j] > movement[max_j]) max_j = j;
+      let second_move = 0;
+      for (let j = 0; j < K; j++) {
+        if (j !== max_j && movement[j] > second_move) second_move = movement[j];
+      }
+      for (let i = 0; i < n; i++) {
+        const l =
+          lower[i] - (labels[i] === max_j ? second_move : movement[max_j]);
+        lower[i] = l > 0 ? l * BOUND_SLACK : 0;
+      }
+    }
+  }
+
+  return {
+    labels,
+    centroids,
+    inertia: prev_inertia,
+    n_iter,
+    n_distance_evals,
+  };
+}
@@ -0,0 +1,239 @@
+import * as tf from '../backend/adapter';
+
+/**
+ * Lloyd iteration for many independent datasets at once, backing
+ * `KMeans.fit_many`.
+ *
+ * The B datasets of a batch are zero-padded to a common row count and every
+ * restart's centroids are stacked per dataset, so one iteration is two
+ * batched matMuls (distances and one-hot centroid sums) plus a single
+ * `[inertia, shift, n_empty]` readback for every (dataset, restart) pair.
+ * Padding rows get an all-zero one-hot row and contribute nothing. Each pair
+ * has its own convergence test and is frozen once it passes.
+ */
+
+export interface LloydProblem {
+  /** Row-major `n×d` samples. */
+  points: Float64Array;
+  n: number;
+  /** One row-major `K×d` k-means++ seed per restart. */
+  seeds: Float32Array[];
+}
+
+export interface LloydRun {
+  inertia: number;
+  labels: Int32Array;
+  /** Row-major `K×d`. */
+  centroids: Float32Array;
+}
+
+/**
+ * scikit-learn's relocation rule, as in `KMeans`'s tensor path: each empty
+ * cluster of restart `r` of problem `b` takes one of the points farthest
+ * from their nearest centroid. Writes into `centroids` in place.
+ */
+function relocate_empty_clusters(
+  x: Float32Array,
+  assigned: ArrayLike<number>,
+  min_dist_sq: ArrayLike<number>,
+  centroids: Float32Array,
+  n: number,
+  dims: {
+    b: number;
+    r: number;
+    n_max: number;
+    R: number;
+    K: number;
+    d: number;
+  },
+): void {
+  const { b, r, n_max, R, K, d } = dims;
+  const at = (i: number): number => (b * n_max + i) * R + r;
+
+  const counts = new Int32Array(K);
+  for (let i = 0; i < n; i++) counts[assigned[at(i)]]++;
+  const empty_clusters: number[] = [];
+  for (let k = 0; k < K; k++) {
+    if (counts[k] === 0) empty_clusters.push(k);
+  }
+
+  const order = Array.from({ length: n }, (_, i) => i);
+  order.sort((p, q) => min_dist_sq[at(q)] - min_dist_sq[at(p)]);
+
+  const n_relocated = Math.min(empty_clusters.length, n);
+  for (let e = 0; e < n_relocated; e++) {
+    const row = (b * n_max + order[e]) * d;
+    centroids.set(
+      x.subarray(row, row + d),
+      ((b * R + r) * K + empty_clusters[e]) * d,
+    );
+  }
+}
+
+/** `result[b][r]` is restart `r` of `problems[b]`. */
+export async function lloyd_many(
+  problems: LloydProblem[],
+  n_features: number,
+  K: number,
+  max_iter: number,
+  tol: number,
+): Promise<LloydRun[][]> {
+  const B = problems.length;
+  const R = problems[0].seeds.length;
+  const d = n_features;
+  const RK = R * K;
+  const n_max = Math.max(...problems.map((p) => p.n));
+
+  const x_flat = new Float32Array(B * n_max * d);
+  const valid_flat = new Float32Array(B * n_max);
+  const seed_flat = new Float32Array(B * RK * d);
+  problems.forEach((p, b) => {
+    x_flat.set(p.points, b * n_max * d);
+    valid_flat.fill(1, b * n_max, b * n_max + p.n);
+    p.seeds.forEach((seed, r) => seed_flat.set(seed, (b * R + r) * K * d));
+  });
+
+  const x = tf.tensor3d(x_flat, [B, n_max, d], 'float32');
+  const valid = tf.tensor3d(valid_flat, [B, n_max, 1], 'float32');
+  const x_norm = tf.tidy(() => x.square().sum(2, true)) as tf.Tensor3D;
+  let centroids = tf.tensor3d(seed_flat, [B, RK, d], 'float32');
+  let labels: tf.Tensor3D | null = null;
+
+  // Indexed by b * R + r.
+  const active = new Array<boolean>(B * R).fill(true);
+  const prev_inertia = new Float64Array(B * R).fill(Number.POSITIVE_INFINITY);
+
+  try {
+    for (let iter = 0; iter < max_iter && active.includes(true); iter++) {
+      const step = tf.tidy(() => {
+        const c_norm = centroids.square().sum(2).reshape([B, 1, RK]);
+        const cross = tf.mat_mul(x, centroids, false, true);
+        const dist_sq = tf
+          .maximum(
+            x_norm.add(c_norm).sub(cross.mul(2)),
+            tf.scalar(0, 'float32'),
+          )
+          .reshape([B, n_max, R, K]);
+        const assigned = dist_sq.argMin(3) as tf.Tensor3D;
+        const min_dist_sq = dist_sq.min(3).mul(valid) as tf.Tensor3D;
+
+        const membership = tf
+          .one_hot(assigned, K)
+          .cast('float32')
+          .mul(valid.reshape([B, n_max, 1, 1]))
+          .reshape([B, n_max, RK]);
+        const sums = tf.mat_mul(membership, x, true, false);
+        const counts = membership.sum(1).reshape([B, RK, 1]);
+        // Empty clusters keep their previous centroid here and are
+        // relocated below.
+        const means = tf.where(
+          counts.greater(0),
+          sums.div(tf.maximum(counts, 1)),
+          centroids,
+        );
+
+        // Converged restarts keep their final centroids and labels.
+        const row_active = tf.tensor3d(
+          Array.from({ length: B * RK }, (_, i) => active[Math.floor(i / K)]),
+          [B, RK, 1],
+          'bool',
+        );
+        const col_active = tf.tensor3d(active, [B, 1, R], 'bool');
+        const updated = tf.where(row_active, means, centroids) as tf.Tensor3D;
+        const next_labels = tf.where(
+          col_active,
+          assigned,
+          labels ?? assigned,
+        ) as tf.Tensor3D;
+
+        const stats = tf.stack([
+          min_dist_sq.sum(1),
+          centroids.sub(means).abs().reshape([B, R, K * d]).max(2),
+          counts.equal(0).cast('float32').reshape([B, R, K]).sum(2),
+        ]);
+        return { assigned, min_dist_sq, updated, labels: next_labels, stats };
+      });
+
+      // (3, B, R): inertia, shift and empty-cluster count per restart.
+      const stats = await step.stats.data();
+      step.stats.dispose();
+      const BR = B * R;
+      const shifts = Array.from(stats.subarray(BR, 2 * BR));
+
+      let next_centroids = step.updated;
+      const with_empty: number[] = [];
+      for (let j = 0; j < BR; j++) {
+        if (active[j] && stats[2 * BR + j] > 0) with_empty.push(j);
+      }
+      if (with_empty.length > 0) {
+        const [assigned, min_dist_sq, updated, previous] = await Promise.all([
+          step.assigned.data(),
+          step.min_dist_sq.data(),
+          step.updated.data(),
+          centroids.data(),
+        ]);
+        const relocated = Float32Array.from(updated);
+        for (const j of with_empty) {
+          const b = Math.floor(j / R);
+          const r = j % R;
+          relocate_empty_clusters(
+            x_flat,
+            assigned,
+            min_dist_sq,
+            relocated,
+            problems[b].n,
+            { b, r, n_max, R, K, d },
+          );
+          let shift = 0;
+          for (let f = j * K * d; f < (j + 1) * K * d; f++) {
+            shift = Math.max(shift, Math.abs(previous[f] - relocated[f]));
+          }
+          shifts[j] = shift;
+        }
+        next_centroids = tf.tensor3d(relocated, [B, RK, d], 'float32');
+        step.updated.dispose();
+      }
+      tf.dispose([step.assigned, step.min_dist_sq]);
+
+      labels?.dispose();
+      labels = step.labels;
+      centroids.dispose();
+      centroids = next_centroids;
+
+      for (let j = 0; j < BR; j++) {
+        if (!active[j]) continue;
+        const inertia = stats[j];
+        const relative_diff =
+          Math.abs(prev_inertia[j] - inertia) / (prev_inertia[j] || 1);
+        prev_inertia[j] = inertia;
+        if (relative_diff <= tol || shifts[j] <= tol) {
+          active[j] = false;
+        }
+      }
+    }
+
+    const [label_data, centroid_data] = await Promise.all([
+      labels!.data(),
+      centroids.data(),
+    ]);
+    return problems.map((p, b) =>
+      Array.from({ length: R }, (_, r) => {
+        const run_labels = new Int32Array(p.n);
+        for (let i = 0; i < p.n; i++) {
+          run_labels[i] = label_data[(b * n_max + i) * R + r];
+        }
+        const offset = (b * R + r) * K * d;
+        return {
+          inertia: prev_inertia[b * R + r],
+          labels: run_labels,
+          centroids: Float32Array.from(
+            centroid_data.subarray(offset, offset + K * d),
+          ),
+        };
+      }),
+    );
+  } finally {
+    tf.dispose([x, valid, x_norm, centroids]);
+    labels?.dispose();
+  }
+}
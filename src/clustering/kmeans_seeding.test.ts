@@ -0,0 +1,83 @@
+import { kmeans_plus_plus } from "./kmeans_seeding";
+import { make_random_stream } from "../random";
+import type { RandomStream } from "../random";
+
+/** Per-round recomputation over number[][]: the pre-incremental seeding. */
+function reference_kmeans_plus_plus(
+  points: number[][],
+  K: number,
+  rng: RandomStream,
+): number[] {
+  const n = points.length;
+  const chosen: number[] = [rng.rand_int(n)];
+  const d2 = (a: number[], b: number[]) =>
+    a.reduce((s, v, j) => s + (v - b[j]) * (v - b[j]), 0);
+
+  while (chosen.length < K) {
+    const dist = points.map((p, i) =>
+      chosen.includes(i) ? 0 : Math.min(...chosen.map((c) => d2(p, points[c]))),
+    );
+    const pot = dist.reduce((a, b) => a + b, 0);
+    if (pot === 0) {
+      chosen.push(points.findIndex((_p, i) => !chosen.includes(i)));
+      continue;
+    }
+    const cumulative: number[] = [];
+    dist.reduce((acc, v) => (cumulative.push(acc + v), acc + v), 0);
+    const candidates: number[] = [];
+    for (let t = 0; t < 2 + Math.floor(Math.log(K)); t++) {
+      const r = rng.rand() * pot;
+      let lo = 0;
+      let hi = n - 1;
+      while (lo < hi) {
+        const mid = Math.floor((lo + hi) / 2);
+        if (r <= cumulative[mid]) hi = mid;
+        else lo = mid + 1;
+      }
+      candidates.push(lo);
+    }
+    let best = candidates[0];
+    let best_pot = Number.POSITIVE_INFINITY;
+    for (const c of candidates) {
+      const p = points.reduce((s, row, i) => s + Math.min(dist[i], d2(row, points[c])), 0);
+      if (p < best_pot) {
+        best_pot = p;
+        best = c;
+      }
+    }
+    chosen.push(best);
+  }
+  return chosen;
+}
+
+function random_rows(n: number, d: number, seed: number, grid: boolean): number[][] {
+  const rng = make_random_stream(seed);
+  return Array.from({ length: n }, () =>
+    Array.from({ length: d }, () => (grid ? rng.rand_int(3) : rng.rand() * 10)),
+  );
+}
+
+describe("kmeans_plus_plus", () => {
+  const cases: Array<[string, number, number, number, boolean]> = [
+    ["continuous data", 300, 4, 25, false],
+    ["heavy duplicates", 120, 2, 40, true],
+    ["K = n with duplicates", 20, 2, 20, true],
+    ["K = 1", 50, 3, 1, false],
+  ];
+
+  for (const [name, n, d, K, grid] of cases) {
+    it(`selects the same centres from the same random stream (${name})`, () => {
+      const rows = random_rows(n, d, n + K, grid);
+      const flat = Float64Array.from(rows.flat());
+      const expected = reference_kmeans_plus_plus(rows, K, make_random_stream(42));
+      const actual = kmeans_plus_plus(flat, n, d, K, make_random_stream(42));
+      expect(actual).toEqual(expected);
+    });
+  }
+
+  it("returns K distinct indices", () => {
+    const rows = random_rows(60, 2, 9, true);
+    const idxs = kmeans_plus_plus(Float64Array.from(rows.flat()), 60, 2, 30, make_random_stream(0));
+    expect(new Set(idxs).size).toBe(30);
+  });
+});
@@ -0,0 +1,133 @@
+import type { RandomStream } from '../random';
+
+/**
+ * Greedy k-means++ seeding (scikit-learn's `_kmeans_plusplus` with
+ * `2 + ⌊ln K⌋` local trials) over row-major float64 samples.
+ *
+ * Each point's squared distance to its closest chosen centre is kept in a
+ * running array and only compared against the newest centre, whose distances
+ * are already known from scoring it as a candidate. All candidates of a round
+ * are scored in one pass over the data. Every sum is accumulated in sample
+ * order, so the random draws and the chosen indices are identical to the
+ * straightforward per-round recomputation.
+ *
+ * @param data Row-major samples, length `n·d`.
+ * @returns Indices of the `K` chosen rows, in selection order.
+ */
+export function kmeans_plus_plus(
+  data: Float64Array,
+  n: number,
+  d: number,
+  K: number,
+  rand_stream: RandomStream,
+): number[] {
+  const rand = rand_stream.rand;
+  const local_trials = 2 + Math.floor(Math.log(K));
+
+  const centroid_idxs: number[] = [];
+  const chosen = new Uint8Array(n);
+  const closest = new Float64Array(n);
+  const cumulative = new Float64Array(n);
+  const candidates = new Int32Array(local_trials);
+  // Squared distances from every point to each candidate of the round.
+  const cand_dist = new Float64Array(local_trials * n);
+  const cand_pot = new Float64Array(local_trials);
+
+  const first_idx = rand_stream.rand_int(n);
+  centroid_idxs.push(first_idx);
+  chosen[first_idx] = 1;
+  const of = first_idx * d;
+  for (let i = 0; i < n; i++) {
+    const oi = i * d;
+    let d2 = 0;
+    for (let f = 0; f < d; f++) {
+      const diff = data[oi + f] - data[of + f];
+      d2 += diff * diff;
+    }
+    closest[i] = d2;
+  }
+
+  while (centroid_idxs.length < K) {
+    let current_pot = 0;
+    for (let i = 0; i < n; i++) {
+      current_pot += closest[i];
+      cumulative[i] = current_pot;
+    }
+
+    let next_idx: number;
+    let next_row: number;
+    if (current_pot === 0) {
+      // Every remaining point coincides with a centre: take the first unused.
+      next_idx = 0;
+      while (chosen[next_idx]) next_idx++;
+      next_row = -1;
+    } else {
+      for (let t = 0; t < local_trials; t++) {
+        const r = rand() * current_pot;
+        let lo = 0;
+        let hi = n - 1;
+        while (lo < hi) {
+          const mid = Math.floor((lo + hi) / 2);
+          if (r <= cumulative[mid]) {
+            hi = mid;
+          } else {
+            lo = mid + 1;
+          }
+        }
+        candidates[t] = lo;
+      }
+
+      cand_pot.fill(0);
+      for (let i = 0; i < n; i++) {
+        const oi = i * d;
+        const c_i = closest[i];
+        for (let t = 0; t < local_trials; t++) {
+          const oc = candidates[t] * d;
+          let d2 = 0;
+          for (let f = 0; f < d; f++) {
+            const diff = data[oi + f] - data[oc + f];
+            d2 += diff * diff;
+          }
+          cand_dist[t * n + i] = d2;
+          cand_pot[t] += Math.min(c_i, d2);
+        }
+      }
+
+      let best_t = 0;
+      let best_potential = Number.POSITIVE_INFINITY;
+      for (let t = 0; t < local_trials; t++) {
+        if (cand_pot[t] < best_potential) {
+          best_potential = cand_pot[t];
+          best_t = t;
+        }
+      }
+      next_idx = candidates[best_t];
+      next_row = best_t;
+    }
+
+    centroid_idxs.push(next_idx);
+    chosen[next_idx] = 1;
+    if (centroid_idxs.length === K) break;
+
+    if (next_row >= 0) {
+      const base = next_row * n;
+      for (let i = 0; i < n; i++) {
+        const d2 = cand_dist[base + i];
+        if (d2 < closest[i]) closest[i] = d2;
+      }
+    } else {
+      const on = next_idx * d;
+      for (let i = 0; i < n; i++) {
+        const oi = i * d;
+        let d2 = 0;
+        for (let f = 0; f < d; f++) {
+          const diff = data[oi + f] - data[on + f];
+          d2 += diff * diff;
+        }
+        if (d2 < closest[i]) closest[i] = d2;
+      }
+    }
+  }
+
+  return centroid_idxs;
+}
@@ -1,6 +1,7 @@
 import * as tf from '../backend/adapter';
 import type { ClusteringMetric, DataMatrix, LabelVector } from './types';
-import { is_tensor } from '../tensor/tensor_guards';
+import { matrix_shape, to_float64, to_tensor2d } from '../tensor/data_matrix';
+import { to_label_array } from '../validation/contingency';
 import {
   euclidean_distance,
   manhattan_distance,
@@ -50,33 +51,23 @@ export async function select_medoids(
   n_clusters: number,
   metric: ClusteringMetric = 'euclidean',
 ): Promise<MedoidResult> {
-  const data: number[][] = is_tensor(X)
-    ? ((await (X as tf.Tensor2D).array()) as number[][])
-    : (X as number[][]);
-  const label_array: number[] = is_tensor(labels)
-    ? Array.from((labels as tf.Tensor1D).dataSync() as Float32Array).map((l) =>
-        Math.round(l),
-      )
-    : (labels as number[]);
+  const [n, d] = matrix_shape(X);
+  const data = await to_float64(X);
+  const label_array = to_label_array(labels);
 
-  const n = data.length;
-  const d = n > 0 ? data[0].length : 0;
-
-  const sums: number[][] = Array.from({ length: n_clusters }, () =>
-    new Array<number>(d).fill(0),
-  );
+  const means = new Float64Array(n_clusters * d);
   const counts: number[] = new Array<number>(n_clusters).fill(0);
   for (let i = 0; i < n; i++) {
     const l = label_array[i];
     if (l < 0 || l >= n_clusters) continue;
     counts[l]++;
-    const row = data[i];
-    const s = sums[l];
-    for (let f = 0; f < d; f++) s[f] += row[f];
+    for (let f = 0; f < d; f++) means[l * d + f] += data[i * d + f];
+  }
+  for (let c = 0; c < n_clusters; c++) {
+    for (let f = 0; f < d; f++) {
+      if (counts[c] > 0) means[c * d + f] /= counts[c];
+    }
   }
-  const means: (number[] | null)[] = sums.map((s, c) =>
-    counts[c] > 0 ? s.map((v) => v / counts[c]) : null,
-  );
 
   const indices = new Int32Array(n_clusters).fill(-1);
   const distances = new Float32Array(n_clusters).fill(Number.POSITIVE_INFINITY);
@@ -85,17 +76,25 @@ export async function select_medoids(
     return { indices, distances };
   }
 
-  const reference_rows: number[][] = new Array<number[]>(n);
+  const references = new Float32Array(n * d);
   for (let i = 0; i < n; i++) {
     const l = label_array[i];
-    const mean = l >= 0 && l < n_clusters ? means[l] : null;
-    reference_rows[i] = mean ?? data[i];
+    const has_mean = l >= 0 && l < n_clusters && counts[l] > 0;
+    references.set(
+      has_mean
+        ? means.subarray(l * d, (l + 1) * d)
+        : data.subarray(i * d, (i + 1) * d),
+      i * d,
+    );
   }
 
   const point_distances = tf.tidy(() => {
-    const points = tf.tensor2d(data, [n, d], 'float32');
-    const references = tf.tensor2d(reference_rows, [n, d], 'float32');
-    return pointwise_distance(points, references, metric);
+    const points = tf.cast(to_tensor2d(X), 'float32') as tf.Tensor2D;
+    return pointwise_distance(
+      points,
+      tf.tensor2d(references, [n, d], 'float32'),
+      metric,
+    );
   });
 
   for (let i = 0; i < n; i++) {
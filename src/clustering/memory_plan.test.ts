@@ -0,0 +1,218 @@
+import { Clustering } from './init';
+import { KMeans } from './kmeans';
+import { HDBSCAN } from './hdbscan';
+import { SpectralClustering } from './spectral';
+import { AgglomerativeClustering } from './agglomerative';
+import { MiniBatchKMeans } from './minibatch_kmeans';
+import { make_random_stream } from '../random';
+import '../../test_support/tensorflow_helper';
+
+function blobs(n_per: number, centers: number[][], seed: number): number[][] {
+  const rng = make_random_stream(seed);
+  const out: number[][] = [];
+  for (let i = 0; i < n_per; i++) {
+    for (const c of centers) {
+      out.push(c.map((v) => v + (rng.rand() - 0.5)));
+    }
+  }
+  return out;
+}
+
+const X = blobs(30, [[0, 0], [6, 0], [0, 6]], 7);
+const cpu = (bytes: number) => ({ bytes, backend: 'cpu' });
+
+describe('Clustering.plan', () => {
+  it('records the plan on the estimator', () => {
+    const km = new KMeans({ n_clusters: 3, random_state: 0 });
+    const plan = Clustering.plan(km, X, cpu(2 ** 30));
+    expect(km.memory_plan_).toBe(plan);
+    expect(plan).toMatchObject({
+      estimator: 'KMeans',
+      n_samples: 90,
+      n_features: 2,
+      backend: 'cpu',
+      path: 'dense',
+      rejected: [],
+    });
+    expect(plan.peak_bytes).toBeGreaterThan(0);
+    expect(plan.stages.map((s) => s.stage)).toEqual(['seeding', 'lloyd']);
+  });
+
+  it('accepts a shape instead of data', () => {
+    const plan = Clustering.plan(
+      new AgglomerativeClustering({ n_clusters: 2 }),
+      [1000, 4],
+      cpu(2 ** 30),
+    );
+    expect(plan.n_samples).toBe(1000);
+    expect(plan.path).toBe('dense');
+  });
+
+  it('fails fast with the peak of every path', () => {
+    const agg = new AgglomerativeClustering({ n_clusters: 2 });
+    expect(() => Clustering.plan(agg, [100_000, 2], cpu(2 ** 30))).toThrow(
+      /^AgglomerativeClustering cannot fit 100000×2 input within 1\.0 GiB on the 'cpu' backend: 'dense' peaks at 74\.\d GiB in stage 'linkage'\.$/,
+    );
+    expect(agg.memory_plan_).toBeNull();
+  });
+
+  it('rejects a non-positive budget', () => {
+    expect(() =>
+      Clustering.plan(new KMeans({ n_clusters: 2 }), X, cpu(0)),
+    ).toThrow('Memory budget bytes must be a positive finite number.');
+  });
+
+  it('counts only tensors against a GPU budget', () => {
+    const mbk = new MiniBatchKMeans({ n_clusters: 3 });
+    expect(() => Clustering.plan(mbk, [1_000_000, 64], cpu(2 ** 20))).toThrow(
+      "'dense' peaks at",
+    );
+    const plan = Clustering.plan(mbk, [1_000_000, 64], {
+      bytes: 2 ** 20,
+      backend: 'webgl',
+    });
+    expect(plan.peak_bytes).toBe(0);
+  });
+});
+
+describe('KMeans memory plans', () => {
+  it('runs fewer restarts per batch under a tight budget', async () => {
+    const params = { n_clusters: 3, random_state: 0 };
+    const planned = new KMeans(params);
+    const dense = Clustering.plan(planned, X, cpu(2 ** 30));
+    const budget = dense.peak_bytes / 2;
+    const plan = Clustering.plan(planned, X, cpu(budget));
+    expect(plan.path).toBe('blocked');
+    expect(plan.settings.restart_batch).toBeLessThan(
+      dense.settings.restart_batch,
+    );
+    expect(plan.peak_bytes).toBeLessThanOrEqual(budget);
+    expect(plan.rejected[0].path).toBe('dense');
+
+    await planned.fit(X);
+    const reference = new KMeans(params);
+    await reference.fit(X);
+    expect(planned.labels_).toEqual(reference.labels_);
+    expect(planned.inertia_).toBe(reference.inertia_);
+    planned.dispose();
+    reference.dispose();
+  });
+
+  it('re-plans when fit sees another shape', async () => {
+    const km = new KMeans({ n_clusters: 3, random_state: 0 });
+    Clustering.plan(km, X.slice(0, 30), cpu(2 ** 30));
+    await km.fit(X);
+    expect(km.memory_plan_!.n_samples).toBe(90);
+    km.dispose();
+  });
+
+  it('keeps its fitted state when the re-plan does not fit', async () => {
+    const km = new KMeans({ n_clusters: 3, random_state: 0 });
+    const plan = Clustering.plan(km, X, cpu(2 ** 30));
+    Clustering.plan(km, X, cpu(plan.peak_bytes));
+    await km.fit(X);
+    const labels = km.labels_;
+
+    const larger = Array.from({ length: 10 }, () => X).flat();
+    await expect(km.fit(larger)).rejects.toThrow(
+      'KMeans cannot fit 900×2 input within',
+    );
+    expect(km.labels_).toBe(labels);
+    expect(km.memory_plan_!.n_samples).toBe(90);
+    km.dispose();
+  });
+});
+
+describe('HDBSCAN memory plans', () => {
+  it('switches to the blocked path and matches the dense labels', async () => {
+    const params = { min_cluster_size: 5 };
+    const planned = new HDBSCAN(params);
+    const dense = Clustering.plan(planned, X, cpu(2 ** 30));
+    expect(dense.path).toBe('dense');
+
+    const plan = Clustering.plan(planned, X, cpu(dense.peak_bytes / 10));
+    expect(plan.path).toBe('blocked');
+    await planned.fit(X);
+
+    const reference = new HDBSCAN(params);
+    await reference.fit(X);
+    expect(planned.labels_).toEqual(reference.labels_);
+    planned.probabilities_!.forEach((p, i) =>
+      expect(p).toBeCloseTo(reference.probabilities_![i], 4),
+    );
+  });
+
+  it('supports the manhattan metric on the blocked path', async () => {
+    const params = { min_cluster_size: 5, metric: 'manhattan' as const };
+    const planned = new HDBSCAN(params);
+    Clustering.plan(planned, X, cpu(64 * 1024));
+    expect(planned.memory_plan_!.path).toBe('blocked');
+    await planned.fit(X);
+
+    const reference = new HDBSCAN(params);
+    await reference.fit(X);
+    expect(planned.labels_).toEqual(reference.labels_);
+  });
+
+  it('keeps precomputed input on the dense path', () => {
+    const hdb = new HDBSCAN({ metric: 'precomputed' });
+    expect(() => Clustering.plan(hdb, [50_000, 50_000], cpu(2 ** 30))).toThrow(
+      /'dense' peaks at .* in stage '\w+'\.$/,
+    );
+  });
+});
+
+describe('SpectralClustering memory plans', () => {
+  const params = { n_clusters: 3, random_state: 0 };
+
+  it('offers the Nystrom path only when approximation is allowed', () => {
+    const sc = new SpectralClustering(params);
+    const dense = Clustering.plan(sc, X, cpu(2 ** 30));
+    expect(dense.path).toBe('dense');
+    const budget = dense.peak_bytes - 1;
+
+    expect(() => Clustering.plan(sc, X, cpu(budget))).toThrow(
+      /'dense' peaks at .*\. The 'approximate' path needs .*; set allow_approximate to use it\.$/,
+    );
+    const plan = Clustering.plan(sc, X, {
+      ...cpu(budget),
+      allow_approximate: true,
+    });
+    expect(plan.path).toBe('approximate');
+  });
+
+  it('fits with the Nystrom affinity on an approximate plan', async () => {
+    const planned = new SpectralClustering(params);
+    const dense = Clustering.plan(planned, X, cpu(2 ** 30));
+    Clustering.plan(planned, X, {
+      ...cpu(dense.peak_bytes - 1),
+      allow_approximate: true,
+    });
+    await planned.fit(X);
+
+    const nystrom = new SpectralClustering({
+      ...params,
+      affinity_approximation: 'nystrom',
+    });
+    await nystrom.fit(X);
+    expect(planned.labels_).toEqual(nystrom.labels_);
+    expect(planned.affinity_matrix_).toBeNull();
+    planned.dispose();
+    nystrom.dispose();
+  });
+
+  it('plans nearest_neighbors affinities as sparse', () => {
+    const plan = Clustering.plan(
+      new SpectralClustering({ n_clusters: 3, affinity: 'nearest_neighbors' }),
+      [100_000, 8],
+      cpu(2 ** 30),
+    );
+    expect(plan.path).toBe('sparse');
+  });
+
+  it('still applies an explicit max_samples', async () => {
+    const sc = new SpectralClustering({ n_clusters: 3, max_samples: 50 });
+    Clustering.plan(sc, X, cpu(2 ** 30));
+    await expect(sc.fit(X)).rejects.toThrow('exceeds the maximum of 50');
+  });
+});
@@ -0,0 +1,540 @@
+import * as tf from '../backend/adapter';
+import { matrix_shape } from '../tensor/data_matrix';
+import { NYSTROM_LANDMARKS_DEFAULT } from './spectral_nystrom';
+import type {
+  AgglomerativeClusteringParams,
+  DataMatrix,
+  HDBSCANParams,
+  KMeansParams,
+  MiniBatchKMeansParams,
+  SOMParams,
+  SpectralClusteringParams,
+} from './types';
+
+/**
+ * Memory planning for `Clustering.plan`: each estimator lists its
+ * implementation paths in order of preference with the footprint of every
+ * stage, and the first path whose largest stage fits the budget is chosen.
+ *
+ * A stage's footprint counts the tensors and typed arrays alive at its peak,
+ * including the intermediates a `tf.tidy` holds until it returns. Tensors are
+ * float32 and the CPU paths float64. The figures are estimates that lean
+ * high; the backend's own buffer pools and JS object headers are not counted.
+ */
+
+export type MemoryPath = 'dense' | 'blocked' | 'sparse' | 'approximate';
+
+export interface MemoryBudget {
+  /** Bytes the fit may hold at its peak. */
+  bytes: number;
+
+  /**
+   * Backend the fit runs on; defaults to the active one. On `'webgl'` and
+   * `'webgpu'` the budget is device memory and only tensors count against
+   * it; on the other backends tensors and typed arrays share it.
+   */
+  backend?: string;
+
+  /**
+   * Allow paths that approximate the exact result (Spectral's Nyström
+   * affinity). Default false: such a path is reported but not chosen.
+   */
+  allow_approximate?: boolean;
+}
+
+export interface StageFootprint {
+  stage: string;
+  tensor_bytes: number;
+  host_bytes: number;
+}
+
+export interface MemoryPathEstimate {
+  path: MemoryPath;
+  stages: StageFootprint[];
+  /** Values the estimator's `fit` applies on this path. */
+  settings?: Record<string, number>;
+}
+
+export interface MemoryPlan {
+  estimator: string;
+  n_samples: number;
+  n_features: number;
+  backend: string;
+  budget: Required<MemoryBudget>;
+  path: MemoryPath;
+  stages: StageFootprint[];
+  /** Largest stage footprint counted against the budget. */
+  peak_bytes: number;
+  settings: Record<string, number>;
+  /** Paths preferred over `path` and the stage that ruled each out. */
+  rejected: { path: MemoryPath; peak_bytes: number; stage: string }[];
+}
+
+/** Estimators `Clustering.plan` can route. */
+export interface MemoryPlannable {
+  /** The plan `fit` follows; `null` fits without one. */
+  memory_plan_: MemoryPlan | null;
+  plan_memory(shape: [number, number], budget: MemoryBudget): MemoryPlan;
+}
+
+const F32 = 4;
+const F64 = 8;
+const I32 = 4;
+
+const DEVICE_BACKENDS = new Set(['webgl', 'webgpu']);
+
+/** `n×n` tensors alive at the peak of `pairwise_euclidean_matrix`. */
+const EUCLIDEAN_MATRIX_TENSORS = 13;
+
+/**
+ * `pairwise_distance_matrix`'s manhattan and cosine paths broadcast an
+ * `(n, n, d)` difference: two such tensors plus this many `n×n` ones.
+ */
+const BROADCAST_MATRIX_TENSORS = 8;
+
+/** `n×(R·K)` distance intermediates per Lloyd step. */
+const LLOYD_DISTANCE_TENSORS = 5;
+
+/** `n×n` tensors alive while `normalised_laplacian` runs, the affinity included. */
+const LAPLACIAN_TENSORS = 9;
+
+/** `n×m` tensors alive while the Nyström kernel block is built and used. */
+const NYSTROM_BLOCK_TENSORS = 6;
+
+/** Query rows per block of the sparse k-NN affinity (`affinity.ts`). */
+const KNN_BLOCK_ROWS = 1024;
+
+/** `b×n` tensors alive per k-NN affinity block. */
+const KNN_BLOCK_TENSORS = 6;
+
+/** A JS `Map` entry of the k-NN row maps, key and value included. */
+const MAP_ENTRY_BYTES = 40;
+
+/** `n×bmu` distance intermediates of a SOM assignment pass. */
+const SOM_DISTANCE_TENSORS = 3;
+
+function format_bytes(bytes: number): string {
+  const units = ['B', 'KiB', 'MiB', 'GiB', 'TiB'];
+  let value = bytes;
+  let u = 0;
+  while (value >= 1024 && u < units.length - 1) {
+    value /= 1024;
+    u++;
+  }
+  return u === 0 ? `${value} B` : `${value.toFixed(1)} ${units[u]}`;
+}
+
+function resolve_budget(budget: MemoryBudget): Required<MemoryBudget> {
+  if (!Number.isFinite(budget.bytes) || budget.bytes <= 0) {
+    throw new Error('Memory budget bytes must be a positive finite number.');
+  }
+  return {
+    bytes: budget.bytes,
+    backend: budget.backend ?? tf.get_backend(),
+    allow_approximate: budget.allow_approximate ?? false,
+  };
+}
+
+function peak_of(
+  stages: StageFootprint[],
+  device_only: boolean,
+): { bytes: number; stage: string } {
+  let peak = { bytes: 0, stage: stages[0]?.stage ?? '' };
+  for (const s of stages) {
+    const bytes = s.tensor_bytes + (device_only ? 0 : s.host_bytes);
+    if (bytes > peak.bytes) peak = { bytes, stage: s.stage };
+  }
+  return peak;
+}
+
+/**
+ * The first of `candidates` (in preference order) whose peak fits `budget`.
+ *
+ * @throws {Error} If none fits; the message gives every path's peak stage.
+ */
+export function choose_memory_path(
+  estimator: string,
+  shape: [number, number],
+  budget: MemoryBudget,
+  candidates: MemoryPathEstimate[],
+): MemoryPlan {
+  const resolved = resolve_budget(budget);
+  const device_only = DEVICE_BACKENDS.has(resolved.backend);
+  const rejected: MemoryPlan['rejected'] = [];
+  let withheld: number | null = null;
+
+  for (const candidate of candidates) {
+    const peak = peak_of(candidate.stages, device_only);
+    if (peak.bytes > resolved.bytes) {
+      rejected.push({
+        path: candidate.path,
+        peak_bytes: peak.bytes,
+        stage: peak.stage,
+      });
+      continue;
+    }
+    if (candidate.path === 'approximate' && !resolved.allow_approximate) {
+      withheld = peak.bytes;
+      continue;
+    }
+    return {
+      estimator,
+      n_samples: shape[0],
+      n_features: shape[1],
+      backend: resolved.backend,
+      budget: resolved,
+      path: candidate.path,
+      stages: candidate.stages,
+      peak_bytes: peak.bytes,
+      settings: candidate.settings ?? {},
+      rejected,
+    };
+  }
+
+  // A path tried at several sizes (KMeans' restart batches) is reported at
+  // its smallest.
+  const smallest = new Map<MemoryPath, MemoryPlan['rejected'][number]>();
+  for (const r of rejected) {
+    const seen = smallest.get(r.path);
+    if (!seen || r.peak_bytes < seen.peak_bytes) smallest.set(r.path, r);
+  }
+  const paths = [...smallest.values()]
+    .map(
+      (r) =>
+        `'${r.path}' peaks at ${format_bytes(r.peak_bytes)} in stage '${r.stage}'`,
+    )
+    .join('; ');
+  throw new Error(
+    `${estimator} cannot fit ${shape[0]}×${shape[1]} input within ` +
+      `${format_bytes(resolved.bytes)} on the '${resolved.backend}' backend: ` +
+      (paths || 'no path applies') +
+      (withheld !== null
+        ? `. The 'approximate' path needs ${format_bytes(withheld)}; ` +
+          'set allow_approximate to use it.'
+        : '.'),
+  );
+}
+
+/**
+ * The plan `fit` should follow for `X`: the recorded one, re-planned against
+ * the same budget when `X` has a different shape. `null` without a plan.
+ *
+ * @throws {Error} If the re-plan finds no path that fits.
+ */
+export function plan_for_fit(
+  estimator: MemoryPlannable,
+  X: DataMatrix,
+): MemoryPlan | null {
+  const plan = estimator.memory_plan_;
+  if (plan === null) return null;
+  const shape = matrix_shape(X);
+  if (shape[0] === plan.n_samples && shape[1] === plan.n_features) {
+    return plan;
+  }
+  estimator.memory_plan_ = estimator.plan_memory(shape, plan.budget);
+  return estimator.memory_plan_;
+}
+
+function lloyd_stages(
+  n: number,
+  d: number,
+  K: number,
+  restarts: number,
+): StageFootprint[] {
+  // Centred x and ‖x‖².
+  const data = (n * d + n) * F32;
+  const points = n * d * F64;
+  return [
+    { stage: 'seeding', tensor_bytes: data, host_bytes: points + n * F64 },
+    {
+      stage: 'lloyd',
+      tensor_bytes:
+        data + restarts * (LLOYD_DISTANCE_TENSORS * n * K + n + K * d) * F32,
+      // Label readback, per-restart labels and centroids, then the float64
+      // sums and distances of the host update.
+      host_bytes:
+        points +
+        restarts * (2 * n * I32 + K * d * F64) +
+        (n + K * d) * F64,
+    },
+  ];
+}
+
+/**
+ * Lloyd runs `restart_batch` restarts per batch: all of `default_batch`
+ * (dense), else the largest halving of it that fits (blocked).
+ */
+export function kmeans_memory_paths(
+  params: KMeansParams,
+  [n, d]: [number, number],
+  default_batch: number,
+): MemoryPathEstimate[] {
+  const K = params.n_clusters;
+  if (params.metric === 'cosine') {
+    // Spherical seeding reads the full cosine distance matrix back as rows.
+    return [
+      {
+        path: 'dense',
+        stages: [
+          {
+            stage: 'seeding',
+            tensor_bytes:
+              (n * d + (2 * d + BROADCAST_MATRIX_TENSORS) * n * n) * F32,
+            host_bytes: (2 * n * d + n * n) * F64,
+          },
+        ],
+      },
+    ];
+  }
+  const algorithm = params.algorithm ?? 'lloyd';
+  if (algorithm !== 'lloyd') {
+    const bounds = algorithm === 'elkan' ? n * K + n : 2 * n;
+    return [
+      {
+        path: 'dense',
+        stages: [
+          {
+            stage: algorithm,
+            tensor_bytes: 0,
+            host_bytes: (n * d + bounds + 2 * K * d + K * K) * F64 + n * I32,
+          },
+        ],
+      },
+    ];
+  }
+  const paths: MemoryPathEstimate[] = [
+    {
+      path: 'dense',
+      stages: lloyd_stages(n, d, K, default_batch),
+      settings: { restart_batch: default_batch },
+    },
+  ];
+  for (let b = Math.floor(default_batch / 2); b >= 1; b = Math.floor(b / 2)) {
+    paths.push({
+      path: 'blocked',
+      stages: lloyd_stages(n, d, K, b),
+      settings: { restart_batch: b },
+    });
+  }
+  return paths;
+}
+
+/** Float64 on the CPU in batches; the only `O(n)` state is the data. */
+export function minibatch_kmeans_memory_paths(
+  params: MiniBatchKMeansParams,
+  [n, d]: [number, number],
+): MemoryPathEstimate[] {
+  const K = params.n_clusters;
+  return [
+    {
+      path: 'dense',
+      stages: [
+        {
+          stage: 'fit',
+          tensor_bytes: 0,
+          host_bytes: (n * d + n + 3 * K * d) * F64,
+        },
+      ],
+    },
+  ];
+}
+
+/**
+ * Exact affinities need several `n×n` tensors plus a float64 copy of the
+ * Laplacian for the eigensolver. `'nearest_neighbors'` is sparse throughout,
+ * and `'rbf'`/`'cosine'` fall back to the Nyström approximation.
+ */
+export function spectral_memory_paths(
+  params: SpectralClusteringParams,
+  [n, d]: [number, number],
+  n_neighbors: number,
+): MemoryPathEstimate[] {
+  const K = params.n_clusters;
+  const x = n * d * F32;
+  // Thick-restart Lanczos keeps a few bases of about k + 5 vectors.
+  const basis = n * 2 * (K + 5) * F64;
+  const embedding = n * K * F32 * (1 + LLOYD_DISTANCE_TENSORS);
+
+  const m = Math.min(params.n_landmarks ?? NYSTROM_LANDMARKS_DEFAULT, n);
+  const nystrom: MemoryPathEstimate = {
+    path: 'approximate',
+    stages: [
+      {
+        stage: 'kernel_block',
+        tensor_bytes: x + NYSTROM_BLOCK_TENSORS * n * m * F32,
+        host_bytes: 3 * m * m * F64,
+      },
+      {
+        stage: 'assignment',
+        tensor_bytes: x + embedding,
+        host_bytes: 0,
+      },
+    ],
+  };
+  if (params.affinity_approximation === 'nystrom') return [nystrom];
+
+  if (params.affinity === 'nearest_neighbors') {
+    const nnz = 2 * n * n_neighbors;
+    const b = Math.min(KNN_BLOCK_ROWS, n);
+    return [
+      {
+        path: 'sparse',
+        stages: [
+          {
+            stage: 'affinity',
+            tensor_bytes: x + KNN_BLOCK_TENSORS * b * n * F32,
+            host_bytes: nnz * MAP_ENTRY_BYTES,
+          },
+          {
+            stage: 'eigensolver',
+            tensor_bytes: x,
+            host_bytes: nnz * (F64 + I32) + basis,
+          },
+          { stage: 'assignment', tensor_bytes: x + embedding, host_bytes: 0 },
+        ],
+      },
+    ];
+  }
+
+  const nn = n * n * F32;
+  const affinity_tensors =
+    params.affinity === 'cosine'
+      ? 2 * d + BROADCAST_MATRIX_TENSORS
+      : params.affinity === 'precomputed'
+        ? 2
+        : EUCLIDEAN_MATRIX_TENSORS;
+  const dense: MemoryPathEstimate = {
+    path: 'dense',
+    stages: [
+      {
+        stage: 'affinity',
+        tensor_bytes: x + affinity_tensors * nn,
+        host_bytes: 0,
+      },
+      {
+        stage: 'laplacian',
+        tensor_bytes: x + LAPLACIAN_TENSORS * nn,
+        host_bytes: 0,
+      },
+      {
+        stage: 'eigensolver',
+        tensor_bytes: x + 2 * nn,
+        host_bytes: n * n * (F32 + F64) + basis,
+      },
+      {
+        stage: 'assignment',
+        tensor_bytes: x + nn + embedding,
+        host_bytes: 0,
+      },
+    ],
+  };
+  const approximable =
+    (params.affinity ?? 'rbf') === 'rbf' || params.affinity === 'cosine';
+  return approximable && !params.intensive_parameter_sweep
+    ? [dense, nystrom]
+    : [dense];
+}
+
+/**
+ * Dense builds the `n×n` distance and mutual-reachability tensors and reads
+ * the latter back; blocked recomputes rows on the CPU from the data and only
+ * keeps `O(n)` state. Precomputed input is already `n×n` and stays dense.
+ */
+export function hdbscan_memory_paths(
+  params: HDBSCANParams,
+  [n, d]: [number, number],
+  min_samples: number,
+): MemoryPathEstimate[] {
+  const metric = params.metric ?? 'euclidean';
+  const nn = n * n * F32;
+  const x = metric === 'precomputed' ? 0 : n * d * F32;
+  const distance_tensors =
+    metric === 'precomputed'
+      ? 1
+      : metric === 'manhattan'
+        ? 2 * d + BROADCAST_MATRIX_TENSORS
+        : EUCLIDEAN_MATRIX_TENSORS;
+  // Prim's weights, sources and visited flags, and the MST edges.
+  const prim = n * (F64 + I32 + 1) + 3 * n * F64;
+
+  const dense: MemoryPathEstimate = {
+    path: 'dense',
+    stages: [
+      {
+        stage: 'distance_matrix',
+        tensor_bytes: x + distance_tensors * nn,
+        host_bytes: 0,
+      },
+      {
+        stage: 'mutual_reachability',
+        tensor_bytes: 4 * nn + 2 * n * min_samples * F32,
+        host_bytes: 0,
+      },
+      { stage: 'readback', tensor_bytes: 2 * nn, host_bytes: nn },
+      { stage: 'spanning_tree', tensor_bytes: 0, host_bytes: nn + prim },
+    ],
+  };
+  if (metric === 'precomputed') return [dense];
+
+  const points = n * d * F64;
+  return [
+    dense,
+    {
+      path: 'blocked',
+      stages: [
+        {
+          stage: 'core_distances',
+          tensor_bytes: 0,
+          host_bytes: points + 2 * n * F64 + min_samples * F64,
+        },
+        {
+          stage: 'spanning_tree',
+          tensor_bytes: 0,
+          host_bytes: points + 2 * n * F64 + prim,
+        },
+      ],
+    },
+  ];
+}
+
+/** NN-chain works in place on a float64 `n×n` distance matrix. */
+export function agglomerative_memory_paths(
+  params: AgglomerativeClusteringParams,
+  [n, d]: [number, number],
+): MemoryPathEstimate[] {
+  const points = params.metric === 'precomputed' ? 0 : n * d * F64;
+  return [
+    {
+      path: 'dense',
+      stages: [
+        {
+          stage: 'linkage',
+          tensor_bytes: 0,
+          host_bytes: points + n * n * F64 + 6 * n * F64,
+        },
+      ],
+    },
+  ];
+}
+
+/** Training and the final assignment both compare every sample with every neuron. */
+export function som_memory_paths(
+  params: SOMParams,
+  [n, d]: [number, number],
+): MemoryPathEstimate[] {
+  const neurons = params.grid_width * params.grid_height;
+  return [
+    {
+      path: 'dense',
+      stages: [
+        {
+          stage: 'training',
+          tensor_bytes:
+            (n * d + 2 * neurons * d + SOM_DISTANCE_TENSORS * n * neurons) *
+            F32,
+          host_bytes: n * F64,
+        },
+      ],
+    },
+  ];
+}
@@ -0,0 +1,171 @@
+import { MiniBatchKMeans } from "./minibatch_kmeans";
+import { make_random_stream } from "../random";
+import * as tf from "../../test_support/tensorflow_helper";
+
+function blobs(n_per: number, centers: number[][], seed: number): number[][] {
+  const rng = make_random_stream(seed);
+  const out: number[][] = [];
+  for (let i = 0; i < n_per; i++) {
+    for (const c of centers) {
+      out.push(c.map((v) => v + (rng.rand() - 0.5)));
+    }
+  }
+  return out;
+}
+
+const CENTERS = [
+  [0, 0],
+  [10, 0],
+  [0, 10],
+];
+
+function partition_matches(labels: number[], period: number): boolean {
+  // Rows are interleaved by blob, so row i belongs to blob i % period.
+  const mapping = new Map<number, number>();
+  for (let i = 0; i < labels.length; i++) {
+    const blob = i % period;
+    if (!mapping.has(blob)) mapping.set(blob, labels[i]);
+    if (mapping.get(blob) !== labels[i]) return false;
+  }
+  return new Set(mapping.values()).size === period;
+}
+
+describe("MiniBatchKMeans – parameter validation", () => {
+  it("throws for n_clusters < 1", () => {
+    expect(() => new MiniBatchKMeans({ n_clusters: 0 })).toThrow("n_clusters");
+  });
+
+  it("throws for batch_size < 1", () => {
+    expect(() => new MiniBatchKMeans({ n_clusters: 2, batch_size: 0 })).toThrow("batch_size");
+  });
+
+  it("throws for invalid max_no_improvement", () => {
+    expect(
+      () => new MiniBatchKMeans({ n_clusters: 2, max_no_improvement: 0 }),
+    ).toThrow("max_no_improvement");
+  });
+
+  it("accepts max_no_improvement: null", () => {
+    expect(
+      () => new MiniBatchKMeans({ n_clusters: 2, max_no_improvement: null }),
+    ).not.toThrow();
+  });
+});
+
+describe("MiniBatchKMeans – fit", () => {
+  const X = blobs(100, CENTERS, 1);
+
+  it("recovers well separated blobs", async () => {
+    const mbk = new MiniBatchKMeans({ n_clusters: 3, batch_size: 32, random_state: 0 });
+    const labels = await mbk.fit_predict(X);
+    expect(partition_matches(labels, 3)).toBe(true);
+    expect(mbk.inertia_).toBeGreaterThan(0);
+    expect(mbk.n_steps_).toBeGreaterThan(0);
+    mbk.dispose();
+  });
+
+  it("stops early once the smoothed inertia plateaus", async () => {
+    const mbk = new MiniBatchKMeans({
+      n_clusters: 3,
+      batch_size: 32,
+      max_iter: 100,
+      max_no_improvement: 3,
+      random_state: 0,
+    });
+    await mbk.fit(X);
+    expect(mbk.n_steps_).toBeLessThan(Math.ceil((100 * X.length) / 32));
+    mbk.dispose();
+  });
+
+  it("is deterministic for a fixed random_state", async () => {
+    const a = new MiniBatchKMeans({ n_clusters: 3, batch_size: 16, random_state: 5 });
+    const b = new MiniBatchKMeans({ n_clusters: 3, batch_size: 16, random_state: 5 });
+    await a.fit(X);
+    await b.fit(X);
+    expect(b.get_centroids()).toEqual(a.get_centroids());
+    expect(b.labels_).toEqual(a.labels_);
+    a.dispose();
+    b.dispose();
+  });
+
+  it("per-centroid counts sum to the samples absorbed", async () => {
+    const mbk = new MiniBatchKMeans({
+      n_clusters: 3,
+      batch_size: 20,
+      max_iter: 1,
+      max_no_improvement: null,
+      random_state: 0,
+    });
+    await mbk.fit(X);
+    const total = Array.from(mbk.counts_!).reduce((s, c) => s + c, 0);
+    expect(total).toBe(mbk.n_steps_ * 20);
+    mbk.dispose();
+  });
+});
+
+describe("MiniBatchKMeans – partial_fit", () => {
+  it("clusters a stream chunk by chunk", async () => {
+    const mbk = new MiniBatchKMeans({ n_clusters: 3, random_state: 0 });
+    for (let c = 0; c < 10; c++) {
+      await mbk.partial_fit(blobs(10, CENTERS, 100 + c));
+    }
+    expect(mbk.n_steps_).toBe(10);
+    const test = blobs(20, CENTERS, 999);
+    expect(partition_matches(await mbk.predict(test), 3)).toBe(true);
+    mbk.dispose();
+  });
+
+  it("throws when the first chunk is smaller than n_clusters", async () => {
+    const mbk = new MiniBatchKMeans({ n_clusters: 3 });
+    await expect(mbk.partial_fit([[0, 0], [1, 1]])).rejects.toThrow("n_clusters");
+  });
+
+  it("throws on a feature dimension change", async () => {
+    const mbk = new MiniBatchKMeans({ n_clusters: 2, random_state: 0 });
+    await mbk.partial_fit([[0, 0], [1, 1], [5, 5]]);
+    await expect(mbk.partial_fit([[0, 0, 0]])).rejects.toThrow("Feature dimension mismatch");
+    mbk.dispose();
+  });
+
+  it("predict throws on a feature dimension change", async () => {
+    const mbk = new MiniBatchKMeans({ n_clusters: 2, random_state: 0 });
+    await mbk.fit([[0, 0], [1, 1], [5, 5]]);
+    await expect(mbk.predict([[0, 0, 0]])).rejects.toThrow("Feature dimension mismatch");
+    mbk.dispose();
+  });
+});
+
+describe("MiniBatchKMeans – serialization", () => {
+  it("from_json restores predict and resumes partial_fit identically", async () => {
+    const chunks = Array.from({ length: 4 }, (_, c) => blobs(10, CENTERS, 200 + c));
+    const model = new MiniBatchKMeans({ n_clusters: 3, random_state: 0 });
+    await model.partial_fit(chunks[0]);
+    await model.partial_fit(chunks[1]);
+
+    const restored = MiniBatchKMeans.from_json(model.to_json());
+    expect(await restored.predict(chunks[2])).toEqual(await model.predict(chunks[2]));
+
+    for (const chunk of chunks.slice(2)) {
+      await model.partial_fit(chunk);
+      await restored.partial_fit(chunk);
+    }
+    expect(restored.get_centroids()).toEqual(model.get_centroids());
+    model.dispose();
+    restored.dispose();
+  });
+
+  it("to_json and predict throw before fit", async () => {
+    const mbk = new MiniBatchKMeans({ n_clusters: 2 });
+    expect(() => mbk.to_json()).toThrow("before fit");
+    await expect(mbk.predict([[0, 0]])).rejects.toThrow("before fit");
+  });
+
+  it("does not leak tensors across fit, partial_fit and dispose", async () => {
+    const before = tf.memory().numTensors;
+    const mbk = new MiniBatchKMeans({ n_clusters: 3, batch_size: 16, random_state: 0 });
+    await mbk.fit(blobs(20, CENTERS, 3));
+    await mbk.partial_fit(blobs(5, CENTERS, 4));
+    mbk.dispose();
+    expect(tf.memory().numTensors).toBe(before);
+  });
+});
@@ -0,0 +1,531 @@
+import type {
+  BaseClustering,
+  DataMatrix,
+  FitPredictOptions,
+  MiniBatchKMeansParams,
+} from './types';
+import * as tf from '../backend/adapter';
+import {
+  format_labels,
+  matrix_shape,
+  to_float64,
+} from '../tensor/data_matrix';
+import { make_random_stream } from '../random';
+import type { RandomStream } from '../random';
+import { rows_to_float64 } from '../distance/float64_distance';
+import { kmeans_plus_plus } from './kmeans_seeding';
+import {
+  choose_memory_path,
+  minibatch_kmeans_memory_paths,
+  plan_for_fit,
+  type MemoryBudget,
+  type MemoryPlan,
+  type MemoryPlannable,
+} from './memory_plan';
+import { profile_stage } from './profiler';
+
+export interface MiniBatchKMeansJSON {
+  params: MiniBatchKMeansParams;
+  centroids_: number[][];
+  /** Accumulated per-centroid sample counts; needed to resume `partial_fit`. */
+  counts_: number[];
+  inertia_: number | null;
+  n_steps_: number;
+}
+
+interface Rows {
+  data: Float64Array;
+  n: number;
+  d: number;
+}
+
+/** Index of the nearest centre to row `offset` (lowest index on ties) and its squared distance. */
+function nearest_center(
+  data: Float64Array,
+  offset: number,
+  centers: Float64Array,
+  K: number,
+  d: number,
+): [number, number] {
+  let best = 0;
+  let best_sq = Number.POSITIVE_INFINITY;
+  for (let k = 0; k < K; k++) {
+    const oc = k * d;
+    let sq = 0;
+    for (let f = 0; f < d; f++) {
+      const diff = data[offset + f] - centers[oc + f];
+      sq += diff * diff;
+    }
+    if (sq < best_sq) {
+      best_sq = sq;
+      best = k;
+    }
+  }
+  return [best, best_sq];
+}
+
+/**
+ * Mini-batch k-means (Sculley, 2010) following scikit-learn's
+ * `MiniBatchKMeans`: k-means++ on a random init sample, then fixed-size
+ * mini-batch updates where centroid `k` moves towards its batch mean with
+ * learning rate `batch_count_k / counts_[k]`.
+ *
+ * `fit` stops early when the exponentially smoothed batch inertia stops
+ * improving; `partial_fit` applies one update per chunk so a stream of any
+ * length is clustered in `O(K·d)` state.
+ */
+export class MiniBatchKMeans
+  implements BaseClustering<MiniBatchKMeansParams>, MemoryPlannable
+{
+  public readonly params: MiniBatchKMeansParams;
+
+  public labels_: number[] | null = null;
+
+  public centroids_: tf.Tensor2D | null = null;
+
+  public inertia_: number | null = null;
+
+  /** Samples absorbed by each centroid across all updates. */
+  public counts_: Float64Array | null = null;
+
+  /** Mini-batch updates applied so far (`fit` steps plus `partial_fit` calls). */
+  public n_steps_ = 0;
+
+  /** MiniBatchKMeans has only the dense path; a plan makes `fit` fail fast. */
+  public memory_plan_: MemoryPlan | null = null;
+
+  // Float64 working copy of the centroids; `centroids_` mirrors it.
+  private centers_: Float64Array | null = null;
+
+  private static readonly DEFAULT_BATCH_SIZE = 1024;
+  private static readonly DEFAULT_MAX_ITER = 100;
+  private static readonly DEFAULT_TOL = 0;
+  private static readonly DEFAULT_MAX_NO_IMPROVEMENT = 10;
+  private static readonly DEFAULT_N_INIT = 3;
+
+  constructor(params: MiniBatchKMeansParams) {
+    this.params = { ...params };
+    MiniBatchKMeans.validate_params(this.params);
+  }
+
+  private static validate_params(params: MiniBatchKMeansParams): void {
+    const {
+      n_clusters,
+      batch_size,
+      max_iter,
+      tol,
+      max_no_improvement,
+      init_size,
+      n_init,
+    } = params;
+
+    if (!Number.isInteger(n_clusters) || n_clusters < 1) {
+      throw new Error('n_clusters must be a positive integer (>= 1).');
+    }
+    if (batch_size !== undefined && (!Number.isInteger(batch_size) || batch_size < 1)) {
+      throw new Error('batch_size must be a positive integer (>= 1) when given.');
+    }
+    if (max_iter !== undefined && (!Number.isInteger(max_iter) || max_iter < 1)) {
+      throw new Error('max_iter must be a positive integer (>= 1) when given.');
+    }
+    if (tol !== undefined && (typeof tol !== 'number' || tol < 0)) {
+      throw new Error('tol must be a non-negative number when given.');
+    }
+    if (
+      max_no_improvement !== undefined &&
+      max_no_improvement !== null &&
+      (!Number.isInteger(max_no_improvement) || max_no_improvement < 1)
+    ) {
+      throw new Error(
+        'max_no_improvement must be a positive integer (>= 1) or null when given.',
+      );
+    }
+    if (init_size !== undefined && (!Number.isInteger(init_size) || init_size < 1)) {
+      throw new Error('init_size must be a positive integer (>= 1) when given.');
+    }
+    if (n_init !== undefined && (!Number.isInteger(n_init) || n_init < 1)) {
+      throw new Error('n_init must be a positive integer (>= 1) when given.');
+    }
+  }
+
+  public dispose(): void {
+    if (this.centroids_ != null) {
+      this.centroids_.dispose();
+      this.centroids_ = null;
+    }
+    this.centers_ = null;
+    this.counts_ = null;
+    this.labels_ = null;
+    this.inertia_ = null;
+    this.n_steps_ = 0;
+  }
+
+  plan_memory(shape: [number, number], budget: MemoryBudget): MemoryPlan {
+    return choose_memory_path(
+      'MiniBatchKMeans',
+      shape,
+      budget,
+      minibatch_kmeans_memory_paths(this.params, shape),
+    );
+  }
+
+  /**
+   * @throws {Error} If input data is empty or n_clusters exceeds n_samples.
+   */
+  async fit(X: DataMatrix): Promise<void> {
+    plan_for_fit(this, X);
+    const rows = await MiniBatchKMeans.read_rows(X);
+    const { n } = rows;
+    if (n === 0) {
+      throw new Error('Input data must contain at least one sample.');
+    }
+    const K = this.params.n_clusters;
+    if (K > n) {
+      throw new Error('n_clusters cannot exceed number of samples.');
+    }
+
+    this.dispose();
+
+    const rng = make_random_stream(this.params.random_state);
+    const batch_size = Math.min(
+      this.params.batch_size ?? MiniBatchKMeans.DEFAULT_BATCH_SIZE,
+      n,
+    );
+    const max_iter = this.params.max_iter ?? MiniBatchKMeans.DEFAULT_MAX_ITER;
+    const max_no_improvement =
+      this.params.max_no_improvement === undefined
+        ? MiniBatchKMeans.DEFAULT_MAX_NO_IMPROVEMENT
+        : this.params.max_no_improvement;
+    const tol = MiniBatchKMeans.scaled_tolerance(
+      rows,
+      this.params.tol ?? MiniBatchKMeans.DEFAULT_TOL,
+    );
+
+    profile_stage('MiniBatchKMeans', 'seeding', () =>
+      this.initialize(rows, rng),
+    );
+
+    const n_steps = Math.ceil((max_iter * n) / batch_size);
+    const batch = new Int32Array(batch_size);
+    // Smoothing factor of the inertia EWA, as in scikit-learn.
+    const alpha = Math.min((batch_size * 2) / (n + 1), 1);
+    let ewa_inertia = 0;
+    let ewa_inertia_min = Number.POSITIVE_INFINITY;
+    let no_improvement = 0;
+
+    // One stage for the whole loop: per-step events would cost more than a
+    // mini-batch step.
+    profile_stage('MiniBatchKMeans', 'update', () => {
+      for (let step = 0; step < n_steps; step++) {
+        for (let b = 0; b < batch_size; b++) batch[b] = rng.rand_int(n);
+        const { inertia, centers_sq_diff } = this.mini_batch_step(rows, batch);
+        this.n_steps_++;
+
+        const batch_inertia = inertia / batch_size;
+        ewa_inertia =
+          step === 0
+            ? batch_inertia
+            : ewa_inertia * (1 - alpha) + batch_inertia * alpha;
+
+        if (tol > 0 && centers_sq_diff <= tol) break;
+
+        if (ewa_inertia < ewa_inertia_min) {
+          no_improvement = 0;
+          ewa_inertia_min = ewa_inertia;
+        } else {
+          no_improvement++;
+        }
+        if (
+          max_no_improvement !== null &&
+          no_improvement >= max_no_improvement
+        ) {
+          break;
+        }
+      }
+    });
+
+    profile_stage('MiniBatchKMeans', 'assign_labels', () =>
+      this.assign_labels(rows),
+    );
+    this.sync_centroids_tensor();
+  }
+
+  /**
+   * Applies one mini-batch update with all rows of `X`. The first call seeds
+   * the centroids from `X` (k-means++ on an `init_size` sample), so it must
+   * hold at least `n_clusters` rows. `labels_` and `inertia_` describe `X`
+   * under the updated centroids.
+   *
+   * @throws {Error} If the first chunk has fewer than n_clusters rows.
+   * @throws {Error} If the feature count differs from earlier chunks.
+   */
+  async partial_fit(X: DataMatrix): Promise<void> {
+    const rows = await MiniBatchKMeans.read_rows(X);
+    if (rows.n === 0) {
+      throw new Error('Input data must contain at least one sample.');
+    }
+    const K = this.params.n_clusters;
+
+    if (this.centers_ == null) {
+      if (K > rows.n) {
+        throw new Error(
+          'The first partial_fit chunk must contain at least n_clusters samples.',
+        );
+      }
+      profile_stage('MiniBatchKMeans', 'seeding', () =>
+        this.initialize(rows, make_random_stream(this.params.random_state)),
+      );
+    } else {
+      const expected_features = this.centers_.length / K;
+      if (rows.d !== expected_features) {
+        throw new Error(
+          `Feature dimension mismatch: expected ${expected_features} features to match prior fit, but got ${rows.d}`,
+        );
+      }
+    }
+
+    profile_stage('MiniBatchKMeans', 'update', () =>
+      this.mini_batch_step(rows, null),
+    );
+    this.n_steps_++;
+    profile_stage('MiniBatchKMeans', 'assign_labels', () =>
+      this.assign_labels(rows),
+    );
+    this.sync_centroids_tensor();
+  }
+
+  /**
+   * @throws {Error} If input data is empty or n_clusters exceeds n_samples.
+   */
+  fit_predict(
+    X: DataMatrix,
+    options?: FitPredictOptions & { int32_labels?: false },
+  ): Promise<number[]>;
+  fit_predict(
+    X: DataMatrix,
+    options: FitPredictOptions & { int32_labels: true },
+  ): Promise<Int32Array>;
+  async fit_predict(
+    X: DataMatrix,
+    options?: FitPredictOptions,
+  ): Promise<number[] | Int32Array> {
+    await this.fit(X);
+    if (this.labels_ == null) {
+      throw new Error('MiniBatchKMeans.fit did not compute labels.');
+    }
+    return format_labels(this.labels_, options);
+  }
+
+  /**
+   * @throws {Error} If called before `fit()`/`partial_fit()`.
+   */
+  async predict(X: DataMatrix): Promise<number[]> {
+    if (this.centers_ == null) {
+      throw new Error(
+        'MiniBatchKMeans.predict called before fit(); centroids_ is null.',
+      );
+    }
+    const { data, n, d } = await MiniBatchKMeans.read_rows(X);
+    const K = this.params.n_clusters;
+    const expected_features = this.centers_.length / K;
+    if (d !== expected_features) {
+      throw new Error(
+        `Feature dimension mismatch: expected ${expected_features} features to match prior fit, but got ${d}`,
+      );
+    }
+    const labels = new Array<number>(n);
+    for (let i = 0; i < n; i++) {
+      labels[i] = nearest_center(data, i * d, this.centers_, K, d)[0];
+    }
+    return labels;
+  }
+
+  /**
+   * @throws {Error} If the model is unfitted.
+   */
+  get_centroids(): number[][] {
+    if (this.centers_ == null) {
+      throw new Error(
+        'MiniBatchKMeans.get_centroids called before fit(); centroids_ is null.',
+      );
+    }
+    return this.center_rows();
+  }
+
+  /**
+   * Includes the per-centroid counts so a restored model can keep absorbing
+   * chunks through {@link partial_fit} with the same learning rates.
+   *
+   * @throws {Error} If the model is unfitted.
+   */
+  to_json(): MiniBatchKMeansJSON {
+    if (this.centers_ == null || this.counts_ == null) {
+      throw new Error(
+        'MiniBatchKMeans.to_json called before fit(); centroids_ is null.',
+      );
+    }
+    return {
+      params: { ...this.params },
+      centroids_: this.center_rows(),
+      counts_: Array.from(this.counts_),
+      inertia_: this.inertia_,
+      n_steps_: this.n_steps_,
+    };
+  }
+
+  static from_json(json: MiniBatchKMeansJSON): MiniBatchKMeans {
+    const model = new MiniBatchKMeans(json.params);
+    model.centers_ = rows_to_float64(json.centroids_);
+    model.counts_ = Float64Array.from(json.counts_);
+    model.inertia_ = json.inertia_;
+    model.n_steps_ = json.n_steps_;
+    model.sync_centroids_tensor();
+    return model;
+  }
+
+  private static async read_rows(X: DataMatrix): Promise<Rows> {
+    const [n, d] = matrix_shape(X);
+    return { data: await to_float64(X), n, d };
+  }
+
+  /** scikit-learn's `_tolerance`: `tol` relative to the mean feature variance. */
+  private static scaled_tolerance({ data, n, d }: Rows, tol: number): number {
+    if (tol === 0 || d === 0) return 0;
+    let variance_sum = 0;
+    for (let f = 0; f < d; f++) {
+      let mean = 0;
+      for (let i = 0; i < n; i++) mean += data[i * d + f];
+      mean /= n;
+      let v = 0;
+      for (let i = 0; i < n; i++) {
+        const diff = data[i * d + f] - mean;
+        v += diff * diff;
+      }
+      variance_sum += v / n;
+    }
+    return (variance_sum / d) * tol;
+  }
+
+  /**
+   * Seeds `n_init` k-means++ candidates on a random `init_size` sample (drawn
+   * with replacement, as scikit-learn does) and keeps the one with the lowest
+   * inertia on that sample.
+   */
+  private initialize(rows: Rows, rng: RandomStream): void {
+    const { data, n, d } = rows;
+    const K = this.params.n_clusters;
+    const batch_size = this.params.batch_size ?? MiniBatchKMeans.DEFAULT_BATCH_SIZE;
+    let init_size = this.params.init_size ?? 3 * batch_size;
+    if (init_size < K) init_size = 3 * K;
+
+    let sample: Float64Array;
+    let n_sample: number;
+    if (init_size >= n) {
+      sample = data;
+      n_sample = n;
+    } else {
+      n_sample = init_size;
+      sample = new Float64Array(n_sample * d);
+      for (let s = 0; s < n_sample; s++) {
+        const idx = rng.rand_int(n);
+        sample.set(data.subarray(idx * d, idx * d + d), s * d);
+      }
+    }
+    const n_init = this.params.n_init ?? MiniBatchKMeans.DEFAULT_N_INIT;
+    let best_inertia = Number.POSITIVE_INFINITY;
+    let best: Float64Array | null = null;
+    for (let run = 0; run < n_init; run++) {
+      const idxs = kmeans_plus_plus(sample, n_sample, d, K, rng);
+      const centers = new Float64Array(K * d);
+      idxs.forEach((idx, k) =>
+        centers.set(sample.subarray(idx * d, idx * d + d), k * d),
+      );
+      let inertia = 0;
+      for (let s = 0; s < n_sample; s++) {
+        inertia += nearest_center(sample, s * d, centers, K, d)[1];
+      }
+      if (inertia < best_inertia) {
+        best_inertia = inertia;
+        best = centers;
+      }
+    }
+
+    this.centers_ = best!;
+    this.counts_ = new Float64Array(K);
+    this.n_steps_ = 0;
+  }
+
+  /**
+   * One mini-batch update over `batch` row indices (all rows when null).
+   * Returns the batch inertia under the pre-update centroids and the total
+   * squared centroid movement.
+   */
+  private mini_batch_step(
+    { data, n, d }: Rows,
+    batch: Int32Array | null,
+  ): { inertia: number; centers_sq_diff: number } {
+    const K = this.params.n_clusters;
+    const centers = this.centers_!;
+    const counts = this.counts_!;
+    const sums = new Float64Array(K * d);
+    const batch_counts = new Float64Array(K);
+    const size = batch ? batch.length : n;
+
+    let inertia = 0;
+    for (let b = 0; b < size; b++) {
+      const offset = (batch ? batch[b] : b) * d;
+      const [k, sq] = nearest_center(data, offset, centers, K, d);
+      inertia += sq;
+      batch_counts[k]++;
+      const oc = k * d;
+      for (let f = 0; f < d; f++) sums[oc + f] += data[offset + f];
+    }
+
+    let centers_sq_diff = 0;
+    for (let k = 0; k < K; k++) {
+      const bc = batch_counts[k];
+      if (bc === 0) continue;
+      counts[k] += bc;
+      const oc = k * d;
+      for (let f = 0; f < d; f++) {
+        // c ← c + (Σx − bc·c) / counts: the running mean of every sample
+        // this centroid has absorbed.
+        const delta = (sums[oc + f] - bc * centers[oc + f]) / counts[k];
+        centers[oc + f] += delta;
+        centers_sq_diff += delta * delta;
+      }
+    }
+    return { inertia, centers_sq_diff };
+  }
+
+  private assign_labels({ data, n, d }: Rows): void {
+    const K = this.params.n_clusters;
+    const labels = new Array<number>(n);
+    let inertia = 0;
+    for (let i = 0; i < n; i++) {
+      const [k, sq] = nearest_center(data, i * d, this.centers_!, K, d);
+      labels[i] = k;
+      inertia += sq;
+    }
+    this.labels_ = labels;
+    this.inertia_ = inertia;
+  }
+
+  private center_rows(): number[][] {
+    const K = this.params.n_clusters;
+    const d = this.centers_!.length / K;
+    return Array.from({ length: K }, (_, k) =>
+      Array.from(this.centers_!.subarray(k * d, k * d + d)),
+    );
+  }
+
+  private sync_centroids_tensor(): void {
+    this.centroids_?.dispose();
+    const K = this.params.n_clusters;
+    this.centroids_ = tf.tensor2d(
+      Float32Array.from(this.centers_!),
+      [K, this.centers_!.length / K],
+      'float32',
+    );
+  }
+}
@@ -0,0 +1,187 @@
+import { Clustering } from './init';
+import { HDBSCAN } from './hdbscan';
+import { KMeans } from './kmeans';
+import { SOM } from './som';
+import { SpectralClustering } from './spectral';
+import { profile_stage, type StageEvent } from './profiler';
+import { make_random_stream } from '../random';
+import * as tf from '../../test_support/tensorflow_helper';
+
+function blobs(n_per: number, centers: number[][], seed: number): number[][] {
+  const rng = make_random_stream(seed);
+  const out: number[][] = [];
+  for (let i = 0; i < n_per; i++) {
+    for (const c of centers) {
+      out.push(c.map((v) => v + (rng.rand() - 0.5)));
+    }
+  }
+  return out;
+}
+
+const X = blobs(10, [[0, 0], [6, 0], [0, 6]], 3);
+
+function record(): StageEvent[] {
+  const events: StageEvent[] = [];
+  Clustering.set_profiler((e) => events.push(e));
+  return events;
+}
+
+function ends(events: StageEvent[], estimator: string) {
+  return events.flatMap((e) =>
+    e.phase === 'end' && e.estimator === estimator ? [e] : [],
+  );
+}
+
+afterEach(() => {
+  Clustering.set_profiler(null);
+});
+
+describe('Clustering.set_profiler', () => {
+  it('reports the cost of each HDBSCAN stage', async () => {
+    const events = record();
+    await new HDBSCAN({ min_cluster_size: 5 }).fit(X);
+
+    const stages = ends(events, 'HDBSCAN');
+    expect(stages.map((e) => e.stage)).toEqual([
+      'distance',
+      'core_distances',
+      'mst',
+      'condense',
+    ]);
+    const [distance, core] = stages;
+    const nn_bytes = X.length * X.length * 4;
+    // The distance matrix outlives its stage; the reachability matrix does not.
+    expect(distance.new_tensors).toBe(1);
+    expect(distance.new_bytes).toBe(nn_bytes);
+    expect(core.new_tensors).toBe(0);
+    expect(core.readback_bytes).toBe(nn_bytes);
+    for (const e of stages) {
+      expect(e.duration_ms).toBeGreaterThanOrEqual(0);
+      expect(e.heap_delta_bytes).not.toBeNull();
+    }
+  });
+
+  it('pairs begin and end events', async () => {
+    const events = record();
+    await new SOM({
+      grid_width: 3,
+      grid_height: 3,
+      num_epochs: 2,
+      tol: 0,
+      random_state: 0,
+    }).fit(X);
+
+    const open: number[] = [];
+    for (const e of events) {
+      if (e.phase === 'begin') {
+        open.push(e.span_id);
+      } else {
+        expect(open.pop()).toBe(e.span_id);
+      }
+    }
+    expect(open).toEqual([]);
+    const stages = ends(events, 'SOM').map((e) => e.stage);
+    expect(stages.filter((s) => s === 'update')).toHaveLength(2);
+    expect(stages).toContain('bmu');
+    expect(stages[stages.length - 1]).toBe('assign_labels');
+  });
+
+  it('covers the spectral pipeline and its nested k-means', async () => {
+    const events = record();
+    const sc = new SpectralClustering({ n_clusters: 3, random_state: 0 });
+    await sc.fit(X);
+    sc.dispose();
+
+    expect(ends(events, 'SpectralClustering').map((e) => e.stage)).toEqual([
+      'affinity',
+      'laplacian',
+      'eigensolve',
+      'assign_labels',
+    ]);
+    expect(ends(events, 'KMeans').map((e) => e.stage)).toContain('update');
+  });
+
+  it('reports seeding and update for each cosine restart', async () => {
+    const events = record();
+    const km = new KMeans({
+      n_clusters: 3,
+      metric: 'cosine',
+      n_init: 2,
+      random_state: 0,
+    });
+    await km.fit(X);
+    km.dispose();
+
+    expect(ends(events, 'KMeans').map((e) => e.stage)).toEqual([
+      'distance',
+      'seeding',
+      'update',
+      'seeding',
+      'update',
+    ]);
+  });
+
+  it('stops and returns the previous listener', async () => {
+    const events: StageEvent[] = [];
+    const listener = (e: StageEvent) => events.push(e);
+    expect(Clustering.set_profiler(listener)).toBeNull();
+    expect(Clustering.set_profiler(null)).toBe(listener);
+    await new HDBSCAN({ min_cluster_size: 5 }).fit(X);
+    expect(events).toEqual([]);
+  });
+
+  it("restores the engine's reads when the listener is removed", async () => {
+    const engine = tf.engine();
+    const { read, readSync } = engine;
+    const events = record();
+    await new HDBSCAN({ min_cluster_size: 5 }).fit(X);
+    expect(engine.readSync).not.toBe(readSync);
+    expect(
+      ends(events, 'HDBSCAN').some((e) => e.readback_bytes > 0),
+    ).toBe(true);
+
+    Clustering.set_profiler(null);
+    expect(engine.read).toBe(read);
+    expect(engine.readSync).toBe(readSync);
+  });
+
+  it('ends a stage that throws', () => {
+    const events = record();
+    expect(() =>
+      profile_stage('KMeans', 'update', () => {
+        throw new Error('boom');
+      }),
+    ).toThrow('boom');
+    expect(events.map((e) => e.phase)).toEqual(['begin', 'end']);
+  });
+});
+
+describe('Clustering.to_chrome_trace', () => {
+  it('emits a complete event per stage, a track per estimator', async () => {
+    const events = record();
+    await new HDBSCAN({ min_cluster_size: 5 }).fit(X);
+    await new SOM({ grid_width: 2, grid_height: 2, num_epochs: 1 }).fit(X);
+
+    const trace = Clustering.to_chrome_trace(events);
+    expect(trace.displayTimeUnit).toBe('ms');
+    expect(trace.traceEvents).toHaveLength(
+      events.filter((e) => e.phase === 'end').length,
+    );
+    const [first] = trace.traceEvents;
+    const source = ends(events, 'HDBSCAN')[0];
+    expect(first).toMatchObject({
+      name: 'distance',
+      cat: 'HDBSCAN',
+      ph: 'X',
+      pid: 1,
+      tid: 1,
+      dur: Math.round(source.duration_ms * 1000),
+      args: { new_tensors: 1, readback_bytes: source.readback_bytes },
+    });
+    const som_tracks = trace.traceEvents
+      .filter((e) => e.cat === 'SOM')
+      .map((e) => e.tid);
+    expect(new Set(som_tracks)).toEqual(new Set([2]));
+    expect(JSON.parse(JSON.stringify(trace))).toEqual(trace);
+  });
+});
@@ -0,0 +1,260 @@
+import * as tf from '../backend/adapter';
+
+/**
+ * Stage-level cost hooks. Estimators wrap their named stages in
+ * {@link profile_stage}; while a listener is set (`Clustering.set_profiler`)
+ * each stage emits a `'begin'` and an `'end'` event carrying its cost. With
+ * no listener a stage costs one null check.
+ *
+ * Costs are inclusive: a stage nested in another (SOM's `'bmu'` inside
+ * `'update'`) is counted in both. On asynchronous backends (webgl, webgpu)
+ * kernels run lazily, so device time is charged to the stage that reads the
+ * result back rather than to the one that dispatched it.
+ */
+
+export type ProfileStage =
+  | 'seeding'
+  | 'distance'
+  | 'core_distances'
+  | 'mst'
+  | 'condense'
+  | 'linkage'
+  | 'affinity'
+  | 'laplacian'
+  | 'eigensolve'
+  | 'assign_labels'
+  | 'bmu'
+  | 'update';
+
+export interface StageCost {
+  duration_ms: number;
+  /** Change in live tensors (`tf.memory().numTensors`) over the stage. */
+  new_tensors: number;
+  /** Change in live tensor bytes (`tf.memory().numBytes`) over the stage. */
+  new_bytes: number;
+  /** Bytes the stage read back from the backend into JS. */
+  readback_bytes: number;
+  /** Change in JS heap use; null where the runtime does not report it. */
+  heap_delta_bytes: number | null;
+}
+
+interface StageEventBase {
+  estimator: string;
+  stage: ProfileStage;
+  /** Pairs a stage's `'begin'` and `'end'` events. */
+  span_id: number;
+  /** Milliseconds on the `performance.now()` clock. */
+  time_ms: number;
+}
+
+export type StageEvent =
+  | (StageEventBase & { phase: 'begin' })
+  | (StageEventBase & { phase: 'end' } & StageCost);
+
+export type ProfilerListener = (event: StageEvent) => void;
+
+export interface ChromeTraceEvent {
+  name: ProfileStage;
+  cat: string;
+  ph: 'X';
+  /** Start, in microseconds. */
+  ts: number;
+  dur: number;
+  pid: number;
+  tid: number;
+  args: Omit<StageCost, 'duration_ms'>;
+}
+
+interface Span {
+  estimator: string;
+  stage: ProfileStage;
+  id: number;
+  start_ms: number;
+  tensors: number;
+  bytes: number;
+  heap: number | null;
+  readback_bytes: number;
+}
+
+let listener: ProfilerListener | null = null;
+let next_span_id = 1;
+const open_spans = new Set<Span>();
+
+type Engine = ReturnType<typeof tf.engine>;
+
+/** The engine whose reads are wrapped, with its original methods. */
+let counted: {
+  engine: Engine;
+  read: Engine['read'];
+  read_sync: Engine['readSync'];
+} | null = null;
+
+function now_ms(): number {
+  return typeof performance !== 'undefined' ? performance.now() : Date.now();
+}
+
+function heap_used(): number | null {
+  if (typeof process !== 'undefined' && process.memoryUsage) {
+    return process.memoryUsage().heapUsed;
+  }
+  // Chromium-only, and coarse.
+  const memory = (
+    globalThis as { performance?: { memory?: { usedJSHeapSize: number } } }
+  ).performance?.memory;
+  return memory ? memory.usedJSHeapSize : null;
+}
+
+/**
+ * Installs `next` (or removes the listener); returns the previous one.
+ * Removing it also restores the engine's own `read` / `readSync`.
+ */
+export function set_profiler(
+  next: ProfilerListener | null,
+): ProfilerListener | null {
+  const previous = listener;
+  listener = next;
+  open_spans.clear();
+  if (next === null) restore_readbacks();
+  return previous;
+}
+
+function begin(estimator: string, stage: ProfileStage): Span {
+  count_readbacks();
+  const { numTensors, numBytes } = tf.memory();
+  const span: Span = {
+    estimator,
+    stage,
+    id: next_span_id++,
+    start_ms: now_ms(),
+    tensors: numTensors,
+    bytes: numBytes,
+    heap: heap_used(),
+    readback_bytes: 0,
+  };
+  open_spans.add(span);
+  listener?.({
+    phase: 'begin',
+    estimator,
+    stage,
+    span_id: span.id,
+    time_ms: span.start_ms,
+  });
+  return span;
+}
+
+function end(span: Span): void {
+  // A listener swapped mid-stage drops the span instead of reporting it.
+  if (!open_spans.delete(span)) return;
+  const time_ms = now_ms();
+  const { numTensors, numBytes } = tf.memory();
+  const heap = heap_used();
+  listener?.({
+    phase: 'end',
+    estimator: span.estimator,
+    stage: span.stage,
+    span_id: span.id,
+    time_ms,
+    duration_ms: time_ms - span.start_ms,
+    new_tensors: numTensors - span.tensors,
+    new_bytes: numBytes - span.bytes,
+    readback_bytes: span.readback_bytes,
+    heap_delta_bytes:
+      heap === null || span.heap === null ? null : heap - span.heap,
+  });
+}
+
+/**
+ * Runs `fn` as `stage` of `estimator`. A returned promise ends the stage
+ * when it settles; a throw ends it too and is rethrown.
+ */
+export function profile_stage<T>(
+  estimator: string,
+  stage: ProfileStage,
+  fn: () => T,
+): T {
+  if (listener === null) return fn();
+  const span = begin(estimator, stage);
+  let result: T;
+  try {
+    result = fn();
+  } catch (err) {
+    end(span);
+    throw err;
+  }
+  if (result instanceof Promise) {
+    return result.finally(() => end(span)) as T;
+  }
+  end(span);
+  return result;
+}
+
+function record_readback(values: unknown): void {
+  const bytes = ArrayBuffer.isView(values) ? values.byteLength : 0;
+  for (const span of open_spans) span.readback_bytes += bytes;
+}
+
+/**
+ * Every `data()`, `dataSync()`, `array()` and `arraySync()` goes through the
+ * engine's `read` / `readSync`, so wrapping those while a listener is set
+ * charges each readback to the open stages. Concurrent fits share the open
+ * stages and are charged for each other's readbacks.
+ */
+function count_readbacks(): void {
+  const engine = tf.engine();
+  if (counted?.engine === engine) return;
+  restore_readbacks();
+  const { read, readSync: read_sync } = engine;
+  counted = { engine, read, read_sync };
+  engine.read = async (data_id) => {
+    const values = await read.call(engine, data_id);
+    record_readback(values);
+    return values;
+  };
+  engine.readSync = (data_id) => {
+    const values = read_sync.call(engine, data_id);
+    record_readback(values);
+    return values;
+  };
+}
+
+function restore_readbacks(): void {
+  if (counted === null) return;
+  counted.engine.read = counted.read;
+  counted.engine.readSync = counted.read_sync;
+  counted = null;
+}
+
+/**
+ * Chrome trace-event JSON (load it in `chrome://tracing` or Perfetto) from
+ * recorded `'end'` events; `'begin'` events are ignored. Each estimator
+ * gets its own track.
+ */
+export function to_chrome_trace(events: StageEvent[]): {
+  traceEvents: ChromeTraceEvent[];
+  displayTimeUnit: 'ms';
+} {
+  const tracks = new Map<string, number>();
+  const trace_events: ChromeTraceEvent[] = [];
+  for (const event of events) {
+    if (event.phase !== 'end') continue;
+    if (!tracks.has(event.estimator)) {
+      tracks.set(event.estimator, tracks.size + 1);
+    }
+    trace_events.push({
+      name: event.stage,
+      cat: event.estimator,
+      ph: 'X',
+      ts: Math.round((event.time_ms - event.duration_ms) * 1000),
+      dur: Math.round(event.duration_ms * 1000),
+      pid: 1,
+      tid: tracks.get(event.estimator)!,
+      args: {
+        new_tensors: event.new_tensors,
+        new_bytes: event.new_bytes,
+        readback_bytes: event.readback_bytes,
+        heap_delta_bytes: event.heap_delta_bytes,
+      },
+    });
+  }
+  return { traceEvents: trace_events, displayTimeUnit: 'ms' };
+}
@@ -501,6 +501,81 @@ describe('SOM (online mini-batch — production path properties)', () => {
 
       batch.dispose();
     });
+
+    it('Train from an async stream in fixed-size batches', async () => {
+      const som = new SOM({
+        grid_width: 3,
+        grid_height: 3,
+        random_state: 42,
+      });
+      async function* source() {
+        for (let i = 0; i < 10; i++) {
+          yield [
+            [i % 3, 0],
+            [0, i % 2],
+            [1, 1],
+          ];
+        }
+        yield new Float32Array([0.5, 0.5, 2, 2]);
+      }
+
+      const reported: number[] = [];
+      const before = tf.memory().numTensors;
+      const stats = await som.fit_stream(source(), {
+        batch_size: 8,
+        stats_interval: 2,
+        on_stats: (s) => reported.push(s.total_samples),
+      });
+
+      // 32 rows → four batches of 8.
+      expect(stats.total_samples).toBe(32);
+      expect(reported).toEqual([16, 32]);
+      expect(som.params.online_mode).toBe(true);
+      expect(som.labels_).toHaveLength(8);
+      expect(som.quantization_error()).toBeGreaterThanOrEqual(0);
+      // Weights, grid distances and bmus_ are the only tensors kept.
+      expect(tf.memory().numTensors).toBe(before + 3);
+      som.dispose();
+    });
+
+    it('Stop the stream on a feature mismatch without leaking', async () => {
+      const som = new SOM({ grid_width: 2, grid_height: 2, random_state: 0 });
+      async function* source() {
+        yield [
+          [0, 0],
+          [1, 1],
+        ];
+        yield [[1, 2, 3]];
+      }
+      const before = tf.memory().numTensors;
+      await expect(
+        som.fit_stream(source(), { batch_size: 2 }),
+      ).rejects.toThrow('Feature dimension mismatch');
+      som.dispose();
+      expect(tf.memory().numTensors).toBe(before);
+    });
+
+    it('Surface a training error while the next batch is still pending', async () => {
+      const som = new SOM({ grid_width: 2, grid_height: 2, random_state: 0 });
+      async function* source() {
+        yield [
+          [0, 0],
+          [1, 1],
+        ];
+        await new Promise<never>(() => undefined);
+      }
+      const before = tf.memory().numTensors;
+      await expect(
+        som.fit_stream(source(), {
+          batch_size: 2,
+          on_stats: () => {
+            throw new Error('stats sink failed');
+          },
+        }),
+      ).rejects.toThrow('stats sink failed');
+      som.dispose();
+      expect(tf.memory().numTensors).toBe(before);
+    });
   });
 
   describe('Model persistence', () => {
@@ -652,6 +727,34 @@ describe('SOM (online mini-batch — production path properties)', () => {
       // Should have cleaned up most tensors (allowing small tolerance)
       expect(final_memory).toBeLessThanOrEqual(initial_memory + 4);
     });
+
+    it('Does not accumulate tensors across partial_fit calls', async () => {
+      const som = new SOM({
+        grid_width: 3,
+        grid_height: 3,
+        online_mode: true,
+        mini_batch_size: 2,
+        random_state: 0,
+      });
+      const batch = [
+        [0, 0],
+        [1, 1],
+        [2, 0],
+        [0, 2],
+        [3, 3],
+      ];
+
+      await som.partial_fit(batch);
+      const after_first = tf.memory().numTensors;
+      for (let i = 0; i < 3; i++) {
+        await som.partial_fit(batch);
+      }
+
+      expect(tf.memory().numTensors).toBe(after_first);
+      expect(som.labels_).toHaveLength(batch.length);
+      expect(som.bmus_!.shape).toEqual([batch.length, 2]);
+      som.dispose();
+    });
   });
 
   describe('Correctness properties', () => {
@@ -2,26 +2,50 @@ import * as tf from '../backend/adapter';
 import type {
   BaseClustering,
   DataMatrix,
+  FitPredictOptions,
   SOMParams,
   SOMState,
   SOMTopology,
   SOMNeighborhood,
   SOMInitialization,
+  SOMTrainingMode,
   SOMClusterOptions,
+  SOMStreamChunk,
+  SOMStreamOptions,
+  SOMStreamingStats,
+  SOMLiveStats,
   DecayFunction,
 } from './types';
 import { AgglomerativeClustering } from './agglomerative';
 import { is_tensor } from '../tensor/tensor_guards';
+import { format_labels, to_tensor2d } from '../tensor/data_matrix';
 import { make_random_stream, type RandomStream } from '../random';
 import {
   initialize_weights,
-  find_bmu_batch,
+  find_bmu_indices,
   compute_neighborhood_influence_batch,
   create_grid_distance_matrix,
-  compute_bmu_distances,
+  compute_bmu_index_distances,
   create_decay_scheduler,
   validate_neighborhood_params,
 } from './som_neighborhood';
+import { coalesce_stream_rows } from './som_stream';
+import {
+  choose_memory_path,
+  som_memory_paths,
+  plan_for_fit,
+  type MemoryBudget,
+  type MemoryPlan,
+  type MemoryPlannable,
+} from './memory_plan';
+import { profile_stage } from './profiler';
+
+/** Per-epoch sums kept on-device; per-neuron ones only with `live_stats`. */
+interface EpochAccumulator {
+  error_sum: tf.Scalar;
+  hits: tf.Tensor1D | null;
+  error_sums: tf.Tensor1D | null;
+}
 
 /**
  * Self-Organizing Map (SOM) implementation using TensorFlow.js.
@@ -29,13 +53,16 @@ import {
  * SOMs create a low-dimensional (typically 2D) discrete representation
  * of high-dimensional input space while preserving topological properties.
  */
-export class SOM implements BaseClustering<SOMParams> {
+export class SOM implements BaseClustering<SOMParams>, MemoryPlannable {
   public readonly params: SOMParams;
 
   public weights_: tf.Tensor3D | null = null;
   public labels_: number[] | null = null;
   public bmus_: tf.Tensor2D | null = null;
 
+  /** SOM has only the dense path; a plan makes `fit` fail fast. */
+  public memory_plan_: MemoryPlan | null = null;
+
   private grid_distance_matrix_: tf.Tensor2D | null = null;
   private learning_rate_scheduler_: DecayFunction | null = null;
   private radius_scheduler_: DecayFunction | null = null;
@@ -43,6 +70,18 @@ export class SOM implements BaseClustering<SOMParams> {
   private last_batch_size_: number = 0;
   private current_epoch_: number = 0;
   private quantization_errors_: number[] = [];
+  private streaming_mode_: boolean = false;
+
+  // Live statistics (`live_stats: true`). Hits and error sums are running
+  // per-neuron totals; the U-matrix is cached against `live_snapshot_`, the
+  // weights it was last computed from (mirrored on the host in
+  // `live_weights_`).
+  private live_hits_: Float64Array | null = null;
+  private live_error_sums_: Float64Array | null = null;
+  private live_samples_seen_: number = 0;
+  private live_snapshot_: tf.Tensor2D | null = null;
+  private live_weights_: Float32Array | null = null;
+  private live_u_matrix_: Float64Array | null = null;
 
   private static readonly DEFAULT_TOPOLOGY: SOMTopology = 'rectangular';
   private static readonly DEFAULT_NEIGHBORHOOD: SOMNeighborhood = 'gaussian';
@@ -51,6 +90,11 @@ export class SOM implements BaseClustering<SOMParams> {
   private static readonly DEFAULT_INITIALIZATION: SOMInitialization = 'random';
   private static readonly DEFAULT_TOL = 1e-4;
   private static readonly DEFAULT_MINI_BATCH_SIZE = 32;
+  private static readonly DEFAULT_STATS_INTERVAL = 100;
+  private static readonly DEFAULT_LIVE_STATS_TOL = 1e-4;
+  private static readonly DEFAULT_TRAINING_MODE: SOMTrainingMode = 'mini_batch';
+  /** Rows per `[rows, neurons]` influence block in batch mode. */
+  private static readonly BATCH_MODE_CHUNK_SIZE = 4096;
   
   constructor(params: SOMParams) {
     this.params = this.validate_and_complete_params(params);
@@ -64,6 +108,24 @@ export class SOM implements BaseClustering<SOMParams> {
     if (!params.grid_height || params.grid_height < 1) {
       throw new Error('grid_height must be >= 1');
     }
+    if (
+      params.training_mode !== undefined &&
+      params.training_mode !== 'mini_batch' &&
+      params.training_mode !== 'batch'
+    ) {
+      throw new Error(
+        `Invalid training_mode '${params.training_mode}'. Must be 'mini_batch' or 'batch'.`
+      );
+    }
+    if (params.training_mode === 'batch' && params.online_mode) {
+      throw new Error("training_mode 'batch' cannot be combined with online_mode");
+    }
+    if (
+      params.live_stats_tol !== undefined &&
+      !(params.live_stats_tol >= 0)
+    ) {
+      throw new Error('live_stats_tol must be >= 0');
+    }
     if (params.initial_weights) {
       this.validate_initial_weights_shape(params.initial_weights, params.grid_height, params.grid_width);
     }
@@ -77,6 +139,9 @@ export class SOM implements BaseClustering<SOMParams> {
       initialization: params.initialization ?? SOM.DEFAULT_INITIALIZATION,
       tol: params.tol ?? SOM.DEFAULT_TOL,
       mini_batch_size: params.mini_batch_size ?? SOM.DEFAULT_MINI_BATCH_SIZE,
+      training_mode: params.training_mode ?? SOM.DEFAULT_TRAINING_MODE,
+      live_stats: params.live_stats ?? false,
+      live_stats_tol: params.live_stats_tol ?? SOM.DEFAULT_LIVE_STATS_TOL,
       online_mode: params.online_mode ?? false,
     };
   }
@@ -165,8 +230,18 @@ export class SOM implements BaseClustering<SOMParams> {
     }
   }
   
+  plan_memory(shape: [number, number], budget: MemoryBudget): MemoryPlan {
+    return choose_memory_path(
+      'SOM',
+      shape,
+      budget,
+      som_memory_paths(this.params, shape),
+    );
+  }
+
   async fit(X: DataMatrix): Promise<void> {
-    const x_tensor = is_tensor(X) ? X as tf.Tensor2D : tf.tensor2d(X);
+    plan_for_fit(this, X);
+    const x_tensor = to_tensor2d(X);
     
     try {
       await this.fit_tensor(x_tensor);
@@ -188,6 +263,8 @@ export class SOM implements BaseClustering<SOMParams> {
     } = this.params;
     
     const [n_samples, n_features] = X.shape;
+    this.reset_live_stats();
+    this.clear_live_u_matrix();
 
     if (!this.weights_) {
       this.weights_ = this.make_initial_weights(X, n_features);
@@ -213,19 +290,25 @@ export class SOM implements BaseClustering<SOMParams> {
 
       validate_neighborhood_params(current_radius, grid_height, grid_width);
 
-      // Shuffle data each epoch to avoid order-dependent bias
-      const shuffled_indices = this.shuffle_indices(n_samples, rng);
-      const indices_tensor = tf.tensor1d(shuffled_indices, 'int32');
-      const shuffled_x = tf.gather(X, indices_tensor) as tf.Tensor2D;
-      indices_tensor.dispose();
+      let quantization_error: number;
+      if (this.params.training_mode === 'batch') {
+        // The batch update is a sum over all samples, so order is irrelevant.
+        ({ quantization_error } = await profile_stage('SOM', 'update', () =>
+          this.train_batch_epoch(X, current_radius)
+        ));
+      } else {
+        // Shuffle data each epoch to avoid order-dependent bias
+        const shuffled_indices = this.shuffle_indices(n_samples, rng);
+        const indices_tensor = tf.tensor1d(shuffled_indices, 'int32');
+        const shuffled_x = tf.gather(X, indices_tensor) as tf.Tensor2D;
+        indices_tensor.dispose();
 
-      const { quantization_error } = await this.train_epoch(
-        shuffled_x,
-        current_learning_rate,
-        current_radius
-      );
+        ({ quantization_error } = await profile_stage('SOM', 'update', () =>
+          this.train_epoch(shuffled_x, current_learning_rate, current_radius)
+        ));
 
-      shuffled_x.dispose();
+        shuffled_x.dispose();
+      }
 
       this.quantization_errors_.push(quantization_error);
 
@@ -240,7 +323,9 @@ export class SOM implements BaseClustering<SOMParams> {
       }
     }
     
-    await this.compute_final_labels(X);
+    await profile_stage('SOM', 'assign_labels', () =>
+      this.compute_final_labels(X)
+    );
   }
 
   private async train_epoch(
@@ -251,51 +336,205 @@ export class SOM implements BaseClustering<SOMParams> {
     const { neighborhood, mini_batch_size } = this.params;
     const [n_samples] = X.shape;
     
-    // Process in mini-batches for memory efficiency
+    // Process in mini-batches for memory efficiency. BMUs, influence and the
+    // error sum stay on-device; the error is read back once per epoch.
     const batch_size = Math.min(mini_batch_size!, n_samples);
-    let total_quantization_error = 0;
-    let samples_processed = 0;
-    
+    const accumulator = this.start_epoch_accumulator();
+
     for (let i = 0; i < n_samples; i += batch_size) {
       const end_idx = Math.min(i + batch_size, n_samples);
       const batch_x = X.slice([i, 0], [end_idx - i, -1]);
-      
-      const bmus = find_bmu_batch(batch_x, this.weights_!);
 
-      const bmu_indices = tf.tidy(() => {
-        const bmus_data = bmus.arraySync();
-        const indices = bmus_data.map(([row, col]) => 
-          row * this.params.grid_width + col
-        );
-        return tf.tensor1d(indices, 'int32');
-      });
-      
+      const bmu_indices = profile_stage('SOM', 'bmu', () =>
+        find_bmu_indices(batch_x, this.weights_!)
+      );
+
       const influence = compute_neighborhood_influence_batch(
         bmu_indices,
         this.grid_distance_matrix_!,
         radius,
         neighborhood!
       );
-      
+
       this.update_weights(batch_x, influence, learning_rate);
 
-      const distances = compute_bmu_distances(batch_x, this.weights_!, bmus);
-      const batch_error = distances.mean().arraySync() as number;
-      total_quantization_error += batch_error * (end_idx - i);
-      samples_processed += (end_idx - i);
-      
+      const distances = compute_bmu_index_distances(
+        batch_x,
+        this.weights_!,
+        bmu_indices
+      );
+      this.accumulate_epoch(accumulator, bmu_indices, distances);
+
       batch_x.dispose();
-      bmus.dispose();
       bmu_indices.dispose();
       influence.dispose();
       distances.dispose();
     }
-    
+
     return {
-      quantization_error: total_quantization_error / samples_processed
+      quantization_error: await this.finish_epoch(accumulator, n_samples)
     };
   }
   
+  /**
+   * One Kohonen batch-SOM epoch: BMUs are taken against the weights at the
+   * start of the epoch, then every neuron becomes
+   * `w_j = Σ_i h_ij x_i / Σ_i h_ij`. Numerator and denominator are summed
+   * over row chunks so the `[n_samples, neurons]` influence matrix is never
+   * materialized. Neurons with no net influence keep their weight.
+   */
+  private async train_batch_epoch(
+    X: tf.Tensor2D,
+    radius: number
+  ): Promise<{ quantization_error: number }> {
+    const { neighborhood } = this.params;
+    const [n_samples, n_features] = X.shape;
+    const [grid_height, grid_width] = this.weights_!.shape;
+    const total_neurons = grid_height * grid_width;
+    const chunk_size = Math.min(SOM.BATCH_MODE_CHUNK_SIZE, n_samples);
+
+    let numerator = tf.zeros([total_neurons, n_features]) as tf.Tensor2D;
+    let denominator = tf.zeros([total_neurons]) as tf.Tensor1D;
+    const accumulator = this.start_epoch_accumulator();
+
+    for (let i = 0; i < n_samples; i += chunk_size) {
+      const end_idx = Math.min(i + chunk_size, n_samples);
+      const chunk_x = X.slice([i, 0], [end_idx - i, -1]);
+      const bmu_indices = profile_stage('SOM', 'bmu', () =>
+        find_bmu_indices(chunk_x, this.weights_!)
+      );
+      const influence = compute_neighborhood_influence_batch(
+        bmu_indices,
+        this.grid_distance_matrix_!,
+        radius,
+        neighborhood!
+      );
+
+      const [next_numerator, next_denominator] = tf.tidy(() => [
+        numerator.add(tf.mat_mul(influence, chunk_x, true, false)),
+        denominator.add(influence.sum(0)),
+      ]) as [tf.Tensor2D, tf.Tensor1D];
+      numerator.dispose();
+      denominator.dispose();
+      numerator = next_numerator;
+      denominator = next_denominator;
+
+      const distances = compute_bmu_index_distances(
+        chunk_x,
+        this.weights_!,
+        bmu_indices
+      );
+      this.accumulate_epoch(accumulator, bmu_indices, distances);
+
+      chunk_x.dispose();
+      bmu_indices.dispose();
+      influence.dispose();
+      distances.dispose();
+    }
+
+    const new_weights = tf.tidy(() => {
+      const weights_flat = this.weights_!.reshape([total_neurons, n_features]);
+      const epsilon = 1e-8;
+      const has_influence = denominator.abs().greater(epsilon);
+      const safe_denominator = tf.where(
+        has_influence,
+        denominator,
+        tf.ones_like(denominator)
+      );
+      const means = numerator.div(safe_denominator.expandDims(1));
+      return tf
+        .where(has_influence.reshape([total_neurons, 1]), means, weights_flat)
+        .reshape([grid_height, grid_width, n_features]) as tf.Tensor3D;
+    });
+    numerator.dispose();
+    denominator.dispose();
+    this.weights_!.dispose();
+    this.weights_ = new_weights;
+
+    return {
+      quantization_error: await this.finish_epoch(accumulator, n_samples)
+    };
+  }
+
+  private start_epoch_accumulator(): EpochAccumulator {
+    if (!this.params.live_stats) {
+      return { error_sum: tf.scalar(0), hits: null, error_sums: null };
+    }
+    const { grid_height, grid_width } = this.params;
+    return {
+      error_sum: tf.scalar(0),
+      hits: tf.zeros([grid_height * grid_width]) as tf.Tensor1D,
+      error_sums: tf.zeros([grid_height * grid_width]) as tf.Tensor1D,
+    };
+  }
+
+  /** Adds one batch's sample-to-BMU distances to the on-device sums. */
+  private accumulate_epoch(
+    accumulator: EpochAccumulator,
+    bmu_indices: tf.Tensor1D,
+    distances: tf.Tensor1D
+  ): void {
+    const next_error_sum = tf.tidy(() =>
+      accumulator.error_sum.add(distances.sum())
+    ) as tf.Scalar;
+    accumulator.error_sum.dispose();
+    accumulator.error_sum = next_error_sum;
+
+    if (accumulator.hits && accumulator.error_sums) {
+      const total_neurons = accumulator.hits.shape[0];
+      const [hits, error_sums] = tf.tidy(() => [
+        accumulator.hits!.add(
+          tf.unsorted_segment_sum(
+            tf.ones_like(distances),
+            bmu_indices,
+            total_neurons
+          )
+        ),
+        accumulator.error_sums!.add(
+          tf.unsorted_segment_sum(distances, bmu_indices, total_neurons)
+        ),
+      ]) as [tf.Tensor1D, tf.Tensor1D];
+      accumulator.hits.dispose();
+      accumulator.error_sums.dispose();
+      accumulator.hits = hits;
+      accumulator.error_sums = error_sums;
+    }
+  }
+
+  /**
+   * Reads the epoch's sums back in one transfer, folds the per-neuron ones
+   * into the live statistics, and returns the mean quantization error.
+   */
+  private async finish_epoch(
+    accumulator: EpochAccumulator,
+    n_samples: number
+  ): Promise<number> {
+    const { error_sum, hits, error_sums } = accumulator;
+    const packed =
+      hits && error_sums
+        ? tf.tidy(() => tf.concat([error_sum.reshape([1]), hits, error_sums]))
+        : error_sum;
+    const data = await packed.data();
+    packed.dispose();
+    error_sum.dispose();
+    hits?.dispose();
+    error_sums?.dispose();
+
+    if (hits) {
+      const total_neurons = hits.shape[0];
+      if (!this.live_hits_ || !this.live_error_sums_) {
+        this.live_hits_ = new Float64Array(total_neurons);
+        this.live_error_sums_ = new Float64Array(total_neurons);
+      }
+      for (let j = 0; j < total_neurons; j++) {
+        this.live_hits_[j] += data[1 + j];
+        this.live_error_sums_[j] += data[1 + total_neurons + j];
+      }
+      this.live_samples_seen_ += n_samples;
+    }
+    return data[0] / n_samples;
+  }
+
   private update_weights(
     samples: tf.Tensor2D,
     influence: tf.Tensor2D,
@@ -311,19 +550,14 @@ export class SOM implements BaseClustering<SOMParams> {
       // Batch SOM update for each neuron j:
       // Δw_j = lr * Σ_i(h_ij * (x_i - w_j)) / Σ_i(h_ij)
       // Normalizes by sum of influences to make updates independent of batch size
-
-      const samples_expanded = samples.expandDims(1); // [n_samples, 1, n_features]
-      const weights_expanded = weights_flat.expandDims(0); // [1, total_neurons, n_features]
-
-      const diff = samples_expanded.sub(weights_expanded); // [n_samples, total_neurons, n_features]
-
-      const influence_expanded = influence.expandDims(2); // [n_samples, total_neurons, 1]
-      const weighted_diff = diff.mul(influence_expanded);
-
-      const total_update = weighted_diff.sum(0); // [total_neurons, n_features]
+      // Σ_i h_ij (x_i - w_j) = (Hᵀ X)_j - (Σ_i h_ij) w_j, so one matMul
+      // replaces the [n_samples, total_neurons, n_features] difference tensor.
+      const influence_sum = influence.sum(0); // [total_neurons]
+      const total_update = tf
+        .mat_mul(influence, samples, true, false)
+        .sub(weights_flat.mul(influence_sum.expandDims(1))); // [total_neurons, n_features]
 
       // Normalize by sum of influences per neuron (sign-preserving for mexican_hat)
-      const influence_sum = influence.sum(0); // [total_neurons]
       const epsilon = 1e-8;
       const abs_influence_sum = influence_sum.abs();
       const influence_sum_safe = tf.where(
@@ -344,19 +578,35 @@ export class SOM implements BaseClustering<SOMParams> {
   }
   
   private async compute_final_labels(X: tf.Tensor2D): Promise<void> {
-    this.bmus_ = find_bmu_batch(X, this.weights_!);
+    const bmu_indices = find_bmu_indices(X, this.weights_!);
+    const grid_width = this.params.grid_width;
+    this.bmus_?.dispose();
+    this.bmus_ = tf.tidy(() =>
+      tf.stack(
+        [bmu_indices.div(grid_width).floor(), bmu_indices.mod(grid_width)],
+        1
+      )
+    ) as tf.Tensor2D;
 
-    const bmus_data = await this.bmus_.array();
-    const labels = bmus_data.map(([row, col]) => 
-      row * this.params.grid_width + col
-    );
-    
-    this.labels_ = labels;
+    const labels_data = await bmu_indices.data();
+    bmu_indices.dispose();
+    this.labels_ = Array.from(labels_data);
   }
   
-  async fit_predict(X: DataMatrix): Promise<number[]> {
+  fit_predict(
+    X: DataMatrix,
+    options?: FitPredictOptions & { int32_labels?: false },
+  ): Promise<number[]>;
+  fit_predict(
+    X: DataMatrix,
+    options: FitPredictOptions & { int32_labels: true },
+  ): Promise<Int32Array>;
+  async fit_predict(
+    X: DataMatrix,
+    options?: FitPredictOptions,
+  ): Promise<number[] | Int32Array> {
     await this.fit(X);
-    return this.labels_!;
+    return format_labels(this.labels_!, options);
   }
   
   async predict(X: DataMatrix): Promise<number[]> {
@@ -364,15 +614,12 @@ export class SOM implements BaseClustering<SOMParams> {
       throw new Error('SOM must be fitted before prediction');
     }
     
-    const x_tensor = is_tensor(X) ? X as tf.Tensor2D : tf.tensor2d(X);
+    const x_tensor = to_tensor2d(X);
     
     try {
-      const bmus = find_bmu_batch(x_tensor, this.weights_);
-      const bmus_data = await bmus.array();
-      const labels = bmus_data.map(([row, col]) => 
-        row * this.params.grid_width + col
-      );
-      bmus.dispose();
+      const bmu_indices = find_bmu_indices(x_tensor, this.weights_);
+      const labels = Array.from(await bmu_indices.data());
+      bmu_indices.dispose();
       return labels;
     } finally {
       if (!is_tensor(X)) {
@@ -462,54 +709,72 @@ export class SOM implements BaseClustering<SOMParams> {
       throw new Error('partial_fit requires online_mode to be enabled');
     }
     
-    const x_tensor = is_tensor(X) ? X as tf.Tensor2D : tf.tensor2d(X);
+    const x_tensor = to_tensor2d(X);
     
     try {
-      const [n_samples] = x_tensor.shape;
-      this.last_batch_size_ = n_samples;
+      await this.partial_fit_tensor(x_tensor, true);
+    } finally {
+      if (!is_tensor(X)) {
+        x_tensor.dispose();
+      }
+    }
+  }
 
-      if (!this.weights_) {
-        this.weights_ = this.make_initial_weights(x_tensor, x_tensor.shape[1]);
+  /** One online step on `x_tensor`; returns its quantization error. */
+  private async partial_fit_tensor(
+    x_tensor: tf.Tensor2D,
+    update_labels: boolean
+  ): Promise<number> {
+    const [n_samples] = x_tensor.shape;
+    this.last_batch_size_ = n_samples;
 
-        this.grid_distance_matrix_ = create_grid_distance_matrix(
-          this.params.grid_height,
-          this.params.grid_width,
-          this.params.topology!
-        );
+    if (!this.weights_) {
+      this.weights_ = this.make_initial_weights(x_tensor, x_tensor.shape[1]);
+
+      this.grid_distance_matrix_ = create_grid_distance_matrix(
+        this.params.grid_height,
+        this.params.grid_width,
+        this.params.topology!
+      );
 
+      // Keep the slower-decaying schedulers from enable_streaming_mode.
+      if (!this.streaming_mode_) {
         this.initialize_schedulers();
-      } else {
-        const expected_features = this.weights_.shape[2];
-        const actual_features = x_tensor.shape[1];
-        if (actual_features !== expected_features) {
-          throw new Error(
-            `Feature dimension mismatch: expected ${expected_features} features to match prior fit, but got ${actual_features}`
-          );
-        }
       }
+    } else {
+      const expected_features = this.weights_.shape[2];
+      const actual_features = x_tensor.shape[1];
+      if (actual_features !== expected_features) {
+        throw new Error(
+          `Feature dimension mismatch: expected ${expected_features} features to match prior fit, but got ${actual_features}`
+        );
+      }
+    }
 
-      const virtual_epoch = Math.floor(
-        this.total_samples_learned_ / n_samples
-      );
-      const current_learning_rate = this.learning_rate_scheduler_!(
-        virtual_epoch,
-        this.params.num_epochs!
-      );
-      const current_radius = this.radius_scheduler_!(
-        virtual_epoch,
-        this.params.num_epochs!
-      );
-      
-      await this.train_epoch(x_tensor, current_learning_rate, current_radius);
+    const virtual_epoch = Math.floor(
+      this.total_samples_learned_ / n_samples
+    );
+    const current_learning_rate = this.learning_rate_scheduler_!(
+      virtual_epoch,
+      this.params.num_epochs!
+    );
+    const current_radius = this.radius_scheduler_!(
+      virtual_epoch,
+      this.params.num_epochs!
+    );
+    
+    const { quantization_error } = await this.train_epoch(
+      x_tensor,
+      current_learning_rate,
+      current_radius
+    );
 
-      this.total_samples_learned_ += n_samples;
+    this.total_samples_learned_ += n_samples;
 
+    if (update_labels) {
       await this.compute_final_labels(x_tensor);
-    } finally {
-      if (!is_tensor(X)) {
-        x_tensor.dispose();
-      }
     }
+    return quantization_error;
   }
   
   /**
@@ -528,67 +793,189 @@ export class SOM implements BaseClustering<SOMParams> {
     return this.weights_.arraySync();
   }
   
+  /**
+   * With `live_stats`, only neurons that moved by more than `live_stats_tol`
+   * since the last call (and their grid neighbours) are recomputed.
+   */
   get_u_matrix(): tf.Tensor2D {
     if (!this.weights_) {
       throw new Error('SOM must be fitted first');
     }
-    
-    return tf.tidy(() => {
-      const { grid_height, grid_width, topology } = this.params;
-      const u_matrix = tf.buffer([grid_height, grid_width]);
-      const weights_data = this.weights_!.arraySync();
-      
-      for (let i = 0; i < grid_height; i++) {
-        for (let j = 0; j < grid_width; j++) {
-          const current_weight = weights_data[i][j];
-          let total_distance = 0;
-          let neighbor_count = 0;
-          
-          let neighbors: number[][];
-          
-          if (topology === 'rectangular') {
-            neighbors = [
-              [i - 1, j], [i + 1, j],
-              [i, j - 1], [i, j + 1],
-              [i - 1, j - 1], [i - 1, j + 1],
-              [i + 1, j - 1], [i + 1, j + 1]
-            ];
-          } else {
-            const even_row = i % 2 === 0;
-            neighbors = even_row ? [
-              [i - 1, j - 1], [i - 1, j],  // Top-left, top-right
-              [i, j - 1], [i, j + 1],      // Left, right
-              [i + 1, j - 1], [i + 1, j]   // Bottom-left, bottom-right
-            ] : [
-              [i - 1, j], [i - 1, j + 1],  // Top-left, top-right
-              [i, j - 1], [i, j + 1],      // Left, right
-              [i + 1, j], [i + 1, j + 1]   // Bottom-left, bottom-right
-            ];
-          }
-          
-          for (const [ni, nj] of neighbors) {
-            if (ni >= 0 && ni < grid_height && nj >= 0 && nj < grid_width) {
-              const neighbor_weight = weights_data[ni][nj];
-              const distance = Math.sqrt(
-                current_weight.reduce((sum, val, idx) => 
-                  sum + Math.pow(val - neighbor_weight[idx], 2), 0
-                )
-              );
-              total_distance += distance;
-              neighbor_count++;
-            }
-          }
-          
-          u_matrix.set(
-            neighbor_count > 0 ? total_distance / neighbor_count : 0,
-            i,
-            j
-          );
+    const { grid_height, grid_width } = this.params;
+
+    if (this.params.live_stats) {
+      return tf.tensor2d(this.refresh_live_u_matrix(), [grid_height, grid_width]);
+    }
+
+    const n_features = this.weights_.shape[2];
+    const weights_data = this.weights_.dataSync() as Float32Array;
+    const u_matrix = new Float32Array(grid_height * grid_width);
+    for (let index = 0; index < u_matrix.length; index++) {
+      u_matrix[index] = this.u_matrix_entry(weights_data, n_features, index);
+    }
+    return tf.tensor2d(u_matrix, [grid_height, grid_width]);
+  }
+
+  /** In-bounds grid neighbours of a neuron, as flat indices. */
+  private u_matrix_neighbors(index: number): number[] {
+    const { grid_height, grid_width, topology } = this.params;
+    const i = Math.floor(index / grid_width);
+    const j = index % grid_width;
+
+    let neighbors: number[][];
+    if (topology === 'rectangular') {
+      neighbors = [
+        [i - 1, j], [i + 1, j],
+        [i, j - 1], [i, j + 1],
+        [i - 1, j - 1], [i - 1, j + 1],
+        [i + 1, j - 1], [i + 1, j + 1]
+      ];
+    } else {
+      const even_row = i % 2 === 0;
+      neighbors = even_row ? [
+        [i - 1, j - 1], [i - 1, j],  // Top-left, top-right
+        [i, j - 1], [i, j + 1],      // Left, right
+        [i + 1, j - 1], [i + 1, j]   // Bottom-left, bottom-right
+      ] : [
+        [i - 1, j], [i - 1, j + 1],  // Top-left, top-right
+        [i, j - 1], [i, j + 1],      // Left, right
+        [i + 1, j], [i + 1, j + 1]   // Bottom-left, bottom-right
+      ];
+    }
+
+    return neighbors
+      .filter(([ni, nj]) => ni >= 0 && ni < grid_height && nj >= 0 && nj < grid_width)
+      .map(([ni, nj]) => ni * grid_width + nj);
+  }
+
+  /** Mean distance from a neuron to its grid neighbours. */
+  private u_matrix_entry(
+    weights: Float32Array,
+    n_features: number,
+    index: number
+  ): number {
+    const neighbors = this.u_matrix_neighbors(index);
+    let total_distance = 0;
+    for (const neighbor of neighbors) {
+      let sum = 0;
+      for (let f = 0; f < n_features; f++) {
+        const d = weights[index * n_features + f] - weights[neighbor * n_features + f];
+        sum += d * d;
+      }
+      total_distance += Math.sqrt(sum);
+    }
+    return neighbors.length > 0 ? total_distance / neighbors.length : 0;
+  }
+
+  /**
+   * Brings the cached U-matrix up to date. Only a per-neuron "moved" mask and
+   * the rows of moved neurons are read back; the snapshot itself is updated
+   * on-device.
+   */
+  private refresh_live_u_matrix(): Float64Array {
+    const [grid_height, grid_width, n_features] = this.weights_!.shape;
+    const total_neurons = grid_height * grid_width;
+    const weights_flat = this.weights_!.reshape([total_neurons, n_features]);
+
+    if (!this.live_snapshot_ || !this.live_weights_ || !this.live_u_matrix_) {
+      this.live_snapshot_?.dispose();
+      this.live_snapshot_ = tf.clone(weights_flat) as tf.Tensor2D;
+      weights_flat.dispose();
+      this.live_weights_ = Float32Array.from(this.live_snapshot_.dataSync());
+      this.live_u_matrix_ = new Float64Array(total_neurons);
+      for (let index = 0; index < total_neurons; index++) {
+        this.live_u_matrix_[index] = this.u_matrix_entry(
+          this.live_weights_,
+          n_features,
+          index
+        );
+      }
+      return this.live_u_matrix_;
+    }
+
+    const tol = this.params.live_stats_tol!;
+    const snapshot = this.live_snapshot_;
+    const moved = tf.tidy(() =>
+      weights_flat.sub(snapshot).abs().max(1).greater(tol)
+    );
+    const moved_data = moved.dataSync();
+    const changed: number[] = [];
+    for (let index = 0; index < total_neurons; index++) {
+      if (moved_data[index]) changed.push(index);
+    }
+
+    if (changed.length > 0) {
+      const changed_indices = tf.tensor1d(changed, 'int32');
+      const rows = tf.gather(weights_flat, changed_indices);
+      const rows_data = rows.dataSync();
+      this.live_snapshot_ = tf.tidy(() =>
+        tf.where(moved.reshape([total_neurons, 1]), weights_flat, snapshot)
+      ) as tf.Tensor2D;
+      snapshot.dispose();
+      changed_indices.dispose();
+      rows.dispose();
+
+      const affected = new Set<number>();
+      changed.forEach((index, k) => {
+        this.live_weights_!.set(
+          rows_data.subarray(k * n_features, (k + 1) * n_features),
+          index * n_features
+        );
+        affected.add(index);
+        for (const neighbor of this.u_matrix_neighbors(index)) {
+          affected.add(neighbor);
         }
+      });
+      for (const index of affected) {
+        this.live_u_matrix_[index] = this.u_matrix_entry(
+          this.live_weights_,
+          n_features,
+          index
+        );
       }
-      
-      return u_matrix.toTensor() as tf.Tensor2D;
-    });
+    }
+
+    moved.dispose();
+    weights_flat.dispose();
+    return this.live_u_matrix_;
+  }
+
+  /**
+   * Running per-neuron totals over every sample trained on since the last
+   * `fit()` or {@link reset_live_stats}; a sample counts once per epoch it is
+   * trained in. Costs O(neurons) regardless of how much data was seen.
+   *
+   * @throws Error if the SOM was not constructed with `live_stats: true`.
+   */
+  get_live_stats(): SOMLiveStats {
+    if (!this.params.live_stats) {
+      throw new Error('Live statistics are disabled; construct the SOM with live_stats: true');
+    }
+    const { grid_height, grid_width } = this.params;
+    const to_grid = (values: Float64Array | null) =>
+      Array.from({ length: grid_height }, (_, row) =>
+        Array.from({ length: grid_width }, (_, col) =>
+          values ? values[row * grid_width + col] : 0
+        )
+      );
+    return {
+      hit_counts: to_grid(this.live_hits_),
+      error_sums: to_grid(this.live_error_sums_),
+      samples_seen: this.live_samples_seen_,
+    };
+  }
+
+  reset_live_stats(): void {
+    this.live_hits_ = null;
+    this.live_error_sums_ = null;
+    this.live_samples_seen_ = 0;
+  }
+
+  private clear_live_u_matrix(): void {
+    this.live_snapshot_?.dispose();
+    this.live_snapshot_ = null;
+    this.live_weights_ = null;
+    this.live_u_matrix_ = null;
   }
   
   quantization_error(): number {
@@ -607,7 +994,7 @@ export class SOM implements BaseClustering<SOMParams> {
       throw new Error('Input data required for topographic error calculation');
     }
 
-    const x_tensor = is_tensor(X) ? X as tf.Tensor2D : tf.tensor2d(X);
+    const x_tensor = to_tensor2d(X);
 
     try {
       const { grid_width, grid_height, topology } = this.params;
@@ -721,6 +1108,8 @@ export class SOM implements BaseClustering<SOMParams> {
   
   load_state(state: SOMState): void {
     this.weights_?.dispose();
+    this.reset_live_stats();
+    this.clear_live_u_matrix();
     this.weights_ = tf.tensor3d(state.weights);
     this.total_samples_learned_ = state.total_samples;
     this.current_epoch_ = state.current_epoch;
@@ -753,6 +1142,8 @@ export class SOM implements BaseClustering<SOMParams> {
     const model_data = JSON.parse(json);
 
     this.weights_?.dispose();
+    this.reset_live_stats();
+    this.clear_live_u_matrix();
 
     this.weights_ = tf.tensor3d(model_data.weights);
 
@@ -788,6 +1179,7 @@ export class SOM implements BaseClustering<SOMParams> {
       writable: false,
       configurable: true,
     });
+    this.streaming_mode_ = true;
     
     // Use slower decay for streaming: avoids catastrophic forgetting on long streams.
     const { grid_width, grid_height } = this.params;
@@ -815,7 +1207,7 @@ export class SOM implements BaseClustering<SOMParams> {
       this.enable_streaming_mode();
     }
     
-    const x_tensor = is_tensor(sample) ? sample as tf.Tensor2D : tf.tensor2d(sample);
+    const x_tensor = to_tensor2d(sample);
     
     try {
       if (auto_train) {
@@ -833,13 +1225,98 @@ export class SOM implements BaseClustering<SOMParams> {
     }
   }
   
-  get_streaming_stats(): {
-    total_samples: number;
-    virtual_epoch: number;
-    current_learning_rate: number;
-    current_radius: number;
-    latest_quantization_error: number;
-  } {
+  /**
+   * Trains on an unbounded async stream with flat memory. Incoming rows are
+   * coalesced into `batch_size` mini-batches, and the next batch is pulled
+   * from `source` while the current one trains. Streaming mode (and its
+   * schedulers) is enabled if `online_mode` is off.
+   *
+   * `quantization_error()` reports the most recent batch, and `labels_` /
+   * `bmus_` describe the final batch. Resolves with the stats after the
+   * source is exhausted.
+   *
+   * @throws Error if a chunk's feature count differs from the stream's.
+   */
+  async fit_stream(
+    source: AsyncIterable<SOMStreamChunk>,
+    options: SOMStreamOptions = {}
+  ): Promise<SOMStreamingStats> {
+    const stats_interval = options.stats_interval ?? SOM.DEFAULT_STATS_INTERVAL;
+    if (!Number.isInteger(stats_interval) || stats_interval < 1) {
+      throw new Error('stats_interval must be a positive integer.');
+    }
+    if (
+      options.batch_size !== undefined &&
+      (!Number.isInteger(options.batch_size) || options.batch_size < 1)
+    ) {
+      throw new Error('batch_size must be a positive integer.');
+    }
+    if (this.params.training_mode === 'batch') {
+      throw new Error("fit_stream cannot be used with training_mode 'batch'");
+    }
+
+    if (!this.params.online_mode) {
+      this.enable_streaming_mode(options.batch_size);
+    }
+    const batch_size = options.batch_size ?? this.params.mini_batch_size!;
+    const n_features =
+      this.weights_?.shape[2] ??
+      this.params.initial_weights?.[0][0].length ??
+      options.n_features;
+
+    const batches = coalesce_stream_rows(source, batch_size, n_features);
+    let last_batch: tf.Tensor2D | null = null;
+    let batches_trained = 0;
+    let completed = false;
+
+    try {
+      let pending = batches.next();
+      for (;;) {
+        const result = await pending;
+        if (result.done) break;
+
+        // Start filling the next batch before training on this one.
+        pending = batches.next();
+        pending.catch(() => undefined);
+
+        const { data, rows, n_features: width } = result.value;
+        const x_tensor = tf.tensor2d(data, [rows, width]);
+        try {
+          this.quantization_errors_ = [
+            await this.partial_fit_tensor(x_tensor, false),
+          ];
+        } catch (error) {
+          x_tensor.dispose();
+          throw error;
+        }
+        last_batch?.dispose();
+        last_batch = x_tensor;
+
+        batches_trained++;
+        if (options.on_stats && batches_trained % stats_interval === 0) {
+          options.on_stats(this.get_streaming_stats());
+        }
+      }
+
+      if (last_batch) {
+        await this.compute_final_labels(last_batch);
+      }
+      completed = true;
+    } finally {
+      last_batch?.dispose();
+      if (completed) {
+        await batches.return(undefined);
+      } else {
+        // return() queues behind the prefetched next(), which may never
+        // settle on a stalled source; don't let it hold back the error.
+        batches.return(undefined).catch(() => undefined);
+      }
+    }
+
+    return this.get_streaming_stats();
+  }
+  
+  get_streaming_stats(): SOMStreamingStats {
     const batch_size = this.last_batch_size_ || this.params.mini_batch_size || 1;
     const virtual_epoch = Math.floor(this.total_samples_learned_ / batch_size);
     
@@ -895,5 +1372,7 @@ export class SOM implements BaseClustering<SOMParams> {
     this.bmus_?.dispose();
     this.bmus_ = null;
     this.labels_ = null;
+    this.reset_live_stats();
+    this.clear_live_u_matrix();
   }
 }
\ No newline at end of file
@@ -0,0 +1,211 @@
+/**
+ * Kohonen batch-SOM (`training_mode: 'batch'`) tests.
+ *
+ * Exactness of one epoch is checked against a float64 transcription of the
+ * update; multi-epoch parity uses the fixtures written by
+ * `tools/sklearn_fixtures/generate_som.py --batch-out-dir` when present.
+ */
+import * as fs from 'fs';
+import * as path from 'path';
+import * as tf from '../backend/adapter';
+import { SOM } from './som';
+
+interface BatchFixture {
+  name: string;
+  X: number[][];
+  params: { grid_width: number; grid_height: number; num_epochs: number };
+  radius_schedule: number[];
+  initial_weights: number[][][];
+  weights: number[][][];
+  labels: number[];
+  quantization_errors: number[];
+}
+
+const X = [
+  [0, 0],
+  [0.5, 0.2],
+  [4, 4],
+  [4.2, 3.9],
+  [8, 0],
+  [7.8, 0.4],
+];
+
+const INITIAL_WEIGHTS = [
+  [
+    [1, 1],
+    [3, 1],
+  ],
+  [
+    [1, 3],
+    [3, 3],
+  ],
+];
+
+/** One batch epoch in float64: w_j = Σ_i h_ij x_i / Σ_i h_ij. */
+function reference_epoch(
+  data: number[][],
+  weights: number[][][],
+  radius: number,
+): number[][][] {
+  const grid_height = weights.length;
+  const grid_width = weights[0].length;
+  const neurons = weights.flat();
+  const numerator = neurons.map((w) => w.map(() => 0));
+  const denominator = neurons.map(() => 0);
+
+  for (const x of data) {
+    let bmu = 0;
+    let best = Infinity;
+    neurons.forEach((w, j) => {
+      const d = w.reduce((sum, v, f) => sum + (x[f] - v) ** 2, 0);
+      if (d < best) {
+        best = d;
+        bmu = j;
+      }
+    });
+    const br = Math.floor(bmu / grid_width);
+    const bc = bmu % grid_width;
+    neurons.forEach((_, j) => {
+      const r = Math.floor(j / grid_width);
+      const c = j % grid_width;
+      const h = Math.exp(-((r - br) ** 2 + (c - bc) ** 2) / (2 * radius ** 2));
+      denominator[j] += h;
+      x.forEach((v, f) => (numerator[j][f] += h * v));
+    });
+  }
+
+  return Array.from({ length: grid_height }, (_, r) =>
+    Array.from({ length: grid_width }, (_, c) => {
+      const j = r * grid_width + c;
+      return numerator[j].map((v) => v / denominator[j]);
+    }),
+  );
+}
+
+function max_abs_diff(a: number[][][], b: number[][][]): number {
+  const fb = b.flat(2);
+  return Math.max(...a.flat(2).map((v, i) => Math.abs(v - fb[i])));
+}
+
+describe("SOM training_mode 'batch'", () => {
+  it('sets each neuron to the neighbourhood-weighted sample mean', async () => {
+    const som = new SOM({
+      grid_width: 2,
+      grid_height: 2,
+      training_mode: 'batch',
+      num_epochs: 1,
+      radius: 1,
+      initial_weights: INITIAL_WEIGHTS,
+    });
+    await som.fit(X);
+
+    const expected = reference_epoch(X, INITIAL_WEIGHTS, 1);
+    expect(max_abs_diff(som.get_weights(), expected)).toBeLessThan(1e-5);
+    som.dispose();
+  });
+
+  it('ignores learning_rate and sample order', async () => {
+    const fit = async (data: number[][], learning_rate: number) => {
+      const som = new SOM({
+        grid_width: 2,
+        grid_height: 2,
+        training_mode: 'batch',
+        num_epochs: 5,
+        tol: 0,
+        learning_rate,
+        initial_weights: INITIAL_WEIGHTS,
+      });
+      await som.fit(data);
+      const weights = som.get_weights();
+      som.dispose();
+      return weights;
+    };
+
+    const base = await fit(X, 0.5);
+    expect(max_abs_diff(await fit([...X].reverse(), 0.01), base)).toBeLessThan(
+      1e-5,
+    );
+  });
+
+  it('converges and does not leak tensors', async () => {
+    const som = new SOM({
+      grid_width: 3,
+      grid_height: 3,
+      training_mode: 'batch',
+      num_epochs: 20,
+      random_state: 0,
+    });
+    const before = tf.memory().numTensors;
+    await som.fit(X);
+    expect(som.labels_).toHaveLength(X.length);
+    expect(som.quantization_error()).toBeLessThan(1);
+    som.dispose();
+    expect(tf.memory().numTensors).toBe(before);
+  });
+
+  it('validates training_mode', () => {
+    expect(
+      () =>
+        new SOM({
+          grid_width: 2,
+          grid_height: 2,
+          training_mode: 'sequential' as 'batch',
+        }),
+    ).toThrow("Invalid training_mode 'sequential'");
+    expect(
+      () =>
+        new SOM({
+          grid_width: 2,
+          grid_height: 2,
+          training_mode: 'batch',
+          online_mode: true,
+        }),
+    ).toThrow('cannot be combined with online_mode');
+  });
+});
+
+const fixtures_dir = path.join(process.cwd(), '__fixtures__', 'som_batch');
+const fixtures: BatchFixture[] = fs.existsSync(fixtures_dir)
+  ? fs
+      .readdirSync(fixtures_dir)
+      .filter((f) => f.endsWith('.json'))
+      .map((file) =>
+        JSON.parse(fs.readFileSync(path.join(fixtures_dir, file), 'utf8')),
+      )
+  : [];
+
+// float32 tensors against a float64 reference.
+const WEIGHT_TOL = 1e-4;
+
+describe('batch SOM reference fixtures', () => {
+  it('has committed fixtures (see generate_som.py)', () => {
+    expect(fixtures.length).toBeGreaterThan(0);
+  });
+
+  for (const fixture of fixtures) {
+    it(fixture.name, async () => {
+      const som = new SOM({
+        grid_width: fixture.params.grid_width,
+        grid_height: fixture.params.grid_height,
+        topology: 'rectangular',
+        neighborhood: 'gaussian',
+        training_mode: 'batch',
+        num_epochs: fixture.params.num_epochs,
+        radius: (epoch) => fixture.radius_schedule[epoch],
+        tol: 0,
+        initial_weights: fixture.initial_weights,
+      });
+      await som.fit(fixture.X);
+
+      expect(max_abs_diff(som.get_weights(), fixture.weights)).toBeLessThan(
+        WEIGHT_TOL,
+      );
+      expect(som.labels_).toEqual(fixture.labels);
+      expect(som.quantization_error()).toBeCloseTo(
+        fixture.quantization_errors[fixture.quantization_errors.length - 1],
+        4,
+      );
+      som.dispose();
+    });
+  }
+});
@@ -8,7 +8,9 @@ import {
   get_grid_coordinates,
   find_bmu,
   find_bmu_batch,
+  find_bmu_indices,
   compute_bmu_distances,
+  compute_bmu_index_distances,
   gaussian_neighborhood,
   bubble_neighborhood,
   mexican_hat_neighborhood,
@@ -128,6 +130,22 @@ describe("BMU search", () => {
     weights.dispose();
   });
 
+  it("find_bmu_indices returns flat int32 indices on-device", () => {
+    const weights = make_weights();
+    const samples = tf.tensor2d([
+      [0, 1],
+      [9, 1],
+      [1, 9],
+      [9, 11],
+    ]);
+    const indices = find_bmu_indices(samples, weights);
+    expect(indices.dtype).toBe("int32");
+    expect(Array.from(indices.dataSync())).toEqual([0, 2, 1, 3]);
+    indices.dispose();
+    samples.dispose();
+    weights.dispose();
+  });
+
   it("compute_bmu_distances returns the sample-to-BMU distance", () => {
     const weights = make_weights();
     const samples = tf.tensor2d([
@@ -147,6 +165,25 @@ describe("BMU search", () => {
     samples.dispose();
     bmus.dispose();
   });
+
+  it("compute_bmu_index_distances agrees with the [row, col] variant", () => {
+    const weights = make_weights();
+    const samples = tf.tensor2d([
+      [1, 2],
+      [13, 10],
+      [-4, 7],
+    ]);
+    const bmus = find_bmu_batch(samples, weights);
+    const indices = find_bmu_indices(samples, weights);
+    const from_pairs = compute_bmu_distances(samples, weights, bmus);
+    const from_indices = compute_bmu_index_distances(samples, weights, indices);
+    const a = Array.from(from_pairs.dataSync());
+    const b = Array.from(from_indices.dataSync());
+    a.forEach((v, i) => expect(b[i]).toBeCloseTo(v, 6));
+    [weights, samples, bmus, indices, from_pairs, from_indices].forEach((t) =>
+      t.dispose()
+    );
+  });
 });
 
 describe("neighborhood functions", () => {
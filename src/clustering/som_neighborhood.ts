@@ -338,62 +338,70 @@ export function find_bmu(
   });
 }
 
-export function find_bmu_batch(
+/**
+ * Flat (row-major) BMU index per sample as int32, without leaving the device.
+ * `||x||²` is constant per row, so the argMin only needs the neuron norms
+ * (computed once for the batch) and one matMul.
+ */
+export function find_bmu_indices(
   samples: tf.Tensor2D,
   weights: tf.Tensor3D
-): tf.Tensor2D {
+): tf.Tensor1D {
   return tf.tidy(() => {
-    const [_n_samples, n_features] = samples.shape;
-    const [grid_height, grid_width, _n_features_weight] = weights.shape;
-    const total_neurons = grid_height * grid_width;
-
-    const weights_flat = weights.reshape([total_neurons, n_features]);
-
-    // ||x - w||^2 = ||x||^2 + ||w||^2 - 2 * x . w
-    const samples_norm = samples.square().sum(1, true);
-    const weights_norm = weights_flat.square().sum(1, true).transpose();
+    const [grid_height, grid_width, n_features] = weights.shape;
+    const weights_flat = weights.reshape([grid_height * grid_width, n_features]);
 
+    // argmin_j ||x - w_j||^2 = argmin_j (||w_j||^2 - 2 * x . w_j)
+    const weights_norm = weights_flat.square().sum(1).expandDims(0);
     const dot_product = tf.mat_mul(samples, weights_flat, false, true);
 
-    const distances = samples_norm.add(weights_norm).sub(dot_product.mul(2));
-
-    const bmu_indices = distances.argMin(1);
+    return weights_norm.sub(dot_product.mul(2)).argMin(1) as tf.Tensor1D;
+  });
+}
 
+export function find_bmu_batch(
+  samples: tf.Tensor2D,
+  weights: tf.Tensor3D
+): tf.Tensor2D {
+  const grid_width = weights.shape[1];
+  const bmu_indices = find_bmu_indices(samples, weights);
+  return tf.tidy(() => {
     const rows = bmu_indices.div(grid_width).floor();
     const cols = bmu_indices.mod(grid_width);
-    
+    bmu_indices.dispose();
     return tf.stack([rows, cols], 1) as tf.Tensor2D;
   });
 }
 
-export function compute_bmu_distances(
+/** Sample-to-BMU distances for flat BMU indices from {@link find_bmu_indices}. */
+export function compute_bmu_index_distances(
   samples: tf.Tensor2D,
   weights: tf.Tensor3D,
-  bmus: tf.Tensor2D
+  bmu_indices: tf.Tensor1D
 ): tf.Tensor1D {
-  // Get data outside tf.tidy to avoid disposal issues
-  const [_n_samples, _n_features] = samples.shape;
-  const [grid_height, grid_width, _n_features_weight] = weights.shape;
-  const bmus_array = bmus.arraySync();
-  
   return tf.tidy(() => {
-    const weights_flat = weights.reshape([grid_height * grid_width, _n_features]);
+    const [grid_height, grid_width, n_features] = weights.shape;
+    const weights_flat = weights.reshape([grid_height * grid_width, n_features]);
+    const bmu_weights = tf.gather(weights_flat, bmu_indices);
 
-    const bmu_indices: number[] = [];
-    
-    for (let i = 0; i < _n_samples; i++) {
-      const row = bmus_array[i][0];
-      const col = bmus_array[i][1];
-      bmu_indices.push(row * grid_width + col);
-    }
-    
-    const bmu_indices_tensor = tf.tensor1d(bmu_indices, 'int32');
-    const bmu_weights = tf.gather(weights_flat, bmu_indices_tensor);
+    return samples.sub(bmu_weights).square().sum(1).sqrt() as tf.Tensor1D;
+  });
+}
 
-    const diff = samples.sub(bmu_weights);
-    const distances = diff.square().sum(1).sqrt();
-    
-    return distances as tf.Tensor1D;
+export function compute_bmu_distances(
+  samples: tf.Tensor2D,
+  weights: tf.Tensor3D,
+  bmus: tf.Tensor2D
+): tf.Tensor1D {
+  const grid_width = weights.shape[1];
+  return tf.tidy(() => {
+    const rows = bmus.slice([0, 0], [-1, 1]);
+    const cols = bmus.slice([0, 1], [-1, 1]);
+    const bmu_indices = tf.cast(
+      rows.mul(grid_width).add(cols).reshape([-1]),
+      'int32'
+    ) as tf.Tensor1D;
+    return compute_bmu_index_distances(samples, weights, bmu_indices);
   });
 }
 
@@ -0,0 +1,64 @@
+import { coalesce_stream_rows } from './som_stream';
+import type { SOMStreamChunk } from './types';
+
+async function* from_chunks(chunks: SOMStreamChunk[]) {
+  for (const chunk of chunks) yield chunk;
+}
+
+async function collect(
+  chunks: SOMStreamChunk[],
+  batch_size: number,
+  n_features?: number,
+): Promise<number[][]> {
+  const batches: number[][] = [];
+  for await (const batch of coalesce_stream_rows(
+    from_chunks(chunks),
+    batch_size,
+    n_features,
+  )) {
+    expect(batch.data.length).toBe(batch.rows * batch.n_features);
+    batches.push(Array.from(batch.data));
+  }
+  return batches;
+}
+
+describe('coalesce_stream_rows', () => {
+  it('regroups mixed chunks into fixed-size batches', async () => {
+    const batches = await collect(
+      [
+        [
+          [1, 2],
+          [3, 4],
+          [5, 6],
+        ],
+        new Float32Array([7, 8, 9, 10]),
+        [[11, 12]],
+        new Float32Array([13, 14]),
+      ],
+      3,
+    );
+    expect(batches).toEqual([
+      [1, 2, 3, 4, 5, 6],
+      [7, 8, 9, 10, 11, 12],
+      [13, 14],
+    ]);
+  });
+
+  it('splits flat Float32Array blocks once n_features is known', async () => {
+    const batches = await collect([new Float32Array([1, 2, 3, 4, 5, 6])], 2, 3);
+    expect(batches).toEqual([[1, 2, 3, 4, 5, 6]]);
+
+    await expect(collect([new Float32Array([1, 2])], 2)).rejects.toThrow(
+      'n_features',
+    );
+    await expect(collect([new Float32Array([1, 2, 3])], 2, 2)).rejects.toThrow(
+      'not a multiple of n_features',
+    );
+  });
+
+  it('rejects rows of the wrong width', async () => {
+    await expect(collect([[[1, 2], [3]]], 4)).rejects.toThrow(
+      'Feature dimension mismatch',
+    );
+  });
+});
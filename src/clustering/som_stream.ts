@@ -0,0 +1,85 @@
+import type { SOMStreamChunk } from './types';
+
+/**
+ * Row coalescing for `SOM.fit_stream`: turns an async stream of arbitrarily
+ * sized chunks into fixed-size float32 mini-batches. Each yielded batch owns
+ * a fresh buffer, so the consumer can keep training on it while the next one
+ * is being filled; at most two batches are alive at once.
+ */
+
+export interface StreamBatch {
+  /** Row-major `rows × n_features` values. */
+  data: Float32Array;
+  rows: number;
+  n_features: number;
+}
+
+/**
+ * `number[][]` chunks carry their own row width; a `Float32Array` is a flat
+ * row-major block (a single sample when its length equals `n_features`), so
+ * the width must already be known when one arrives. The final batch may be
+ * shorter than `batch_size`.
+ */
+export async function* coalesce_stream_rows(
+  source: AsyncIterable<SOMStreamChunk>,
+  batch_size: number,
+  n_features?: number,
+): AsyncGenerator<StreamBatch, void, undefined> {
+  let width = n_features ?? 0;
+  let buffer: Float32Array | null = null;
+  let filled = 0;
+
+  for await (const chunk of source) {
+    let values: ArrayLike<number>[];
+    if (chunk instanceof Float32Array) {
+      if (width === 0) {
+        throw new Error(
+          'fit_stream cannot split a Float32Array chunk before n_features is known; pass n_features or start the stream with number[][] rows.',
+        );
+      }
+      if (chunk.length % width !== 0) {
+        throw new Error(
+          `Float32Array chunk length ${chunk.length} is not a multiple of n_features (${width}).`,
+        );
+      }
+      values = [];
+      for (let offset = 0; offset < chunk.length; offset += width) {
+        values.push(chunk.subarray(offset, offset + width));
+      }
+    } else {
+      values = chunk;
+    }
+
+    for (const row of values) {
+      if (width === 0) {
+        if (row.length === 0) {
+          throw new Error('fit_stream rows must have at least one feature.');
+        }
+        width = row.length;
+      }
+      if (row.length !== width) {
+        throw new Error(
+          `Feature dimension mismatch: expected ${width} features, but got ${row.length}`,
+        );
+      }
+      if (buffer === null) {
+        buffer = new Float32Array(batch_size * width);
+      }
+      buffer.set(row, filled * width);
+      filled++;
+      if (filled === batch_size) {
+        yield { data: buffer, rows: filled, n_features: width };
+        buffer = null;
+        filled = 0;
+      }
+    }
+  }
+
+  if (buffer !== null && filled > 0) {
+    yield {
+      data: buffer.subarray(0, filled * width),
+      rows: filled,
+      n_features: width,
+    };
+  }
+}
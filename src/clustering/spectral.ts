@@ -1,5 +1,6 @@
 import type {
   DataMatrix,
+  FitPredictOptions,
   SpectralClusteringParams,
   BaseClustering,
 } from './types';
@@ -16,8 +17,18 @@ import {
   sparse_to_dense_tensor,
 } from '../graph/sparse';
 import { is_tensor } from '../tensor/tensor_guards';
+import { format_labels, to_tensor2d } from '../tensor/data_matrix';
 import type { ClusterRepresentations } from './representations';
 import { select_medoids } from './medoid_selection';
+import {
+  choose_memory_path,
+  plan_for_fit,
+  spectral_memory_paths,
+  type MemoryBudget,
+  type MemoryPlan,
+  type MemoryPlannable,
+} from './memory_plan';
+import { profile_stage } from './profiler';
 
 export interface LaplacianResult {
   laplacian: tf.Tensor2D;
@@ -34,6 +45,15 @@ export interface EmbeddingResult {
   scaling_factors?: tf.Tensor1D;
 }
 
+/** Affinity graph shared by every embedding built from one fit. */
+interface SpectralGraph {
+  /** Set for `'nearest_neighbors'`; the dense affinity is `affinity_matrix_`. */
+  sparse_affinity: SparseMatrix | null;
+  num_components: number;
+  is_fully_connected: boolean;
+  component_labels: Int32Array;
+}
+
 export interface IntermediateSteps {
   affinity: tf.Tensor2D;
   laplacian: LaplacianResult;
@@ -69,7 +89,8 @@ export interface DebugInfo {
  *   1. Build the similarity graph (affinity matrix) — `'rbf'`,
  *      `'nearest_neighbors'`, `'cosine'`, `'precomputed'`, or a user callable.
  *   2. Form the normalised Laplacian and take its smallest eigenvectors.
- *   3. Row-normalise the embedding and cluster it with k-means.
+ *   3. Cluster the embedding with k-means, or assign labels in a single pass
+ *      with `assign_labels: 'cluster_qr'` or `'discretize'`.
  *
  * Precomputed and callable affinities are validated (square, symmetric,
  * non-negative). The estimator is transductive: it exposes no `predict` and no
@@ -80,7 +101,8 @@ export interface DebugInfo {
 export class SpectralClustering
   implements
     BaseClustering<SpectralClusteringParams>,
-    ClusterRepresentations
+    ClusterRepresentations,
+    MemoryPlannable
 {
   public readonly params: SpectralClusteringParams;
 
@@ -97,6 +119,12 @@ export class SpectralClustering
 
   public sparse_affinity_matrix_: SparseMatrix | null = null;
 
+  /**
+   * A plan with path `'approximate'` fits with the Nyström affinity; any
+   * plan lifts the `max_samples` default, since the budget bounds memory.
+   */
+  public memory_plan_: MemoryPlan | null = null;
+
   private debug_info_: DebugInfo | null = null;
 
   private capture_debug_info: boolean = false;
@@ -123,6 +151,12 @@ export class SpectralClustering
     'precomputed',
   ] as const;
 
+  private static readonly VALID_ASSIGN_LABELS = [
+    'kmeans',
+    'cluster_qr',
+    'discretize',
+  ] as const;
+
   constructor(params: SpectralClusteringParams) {
     const { capture_debug_info = false, ...clustering_params } = params;
 
@@ -138,28 +172,177 @@ export class SpectralClustering
    * assign_labels='discretize', not for the default k-means approach.
    */
   async fit(_X: DataMatrix): Promise<void> {
+    plan_for_fit(this, _X);
     this.dispose();
 
     if (this.capture_debug_info) {
       this.debug_info_ = {};
     }
 
-    const x_tensor: tf.Tensor2D =
-      is_tensor(_X)
-        ? (tf.cast(_X as tf.Tensor2D, 'float32') as tf.Tensor2D)
-        : tf.tensor2d(_X as number[][], undefined, 'float32');
-
+    const x_tensor = SpectralClustering.to_float_tensor(_X);
     const n_samples = x_tensor.shape[0];
     if (this.params.n_clusters > n_samples) {
       x_tensor.dispose();
       throw new Error('n_clusters cannot exceed number of samples.');
     }
 
+    let U: tf.Tensor2D;
+    try {
+      if (this.uses_nystrom()) {
+        U = await this.nystrom_embedding(x_tensor, this.params.n_clusters);
+      } else {
+        const graph = await profile_stage(
+          'SpectralClustering',
+          'affinity',
+          () => this.build_graph(x_tensor),
+        );
+        U =
+          !graph.is_fully_connected &&
+          graph.num_components >= this.params.n_clusters
+            ? await this.component_embedding(graph)
+            : await this.eigen_embedding(graph, this.params.n_clusters);
+      }
+    } catch (err) {
+      x_tensor.dispose();
+      throw err;
+    }
+
+    try {
+      await profile_stage('SpectralClustering', 'assign_labels', () =>
+        this.assign_labels_from_embedding(U, x_tensor),
+      );
+    } finally {
+      U.dispose();
+      x_tensor.dispose();
+    }
+  }
+
+  /**
+   * Labels for every cluster count in `k_values` from one affinity, one
+   * connectivity check and one eigensolve for the largest k. The leading
+   * eigenvectors are nested across k, so each k clusters the first k
+   * columns of the shared embedding; results match separate fits with
+   * `n_clusters: k`. `params.n_clusters` is ignored and `labels_` holds
+   * the labels of the last k.
+   *
+   * @throws {Error} If a k is not a positive integer or exceeds n_samples.
+   */
+  async fit_predict_sweep(
+    X: DataMatrix,
+    k_values: number[],
+  ): Promise<number[][]> {
+    plan_for_fit(this, X);
+    this.dispose();
+
+    if (this.capture_debug_info) {
+      this.debug_info_ = {};
+    }
+
+    const x_tensor = SpectralClustering.to_float_tensor(X);
+    const n_samples = x_tensor.shape[0];
+    for (const k of k_values) {
+      if (!Number.isInteger(k) || k < 1 || k > n_samples) {
+        x_tensor.dispose();
+        throw new Error(
+          `k_values must be positive integers not exceeding the number of samples (${n_samples}); got ${k}.`,
+        );
+      }
+    }
+
+    const owned: tf.Tensor2D[] = [];
+    const results: number[][] = [];
+    try {
+      if (k_values.length === 0) return results;
+
+      let shared: tf.Tensor2D | null = null;
+      let indicators: tf.Tensor2D | null = null;
+      let graph: SpectralGraph | null = null;
+      if (this.uses_nystrom()) {
+        shared = await this.nystrom_embedding(x_tensor, Math.max(...k_values));
+        owned.push(shared);
+      } else {
+        const built = await profile_stage(
+          'SpectralClustering',
+          'affinity',
+          () => this.build_graph(x_tensor),
+        );
+        graph = built;
+        const eigen_ks = k_values.filter(
+          (k) => built.is_fully_connected || built.num_components < k,
+        );
+        if (eigen_ks.length > 0) {
+          shared = await this.eigen_embedding(built, Math.max(...eigen_ks));
+          owned.push(shared);
+        }
+      }
+
+      for (const k of k_values) {
+        let U: tf.Tensor2D;
+        if (
+          graph != null &&
+          !graph.is_fully_connected &&
+          graph.num_components >= k
+        ) {
+          if (indicators == null) {
+            indicators = await this.component_embedding(graph);
+            owned.push(indicators);
+          }
+          U = indicators;
+        } else {
+          const width = Math.min(k, shared!.shape[1]);
+          U = tf.slice(shared!, [0, 0], [-1, width]) as tf.Tensor2D;
+          owned.push(U);
+        }
+        await profile_stage('SpectralClustering', 'assign_labels', () =>
+          this.assign_labels_from_embedding(U, x_tensor, k),
+        );
+        results.push(this.labels_!);
+      }
+      return results;
+    } finally {
+      for (const t of owned) t.dispose();
+      x_tensor.dispose();
+    }
+  }
+
+  plan_memory(shape: [number, number], budget: MemoryBudget): MemoryPlan {
+    return choose_memory_path(
+      'SpectralClustering',
+      shape,
+      budget,
+      spectral_memory_paths(
+        this.params,
+        shape,
+        SpectralClustering.default_neighbors(this.params, Math.max(shape[0], 1)),
+      ),
+    );
+  }
+
+  private uses_nystrom(): boolean {
+    return (
+      this.params.affinity_approximation === 'nystrom' ||
+      this.memory_plan_?.path === 'approximate'
+    );
+  }
+
+  private static to_float_tensor(X: DataMatrix): tf.Tensor2D {
+    return is_tensor(X)
+      ? (tf.cast(X as tf.Tensor2D, 'float32') as tf.Tensor2D)
+      : to_tensor2d(X);
+  }
+
+  /**
+   * Affinity (stored on the estimator) and its connected components. Throws
+   * when `max_samples` is exceeded or the affinity is all zeros.
+   */
+  private async build_graph(x_tensor: tf.Tensor2D): Promise<SpectralGraph> {
+    const n_samples = x_tensor.shape[0];
     const use_sparse_nearest_neighbors =
       this.params.affinity === 'nearest_neighbors';
-    const max_samples = this.params.max_samples ?? 10_000;
+    const max_samples =
+      this.params.max_samples ??
+      (this.memory_plan_ ? Number.POSITIVE_INFINITY : 10_000);
     if (!use_sparse_nearest_neighbors && n_samples > max_samples) {
-      x_tensor.dispose();
       throw new Error(
         `Input has ${n_samples} samples, which exceeds the maximum of ${max_samples} ` +
         `for spectral clustering. The algorithm requires O(n^2) memory for the affinity matrix. ` +
@@ -228,142 +411,188 @@ export class SpectralClustering
       );
     }
 
-    let U: tf.Tensor2D;
-
-    if (!is_fully_connected && num_components >= this.params.n_clusters) {
-      const { create_component_indicators } = await import(
-        '../graph/component_indicators'
-      );
+    return {
+      sparse_affinity,
+      num_components,
+      is_fully_connected,
+      component_labels,
+    };
+  }
 
-      U = create_component_indicators(
-        component_labels,
-        num_components,
-        // All components, not n_clusters: k-means then groups them into clusters.
-        num_components,
-      );
+  private async component_embedding(
+    graph: SpectralGraph,
+  ): Promise<tf.Tensor2D> {
+    const { num_components, component_labels } = graph;
+    const { create_component_indicators } = await import(
+      '../graph/component_indicators'
+    );
 
-      // Indicator columns are already unit-norm, so the D^{1/2} scaling the
-      // eigenvector path applies is intentionally skipped here.
+    const U = create_component_indicators(
+      component_labels,
+      num_components,
+      // All components, not n_clusters: k-means then groups them into clusters.
+      num_components,
+    );
 
-      if (this.capture_debug_info) {
-        // Constant per-component indicators are eigenvectors with eigenvalue 0.
-        this.debug_info_!.laplacian_spectrum = Array(num_components).fill(0);
+    // Indicator columns are already unit-norm, so the D^{1/2} scaling the
+    // eigenvector path applies is intentionally skipped here.
 
-        const emb_data = await U.data();
-        const [n, k] = U.shape;
-        const unique_values_per_dim: number[] = [];
+    if (this.capture_debug_info) {
+      // Constant per-component indicators are eigenvectors with eigenvalue 0.
+      this.debug_info_!.laplacian_spectrum = Array(num_components).fill(0);
 
-        for (let i = 0; i < k; i++) {
-          const col = emb_data.slice(i * n, (i + 1) * n);
-          const unique = new Set(col.map((v) => Math.round(v * 1e10) / 1e10));
-          unique_values_per_dim.push(unique.size);
-        }
+      const emb_data = await U.data();
+      const [n, k] = U.shape;
+      const unique_values_per_dim: number[] = [];
 
-        this.debug_info_!.embedding_stats = {
-          shape: U.shape,
-          unique_values_per_dim,
-          scaling_factors: Array(num_components).fill(1), // No scaling for component indicators
-        };
+      for (let i = 0; i < k; i++) {
+        const col = emb_data.slice(i * n, (i + 1) * n);
+        const unique = new Set(col.map((v) => Math.round(v * 1e10) / 1e10));
+        unique_values_per_dim.push(unique.size);
       }
-    } else {
-      const { smallest_eigenvectors_with_values } = await import(
-        '../eigen/smallest_eigenvectors_with_values'
-      );
 
-      const num_eigenvectors = Math.max(this.params.n_clusters, num_components);
-      let U_full: tf.Tensor2D;
-      let eigenvalues: tf.Tensor1D;
-      let sqrt_degrees_tensor: tf.Tensor1D | null = null;
+      this.debug_info_!.embedding_stats = {
+        shape: U.shape,
+        unique_values_per_dim,
+        scaling_factors: Array(num_components).fill(1), // No scaling for component indicators
+      };
+    }
+    return U;
+  }
 
-      if (sparse_affinity != null) {
-        const { sparse_normalised_laplacian_operator } = await import(
-          '../graph/laplacian'
-        );
-        const sparse_laplacian =
-          sparse_normalised_laplacian_operator(sparse_affinity);
-
-        if (this.capture_debug_info) {
-          const spectrum_k = Math.min(10, sparse_laplacian.operator.n);
-          const { eigenvalues: spec_evals, eigenvectors: spec_vecs } =
-            smallest_eigenvectors_with_values(
-              sparse_laplacian.operator,
-              spectrum_k,
-            );
-          const spec_data = await spec_evals.data();
-          this.debug_info_!.laplacian_spectrum = Array.from(spec_data);
-          spec_evals.dispose();
-          spec_vecs.dispose();
-        }
+  /** The `n_components` smallest Laplacian eigenvectors, divided by D^{1/2}. */
+  private async eigen_embedding(
+    graph: SpectralGraph,
+    n_components: number,
+  ): Promise<tf.Tensor2D> {
+    const { sparse_affinity, num_components } = graph;
+    const { smallest_eigenvectors_with_values } = await import(
+      '../eigen/smallest_eigenvectors_with_values'
+    );
 
-        const result = smallest_eigenvectors_with_values(
-          sparse_laplacian.operator,
-          num_eigenvectors,
-        );
-        U_full = result.eigenvectors;
-        eigenvalues = result.eigenvalues;
-        sqrt_degrees_tensor = tf.tensor1d(
-          Array.from(sparse_laplacian.sqrt_degrees),
-          'float32',
-        );
-      } else {
-        const { normalised_laplacian } = await import('../graph/laplacian');
-        const { laplacian, sqrt_degrees } = tf.tidy(() =>
-          normalised_laplacian(this.affinity_matrix_ as tf.Tensor2D, true),
-        );
+    const num_eigenvectors = Math.max(n_components, num_components);
+    let U_full: tf.Tensor2D;
+    let eigenvalues: tf.Tensor1D;
+    let sqrt_degrees_tensor: tf.Tensor1D | null = null;
 
-        if (this.capture_debug_info) {
-          const spectrum_k = Math.min(10, laplacian.shape[0]);
-          const { eigenvalues: spec_evals, eigenvectors: spec_vecs } =
-            smallest_eigenvectors_with_values(laplacian, spectrum_k);
-          const spec_data = await spec_evals.data();
-          this.debug_info_!.laplacian_spectrum = Array.from(spec_data);
-          spec_evals.dispose();
-          spec_vecs.dispose();
-        }
+    if (sparse_affinity != null) {
+      const { sparse_normalised_laplacian_operator } = await import(
+        '../graph/laplacian'
+      );
+      const sparse_laplacian = profile_stage(
+        'SpectralClustering',
+        'laplacian',
+        () => sparse_normalised_laplacian_operator(sparse_affinity),
+      );
 
-        const result = smallest_eigenvectors_with_values(
-          laplacian,
-          num_eigenvectors,
-        );
-        U_full = result.eigenvectors;
-        eigenvalues = result.eigenvalues;
-        sqrt_degrees_tensor = sqrt_degrees;
-        laplacian.dispose();
+      if (this.capture_debug_info) {
+        const spectrum_k = Math.min(10, sparse_laplacian.operator.n);
+        const { eigenvalues: spec_evals, eigenvectors: spec_vecs } =
+          smallest_eigenvectors_with_values(
+            sparse_laplacian.operator,
+            spectrum_k,
+          );
+        const spec_data = await spec_evals.data();
+        this.debug_info_!.laplacian_spectrum = Array.from(spec_data);
+        spec_evals.dispose();
+        spec_vecs.dispose();
       }
 
-      U = tf.tidy(() => {
-        const U_selected = tf.slice(
-          U_full,
-          [0, 0],
-          [-1, this.params.n_clusters],
-        ) as tf.Tensor2D;
-        const sqrt_deg = tf.pow(sqrt_degrees_tensor!, -1) as tf.Tensor1D;
-        const sqrt_deg_col = sqrt_deg.reshape([-1, 1]) as tf.Tensor2D;
-        return U_selected.div(sqrt_deg_col) as tf.Tensor2D;
-      });
+      const result = profile_stage('SpectralClustering', 'eigensolve', () =>
+        smallest_eigenvectors_with_values(
+          sparse_laplacian.operator,
+          num_eigenvectors,
+        ),
+      );
+      U_full = result.eigenvectors;
+      eigenvalues = result.eigenvalues;
+      sqrt_degrees_tensor = tf.tensor1d(
+        Array.from(sparse_laplacian.sqrt_degrees),
+        'float32',
+      );
+    } else {
+      const { normalised_laplacian } = await import('../graph/laplacian');
+      const { laplacian, sqrt_degrees } = profile_stage(
+        'SpectralClustering',
+        'laplacian',
+        () =>
+          tf.tidy(() =>
+            normalised_laplacian(this.affinity_matrix_ as tf.Tensor2D, true),
+          ),
+      );
 
       if (this.capture_debug_info) {
-        const emb_data = await U.data();
-        const [n, k] = U.shape;
-        const unique_values_per_dim: number[] = [];
-
-        for (let i = 0; i < k; i++) {
-          const col = emb_data.slice(i * n, (i + 1) * n);
-          const unique = new Set(col.map((v) => Math.round(v * 1e10) / 1e10));
-          unique_values_per_dim.push(unique.size);
-        }
+        const spectrum_k = Math.min(10, laplacian.shape[0]);
+        const { eigenvalues: spec_evals, eigenvectors: spec_vecs } =
+          smallest_eigenvectors_with_values(laplacian, spectrum_k);
+        const spec_data = await spec_evals.data();
+        this.debug_info_!.laplacian_spectrum = Array.from(spec_data);
+        spec_evals.dispose();
+        spec_vecs.dispose();
+      }
 
-        const eigen_data = await eigenvalues.data();
-        this.debug_info_!.embedding_stats = {
-          shape: U.shape,
-          unique_values_per_dim,
-          scaling_factors: Array.from(eigen_data.slice(0, this.params.n_clusters)),
-        };
+      const result = profile_stage('SpectralClustering', 'eigensolve', () =>
+        smallest_eigenvectors_with_values(laplacian, num_eigenvectors),
+      );
+      U_full = result.eigenvectors;
+      eigenvalues = result.eigenvalues;
+      sqrt_degrees_tensor = sqrt_degrees;
+      laplacian.dispose();
+    }
+
+    const U = tf.tidy(() => {
+      const U_selected = tf.slice(
+        U_full,
+        [0, 0],
+        [-1, n_components],
+      ) as tf.Tensor2D;
+      const sqrt_deg = tf.pow(sqrt_degrees_tensor!, -1) as tf.Tensor1D;
+      const sqrt_deg_col = sqrt_deg.reshape([-1, 1]) as tf.Tensor2D;
+      return U_selected.div(sqrt_deg_col) as tf.Tensor2D;
+    });
+
+    if (this.capture_debug_info) {
+      const emb_data = await U.data();
+      const [n, k] = U.shape;
+      const unique_values_per_dim: number[] = [];
+
+      for (let i = 0; i < k; i++) {
+        const col = emb_data.slice(i * n, (i + 1) * n);
+        const unique = new Set(col.map((v) => Math.round(v * 1e10) / 1e10));
+        unique_values_per_dim.push(unique.size);
       }
 
-      sqrt_degrees_tensor.dispose();
-      eigenvalues.dispose();
-      U_full.dispose();
+      const eigen_data = await eigenvalues.data();
+      this.debug_info_!.embedding_stats = {
+        shape: U.shape,
+        unique_values_per_dim,
+        scaling_factors: Array.from(eigen_data.slice(0, n_components)),
+      };
+    }
+
+    sqrt_degrees_tensor.dispose();
+    eigenvalues.dispose();
+    U_full.dispose();
+    return U;
+  }
+
+  /**
+   * Label assignment on a finished embedding; sets `labels_`. The caller
+   * owns (and disposes) `U` and `x_tensor`.
+   */
+  private async assign_labels_from_embedding(
+    U: tf.Tensor2D,
+    x_tensor: tf.Tensor2D,
+    n_clusters: number = this.params.n_clusters,
+  ): Promise<void> {
+    // Component indicators can be wider than n_clusters; only k-means can
+    // group those columns, so the single-pass assignments need k columns.
+    if (
+      (this.params.assign_labels ?? 'kmeans') !== 'kmeans' &&
+      U.shape[1] === n_clusters
+    ) {
+      this.labels_ = await this.assign_labels_without_kmeans(U);
+      return;
     }
 
     // IMPORTANT: sklearn does NOT row-normalize when using k-means!
@@ -377,19 +606,14 @@ export class SpectralClustering
         './spectral_optimization'
       );
 
-      let result;
-      try {
-        result = await intensive_parameter_sweep(
-          x_tensor,
-          this.params,
-          this.compute_embedding_from_affinity.bind(this),
-          SpectralClustering.compute_affinity_matrix,
-        );
-      } catch (err) {
-        U.dispose();
-        x_tensor.dispose();
-        throw err;
-      }
+      const { SpectralWorkspace } = await import('./spectral_workspace');
+      // Distances, connectivity and eigenvector warm starts are shared
+      // across the gamma range.
+      const workspace = new SpectralWorkspace(x_tensor);
+      const result = await intensive_parameter_sweep(
+        { ...this.params, n_clusters },
+        async (gamma) => workspace.embedding(gamma, n_clusters),
+      ).finally(() => workspace.dispose());
 
       this.labels_ = result.labels;
 
@@ -400,7 +624,7 @@ export class SpectralClustering
         enumerable: false,
       });
     }
-    else if (this.params.use_validation && this.params.n_clusters >= 3) {
+    else if (this.params.use_validation && n_clusters >= 3) {
       const { validation_based_optimization } = await import(
         './spectral_optimization'
       );
@@ -410,7 +634,7 @@ export class SpectralClustering
 
       const result = await validation_based_optimization(
         U,
-        this.params.n_clusters,
+        n_clusters,
         metric,
         attempts,
         this.params.random_state,
@@ -426,7 +650,7 @@ export class SpectralClustering
       });
     } else {
       const km_params = {
-        n_clusters: this.params.n_clusters,
+        n_clusters,
         random_state: this.params.random_state,
         // Multiple initialisations significantly increase robustness of the
         // final clustering outcome.  Follow scikit-learn default (n_init = 10)
@@ -457,20 +681,64 @@ export class SpectralClustering
       km.dispose();
     }
 
-    U.dispose();
+  }
 
-    x_tensor.dispose();
+  /**
+   * Nyström path: the embedding is built from the n×m landmark kernel block,
+   * so neither `max_samples` nor the dense connectivity check applies and
+   * `affinity_matrix_` stays null.
+   */
+  private async nystrom_embedding(
+    x_tensor: tf.Tensor2D,
+    n_components: number,
+  ): Promise<tf.Tensor2D> {
+    const { nystrom_spectral_embedding } = await import('./spectral_nystrom');
+    // The landmark kernel block and its eigensolve form one stage.
+    const result = profile_stage('SpectralClustering', 'eigensolve', () =>
+      nystrom_spectral_embedding(x_tensor, this.params, n_components),
+    );
+    if (this.capture_debug_info) {
+      this.debug_info_!.laplacian_spectrum = Array.from(result.eigenvalues);
+    }
+    return result.embedding;
+  }
+
+  /** `'cluster_qr'` / `'discretize'` on the host copy of the embedding. */
+  private async assign_labels_without_kmeans(
+    U: tf.Tensor2D,
+  ): Promise<number[]> {
+    const { cluster_qr, discretize } = await import(
+      './spectral_label_assignment'
+    );
+    const [n, k] = U.shape;
+    const vectors = Float64Array.from(await U.data());
+    const labels =
+      this.params.assign_labels === 'cluster_qr'
+        ? cluster_qr(vectors, n, k)
+        : discretize(vectors, n, k, this.params.random_state);
+    return Array.from(labels);
   }
 
   /**
    * @throws {Error} If n_clusters exceeds n_samples or n_samples exceeds max_samples.
    */
-  async fit_predict(X: DataMatrix): Promise<number[]> {
+  fit_predict(
+    X: DataMatrix,
+    options?: FitPredictOptions & { int32_labels?: false },
+  ): Promise<number[]>;
+  fit_predict(
+    X: DataMatrix,
+    options: FitPredictOptions & { int32_labels: true },
+  ): Promise<Int32Array>;
+  async fit_predict(
+    X: DataMatrix,
+    options?: FitPredictOptions,
+  ): Promise<number[] | Int32Array> {
     await this.fit(X);
     if (this.labels_ == null) {
       throw new Error('SpectralClustering failed to compute labels.');
     }
-    return this.labels_;
+    return format_labels(this.labels_, options);
   }
 
   /**
@@ -498,13 +766,15 @@ export class SpectralClustering
   }
 
   async fit_with_intermediate_steps(X: DataMatrix): Promise<IntermediateSteps> {
+    if (this.params.affinity_approximation === 'nystrom') {
+      throw new Error(
+        "fit_with_intermediate_steps requires the exact affinity; it does not support affinity_approximation 'nystrom'.",
+      );
+    }
     this.dispose();
     this.debug_info_ = {};
 
-    const x_tensor: tf.Tensor2D =
-      is_tensor(X)
-        ? (tf.cast(X as tf.Tensor2D, 'float32') as tf.Tensor2D)
-        : tf.tensor2d(X as number[][], undefined, 'float32');
+    const x_tensor = SpectralClustering.to_float_tensor(X);
 
     const n_samples_debug = x_tensor.shape[0];
     if (this.params.n_clusters > n_samples_debug) {
@@ -621,24 +891,29 @@ export class SpectralClustering
       scaling_factors: Array.from(eigen_data.slice(0, this.params.n_clusters)),
     };
 
-    const { KMeans } = await import('./kmeans');
-    const km_params = {
-      n_clusters: this.params.n_clusters,
-      random_state: this.params.random_state,
-      n_init: this.params.n_init ?? 10,
-    } as const;
-
-    const km = new KMeans(km_params);
-    await km.fit(embedding);
-    const labels = km.labels_!;
-
-    if (km.inertia_ !== null) {
-      this.debug_info_.clustering_metrics = {
-        inertia: km.inertia_,
-        iterations: 0, // KMeans doesn't expose iteration count currently
-      };
+    let labels: number[];
+    if ((this.params.assign_labels ?? 'kmeans') !== 'kmeans') {
+      labels = await this.assign_labels_without_kmeans(embedding);
+    } else {
+      const { KMeans } = await import('./kmeans');
+      const km_params = {
+        n_clusters: this.params.n_clusters,
+        random_state: this.params.random_state,
+        n_init: this.params.n_init ?? 10,
+      } as const;
+
+      const km = new KMeans(km_params);
+      await km.fit(embedding);
+      labels = km.labels_!;
+
+      if (km.inertia_ !== null) {
+        this.debug_info_.clustering_metrics = {
+          inertia: km.inertia_,
+          iterations: 0, // KMeans doesn't expose iteration count currently
+        };
+      }
+      km.dispose();
     }
-    km.dispose();
 
     // Compute D^{1/2} for the result (sqrt_degrees is D^{-1/2}, so pow(-1) gives D^{1/2})
     const degrees_intermediate = tf.pow(sqrt_degrees, -1) as tf.Tensor1D;
@@ -676,7 +951,15 @@ export class SpectralClustering
   }
 
   private static validate_params(params: SpectralClusteringParams): void {
-    const { n_clusters, affinity = 'rbf', gamma, n_neighbors } = params;
+    const {
+      n_clusters,
+      affinity = 'rbf',
+      gamma,
+      n_neighbors,
+      affinity_approximation,
+      n_landmarks,
+      assign_labels = 'kmeans',
+    } = params;
 
     if (!Number.isInteger(n_clusters) || n_clusters < 1) {
       throw new Error('n_clusters must be a positive integer (>= 1).');
@@ -714,6 +997,47 @@ export class SpectralClustering
       );
     }
 
+    if (!SpectralClustering.VALID_ASSIGN_LABELS.includes(assign_labels)) {
+      throw new Error(
+        `Invalid assign_labels '${assign_labels}'. Must be one of ${SpectralClustering.VALID_ASSIGN_LABELS.join(', ')}.`,
+      );
+    }
+    if (assign_labels !== 'kmeans') {
+      if (params.use_validation || params.intensive_parameter_sweep) {
+        throw new Error(
+          `use_validation and intensive_parameter_sweep select among k-means runs; they cannot be combined with assign_labels '${assign_labels}'.`,
+        );
+      }
+    }
+
+    if (affinity_approximation !== undefined) {
+      if (affinity_approximation !== 'nystrom') {
+        throw new Error(
+          `Invalid affinity_approximation '${affinity_approximation}'. Must be 'nystrom'.`,
+        );
+      }
+      if (is_callable || (affinity !== 'rbf' && affinity !== 'cosine')) {
+        throw new Error(
+          "affinity_approximation 'nystrom' requires affinity 'rbf' or 'cosine'.",
+        );
+      }
+      if (params.intensive_parameter_sweep) {
+        throw new Error(
+          "intensive_parameter_sweep is not supported with affinity_approximation 'nystrom'.",
+        );
+      }
+    }
+    if (n_landmarks !== undefined) {
+      if (affinity_approximation !== 'nystrom') {
+        throw new Error(
+          "n_landmarks is only applicable when affinity_approximation is 'nystrom'.",
+        );
+      }
+      if (!Number.isInteger(n_landmarks) || n_landmarks < 1) {
+        throw new Error('n_landmarks must be a positive integer (>= 1).');
+      }
+    }
+
     if (!is_callable && affinity === 'precomputed') {
       if (gamma !== undefined) {
         throw new Error(
@@ -772,61 +1096,6 @@ export class SpectralClustering
     return Math.max(1, default_k);
   }
 
-  private async compute_embedding_from_affinity(
-    affinity_matrix: tf.Tensor2D,
-  ): Promise<tf.Tensor2D> {
-    const { detect_connected_components } = await import(
-      '../graph/connected_components'
-    );
-    const { num_components, is_fully_connected, component_labels } =
-      detect_connected_components(affinity_matrix);
-
-    if (!is_fully_connected && num_components >= this.params.n_clusters) {
-      const { create_component_indicators } = await import(
-        '../graph/component_indicators'
-      );
-      return create_component_indicators(
-        component_labels,
-        num_components,
-        num_components,
-      );
-    } else {
-      const { normalised_laplacian } = await import('../graph/laplacian');
-      const { smallest_eigenvectors_with_values } = await import(
-        '../eigen/smallest_eigenvectors_with_values'
-      );
-
-      const { laplacian, sqrt_degrees } = tf.tidy(() =>
-        normalised_laplacian(affinity_matrix, true),
-      );
-
-      const num_eigenvectors = Math.max(this.params.n_clusters, num_components);
-      const { eigenvectors: U_full, eigenvalues } =
-        smallest_eigenvectors_with_values(laplacian, num_eigenvectors);
-
-      const U_scaled = tf.tidy(() => {
-        const num_to_use = this.params.n_clusters;
-        const U_selected = tf.slice(
-          U_full,
-          [0, 0],
-          [-1, num_to_use],
-        ) as tf.Tensor2D;
-        // sqrt_degrees is D^{-1/2}, so D^{1/2} = pow(sqrt_degrees, -1)
-        const sqrt_deg = tf.pow(sqrt_degrees, -1) as tf.Tensor1D;
-        const sqrt_deg_col = sqrt_deg.reshape([-1, 1]) as tf.Tensor2D;
-        const U_normalized = U_selected.div(sqrt_deg_col) as tf.Tensor2D;
-        return U_normalized;
-      });
-
-      laplacian.dispose();
-      sqrt_degrees.dispose();
-      eigenvalues.dispose();
-      U_full.dispose();
-
-      return U_scaled;
-    }
-  }
-
   /**
    * Validates that the provided tensor is a proper affinity / similarity
    * matrix suitable for spectral clustering.
@@ -0,0 +1,123 @@
+import { SpectralClustering } from '..';
+import { cluster_qr, discretize } from './spectral_label_assignment';
+import { make_random_stream } from '../random';
+
+/**
+ * Embedding of `n` samples whose rows lie near one of `k` orthogonal
+ * directions, rotated away from the coordinate axes. Sample `i` belongs to
+ * cluster `i % k`.
+ */
+function rotated_indicator_embedding(n: number, seed: number): Float64Array {
+  const k = 3;
+  const rng = make_random_stream(seed);
+  const c = Math.cos(0.7);
+  const s = Math.sin(0.7);
+  const rotation = [
+    [c, -s, 0],
+    [s, c, 0],
+    [0, 0, 1],
+  ];
+  const vectors = new Float64Array(n * k);
+  for (let i = 0; i < n; i++) {
+    const base = [0, 0, 0].map(() => (rng.rand() - 0.5) * 0.2);
+    base[i % k] += 1;
+    for (let a = 0; a < k; a++) {
+      let sum = 0;
+      for (let b = 0; b < k; b++) sum += rotation[a][b] * base[b];
+      vectors[i * k + a] = 0.05 * sum;
+    }
+  }
+  return vectors;
+}
+
+function expect_recovers_clusters(labels: ArrayLike<number>, k: number): void {
+  const per_cluster = Array.from({ length: k }, (_, c) => {
+    const seen = new Set(Array.from(labels).filter((_, i) => i % k === c));
+    expect(seen.size).toBe(1);
+    return [...seen][0];
+  });
+  expect(new Set(per_cluster).size).toBe(k);
+}
+
+const BLOBS = [
+  [0, 0],
+  [0.2, 0.1],
+  [0.1, 0.3],
+  [5, 5],
+  [5.2, 5.1],
+  [5.1, 4.8],
+  [0, 10],
+  [0.3, 10.2],
+  [-0.2, 9.9],
+];
+
+describe('Spectral label assignment without k-means', () => {
+  it('cluster_qr rotates a noisy indicator embedding onto its clusters', () => {
+    const n = 90;
+    const vectors = rotated_indicator_embedding(n, 5);
+    const labels = cluster_qr(vectors, n, 3);
+    expect(labels).toHaveLength(n);
+    expect_recovers_clusters(labels, 3);
+    expect(Array.from(cluster_qr(vectors, n, 3))).toEqual(Array.from(labels));
+  });
+
+  it('discretize recovers the clusters reproducibly for a seed', () => {
+    const n = 90;
+    const vectors = rotated_indicator_embedding(n, 9);
+    const labels = discretize(vectors, n, 3, 42);
+    expect_recovers_clusters(labels, 3);
+    expect(Array.from(discretize(vectors, n, 3, 42))).toEqual(
+      Array.from(labels),
+    );
+  });
+
+  it('handles rank-deficient embeddings', () => {
+    const vectors = new Float64Array(20).fill(1);
+    const results = [cluster_qr(vectors, 10, 2), discretize(vectors, 10, 2, 1)];
+    for (const labels of results) {
+      expect(labels).toHaveLength(10);
+      for (const l of labels) expect([0, 1]).toContain(l);
+    }
+  });
+
+  it.each(['cluster_qr', 'discretize'] as const)(
+    'SpectralClustering assigns labels with %s and skips k-means',
+    async (assign_labels) => {
+      const model = new SpectralClustering({
+        n_clusters: 3,
+        gamma: 0.5,
+        assign_labels,
+        random_state: 0,
+      });
+      const labels = await model.fit_predict(BLOBS);
+      expect(labels).toHaveLength(BLOBS.length);
+      for (let b = 0; b < 3; b++) {
+        expect(new Set(labels.slice(3 * b, 3 * b + 3)).size).toBe(1);
+      }
+      expect(new Set(labels).size).toBe(3);
+      expect(
+        (model as SpectralClustering & { _debug_last_kmeans_params_?: object })
+          ._debug_last_kmeans_params_,
+      ).toBeUndefined();
+      model.dispose();
+    },
+  );
+
+  it('validates assign_labels', () => {
+    expect(
+      () =>
+        new SpectralClustering({
+          n_clusters: 2,
+          assign_labels: 'amg' as 'kmeans',
+        }),
+    ).toThrow("Invalid assign_labels 'amg'");
+    expect(
+      () =>
+        new SpectralClustering({
+          n_clusters: 3,
+          assign_labels: 'cluster_qr',
+          use_validation: true,
+        }),
+    ).toThrow('cannot be combined');
+  });
+});
@@ -0,0 +1,240 @@
+import { make_random_stream } from '../random';
+import { symmetric_eigen } from '../eigen/householder';
+
+/**
+ * Non-iterative alternatives to k-means for turning a spectral embedding into
+ * labels, mirroring scikit-learn's `assign_labels='cluster_qr'` and
+ * `'discretize'`. Both operate on the row-major `n × k` embedding in float64
+ * and only ever solve `k × k` eigenproblems, so the cost is O(n·k²) with no
+ * restarts.
+ */
+
+/** Rotation updates before `discretize` stops (sklearn's `n_iter_max`). */
+const DISCRETIZE_MAX_ITER = 20;
+
+interface PolarFactor {
+  /** Orthogonal `k × k` factor `W Vᵀ` of `M = W S Vᵀ`, row-major. */
+  orthogonal: Float64Array;
+  /** Sum of the singular values of `M`. */
+  singular_sum: number;
+}
+
+/**
+ * Polar decomposition of a square matrix from the eigenpairs of `MᵀM`. Left
+ * singular vectors of (numerically) zero singular values are completed by
+ * Gram–Schmidt so the factor stays orthogonal for rank-deficient `M`, as
+ * happens when a discretized cluster is empty.
+ */
+function polar_factor(M: Float64Array, k: number): PolarFactor {
+  const gram = new Float64Array(k * k);
+  for (let a = 0; a < k; a++) {
+    for (let b = a; b < k; b++) {
+      let sum = 0;
+      for (let r = 0; r < k; r++) sum += M[r * k + a] * M[r * k + b];
+      gram[a * k + b] = sum;
+      gram[b * k + a] = sum;
+    }
+  }
+
+  const { values, vectors: V } = symmetric_eigen(gram, k);
+  const singular = values.map((v) => Math.sqrt(Math.max(v, 0)));
+  const tol = k * Number.EPSILON * singular[k - 1];
+
+  // Columns of W, row-major k × k; largest singular values first so the
+  // completion below only has to fill the trailing columns.
+  const W = new Float64Array(k * k);
+  const filled: number[] = [];
+  let singular_sum = 0;
+  for (let c = k - 1; c >= 0; c--) {
+    singular_sum += singular[c];
+    if (singular[c] <= tol) continue;
+    for (let r = 0; r < k; r++) {
+      let sum = 0;
+      for (let j = 0; j < k; j++) sum += M[r * k + j] * V[j * k + c];
+      W[r * k + c] = sum / singular[c];
+    }
+    filled.push(c);
+  }
+
+  let candidate = 0;
+  for (let c = k - 1 - filled.length; c >= 0; c--) {
+    for (; candidate < k; candidate++) {
+      const w = new Float64Array(k);
+      w[candidate] = 1;
+      for (const f of filled) {
+        const dot = W[candidate * k + f];
+        for (let r = 0; r < k; r++) w[r] -= dot * W[r * k + f];
+      }
+      let norm = 0;
+      for (let r = 0; r < k; r++) norm += w[r] * w[r];
+      norm = Math.sqrt(norm);
+      if (norm > 1e-8) {
+        for (let r = 0; r < k; r++) W[r * k + c] = w[r] / norm;
+        filled.push(c);
+        candidate++;
+        break;
+      }
+    }
+  }
+
+  const orthogonal = new Float64Array(k * k);
+  for (let a = 0; a < k; a++) {
+    for (let b = 0; b < k; b++) {
+      let sum = 0;
+      for (let c = 0; c < k; c++) sum += W[a * k + c] * V[b * k + c];
+      orthogonal[a * k + b] = sum;
+    }
+  }
+  return { orthogonal, singular_sum };
+}
+
+/** Row-wise argmax of `vectors · R` (or of its absolute value). */
+function rotated_argmax(
+  vectors: Float64Array,
+  R: Float64Array,
+  n: number,
+  k: number,
+  absolute: boolean,
+): Int32Array {
+  const labels = new Int32Array(n);
+  for (let i = 0; i < n; i++) {
+    let best = -Infinity;
+    for (let c = 0; c < k; c++) {
+      let sum = 0;
+      for (let j = 0; j < k; j++) sum += vectors[i * k + j] * R[j * k + c];
+      const score = absolute ? Math.abs(sum) : sum;
+      if (score > best) {
+        best = score;
+        labels[i] = c;
+      }
+    }
+  }
+  return labels;
+}
+
+/**
+ * Damle, Minden & Ying (2019): column-pivoted QR of `vectorsᵀ` picks the `k`
+ * most linearly independent samples, and the polar factor of their rows
+ * rotates the embedding onto the coordinate axes. Deterministic.
+ */
+export function cluster_qr(
+  vectors: Float64Array,
+  n: number,
+  k: number,
+): Int32Array {
+  const residual = Float64Array.from(vectors);
+  const norms = new Float64Array(n);
+  const pivots = new Int32Array(k);
+  const q = new Float64Array(k);
+
+  for (let step = 0; step < k; step++) {
+    for (let i = 0; i < n; i++) {
+      let sum = 0;
+      for (let j = 0; j < k; j++) sum += residual[i * k + j] ** 2;
+      norms[i] = sum;
+    }
+    let pivot = 0;
+    for (let i = 1; i < n; i++) if (norms[i] > norms[pivot]) pivot = i;
+    pivots[step] = pivot;
+
+    const norm = Math.sqrt(norms[pivot]);
+    if (norm === 0) continue;
+    for (let j = 0; j < k; j++) q[j] = residual[pivot * k + j] / norm;
+    for (let i = 0; i < n; i++) {
+      let dot = 0;
+      for (let j = 0; j < k; j++) dot += residual[i * k + j] * q[j];
+      for (let j = 0; j < k; j++) residual[i * k + j] -= dot * q[j];
+    }
+  }
+
+  // M = vectors[pivots, :]ᵀ
+  const M = new Float64Array(k * k);
+  for (let c = 0; c < k; c++) {
+    for (let r = 0; r < k; r++) M[r * k + c] = vectors[pivots[c] * k + r];
+  }
+  const { orthogonal } = polar_factor(M, k);
+  return rotated_argmax(vectors, orthogonal, n, k, true);
+}
+
+/**
+ * Yu & Shi (2003) multiclass discretization: alternate between the nearest
+ * partition matrix and the best rotation towards it until the normalized-cut
+ * objective stops changing. Only the initial rotation is random.
+ */
+export function discretize(
+  vectors: Float64Array,
+  n: number,
+  k: number,
+  random_state?: number,
+): Int32Array {
+  const Y = Float64Array.from(vectors);
+
+  // Scale columns to norm √n and orient them negative at the first sample.
+  const norm_ones = Math.sqrt(n);
+  for (let c = 0; c < k; c++) {
+    let norm = 0;
+    for (let i = 0; i < n; i++) norm += Y[i * k + c] ** 2;
+    norm = Math.sqrt(norm);
+    if (norm === 0) continue;
+    const scale = (Y[c] > 0 ? -1 : 1) * (norm_ones / norm);
+    for (let i = 0; i < n; i++) Y[i * k + c] *= scale;
+  }
+  // Project the rows onto the unit sphere.
+  for (let i = 0; i < n; i++) {
+    let norm = 0;
+    for (let j = 0; j < k; j++) norm += Y[i * k + j] ** 2;
+    norm = Math.sqrt(norm);
+    if (norm === 0) continue;
+    for (let j = 0; j < k; j++) Y[i * k + j] /= norm;
+  }
+
+  // Initial rotation: a random row, then rows as orthogonal as possible to
+  // the ones already chosen. Stored row-major k × k, one column per pick.
+  const rng = make_random_stream(random_state);
+  let rotation = new Float64Array(k * k);
+  let row = rng.rand_int(n);
+  const accumulated = new Float64Array(n);
+  for (let c = 0; c < k; c++) {
+    if (c > 0) {
+      for (let i = 0; i < n; i++) {
+        let dot = 0;
+        for (let j = 0; j < k; j++) {
+          dot += Y[i * k + j] * rotation[j * k + c - 1];
+        }
+        accumulated[i] += Math.abs(dot);
+      }
+      row = 0;
+      for (let i = 1; i < n; i++) {
+        if (accumulated[i] < accumulated[row]) row = i;
+      }
+    }
+    for (let j = 0; j < k; j++) rotation[j * k + c] = Y[row * k + j];
+  }
+
+  let last_objective = 0;
+  for (let iter = 1; ; iter++) {
+    const labels = rotated_argmax(Y, rotation, n, k, false);
+
+    // T = Xᵀ Y for the indicator matrix X of `labels`.
+    const T = new Float64Array(k * k);
+    for (let i = 0; i < n; i++) {
+      const l = labels[i];
+      for (let j = 0; j < k; j++) T[l * k + j] += Y[i * k + j];
+    }
+    const { orthogonal, singular_sum } = polar_factor(T, k);
+    const ncut = 2 * (n - singular_sum);
+    if (
+      Math.abs(ncut - last_objective) < Number.EPSILON ||
+      iter > DISCRETIZE_MAX_ITER
+    ) {
+      return labels;
+    }
+    last_objective = ncut;
+
+    // rotation = (W Vᵀ)ᵀ
+    rotation = new Float64Array(k * k);
+    for (let a = 0; a < k; a++) {
+      for (let b = 0; b < k; b++) rotation[a * k + b] = orthogonal[b * k + a];
+    }
+  }
+}
@@ -0,0 +1,132 @@
+import * as tf from '../backend/adapter';
+import { SpectralClustering } from './spectral';
+import {
+  nystrom_spectral_embedding,
+  sample_landmarks,
+} from './spectral_nystrom';
+import { make_random_stream } from '../random';
+
+function blobs(
+  n_per: number,
+  centers: number[][],
+  seed: number,
+  spread: number = 1,
+): number[][] {
+  const rng = make_random_stream(seed);
+  const out: number[][] = [];
+  for (let i = 0; i < n_per; i++) {
+    for (const c of centers) {
+      out.push(c.map((v) => v + (rng.rand() - 0.5) * spread));
+    }
+  }
+  return out;
+}
+
+const CENTERS = [
+  [0, 0],
+  [8, 0],
+  [0, 8],
+];
+
+describe('Nyström spectral embedding', () => {
+  it('samples distinct, sorted, seeded landmarks', () => {
+    const a = sample_landmarks(100, 20, 7);
+    const b = sample_landmarks(100, 20, 7);
+    expect(Array.from(a)).toEqual(Array.from(b));
+    expect(new Set(a).size).toBe(20);
+    for (let i = 1; i < a.length; i++) expect(a[i]).toBeGreaterThan(a[i - 1]);
+    expect(Array.from(sample_landmarks(5, 5, 1))).toEqual([0, 1, 2, 3, 4]);
+  });
+
+  it('returns an n×k embedding whose leading eigenvalue is ~0', () => {
+    const X = tf.tensor2d(blobs(40, CENTERS, 3));
+    const before = tf.memory().numTensors;
+    const result = nystrom_spectral_embedding(
+      X,
+      { n_clusters: 3, n_landmarks: 30, random_state: 0 },
+      3,
+    );
+
+    expect(result.embedding.shape).toEqual([120, 3]);
+    expect(result.landmarks).toHaveLength(30);
+    expect(result.eigenvalues[0]).toBeCloseTo(0, 3);
+    for (let i = 1; i < 3; i++) {
+      expect(result.eigenvalues[i]).toBeGreaterThanOrEqual(
+        result.eigenvalues[i - 1],
+      );
+    }
+
+    result.embedding.dispose();
+    expect(tf.memory().numTensors).toBe(before);
+    X.dispose();
+  });
+
+  it.each(['rbf', 'cosine'] as const)(
+    'SpectralClustering recovers separated blobs with %s affinity',
+    async (affinity) => {
+      // Cosine separates directions: orthogonal axes with little spread.
+      const X =
+        affinity === 'cosine'
+          ? blobs(60, [[1, 0, 0], [0, 1, 0], [0, 0, 1]], 11, 0.1)
+          : blobs(60, CENTERS, 11);
+      const model = new SpectralClustering({
+        n_clusters: 3,
+        affinity,
+        affinity_approximation: 'nystrom',
+        n_landmarks: 40,
+        random_state: 42,
+        // Not applied on the Nyström path.
+        max_samples: 50,
+      });
+
+      await model.fit(X);
+      const labels = model.labels_!;
+      expect(labels).toHaveLength(X.length);
+      expect(model.affinity_matrix_).toBeNull();
+
+      // Blob i % 3 must map to a single label, distinct per blob.
+      const blob_labels = [0, 1, 2].map((b) => {
+        const seen = new Set(labels.filter((_, i) => i % 3 === b));
+        expect(seen.size).toBe(1);
+        return [...seen][0];
+      });
+      expect(new Set(blob_labels).size).toBe(3);
+      model.dispose();
+    },
+  );
+
+  it('validates the approximation parameters', () => {
+    expect(
+      () =>
+        new SpectralClustering({
+          n_clusters: 2,
+          affinity: 'nearest_neighbors',
+          affinity_approximation: 'nystrom',
+        }),
+    ).toThrow("requires affinity 'rbf' or 'cosine'");
+    expect(
+      () => new SpectralClustering({ n_clusters: 2, n_landmarks: 10 }),
+    ).toThrow('only applicable');
+    expect(
+      () =>
+        new SpectralClustering({
+          n_clusters: 2,
+          affinity_approximation: 'nystrom',
+          n_landmarks: 0,
+        }),
+    ).toThrow('positive integer');
+  });
+
+  it('rejects fit_with_intermediate_steps', async () => {
+    const model = new SpectralClustering({
+      n_clusters: 2,
+      affinity_approximation: 'nystrom',
+    });
+    await expect(
+      model.fit_with_intermediate_steps([
+        [0, 0],
+        [1, 1],
+      ]),
+    ).rejects.toThrow('nystrom');
+  });
+});
@@ -0,0 +1,190 @@
+import * as tf from '../backend/adapter';
+import type { SpectralClusteringParams } from './types';
+import { make_random_stream } from '../random';
+import { symmetric_eigen } from '../eigen/householder';
+
+/**
+ * Nyström approximation of the normalized spectral embedding (Fowlkes et al.
+ * 2004, one-shot orthogonalization).
+ *
+ * With `m` landmark rows, `C = K(X, X_L)` (n×m) and `W = K(X_L, X_L)` (m×m),
+ * the kernel is approximated by `K ≈ C W⁺ Cᵀ`. Degrees follow as
+ * `d = C W⁺ (Cᵀ1)` without forming `K`; with `R = D^{-1/2} C W^{-1/2}` the
+ * normalized affinity is `R Rᵀ`, whose leading eigenvectors are
+ * `R V Σ^{-1/2}` for the eigenpairs `(Σ, V)` of the small matrix `Rᵀ R`.
+ * Peak memory is O(n·m) instead of O(n²).
+ */
+
+/** Landmark count when `n_landmarks` is not specified. */
+export const NYSTROM_LANDMARKS_DEFAULT = 300;
+
+/**
+ * Kernel eigenvalues below this fraction of the largest are dropped from
+ * `W⁺`; the float32 kernel blocks carry no information beneath it.
+ */
+const PINV_RTOL = 1e-6;
+
+export interface NystromEmbedding {
+  /** `n × n_components`, scaled by `D^{-1/2}` like the exact path. */
+  embedding: tf.Tensor2D;
+  /** Approximate smallest normalized-Laplacian eigenvalues, ascending. */
+  eigenvalues: Float64Array;
+  /** Sorted indices of the landmark rows. */
+  landmarks: Int32Array;
+}
+
+/** `m` distinct indices from `[0, n)` by a partial Fisher–Yates shuffle. */
+export function sample_landmarks(
+  n: number,
+  m: number,
+  random_state?: number,
+): Int32Array {
+  const rng = make_random_stream(random_state);
+  const pool = new Int32Array(n);
+  for (let i = 0; i < n; i++) pool[i] = i;
+  for (let i = 0; i < m; i++) {
+    const j = i + rng.rand_int(n - i);
+    const tmp = pool[i];
+    pool[i] = pool[j];
+    pool[j] = tmp;
+  }
+  return pool.slice(0, m).sort();
+}
+
+/** `K(X, L)` for the RBF or cosine affinity, matching `compute_affinity_matrix`. */
+function kernel_block(
+  X: tf.Tensor2D,
+  L: tf.Tensor2D,
+  params: SpectralClusteringParams,
+): tf.Tensor2D {
+  return tf.tidy(() => {
+    if (params.affinity === 'cosine') {
+      const unit = (T: tf.Tensor2D): tf.Tensor2D =>
+        T.div(tf.maximum(T.square().sum(1, true).sqrt(), 1e-12));
+      return unit(X).matMul(unit(L).transpose()) as tf.Tensor2D;
+    }
+    const gamma = params.gamma ?? 1.0 / X.shape[1];
+    const x_sq = X.square().sum(1, true);
+    const l_sq = L.square().sum(1).reshape([1, -1]);
+    const sq = tf.maximum(
+      x_sq.add(l_sq).sub(X.matMul(L.transpose()).mul(2)),
+      0,
+    );
+    return sq.mul(-gamma).exp() as tf.Tensor2D;
+  });
+}
+
+export function nystrom_spectral_embedding(
+  X: tf.Tensor2D,
+  params: SpectralClusteringParams,
+  n_components: number,
+): NystromEmbedding {
+  const n = X.shape[0];
+  const m = Math.min(params.n_landmarks ?? NYSTROM_LANDMARKS_DEFAULT, n);
+  const landmarks = sample_landmarks(n, m, params.random_state);
+
+  const C = tf.tidy(() =>
+    kernel_block(X, tf.gather(X, Array.from(landmarks)) as tf.Tensor2D, params),
+  );
+
+  try {
+    // W = C[landmarks, :], symmetrized in float64.
+    const w_raw = tf.tidy(() =>
+      tf.gather(C, Array.from(landmarks)).dataSync(),
+    );
+    const W = new Float64Array(m * m);
+    for (let i = 0; i < m; i++) {
+      for (let j = 0; j < m; j++) {
+        W[i * m + j] = 0.5 * (w_raw[i * m + j] + w_raw[j * m + i]);
+      }
+    }
+
+    // W^{-1/2} restricted to the numerically non-null space: P (m×r).
+    const w_eig = symmetric_eigen(W, m);
+    const w_max = w_eig.values[m - 1];
+    const kept: number[] = [];
+    for (let j = m - 1; j >= 0; j--) {
+      if (w_eig.values[j] > PINV_RTOL * w_max) kept.push(j);
+    }
+    const r = kept.length;
+    if (r === 0) {
+      throw new Error(
+        'Affinity matrix contains only zeros – cannot perform spectral clustering.',
+      );
+    }
+    const P = new Float64Array(m * r);
+    for (let c = 0; c < r; c++) {
+      const j = kept[c];
+      const scale = 1 / Math.sqrt(w_eig.values[j]);
+      for (let i = 0; i < m; i++) P[i * r + c] = w_eig.vectors[i * m + j] * scale;
+    }
+
+    // d = C P Pᵀ (Cᵀ 1).
+    const col_sums = tf.tidy(() => C.sum(0).dataSync());
+    const pt_s = new Float64Array(r);
+    for (let i = 0; i < m; i++) {
+      for (let c = 0; c < r; c++) pt_s[c] += P[i * r + c] * col_sums[i];
+    }
+    const t = new Float32Array(m);
+    for (let i = 0; i < m; i++) {
+      let sum = 0;
+      for (let c = 0; c < r; c++) sum += P[i * r + c] * pt_s[c];
+      t[i] = sum;
+    }
+
+    const { R, inv_sqrt_deg, degree_sum } = tf.tidy(() => {
+      const deg = C.matMul(tf.tensor2d(t, [m, 1])) as tf.Tensor2D;
+      const degree_sum_t = deg.sum();
+      // The low-rank degrees can dip to ~0 for points far from every
+      // landmark; floor them so D^{-1/2} stays finite.
+      const inv_sqrt = tf.maximum(deg, 1e-12).rsqrt() as tf.Tensor2D;
+      const P_t = tf.tensor2d(Float32Array.from(P), [m, r]);
+      return {
+        R: C.matMul(P_t).mul(inv_sqrt) as tf.Tensor2D,
+        inv_sqrt_deg: inv_sqrt,
+        degree_sum: degree_sum_t,
+      };
+    });
+
+    try {
+      if (degree_sum.dataSync()[0] <= 0) {
+        throw new Error(
+          'Affinity matrix contains only zeros – cannot perform spectral clustering.',
+        );
+      }
+
+      // Eigenpairs of the r×r Gram matrix RᵀR, largest first.
+      const g_raw = tf.tidy(() => R.transpose().matMul(R).dataSync());
+      const G = new Float64Array(r * r);
+      for (let i = 0; i < r; i++) {
+        for (let j = 0; j < r; j++) {
+          G[i * r + j] = 0.5 * (g_raw[i * r + j] + g_raw[j * r + i]);
+        }
+      }
+      const g_eig = symmetric_eigen(G, r);
+      const k = Math.min(n_components, r);
+      const V = new Float32Array(r * k);
+      const eigenvalues = new Float64Array(k);
+      for (let c = 0; c < k; c++) {
+        const j = r - 1 - c;
+        const sigma = Math.max(g_eig.values[j], 0);
+        eigenvalues[c] = 1 - sigma;
+        const scale = sigma > 0 ? 1 / Math.sqrt(sigma) : 0;
+        for (let i = 0; i < r; i++) V[i * k + c] = g_eig.vectors[i * r + j] * scale;
+      }
+
+      // U = R V Σ^{-1/2}; the embedding divides by D^{1/2} as sklearn does.
+      const embedding = tf.tidy(
+        () =>
+          R.matMul(tf.tensor2d(V, [r, k])).mul(inv_sqrt_deg) as tf.Tensor2D,
+      );
+      return { embedding, eigenvalues, landmarks };
+    } finally {
+      R.dispose();
+      inv_sqrt_deg.dispose();
+      degree_sum.dispose();
+    }
+  } finally {
+    C.dispose();
+  }
+}
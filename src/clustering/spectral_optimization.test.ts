@@ -144,36 +144,42 @@ describe("intensive_parameter_sweep", () => {
   const n = separated_data.length;
 
   it("returns valid clustering for well-separated data", async () => {
-    const X = tf.zeros([n, 2]) as tf.Tensor2D;
     const params: SpectralClusteringParams = {
       n_clusters: 2,
       affinity: 'rbf',
       gamma_range: [1.0],
     };
 
-    const fixed_embedding = async (a: tf.Tensor2D): Promise<tf.Tensor2D> => {
-      a.dispose();
+    const fixed_embedding = async (_gamma: number): Promise<tf.Tensor2D> =>
+      tf.tensor2d(separated_data) as tf.Tensor2D;
+
+    const result = await intensive_parameter_sweep(params, fixed_embedding);
+    expect(result.labels.length).toBe(n);
+    expect(new Set(result.labels).size).toBe(2);
+    // First and second half should each be in a single cluster.
+    expect(new Set(result.labels.slice(0, 5)).size).toBe(1);
+    expect(new Set(result.labels.slice(5)).size).toBe(1);
+    expect(result.labels[0]).not.toBe(result.labels[5]);
+  });
+
+  it("requests one embedding per gamma, in order", async () => {
+    const params: SpectralClusteringParams = {
+      n_clusters: 2,
+      affinity: 'rbf',
+      gamma_range: [0.5, 2.0],
+    };
+    const requested: number[] = [];
+    const fixed_embedding = async (gamma: number): Promise<tf.Tensor2D> => {
+      requested.push(gamma);
       return tf.tensor2d(separated_data) as tf.Tensor2D;
     };
-    const trivial_affinity = (_x: tf.Tensor2D, _p: SpectralClusteringParams): tf.Tensor2D =>
-      tf.eye(n) as tf.Tensor2D;
 
-    try {
-      const result = await intensive_parameter_sweep(X, params, fixed_embedding, trivial_affinity);
-      expect(result.labels.length).toBe(n);
-      expect(new Set(result.labels).size).toBe(2);
-      // First and second half should each be in a single cluster.
-      expect(new Set(result.labels.slice(0, 5)).size).toBe(1);
-      expect(new Set(result.labels.slice(5)).size).toBe(1);
-      expect(result.labels[0]).not.toBe(result.labels[5]);
-    } finally {
-      X.dispose();
-    }
+    await intensive_parameter_sweep(params, fixed_embedding);
+    expect(requested).toEqual([0.5, 2.0]);
   });
 
   it("throws when all gamma attempts produce degenerate embeddings", async () => {
     const n = 6;
-    const X = tf.zeros([n, 2]) as tf.Tensor2D;
     const params: SpectralClusteringParams = {
       n_clusters: 2,
       affinity: 'rbf',
@@ -182,21 +188,11 @@ describe("intensive_parameter_sweep", () => {
 
     // All-zero embedding: metric scores become NaN (or the metric throws for k≤1),
     // so no gamma ever beats the -Infinity baseline.
-    const degenerate_embedding = async (a: tf.Tensor2D): Promise<tf.Tensor2D> => {
-      a.dispose();
-      return tf.zeros([n, 2]) as tf.Tensor2D;
-    };
-
-    const trivial_affinity = (_x: tf.Tensor2D, _p: SpectralClusteringParams): tf.Tensor2D => {
-      return tf.eye(n) as tf.Tensor2D;
-    };
+    const degenerate_embedding = async (_gamma: number): Promise<tf.Tensor2D> =>
+      tf.zeros([n, 2]) as tf.Tensor2D;
 
-    try {
-      await expect(
-        intensive_parameter_sweep(X, params, degenerate_embedding, trivial_affinity),
-      ).rejects.toThrow(/all gamma attempts produced degenerate embeddings/);
-    } finally {
-      X.dispose();
-    }
+    await expect(
+      intensive_parameter_sweep(params, degenerate_embedding),
+    ).rejects.toThrow(/all gamma attempts produced degenerate embeddings/);
   });
 });
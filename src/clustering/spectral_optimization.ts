@@ -81,20 +81,15 @@ export async function validation_based_optimization(
 /**
  * The embedding is computed once per gamma and reused across all
  * metric/attempt combinations to avoid redundant eigendecompositions.
+ * `compute_embedding` is typically backed by a `SpectralWorkspace`, so the
+ * gammas share one distance matrix and warm-started eigensolves.
  *
  * @throws {Error} If every gamma value produces a degenerate embedding so that
  *   no valid clustering is found.
  */
 export async function intensive_parameter_sweep(
-  X: tf.Tensor2D,
   params: SpectralClusteringParams,
-  compute_embedding_from_affinity: (
-    affinity_matrix: tf.Tensor2D,
-  ) => Promise<tf.Tensor2D>,
-  compute_affinity_matrix: (
-    X: tf.Tensor2D,
-    params: SpectralClusteringParams,
-  ) => tf.Tensor2D,
+  compute_embedding: (gamma: number) => Promise<tf.Tensor2D>,
 ): Promise<OptimizationResult> {
   const validation_module = await import('../validation');
   const gamma_range = params.gamma_range ?? [
@@ -118,12 +113,7 @@ export async function intensive_parameter_sweep(
   for (const gamma of gamma_range) {
     let embedding: tf.Tensor2D | null = null;
     try {
-      const affinity_matrix = compute_affinity_matrix(X, { ...params, gamma });
-      try {
-        embedding = await compute_embedding_from_affinity(affinity_matrix);
-      } finally {
-        affinity_matrix.dispose(); // Dispose regardless of embedding success
-      }
+      embedding = await compute_embedding(gamma);
       const km = new KMeans({
         n_clusters: params.n_clusters,
         random_state: params.random_state,
@@ -99,6 +99,7 @@ describe("SpectralClustering – reference parity with scikit-learn", () => {
         gamma?: number;
         n_neighbors?: number;
         random_state: number;
+        assign_labels?: SpectralClusteringParams['assign_labels'];
       };
       labels: number[];
     };
@@ -110,6 +111,7 @@ describe("SpectralClustering – reference parity with scikit-learn", () => {
         random_state: fixture.params.random_state,
         gamma: fixture.params.gamma ?? undefined,
         n_neighbors: fixture.params.n_neighbors ?? undefined,
+        assign_labels: fixture.params.assign_labels ?? undefined,
       };
 
       const model = new SpectralClustering(ctor_params);
@@ -0,0 +1,94 @@
+import * as tf from '../backend/adapter';
+import { SpectralClustering } from './spectral';
+import { make_random_stream } from '../random';
+
+function blobs(n_per: number, centers: number[][], seed: number): number[][] {
+  const rng = make_random_stream(seed);
+  const out: number[][] = [];
+  for (let i = 0; i < n_per; i++) {
+    for (const c of centers) out.push(c.map((v) => v + rng.rand() - 0.5));
+  }
+  return out;
+}
+
+/** True when both labelings induce the same partition. */
+function same_partition(a: number[], b: number[]): boolean {
+  const forward = new Map<number, number>();
+  const backward = new Map<number, number>();
+  for (let i = 0; i < a.length; i++) {
+    if ((forward.get(a[i]) ?? b[i]) !== b[i]) return false;
+    if ((backward.get(b[i]) ?? a[i]) !== a[i]) return false;
+    forward.set(a[i], b[i]);
+    backward.set(b[i], a[i]);
+  }
+  return true;
+}
+
+const CENTERS = [
+  [0, 0],
+  [6, 0],
+  [0, 6],
+  [6, 6],
+];
+
+describe('SpectralClustering.fit_predict_sweep', () => {
+  it('matches separate fits for every k', async () => {
+    const X = blobs(10, CENTERS, 4);
+    const params = { n_clusters: 2, gamma: 0.5, random_state: 7 };
+
+    const sweep = await new SpectralClustering(params).fit_predict_sweep(
+      X,
+      [2, 3, 4],
+    );
+
+    expect(sweep).toHaveLength(3);
+    for (const [i, k] of [2, 3, 4].entries()) {
+      const single = await new SpectralClustering({
+        ...params,
+        n_clusters: k,
+      }).fit_predict(X);
+      expect(new Set(sweep[i]).size).toBe(k);
+      expect(same_partition(sweep[i], single)).toBe(true);
+    }
+  });
+
+  it('mixes component indicators and eigenvectors on disconnected graphs', async () => {
+    // Three disconnected 3-cliques.
+    const n = 9;
+    const affinity = Array.from({ length: n }, (_, i) =>
+      Array.from({ length: n }, (_, j) =>
+        Math.floor(i / 3) === Math.floor(j / 3) ? 1 : 0,
+      ),
+    );
+    const model = new SpectralClustering({
+      n_clusters: 2,
+      affinity: 'precomputed',
+      random_state: 0,
+    });
+    const warn = jest.spyOn(console, 'warn').mockImplementation(() => {});
+    const [three, four] = await model.fit_predict_sweep(affinity, [3, 4]);
+    warn.mockRestore();
+
+    for (let c = 0; c < 3; c++) {
+      expect(new Set(three.slice(3 * c, 3 * c + 3)).size).toBe(1);
+    }
+    expect(new Set(three).size).toBe(3);
+    expect(four).toHaveLength(n);
+    expect(model.labels_).toEqual(four);
+    model.dispose();
+  });
+
+  it('does not leak tensors and validates k_values', async () => {
+    const X = blobs(5, CENTERS, 2);
+    const model = new SpectralClustering({ n_clusters: 2, random_state: 0 });
+    const before = tf.memory().numTensors;
+    await model.fit_predict_sweep(X, [2, 3]);
+    model.dispose();
+    expect(tf.memory().numTensors).toBe(before);
+
+    await expect(model.fit_predict_sweep(X, [2, 21])).rejects.toThrow(
+      'k_values',
+    );
+    expect(tf.memory().numTensors).toBe(before);
+  });
+});
@@ -0,0 +1,94 @@
+import * as tf from '../backend/adapter';
+import { SpectralWorkspace } from './spectral_workspace';
+import { compute_rbf_affinity } from '../graph/affinity';
+import { detect_connected_components } from '../graph/connected_components';
+import { SpectralClustering } from './spectral';
+
+// Three tight groups; pairs inside a group are ≤ 0.1² apart, groups 3 and 6.
+const POINTS = [
+  [0, 0],
+  [0.1, 0],
+  [0, 0.1],
+  [3, 0],
+  [3.1, 0],
+  [3, 0.1],
+  [3, 6],
+  [3.1, 6],
+  [3, 6.1],
+];
+
+describe('SpectralWorkspace', () => {
+  it('derives the RBF affinity from the cached squared distances', () => {
+    const X = tf.tensor2d(POINTS);
+    const workspace = new SpectralWorkspace(X);
+    for (const gamma of [0.1, 1, 5]) {
+      const ours = workspace.rbf_affinity(gamma);
+      const reference = compute_rbf_affinity(X, gamma);
+      const diff = ours.sub(reference).abs().max().dataSync()[0];
+      expect(diff).toBeLessThan(1e-5);
+      ours.dispose();
+      reference.dispose();
+    }
+    workspace.dispose();
+    X.dispose();
+  });
+
+  it('matches dense connected components for every gamma', () => {
+    const X = tf.tensor2d(POINTS);
+    const workspace = new SpectralWorkspace(X);
+    // 0.05 → connected, 0.3 → groups 1+2 split from 3, 5 → all split.
+    for (const gamma of [0.05, 0.3, 5]) {
+      const affinity = compute_rbf_affinity(X, gamma);
+      const expected = detect_connected_components(affinity);
+      const ours = workspace.connected_components(gamma);
+      expect(ours.num_components).toBe(expected.num_components);
+      expect(Array.from(ours.component_labels)).toEqual(
+        Array.from(expected.component_labels),
+      );
+      affinity.dispose();
+    }
+    expect(workspace.connected_components(5).num_components).toBe(3);
+    workspace.dispose();
+    X.dispose();
+  });
+
+  it('returns indicator or eigenvector embeddings without leaking', () => {
+    const X = tf.tensor2d(POINTS);
+    const workspace = new SpectralWorkspace(X);
+    const before = tf.memory().numTensors;
+
+    // Disconnected into 3 components ≥ n_clusters → indicator columns.
+    const indicators = workspace.embedding(5, 3);
+    expect(indicators.shape).toEqual([9, 3]);
+    indicators.dispose();
+
+    // Connected → eigenvector embedding, warm-started on the second call.
+    for (const gamma of [0.05, 0.06]) {
+      const embedding = workspace.embedding(gamma, 3);
+      expect(embedding.shape).toEqual([9, 3]);
+      expect(
+        Array.from(embedding.dataSync()).every((v) => Number.isFinite(v)),
+      ).toBe(true);
+      embedding.dispose();
+    }
+
+    expect(tf.memory().numTensors).toBe(before);
+    workspace.dispose();
+    X.dispose();
+  });
+
+  it('backs the intensive parameter sweep', async () => {
+    const model = new SpectralClustering({
+      n_clusters: 3,
+      intensive_parameter_sweep: true,
+      gamma_range: [0.05, 0.3, 5],
+      random_state: 0,
+    });
+    const labels = await model.fit_predict(POINTS);
+    for (let g = 0; g < 3; g++) {
+      expect(new Set(labels.slice(3 * g, 3 * g + 3)).size).toBe(1);
+    }
+    expect(new Set(labels).size).toBe(3);
+    model.dispose();
+  });
+});
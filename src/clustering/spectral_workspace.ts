@@ -0,0 +1,188 @@
+import * as tf from '../backend/adapter';
+import { pairwise_euclidean_matrix } from '../distance/pairwise_distance';
+import { normalised_laplacian } from '../graph/laplacian';
+import { create_component_indicators } from '../graph/component_indicators';
+import { smallest_eigenvectors_with_values } from '../eigen/smallest_eigenvectors_with_values';
+
+/**
+ * Per-fit cache for RBF spectral embeddings over several gammas.
+ *
+ * Everything that depends only on `X` is computed once: the squared distance
+ * matrix, from which each gamma's affinity is a single elementwise `exp`, and
+ * its minimum spanning tree. An RBF edge survives the connectivity threshold
+ * exactly when its squared distance is below `-ln(tol) / gamma`, so the
+ * components for any gamma follow from the tree edges in O(n) instead of a
+ * dense O(n²) graph search. Consecutive gammas also warm-start Lanczos from
+ * the previous Laplacian eigenvectors.
+ */
+
+/** Affinity threshold of `detect_connected_components`. */
+const CONNECTIVITY_TOL = 1e-2;
+
+export interface WorkspaceComponents {
+  num_components: number;
+  is_fully_connected: boolean;
+  component_labels: Int32Array;
+}
+
+interface SpanningTree {
+  /** Nodes in the order Prim's algorithm added them; `order[0]` is the root. */
+  order: Int32Array;
+  /** Tree parent of each node (`-1` for the root). */
+  parent: Int32Array;
+  /** Squared distance of the edge to `parent`. */
+  weight: Float64Array;
+}
+
+/** Dense Prim's algorithm, O(n²) time and O(n) extra memory. */
+function minimum_spanning_tree(sq: Float32Array, n: number): SpanningTree {
+  const order = new Int32Array(n);
+  const parent = new Int32Array(n).fill(-1);
+  const weight = new Float64Array(n);
+  const best = new Float64Array(n).fill(Infinity);
+  const in_tree = new Uint8Array(n);
+
+  let current = 0;
+  for (let t = 0; t < n; t++) {
+    order[t] = current;
+    in_tree[current] = 1;
+    let next = -1;
+    for (let j = 0; j < n; j++) {
+      if (in_tree[j]) continue;
+      const w = sq[current * n + j];
+      if (w < best[j]) {
+        best[j] = w;
+        parent[j] = current;
+      }
+      if (next === -1 || best[j] < best[next]) next = j;
+    }
+    if (next === -1) break;
+    weight[next] = best[next];
+    current = next;
+  }
+  return { order, parent, weight };
+}
+
+export class SpectralWorkspace {
+  private sq_distances_: tf.Tensor2D;
+
+  private tree_: SpanningTree | null = null;
+
+  private warm_start_: Float64Array | null = null;
+
+  constructor(X: tf.Tensor2D) {
+    this.sq_distances_ = tf.tidy(
+      () => pairwise_euclidean_matrix(X).square() as tf.Tensor2D,
+    );
+  }
+
+  /** Same values as `compute_rbf_affinity(X, gamma)`. */
+  rbf_affinity(gamma: number): tf.Tensor2D {
+    return tf.tidy(
+      () => this.sq_distances_.mul(-gamma).exp() as tf.Tensor2D,
+    );
+  }
+
+  /**
+   * Connected components of the `gamma` affinity graph, labelled in order of
+   * each component's smallest node as `detect_connected_components` does.
+   */
+  connected_components(gamma: number): WorkspaceComponents {
+    if (this.tree_ === null) {
+      const n = this.sq_distances_.shape[0];
+      this.tree_ = minimum_spanning_tree(
+        this.sq_distances_.dataSync() as Float32Array,
+        n,
+      );
+    }
+    const { order, parent, weight } = this.tree_;
+    const n = order.length;
+
+    // Prim order visits every parent before its child.
+    const root_of = new Int32Array(n);
+    for (const v of order) {
+      const p = parent[v];
+      root_of[v] =
+        p !== -1 && Math.exp(-gamma * weight[v]) > CONNECTIVITY_TOL
+          ? root_of[p]
+          : v;
+    }
+
+    const label_of_root = new Map<number, number>();
+    const component_labels = new Int32Array(n);
+    for (let i = 0; i < n; i++) {
+      let label = label_of_root.get(root_of[i]);
+      if (label === undefined) {
+        label = label_of_root.size;
+        label_of_root.set(root_of[i], label);
+      }
+      component_labels[i] = label;
+    }
+
+    const num_components = label_of_root.size;
+    return {
+      num_components,
+      is_fully_connected: num_components === 1,
+      component_labels,
+    };
+  }
+
+  /**
+   * Spectral embedding for one gamma, matching the exact dense pipeline:
+   * component indicators when the graph splits into at least `n_clusters`
+   * pieces, otherwise the smallest normalized-Laplacian eigenvectors divided
+   * by `D^{1/2}`.
+   */
+  embedding(gamma: number, n_clusters: number): tf.Tensor2D {
+    const { num_components, is_fully_connected, component_labels } =
+      this.connected_components(gamma);
+
+    if (!is_fully_connected && num_components >= n_clusters) {
+      return create_component_indicators(
+        component_labels,
+        num_components,
+        num_components,
+      );
+    }
+
+    const affinity = this.rbf_affinity(gamma);
+    const { laplacian, sqrt_degrees } = tf.tidy(() =>
+      normalised_laplacian(affinity, true),
+    );
+    affinity.dispose();
+
+    const num_eigenvectors = Math.max(n_clusters, num_components);
+    const { eigenvectors: U_full, eigenvalues } =
+      smallest_eigenvectors_with_values(laplacian, num_eigenvectors, {
+        initial_vector: this.warm_start_ ?? undefined,
+      });
+    laplacian.dispose();
+    eigenvalues.dispose();
+
+    // Next gamma starts from the sum of this gamma's wanted eigenvectors.
+    const [n, cols] = U_full.shape;
+    const data = U_full.dataSync();
+    const warm = new Float64Array(n);
+    for (let i = 0; i < n; i++) {
+      for (let c = 0; c < num_eigenvectors && c < cols; c++) {
+        warm[i] += data[i * cols + c];
+      }
+    }
+    this.warm_start_ = warm;
+
+    const embedding = tf.tidy(() => {
+      const U_selected = tf.slice(U_full, [0, 0], [-1, n_clusters]);
+      // sqrt_degrees is D^{-1/2}, so dividing by D^{1/2} is a multiply.
+      return U_selected.mul(sqrt_degrees.reshape([-1, 1])) as tf.Tensor2D;
+    });
+    U_full.dispose();
+    sqrt_degrees.dispose();
+    return embedding;
+  }
+
+  dispose(): void {
+    this.sq_distances_.dispose();
+    this.tree_ = null;
+    this.warm_start_ = null;
+  }
+}
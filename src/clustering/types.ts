@@ -1,12 +1,28 @@
 import * as tf from '../backend/adapter';
 
 /**
- * Allowing both `tf.Tensor2D` and plain nested arrays keeps the public API
- * flexible while internal paths can use the tensor directly.
+ * Row-major `n × d` samples in one typed array. Large inputs skip the nested
+ * arrays entirely: float32 data can back a tensor directly and float64 data
+ * feeds the float64 CPU paths as is, so neither should be mutated while an
+ * estimator uses it.
  */
-export type DataMatrix = tf.Tensor2D | number[][];
+export interface FlatMatrix {
+  data: Float32Array | Float64Array;
+  shape: [number, number];
+}
+
+/**
+ * Allowing `tf.Tensor2D`, plain nested arrays and flat typed arrays keeps the
+ * public API flexible while internal paths can use the tensor directly.
+ */
+export type DataMatrix = tf.Tensor2D | number[][] | FlatMatrix;
 
-export type LabelVector = tf.Tensor1D | number[];
+export type LabelVector = tf.Tensor1D | number[] | Int32Array;
+
+export interface FitPredictOptions {
+  /** Return the labels as an `Int32Array` instead of `number[]`. */
+  int32_labels?: boolean;
+}
 
 export type ClusteringMetric = 'euclidean' | 'manhattan' | 'cosine';
 
@@ -42,6 +58,51 @@ export interface KMeansParams extends BaseClusteringParams {
    * standard Lloyd.
    */
   metric?: 'euclidean' | 'cosine';
+
+  /**
+   * - `'lloyd'` (default): full assignment sweep on the TensorFlow.js backend
+   * - `'elkan'`: float64 Lloyd on the CPU with per-centroid lower bounds
+   *   (`n×K` memory); prunes the most distance evaluations
+   * - `'hamerly'`: as `'elkan'` with one lower bound per point (`n` memory);
+   *   better suited to low-dimensional data or very large `n·K`
+   *
+   * The bounded variants only skip distances the triangle inequality proves
+   * irrelevant, so they return the same partition as a float64 Lloyd sweep.
+   * Euclidean metric only.
+   */
+  algorithm?: 'lloyd' | 'elkan' | 'hamerly';
+}
+
+export interface MiniBatchKMeansParams extends BaseClusteringParams {
+  /** Samples per mini-batch update. Default 1024. */
+  batch_size?: number;
+
+  /** Passes over the data in `fit`, in units of `n_samples / batch_size` steps. Default 100. */
+  max_iter?: number;
+
+  /**
+   * Stop `fit` when the squared centroid movement of a step falls to
+   * `tol × mean feature variance`. Default 0 (disabled), as in scikit-learn.
+   */
+  tol?: number;
+
+  /**
+   * Stop `fit` after this many consecutive steps without improving the
+   * smoothed mini-batch inertia. Default 10; `null` disables the check.
+   */
+  max_no_improvement?: number | null;
+
+  /**
+   * Size of the random sample k-means++ is seeded on. Default
+   * `3 × batch_size`, raised to `3 × n_clusters` when smaller than `n_clusters`.
+   */
+  init_size?: number;
+
+  /**
+   * Number of k-means++ seedings tried on the init sample; the one with the
+   * lowest sample inertia is kept. Default 3.
+   */
+  n_init?: number;
 }
 
 export interface SpectralClusteringParams extends BaseClusteringParams {
@@ -69,6 +130,13 @@ export interface SpectralClusteringParams extends BaseClusteringParams {
    */
   n_init?: number;
 
+  /**
+   * How labels are read off the embedding. `'kmeans'` (default) runs k-means
+   * with `n_init` restarts; `'cluster_qr'` (deterministic) and `'discretize'`
+   * assign in a single O(n·k²) pass and ignore `n_init`.
+   */
+  assign_labels?: 'kmeans' | 'cluster_qr' | 'discretize';
+
   /**
    * Tries multiple k-means initialisations and selects the best by
    * Calinski-Harabász score. Particularly useful for 3+ cluster problems.
@@ -99,9 +167,20 @@ export interface SpectralClusteringParams extends BaseClusteringParams {
 
   /**
    * Spectral clustering requires O(n²) memory for the affinity matrix; raise
-   * this only if you have sufficient memory. Default: 10 000.
+   * this only if you have sufficient memory. Default: 10 000. Not applied
+   * with `affinity_approximation: 'nystrom'`.
    */
   max_samples?: number;
+
+  /**
+   * `'nystrom'` approximates the `'rbf'` or `'cosine'` affinity from
+   * `n_landmarks` sampled rows, so memory is O(n·m) instead of O(n²).
+   * Exact (dense) affinity when unset.
+   */
+  affinity_approximation?: 'nystrom';
+
+  /** Landmark rows for the Nyström approximation. Default 300 (capped at n). */
+  n_landmarks?: number;
 }
 
 export interface HDBSCANParams extends CoreClusteringParams {
@@ -166,7 +245,14 @@ export interface BaseClustering<
   /** Async because underlying operations (GPU kernels, web workers) may not complete synchronously. */
   fit(X: DataMatrix): Promise<void>;
 
-  fit_predict(X: DataMatrix): Promise<number[]>;
+  fit_predict(
+    X: DataMatrix,
+    options?: FitPredictOptions & { int32_labels?: false },
+  ): Promise<number[]>;
+  fit_predict(
+    X: DataMatrix,
+    options: FitPredictOptions & { int32_labels: true },
+  ): Promise<Int32Array>;
 }
 
 export type SOMTopology = 'rectangular' | 'hexagonal';
@@ -175,6 +261,8 @@ export type SOMNeighborhood = 'gaussian' | 'bubble' | 'mexican_hat';
 
 export type SOMInitialization = 'random' | 'linear' | 'pca';
 
+export type SOMTrainingMode = 'mini_batch' | 'batch';
+
 export type DecayFunction = (epoch: number, total_epochs: number) => number;
 
 /**
@@ -220,6 +308,15 @@ export interface SOMParams extends CoreClusteringParams {
 
   initialization?: SOMInitialization;
 
+  /**
+   * - `'mini_batch'`: shuffled mini-batch updates scaled by `learning_rate`
+   * - `'batch'`: Kohonen batch SOM; each epoch sets every neuron to the
+   *   neighbourhood-weighted mean of all samples. Ignores `learning_rate`
+   *   and cannot be combined with `online_mode`.
+   * Default: `'mini_batch'`
+   */
+  training_mode?: SOMTrainingMode;
+
   online_mode?: boolean;
 
   /** Only used when `online_mode` is true. Default: 32. */
@@ -236,6 +333,21 @@ export interface SOMParams extends CoreClusteringParams {
    * match the training data; a mismatch throws at fit time.
    */
   initial_weights?: number[][][];
+
+  /**
+   * Maintain per-neuron hit counts and error sums from the BMUs found during
+   * training, and cache the U-matrix between calls. Lets `get_live_stats`,
+   * `get_u_matrix` and the visualization helpers (called without data) run
+   * without a pass over the samples. Default: false.
+   */
+  live_stats?: boolean;
+
+  /**
+   * With `live_stats`, a neuron's cached U-matrix entries are recomputed only
+   * once its weights moved by more than this (max-abs) since the last
+   * refresh. Default: 1e-4.
+   */
+  live_stats_tol?: number;
 }
 
 export interface SOMState {
@@ -252,6 +364,46 @@ export interface SOMClusterOptions {
   metric?: 'euclidean' | 'manhattan' | 'cosine';
 }
 
+/**
+ * One item of a `SOM.fit_stream` source: rows as `number[][]`, or a flat
+ * row-major `Float32Array` block (a single sample when its length equals the
+ * feature count).
+ */
+export type SOMStreamChunk = Float32Array | number[][];
+
+export interface SOMStreamingStats {
+  total_samples: number;
+  virtual_epoch: number;
+  current_learning_rate: number;
+  current_radius: number;
+  latest_quantization_error: number;
+}
+
+export interface SOMStreamOptions {
+  /** Rows per training step. Default: `mini_batch_size`. */
+  batch_size?: number;
+
+  /**
+   * Row width for flat `Float32Array` chunks. Only needed when the SOM has
+   * no weights yet and the stream does not start with `number[][]` rows.
+   */
+  n_features?: number;
+
+  /** Called with `get_streaming_stats()` every `stats_interval` batches. */
+  on_stats?: (stats: SOMStreamingStats) => void;
+
+  /** Default: 100. */
+  stats_interval?: number;
+}
+
+export interface SOMLiveStats {
+  /** Samples whose BMU was each neuron, `[grid_height][grid_width]`. */
+  hit_counts: number[][];
+  /** Summed sample-to-BMU distance per neuron. */
+  error_sums: number[][];
+  samples_seen: number;
+}
+
 export interface SOMMetrics {
   /** Average distance between samples and their Best Matching Units (BMUs). */
   quantization_error: number;
@@ -1,5 +1,5 @@
 import type { CoreClusteringParams, DataMatrix } from '../clustering/types';
-import { is_tensor } from '../tensor/tensor_guards';
+import { matrix_shape, to_float64_sync } from '../tensor/data_matrix';
 import { make_random_stream } from '../random';
 
 /**
@@ -32,12 +32,6 @@ export interface EigResult {
   eigenvalues: number[];
 }
 
-function to_array(X: DataMatrix): number[][] {
-  return is_tensor(X)
-    ? (X.arraySync() as number[][])
-    : (X as number[][]);
-}
-
 /**
  * Top-`k` eigenvectors/eigenvalues of a symmetric matrix via power iteration
  * with deflation. Deterministic for a fixed `random_state`. Shared by
@@ -120,27 +114,29 @@ export class PCA {
   }
 
   fit(X: DataMatrix): this {
-    const data = to_array(X);
-    const n = data.length;
+    const [n, d] = matrix_shape(X);
     if (n === 0) throw new Error('Input data must contain at least one sample.');
-    const d = data[0].length;
     if (this.params.n_components > d) {
       throw new Error(
         `n_components (${this.params.n_components}) cannot exceed the number of features (${d}).`,
       );
     }
+    const data = to_float64_sync(X);
 
     const mean = new Array<number>(d).fill(0);
-    for (const row of data) for (let j = 0; j < d; j++) mean[j] += row[j];
+    for (let i = 0; i < n; i++) {
+      for (let j = 0; j < d; j++) mean[j] += data[i * d + j];
+    }
     for (let j = 0; j < d; j++) mean[j] /= n;
-    const centered = data.map((row) => row.map((v, j) => v - mean[j]));
 
     // Covariance = Xcᵀ Xc / (n - 1) (sklearn convention).
     const denom = n > 1 ? n - 1 : 1;
     const cov: number[][] = Array.from({ length: d }, () =>
       new Array<number>(d).fill(0),
     );
-    for (const row of centered) {
+    const row = new Float64Array(d);
+    for (let r = 0; r < n; r++) {
+      for (let j = 0; j < d; j++) row[j] = data[r * d + j] - mean[j];
       for (let i = 0; i < d; i++) {
         const ri = row[i];
         if (ri === 0) continue;
@@ -172,11 +168,13 @@ export class PCA {
     if (this.components_ == null || this.mean_ == null) {
       throw new Error('PCA.transform called before fit().');
     }
-    const data = to_array(X);
+    const [n, d] = matrix_shape(X);
+    const data = to_float64_sync(X);
     const mean = this.mean_;
     const comps = this.components_;
-    return data.map((row) => {
-      const centered = row.map((v, j) => v - mean[j]);
+    const centered = new Float64Array(d);
+    return Array.from({ length: n }, (_, i) => {
+      for (let j = 0; j < d; j++) centered[j] = data[i * d + j] - mean[j];
       return comps.map((comp) => {
         let s = 0;
         for (let j = 0; j < comp.length; j++) s += centered[j] * comp[j];
@@ -194,14 +192,15 @@ export class PCA {
     if (this.components_ == null || this.mean_ == null) {
       throw new Error('PCA.inverse_transform called before fit().');
     }
-    const data = to_array(Z);
+    const [n, n_comps] = matrix_shape(Z);
+    const data = to_float64_sync(Z);
     const mean = this.mean_;
     const comps = this.components_;
     const d = mean.length;
-    return data.map((z) => {
+    return Array.from({ length: n }, (_, i) => {
       const out = new Array<number>(d).fill(0);
       for (let c = 0; c < comps.length; c++) {
-        const zc = z[c];
+        const zc = data[i * n_comps + c];
         const comp = comps[c];
         for (let j = 0; j < d; j++) out[j] += zc * comp[j];
       }
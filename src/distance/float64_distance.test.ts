@@ -0,0 +1,155 @@
+import fs from "fs";
+import path from "path";
+
+import {
+  pairwise_distances_f64,
+  rows_to_float64,
+  condensed_index,
+  type Float64DistanceMetric,
+} from "./float64_distance";
+
+const FIXTURE_DIR = path.join(process.cwd(), "__fixtures__", "agglomerative");
+
+function load_X(file: string): number[][] {
+  return (
+    JSON.parse(fs.readFileSync(path.join(FIXTURE_DIR, file), "utf-8")) as {
+      X: number[][];
+    }
+  ).X;
+}
+
+// Straight nested-loop reference with scipy pdist's per-pair summation order.
+function naive(X: number[][], metric: Float64DistanceMetric): Float64Array {
+  const n = X.length;
+  const d = X[0].length;
+  const D = new Float64Array(n * n);
+  const norms = X.map((r) => Math.sqrt(r.reduce((s, v) => s + v * v, 0)));
+  for (let i = 0; i < n; i++) {
+    for (let j = i + 1; j < n; j++) {
+      let v = 0;
+      if (metric === "euclidean") {
+        for (let k = 0; k < d; k++) {
+          const diff = X[i][k] - X[j][k];
+          v += diff * diff;
+        }
+        v = Math.sqrt(v);
+      } else if (metric === "manhattan") {
+        for (let k = 0; k < d; k++) v += Math.abs(X[i][k] - X[j][k]);
+      } else {
+        let dot = 0;
+        for (let k = 0; k < d; k++) dot += X[i][k] * X[j][k];
+        const denom = norms[i] * norms[j];
+        v = denom === 0 ? 0 : 1 - dot / denom;
+      }
+      D[i * n + j] = v;
+      D[j * n + i] = v;
+    }
+  }
+  return D;
+}
+
+function random_rows(n: number, d: number, seed: number): number[][] {
+  let s = seed;
+  const next = (): number => {
+    s = (s * 1103515245 + 12345) % 2147483648;
+    return s / 2147483648 - 0.5;
+  };
+  return Array.from({ length: n }, () => Array.from({ length: d }, next));
+}
+
+describe("pairwise_distances_f64", () => {
+  const EUCLIDEAN_X = load_X("blobs_n3_ward_euclidean.json");
+  const COSINE_X = load_X("blobs_n3_average_cosine.json");
+
+  const CASES: { metric: Float64DistanceMetric; X: number[][] }[] = [
+    { metric: "euclidean", X: EUCLIDEAN_X },
+    { metric: "manhattan", X: EUCLIDEAN_X },
+    { metric: "cosine", X: COSINE_X },
+  ];
+
+  for (const { metric, X } of CASES) {
+    it(`${metric}: |D − Dᵀ|_max < 1e-10 and diag(D) = 0`, () => {
+      const n = X.length;
+      const D = pairwise_distances_f64(rows_to_float64(X), n, X[0].length, metric);
+
+      let max_asymmetry = 0;
+      for (let i = 0; i < n; i++) {
+        expect(D[i * n + i]).toBe(0);
+        for (let j = i + 1; j < n; j++) {
+          const diff = Math.abs(D[i * n + j] - D[j * n + i]);
+          if (diff > max_asymmetry) max_asymmetry = diff;
+        }
+      }
+      expect(max_asymmetry).toBeLessThan(1e-10);
+    });
+
+    it(`${metric}: bit-identical to the nested-loop reference across tiles`, () => {
+      // n and d large enough that the rows span several tiles.
+      const rows = metric === "cosine" ? COSINE_X : random_rows(300, 96, 7);
+      const D = pairwise_distances_f64(
+        rows_to_float64(rows),
+        rows.length,
+        rows[0].length,
+        metric,
+      );
+      expect(Array.from(D)).toEqual(Array.from(naive(rows, metric)));
+    });
+  }
+
+  it("condensed layout follows scipy pdist order", () => {
+    const X = random_rows(37, 5, 3);
+    const n = X.length;
+    const dense = pairwise_distances_f64(rows_to_float64(X), n, 5);
+    const condensed = pairwise_distances_f64(rows_to_float64(X), n, 5, "euclidean", {
+      layout: "condensed",
+    });
+    expect(condensed.length).toBe((n * (n - 1)) / 2);
+    let p = 0;
+    for (let i = 0; i < n; i++) {
+      for (let j = i + 1; j < n; j++) {
+        expect(condensed_index(i, j, n)).toBe(p);
+        expect(condensed[p]).toBe(dense[i * n + j]);
+        p++;
+      }
+    }
+  });
+
+  it("gram method agrees with exact and keeps near-duplicates at zero", () => {
+    const X = random_rows(120, 128, 11).map((r) => r.map((v) => v + 1000));
+    // Exact duplicate and a near-duplicate pair, where the raw expansion cancels.
+    X[5] = X[4].slice();
+    X[7] = X[6].map((v, k) => (k === 0 ? v + 1e-9 : v));
+    const flat = rows_to_float64(X);
+    const exact = pairwise_distances_f64(flat, 120, 128);
+    const gram = pairwise_distances_f64(flat, 120, 128, "euclidean", {
+      method: "gram",
+    });
+    for (let p = 0; p < exact.length; p++) {
+      expect(Math.abs(gram[p] - exact[p])).toBeLessThan(1e-9 * (1 + exact[p]));
+    }
+    expect(gram[4 * 120 + 5]).toBe(0);
+    expect(gram[6 * 120 + 7]).toBe(exact[6 * 120 + 7]);
+  });
+
+  it("cosine: a zero-norm row has distance 0 to everything", () => {
+    const D = pairwise_distances_f64(
+      rows_to_float64([[0, 0], [1, 0], [0, 2]]),
+      3,
+      2,
+      "cosine",
+    );
+    expect(D[1]).toBe(0);
+    expect(D[2]).toBe(0);
+    expect(D[1 * 3 + 2]).toBe(1);
+  });
+
+  it("rejects a length that does not match the shape", () => {
+    expect(() => pairwise_distances_f64(new Float64Array(5), 2, 3)).toThrow(
+      "does not match shape",
+    );
+  });
+
+  it("rows_to_float64 rejects ragged rows", () => {
+    expect(() => rows_to_float64([[1, 2], [3]])).toThrow("rectangular");
+  });
+});
@@ -0,0 +1,160 @@
+/**
+ * Float64 pairwise distances over a row-major `Float64Array`.
+ *
+ * The tensor helpers in `pairwise_distance.ts` run in float32 on the tfjs
+ * backend. Agglomerative clustering needs float64 for tie resolution and
+ * uses this kernel instead of walking `number[][]` rows, which keeps the
+ * inner loops on contiguous typed memory.
+ *
+ * The i/j loops are tiled so a tile of rows stays cache-resident while it is
+ * paired with every other tile; only the upper triangle is computed and
+ * mirrored, so `D[i,j] ≡ D[j,i]` exactly and the diagonal is exactly zero.
+ */
+
+export type Float64DistanceMetric = 'euclidean' | 'manhattan' | 'cosine';
+
+export interface Float64DistanceOptions {
+  /**
+   * - `'dense'`: `n×n` row-major (`i*n+j`), the NN-chain layout (default)
+   * - `'condensed'`: scipy `pdist` order, length `n(n−1)/2`
+   */
+  layout?: 'dense' | 'condensed';
+
+  /**
+   * Euclidean only.
+   * - `'exact'`: per-pair `Σ(xᵢ−yᵢ)²` in feature order, bit-identical to
+   *   scipy's `pdist` (default)
+   * - `'gram'`: `‖x‖²+‖y‖²−2x·y` with the cancellation-prone pairs recomputed
+   *   exactly; faster for wide rows but not bit-identical in the last ulp
+   */
+  method?: 'exact' | 'gram';
+}
+
+/** Target bytes of row data per tile; two tiles should sit comfortably in L2. */
+const TILE_BYTES = 64 * 1024;
+
+/**
+ * In `'gram'` mode a squared distance below this fraction of `‖x‖²+‖y‖²` has
+ * lost most of its significant bits to cancellation and is recomputed from
+ * the coordinate differences.
+ */
+const GRAM_RECOMPUTE_RATIO = 1e-6;
+
+/** Flattens `number[][]` rows into a row-major `Float64Array`. */
+export function rows_to_float64(rows: number[][]): Float64Array {
+  const n = rows.length;
+  const d = n > 0 ? rows[0].length : 0;
+  const out = new Float64Array(n * d);
+  for (let i = 0; i < n; i++) {
+    const row = rows[i];
+    if (row.length !== d) {
+      throw new Error(
+        'Input data must be rectangular: every sample needs the same feature count.',
+      );
+    }
+    out.set(row, i * d);
+  }
+  return out;
+}
+
+/** Position of pair `(i, j)`, `i < j`, in a condensed (scipy `pdist`) vector. */
+export function condensed_index(i: number, j: number, n: number): number {
+  return n * i - (i * (i + 1)) / 2 + (j - i - 1);
+}
+
+/**
+ * @param data Row-major samples, length `n·d`.
+ * @throws {Error} If `data.length !== n·d`.
+ */
+export function pairwise_distances_f64(
+  data: Float64Array,
+  n: number,
+  d: number,
+  metric: Float64DistanceMetric = 'euclidean',
+  options: Float64DistanceOptions = {},
+): Float64Array {
+  if (data.length !== n * d) {
+    throw new Error(
+      `data length (${data.length}) does not match shape [${n}, ${d}].`,
+    );
+  }
+  const { layout = 'dense', method = 'exact' } = options;
+  const condensed = layout === 'condensed';
+  const out = new Float64Array(condensed ? (n * (n - 1)) / 2 : n * n);
+  if (n < 2) return out;
+
+  const store = (i: number, j: number, v: number): void => {
+    if (condensed) {
+      out[condensed_index(i, j, n)] = v;
+    } else {
+      out[i * n + j] = v;
+      out[j * n + i] = v;
+    }
+  };
+
+  const tile = Math.max(8, Math.floor(TILE_BYTES / (8 * Math.max(d, 1))));
+
+  // ‖x‖² for the gram expansion, ‖x‖ for cosine.
+  let norms: Float64Array | null = null;
+  if (metric === 'cosine' || (metric === 'euclidean' && method === 'gram')) {
+    norms = new Float64Array(n);
+    for (let i = 0; i < n; i++) {
+      const off = i * d;
+      let sq = 0;
+      for (let k = 0; k < d; k++) sq += data[off + k] * data[off + k];
+      norms[i] = metric === 'cosine' ? Math.sqrt(sq) : sq;
+    }
+  }
+
+  for (let i0 = 0; i0 < n; i0 += tile) {
+    const i1 = Math.min(i0 + tile, n);
+    for (let j0 = i0; j0 < n; j0 += tile) {
+      const j1 = Math.min(j0 + tile, n);
+      for (let i = i0; i < i1; i++) {
+        const oi = i * d;
+        for (let j = Math.max(j0, i + 1); j < j1; j++) {
+          const oj = j * d;
+          let v: number;
+          if (metric === 'manhattan') {
+            v = 0;
+            for (let k = 0; k < d; k++) v += Math.abs(data[oi + k] - data[oj + k]);
+          } else if (metric === 'cosine') {
+            // 1 − (xᵢ·xⱼ) / (‖xᵢ‖·‖xⱼ‖); a zero-norm vector yields distance 0.
+            let dot = 0;
+            for (let k = 0; k < d; k++) dot += data[oi + k] * data[oj + k];
+            const denom = norms![i] * norms![j];
+            v = denom === 0 ? 0 : 1 - dot / denom;
+          } else if (method === 'gram') {
+            let dot = 0;
+            for (let k = 0; k < d; k++) dot += data[oi + k] * data[oj + k];
+            const scale = norms![i] + norms![j];
+            let sq = scale - 2 * dot;
+            if (sq < GRAM_RECOMPUTE_RATIO * scale) {
+              sq = squared_euclidean(data, oi, oj, d);
+            }
+            v = Math.sqrt(sq);
+          } else {
+            v = Math.sqrt(squared_euclidean(data, oi, oj, d));
+          }
+          store(i, j, v);
+        }
+      }
+    }
+  }
+
+  return out;
+}
+
+function squared_euclidean(
+  data: Float64Array,
+  oi: number,
+  oj: number,
+  d: number,
+): number {
+  let sum = 0;
+  for (let k = 0; k < d; k++) {
+    const diff = data[oi + k] - data[oj + k];
+    sum += diff * diff;
+  }
+  return sum;
+}
@@ -0,0 +1,147 @@
+import {
+  apply_householder_q,
+  count_tridiagonal_eigenvalues_below,
+  householder_tridiagonalize,
+  symmetric_eigen,
+} from './householder';
+import { make_random_stream } from '../random';
+
+function random_symmetric(m: number, seed: number): Float64Array {
+  const rng = make_random_stream(seed);
+  const A = new Float64Array(m * m);
+  for (let i = 0; i < m; i++) {
+    for (let j = i; j < m; j++) {
+      const v = rng.rand() - 0.5;
+      A[i * m + j] = v;
+      A[j * m + i] = v;
+    }
+  }
+  return A;
+}
+
+describe('Householder symmetric eigensolver', () => {
+  it('tridiagonalizes with an orthogonal Q such that A = Q T Qᵀ', () => {
+    const m = 12;
+    const A = random_symmetric(m, 7);
+    const tri = householder_tridiagonalize(A, m);
+    const { diagonal, off_diagonal } = tri;
+    const Q = new Float64Array(m * m);
+    for (let i = 0; i < m; i++) Q[i * m + i] = 1;
+    apply_householder_q(tri, Q, m);
+
+    const T = new Float64Array(m * m);
+    for (let i = 0; i < m; i++) T[i * m + i] = diagonal[i];
+    for (let i = 0; i < m - 1; i++) {
+      T[(i + 1) * m + i] = off_diagonal[i];
+      T[i * m + i + 1] = off_diagonal[i];
+    }
+
+    for (let i = 0; i < m; i++) {
+      for (let j = 0; j < m; j++) {
+        let qtq = 0;
+        let recon = 0;
+        for (let r = 0; r < m; r++) {
+          qtq += Q[r * m + i] * Q[r * m + j];
+          for (let s = 0; s < m; s++) {
+            recon += Q[i * m + r] * T[r * m + s] * Q[j * m + s];
+          }
+        }
+        expect(qtq).toBeCloseTo(i === j ? 1 : 0, 10);
+        expect(recon).toBeCloseTo(A[i * m + j], 10);
+      }
+    }
+  });
+
+  it('returns ascending eigenpairs with small residuals', () => {
+    const m = 30;
+    const A = random_symmetric(m, 42);
+    const { values, vectors } = symmetric_eigen(A, m);
+
+    for (let c = 1; c < m; c++) {
+      expect(values[c]).toBeGreaterThanOrEqual(values[c - 1]);
+    }
+    for (let c = 0; c < m; c++) {
+      let norm_sq = 0;
+      for (let r = 0; r < m; r++) {
+        let av = 0;
+        for (let j = 0; j < m; j++) av += A[r * m + j] * vectors[j * m + c];
+        const res = av - values[c] * vectors[r * m + c];
+        expect(Math.abs(res)).toBeLessThan(1e-10);
+        norm_sq += vectors[r * m + c] * vectors[r * m + c];
+      }
+      expect(norm_sq).toBeCloseTo(1, 10);
+    }
+  });
+
+  it('returns only the k smallest eigenpairs by bisection', () => {
+    const m = 40;
+    const k = 6;
+    const A = random_symmetric(m, 3);
+    const full = symmetric_eigen(A, m);
+    const partial = symmetric_eigen(A, m, k);
+
+    expect(partial.values).toHaveLength(k);
+    expect(partial.vectors).toHaveLength(m * k);
+    for (let c = 0; c < k; c++) {
+      expect(partial.values[c]).toBeCloseTo(full.values[c], 12);
+      let dot = 0;
+      for (let r = 0; r < m; r++) {
+        dot += partial.vectors[r * k + c] * full.vectors[r * m + c];
+      }
+      expect(Math.abs(dot)).toBeCloseTo(1, 10);
+    }
+  });
+
+  it('keeps repeated eigenvalues of decoupled blocks orthogonal', () => {
+    // Four disconnected 5-cliques: eigenvalue 0 with multiplicity 4.
+    const blocks = 4;
+    const size = 5;
+    const m = blocks * size;
+    const L = new Float64Array(m * m);
+    for (let b = 0; b < blocks; b++) {
+      for (let i = 0; i < size; i++) {
+        for (let j = 0; j < size; j++) {
+          L[(b * size + i) * m + b * size + j] = i === j ? size - 1 : -1;
+        }
+      }
+    }
+
+    const tri = householder_tridiagonalize(L, m);
+    expect(
+      count_tridiagonal_eigenvalues_below(tri.diagonal, tri.off_diagonal, 1e-8),
+    ).toBe(blocks);
+
+    const k = blocks + 1;
+    const { values, vectors } = symmetric_eigen(L, m, k);
+    for (let c = 0; c < blocks; c++) expect(values[c]).toBeCloseTo(0, 12);
+    expect(values[blocks]).toBeCloseTo(size, 12);
+    for (let a = 0; a < k; a++) {
+      for (let b = 0; b < k; b++) {
+        let dot = 0;
+        for (let r = 0; r < m; r++) {
+          dot += vectors[r * k + a] * vectors[r * k + b];
+        }
+        expect(dot).toBeCloseTo(a === b ? 1 : 0, 10);
+      }
+    }
+  });
+
+  it('handles diagonal and 1×1 inputs', () => {
+    const diag = Float64Array.from([3, 0, 0, 0, 1, 0, 0, 0, 2]);
+    expect(Array.from(symmetric_eigen(diag, 3).values)).toEqual([1, 2, 3]);
+    expect(Array.from(symmetric_eigen(diag, 3, 2).values)).toEqual([1, 2]);
+
+    const single = symmetric_eigen(Float64Array.from([5]), 1);
+    expect(single.values[0]).toBe(5);
+    expect(Math.abs(single.vectors[0])).toBe(1);
+  });
+
+  it('validates the shape and k', () => {
+    expect(() => symmetric_eigen(new Float64Array(5), 2)).toThrow(
+      'does not match shape',
+    );
+    expect(() => symmetric_eigen(new Float64Array(4), 2, 3)).toThrow(
+      'must be an integer',
+    );
+  });
+});
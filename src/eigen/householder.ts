@@ -0,0 +1,441 @@
+import { tridiagonal_ql } from './lanczos';
+import { make_random_stream } from '../random';
+import type { RandomStream } from '../random';
+
+export interface SymmetricEigenResult {
+  /** Ascending. */
+  values: Float64Array;
+  /** Row-major `m×k`; column `j` belongs to `values[j]`. */
+  vectors: Float64Array;
+}
+
+export interface HouseholderTridiagonal {
+  m: number;
+  diagonal: Float64Array;
+  /** Sub-diagonal, length `m−1`. */
+  off_diagonal: Float64Array;
+  /**
+   * Row-major `m×m`; row `j` holds the unit vector `v_j` of the reflector
+   * `H_j = I − 2 v_j v_jᵀ` (all zeros when step `j` was skipped), so that
+   * `A = Q T Qᵀ` with `Q = H_0 H_1 ⋯ H_{m−3}`.
+   */
+  reflectors: Float64Array;
+}
+
+interface TridiagonalEigenpair {
+  value: number;
+  /** Index into the list of unreduced blocks. */
+  block: number;
+}
+
+/** Inverse-iteration steps per eigenvector. */
+const INVERSE_ITERATION_MAX = 8;
+/** Eigenvalues closer than this fraction of ‖T‖ are reorthogonalized. */
+const CLUSTER_GAP = 1e-3;
+/** Sturm pivots smaller than this are perturbed (LAPACK's `pivmin`). */
+const PIVOT_MIN = 1e-290;
+
+/**
+ * Reduces the symmetric `m×m` row-major matrix `A` to tridiagonal form
+ * `A = Q T Qᵀ` with Householder reflections (Golub & Van Loan §8.3.1).
+ * `A` is not modified; `Q` is kept in factored form.
+ */
+export function householder_tridiagonalize(
+  A: Float64Array,
+  m: number,
+): HouseholderTridiagonal {
+  const a = Float64Array.from(A);
+  const reflectors = new Float64Array(m * m);
+  const w = new Float64Array(m);
+
+  for (let k = 0; k < m - 2; k++) {
+    // Reflect x = A[k+1:, k] onto (α, 0, …, 0).
+    let x_norm_sq = 0;
+    for (let i = k + 1; i < m; i++) x_norm_sq += a[i * m + k] * a[i * m + k];
+    const x0 = a[(k + 1) * m + k];
+    // Column already tridiagonal.
+    if (x_norm_sq - x0 * x0 === 0) continue;
+
+    const v = reflectors.subarray(k * m, k * m + m);
+    const alpha = x0 >= 0 ? -Math.sqrt(x_norm_sq) : Math.sqrt(x_norm_sq);
+    let v_norm_sq = 0;
+    for (let i = k + 1; i < m; i++) {
+      v[i] = a[i * m + k] - (i === k + 1 ? alpha : 0);
+      v_norm_sq += v[i] * v[i];
+    }
+    const v_norm = Math.sqrt(v_norm_sq);
+    for (let i = k + 1; i < m; i++) v[i] /= v_norm;
+
+    // A₂₂ ← H A₂₂ H = A₂₂ − 2(v wᵀ + w vᵀ),
+    // with p = A₂₂v and w = p − (vᵀp)v.
+    let vp = 0;
+    for (let i = k + 1; i < m; i++) {
+      let p = 0;
+      for (let j = k + 1; j < m; j++) p += a[i * m + j] * v[j];
+      w[i] = p;
+      vp += v[i] * p;
+    }
+    for (let i = k + 1; i < m; i++) w[i] -= vp * v[i];
+    for (let i = k + 1; i < m; i++) {
+      for (let j = k + 1; j < m; j++) {
+        a[i * m + j] -= 2 * (v[i] * w[j] + w[i] * v[j]);
+      }
+    }
+    a[(k + 1) * m + k] = alpha;
+    a[k * m + k + 1] = alpha;
+    for (let i = k + 2; i < m; i++) {
+      a[i * m + k] = 0;
+      a[k * m + i] = 0;
+    }
+  }
+
+  const diagonal = new Float64Array(m);
+  const off_diagonal = new Float64Array(Math.max(m - 1, 0));
+  for (let i = 0; i < m; i++) diagonal[i] = a[i * m + i];
+  for (let i = 0; i < m - 1; i++) off_diagonal[i] = a[(i + 1) * m + i];
+  return { m, diagonal, off_diagonal, reflectors };
+}
+
+/** `Y ← Q·Y` in place for a row-major `m×cols` block `Y`. */
+export function apply_householder_q(
+  tri: HouseholderTridiagonal,
+  Y: Float64Array,
+  cols: number,
+): void {
+  const { m, reflectors } = tri;
+  const dots = new Float64Array(cols);
+  for (let k = m - 3; k >= 0; k--) {
+    const base = k * m;
+    dots.fill(0);
+    for (let i = k + 1; i < m; i++) {
+      const vi = reflectors[base + i];
+      if (vi === 0) continue;
+      const row = i * cols;
+      for (let c = 0; c < cols; c++) dots[c] += vi * Y[row + c];
+    }
+    for (let i = k + 1; i < m; i++) {
+      const vi = 2 * reflectors[base + i];
+      if (vi === 0) continue;
+      const row = i * cols;
+      for (let c = 0; c < cols; c++) Y[row + c] -= vi * dots[c];
+    }
+  }
+}
+
+/**
+ * Sturm count: the number of eigenvalues of the tridiagonal matrix
+ * (`diagonal`, `off_diagonal`) strictly below `x`.
+ */
+export function count_tridiagonal_eigenvalues_below(
+  diagonal: Float64Array,
+  off_diagonal: Float64Array,
+  x: number,
+): number {
+  return sturm_count(diagonal, off_diagonal, 0, diagonal.length, x);
+}
+
+/**
+ * Eigenpairs of `A` from its Householder reduction. `k = m` runs the implicit
+ * QL iteration on `T`; `k < m` finds only the `k` smallest eigenvalues by
+ * Sturm bisection and their eigenvectors by inverse iteration, which costs
+ * `O(k·m)` on `T` instead of `O(m³)`.
+ */
+export function tridiagonal_eigen(
+  tri: HouseholderTridiagonal,
+  k: number = tri.m,
+): SymmetricEigenResult {
+  const { m, diagonal, off_diagonal } = tri;
+  if (!Number.isInteger(k) || k < 0 || k > m) {
+    throw new Error(`k (${k}) must be an integer in [0, ${m}].`);
+  }
+  if (k === 0) {
+    return { values: new Float64Array(0), vectors: new Float64Array(0) };
+  }
+
+  const result =
+    k === m
+      ? ql_eigen(diagonal, off_diagonal)
+      : bisection_eigen(diagonal, off_diagonal, k);
+  apply_householder_q(tri, result.vectors, k);
+  return result;
+}
+
+/**
+ * Eigendecomposition of a symmetric row-major matrix: Householder
+ * tridiagonalization, then QL (all pairs) or bisection with inverse
+ * iteration (the `k` smallest).
+ */
+export function symmetric_eigen(
+  A: Float64Array,
+  m: number,
+  k: number = m,
+): SymmetricEigenResult {
+  if (A.length !== m * m) {
+    throw new Error(
+      `matrix length (${A.length}) does not match shape [${m}, ${m}].`,
+    );
+  }
+  return tridiagonal_eigen(householder_tridiagonalize(A, m), k);
+}
+
+function ql_eigen(
+  diagonal: Float64Array,
+  off_diagonal: Float64Array,
+): SymmetricEigenResult {
+  const m = diagonal.length;
+  const { values, vectors } = tridiagonal_ql(
+    Array.from(diagonal),
+    Array.from(off_diagonal),
+  );
+
+  const order = values.map((_, i) => i).sort((p, q) => values[p] - values[q]);
+  const sorted_values = new Float64Array(m);
+  const sorted_vectors = new Float64Array(m * m);
+  for (let c = 0; c < m; c++) {
+    const src = order[c];
+    sorted_values[c] = values[src];
+    for (let r = 0; r < m; r++) sorted_vectors[r * m + c] = vectors[r][src];
+  }
+  return { values: sorted_values, vectors: sorted_vectors };
+}
+
+/** Largest absolute row sum of the tridiagonal matrix. */
+function tridiagonal_norm(d: Float64Array, e: Float64Array): number {
+  let norm = 0;
+  for (let i = 0; i < d.length; i++) {
+    const row =
+      Math.abs(d[i]) +
+      (i > 0 ? Math.abs(e[i - 1]) : 0) +
+      (i < d.length - 1 ? Math.abs(e[i]) : 0);
+    if (row > norm) norm = row;
+  }
+  return norm;
+}
+
+function sturm_count(
+  d: Float64Array,
+  e: Float64Array,
+  start: number,
+  len: number,
+  x: number,
+): number {
+  let count = 0;
+  let q = 1;
+  for (let i = start; i < start + len; i++) {
+    q = d[i] - x - (i > start ? (e[i - 1] * e[i - 1]) / q : 0);
+    // A zero pivot is perturbed to the negative side, as in LAPACK `dstebz`.
+    if (Math.abs(q) < PIVOT_MIN) q = -PIVOT_MIN;
+    if (q < 0) count++;
+  }
+  return count;
+}
+
+/**
+ * The `k` smallest eigenpairs of a tridiagonal matrix. `T` is first split
+ * at negligible off-diagonals so that repeated eigenvalues from decoupled
+ * blocks get vectors with disjoint support; within a block, inverse
+ * iterates of clustered eigenvalues are reorthogonalized against each other
+ * (as LAPACK `dstein`).
+ */
+function bisection_eigen(
+  diagonal: Float64Array,
+  off_diagonal: Float64Array,
+  k: number,
+): SymmetricEigenResult {
+  const m = diagonal.length;
+  const d = diagonal;
+  const e = Float64Array.from(off_diagonal);
+  const t_norm = tridiagonal_norm(d, e);
+  const split_tol = Number.EPSILON * t_norm;
+
+  const blocks: Array<[number, number]> = [];
+  let block_start = 0;
+  for (let i = 0; i < m - 1; i++) {
+    if (Math.abs(e[i]) <= split_tol) {
+      e[i] = 0;
+      blocks.push([block_start, i + 1 - block_start]);
+      block_start = i + 1;
+    }
+  }
+  blocks.push([block_start, m - block_start]);
+
+  // Candidates from every block, then the k smallest overall. Ties keep
+  // block order, so a diagonal matrix maps to unit vectors in index order.
+  const candidates: TridiagonalEigenpair[] = [];
+  for (let b = 0; b < blocks.length; b++) {
+    const [start, len] = blocks[b];
+    const count = Math.min(k, len);
+    for (let j = 0; j < count; j++) {
+      candidates.push({ value: bisect(d, e, start, len, j), block: b });
+    }
+  }
+  candidates.sort((p, q) => p.value - q.value || p.block - q.block);
+  const chosen = candidates.slice(0, k);
+
+  const values = new Float64Array(k);
+  const vectors = new Float64Array(m * k);
+  const rng = make_random_stream(42);
+  const cluster_tol = CLUSTER_GAP * t_norm;
+
+  for (let b = 0; b < blocks.length; b++) {
+    const [start, len] = blocks[b];
+    const solved: Float64Array[] = [];
+    const solved_values: number[] = [];
+    for (let col = 0; col < k; col++) {
+      if (chosen[col].block !== b) continue;
+      const value = chosen[col].value;
+      const cluster = solved.filter(
+        (_, idx) => Math.abs(solved_values[idx] - value) <= cluster_tol,
+      );
+      const y = inverse_iteration(
+        d,
+        e,
+        start,
+        len,
+        value,
+        cluster,
+        t_norm,
+        rng,
+      );
+      solved.push(y);
+      solved_values.push(value);
+      values[col] = value;
+      for (let i = 0; i < len; i++) vectors[(start + i) * k + col] = y[i];
+    }
+  }
+  return { values, vectors };
+}
+
+/** Eigenvalue `j` (0-based, ascending) of the unreduced block. */
+function bisect(
+  d: Float64Array,
+  e: Float64Array,
+  start: number,
+  len: number,
+  j: number,
+): number {
+  if (len === 1) return d[start];
+
+  // Gershgorin interval.
+  let lo = Number.POSITIVE_INFINITY;
+  let hi = Number.NEGATIVE_INFINITY;
+  for (let i = start; i < start + len; i++) {
+    const radius =
+      (i > start ? Math.abs(e[i - 1]) : 0) +
+      (i < start + len - 1 ? Math.abs(e[i]) : 0);
+    lo = Math.min(lo, d[i] - radius);
+    hi = Math.max(hi, d[i] + radius);
+  }
+  const pad = Number.EPSILON * Math.max(Math.abs(lo), Math.abs(hi), 1);
+  lo -= pad;
+  hi += pad;
+
+  for (let iter = 0; iter < 200; iter++) {
+    const mid = 0.5 * (lo + hi);
+    if (mid === lo || mid === hi) break;
+    if (sturm_count(d, e, start, len, mid) > j) {
+      hi = mid;
+    } else {
+      lo = mid;
+    }
+  }
+  return 0.5 * (lo + hi);
+}
+
+/**
+ * Inverse iteration on the block `T[start:start+len]` shifted by `lambda`,
+ * using a partially pivoted LU of the tridiagonal system.
+ */
+function inverse_iteration(
+  d: Float64Array,
+  e: Float64Array,
+  start: number,
+  len: number,
+  lambda: number,
+  cluster: Float64Array[],
+  t_norm: number,
+  rng: RandomStream,
+): Float64Array {
+  const y = new Float64Array(len);
+  if (len === 1) {
+    y[0] = 1;
+    return y;
+  }
+
+  // LU with partial pivoting: U has two super-diagonals.
+  const u0 = new Float64Array(len);
+  const u1 = new Float64Array(len);
+  const u2 = new Float64Array(len);
+  const mult = new Float64Array(len);
+  const swapped = new Uint8Array(len);
+  const pivot_floor = Number.EPSILON * Math.max(t_norm, PIVOT_MIN);
+
+  let diag = d[start] - lambda;
+  let sup = e[start];
+  for (let i = 0; i < len - 1; i++) {
+    const sub = e[start + i];
+    const next_diag = d[start + i + 1] - lambda;
+    const next_sup = i + 1 < len - 1 ? e[start + i + 1] : 0;
+    if (Math.abs(diag) >= Math.abs(sub)) {
+      const piv = Math.abs(diag) < pivot_floor ? pivot_floor : diag;
+      u0[i] = piv;
+      u1[i] = sup;
+      mult[i] = sub / piv;
+      diag = next_diag - mult[i] * sup;
+      sup = next_sup;
+    } else {
+      swapped[i] = 1;
+      u0[i] = sub;
+      u1[i] = next_diag;
+      u2[i] = next_sup;
+      mult[i] = diag / sub;
+      diag = sup - mult[i] * next_diag;
+      sup = -mult[i] * next_sup;
+    }
+  }
+  u0[len - 1] = Math.abs(diag) < pivot_floor ? pivot_floor : diag;
+
+  const solve = (x: Float64Array): void => {
+    for (let i = 0; i < len - 1; i++) {
+      if (swapped[i]) {
+        const tmp = x[i];
+        x[i] = x[i + 1];
+        x[i + 1] = tmp;
+      }
+      x[i + 1] -= mult[i] * x[i];
+    }
+    x[len - 1] /= u0[len - 1];
+    x[len - 2] = (x[len - 2] - u1[len - 2] * x[len - 1]) / u0[len - 2];
+    for (let i = len - 3; i >= 0; i--) {
+      x[i] = (x[i] - u1[i] * x[i + 1] - u2[i] * x[i + 2]) / u0[i];
+    }
+  };
+
+  const orthonormalize = (): number => {
+    for (const q of cluster) {
+      let dot = 0;
+      for (let i = 0; i < len; i++) dot += q[i] * y[i];
+      for (let i = 0; i < len; i++) y[i] -= dot * q[i];
+    }
+    let norm_sq = 0;
+    for (let i = 0; i < len; i++) norm_sq += y[i] * y[i];
+    const norm = Math.sqrt(norm_sq);
+    if (norm > 0) for (let i = 0; i < len; i++) y[i] /= norm;
+    return norm;
+  };
+
+  for (let i = 0; i < len; i++) y[i] = rng.rand() - 0.5;
+  orthonormalize();
+
+  // ‖(T − λI)⁻¹ y‖ ≈ 1/|λ − λ_true|: once it is large the iterate is
+  // dominated by the wanted eigenvector, and two more steps refine it.
+  const growth_target =
+    1 / (Math.sqrt(Number.EPSILON) * Math.max(t_norm, PIVOT_MIN));
+  let extra = 0;
+  for (let iter = 0; iter < INVERSE_ITERATION_MAX && extra < 2; iter++) {
+    solve(y);
+    const growth = orthonormalize();
+    if (growth >= growth_target) extra++;
+  }
+  return y;
+}
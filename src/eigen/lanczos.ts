@@ -21,6 +21,12 @@ export interface LanczosResult {
 export interface LanczosOperator {
   n: number;
   matvec: (vector: Float64Array) => Float64Array;
+  /**
+   * Optional block product: `block` and the result are row-major `n×b`.
+   * Used by `thick_restart_lanczos` when `block_size > 1`; otherwise
+   * `matvec` is applied column by column.
+   */
+  matmat?: (block: Float64Array, b: number) => Float64Array;
 }
 
 const CONVERGENCE_TOL_DEFAULT = 1e-6;
@@ -420,7 +426,8 @@ function extract_smallest(
 
 
 /**
- * Implicit QL algorithm for symmetric tridiagonal matrices.
+ * Implicit QL algorithm for symmetric tridiagonal matrices. Also the
+ * back end of the dense solver in `householder.ts`.
  *
  * Follows the Numerical Recipes tqli algorithm (Golub & Van Loan §8.3.3).
  * Each outer iteration drives one eigenvalue to convergence via implicit
@@ -430,7 +437,7 @@ function extract_smallest(
  * @param off_diagonal  Sub-diagonal entries (length m-1)
  * @returns            Eigenvalues and column-wise eigenvectors
  */
-function tridiagonal_ql(
+export function tridiagonal_ql(
   diagonal: number[],
   off_diagonal: number[],
 ): { values: number[]; vectors: number[][] } {
@@ -33,8 +33,8 @@ function two_cluster_data(n: number): number[][] {
    ========================================================================= */
 
 describe('smallest_eigenvectors_with_values – path tolerance alignment', () => {
-  it('Jacobi path (n=4): eigenvalue 0.005 is not counted as near-zero', () => {
-    // n=4 ≤ 100 → Jacobi path
+  it('dense path (n=4): eigenvalue 0.005 is not counted as near-zero', () => {
+    // n=4 ≤ 100 → dense path
     // eigenvalues: [0, 0.005, 1.0, 1.5]
     // With NEAR_ZERO_TOL=1e-5: c=1 (only exact 0), slice_cols = min(2+1, 4) = 3
     const M = diagonal_matrix([0, 0.005, 1.0, 1.5]);
@@ -64,7 +64,7 @@ describe('smallest_eigenvectors_with_values – path tolerance alignment', () =>
   });
 
   it('both paths return the same eigenvector count for equivalent eigenvalue structure', () => {
-    // Same leading eigenvalue pattern [0, 0.005, 1.0, …] on a small (Jacobi)
+    // Same leading eigenvalue pattern [0, 0.005, 1.0, …] on a small (dense)
     // and large (Lanczos) matrix must produce the same slice_cols.
     const M_small = diagonal_matrix([0, 0.005, 1.0, 1.5]);
 
@@ -107,7 +107,7 @@ describe('smallest_eigenvectors_with_values – input validation', () => {
 });
 
 describe('smallest_eigenvectors_with_values – eigenvalue content', () => {
-  it('returns the smallest eigenvalues in ascending order (Jacobi path)', () => {
+  it('returns the smallest eigenvalues in ascending order (dense path)', () => {
     // slice_cols = min(k + c, n) = min(2 + 1, 4) = 3, so the three smallest
     // eigenvalues of the diagonal come back ascending.
     const M = diagonal_matrix([1.5, 0, 1.0, 0.005]);
@@ -121,6 +121,37 @@ describe('smallest_eigenvectors_with_values – eigenvalue content', () => {
     result.eigenvalues.dispose();
     M.dispose();
   });
+
+  it('dense path returns eigenpairs with the positive-max sign convention', () => {
+    // Path graph Laplacian: connected, distinct eigenvalues 2 − 2cos(πj/n).
+    const n = 12;
+    const flat = new Array(n * n).fill(0);
+    for (let i = 0; i < n - 1; i++) {
+      flat[i * n + i] += 1;
+      flat[(i + 1) * n + i + 1] += 1;
+      flat[i * n + i + 1] = -1;
+      flat[(i + 1) * n + i] = -1;
+    }
+    const M = tf.tensor2d(flat, [n, n]);
+    const result = smallest_eigenvectors_with_values(M, 3);
+    const vals = result.eigenvalues.dataSync();
+    const vecs = result.eigenvectors.arraySync();
+
+    // c = 1 (the constant vector), so k + c = 4 columns.
+    expect(vals).toHaveLength(4);
+    for (let j = 0; j < 4; j++) {
+      expect(vals[j]).toBeCloseTo(2 - 2 * Math.cos((Math.PI * j) / n), 5);
+      // Odd modes have two extremes of equal magnitude; either may win.
+      const column = vecs.map((row) => row[j]);
+      expect(Math.max(...column)).toBeGreaterThanOrEqual(
+        -Math.min(...column) - 1e-6,
+      );
+    }
+
+    result.eigenvectors.dispose();
+    result.eigenvalues.dispose();
+    M.dispose();
+  });
 });
 
 /* =========================================================================
@@ -149,32 +180,32 @@ describe('smallest_eigenvectors_with_values – >5 near-zero eigenpairs', () =>
   }
 
   it.each([
-    { k: 2, num_blocks: 6, jacobi_block_size: 2, lanczos_block_size: 17 },
-    { k: 6, num_blocks: 6, jacobi_block_size: 2, lanczos_block_size: 17 },
-    { k: 2, num_blocks: 8, jacobi_block_size: 2, lanczos_block_size: 13 },
+    { k: 2, num_blocks: 6, dense_block_size: 2, lanczos_block_size: 17 },
+    { k: 6, num_blocks: 6, dense_block_size: 2, lanczos_block_size: 17 },
+    { k: 2, num_blocks: 8, dense_block_size: 2, lanczos_block_size: 13 },
   ])(
-    'Lanczos (n=$lanczos_block_size×$num_blocks, k=$k, $num_blocks components) matches Jacobi column count',
-    ({ k, num_blocks, jacobi_block_size, lanczos_block_size }) => {
-      // Jacobi path: n = jacobi_block_size * num_blocks ≤ 100
+    'Lanczos (n=$lanczos_block_size×$num_blocks, k=$k, $num_blocks components) matches dense column count',
+    ({ k, num_blocks, dense_block_size, lanczos_block_size }) => {
+      // dense path: n = dense_block_size * num_blocks ≤ 100
       // Lanczos path: n = lanczos_block_size * num_blocks > 100, k < n/3
       // Both must return k + num_blocks columns — the near-zero count matches
       // the number of disconnected components.
       const expected_cols = k + num_blocks;
 
-      const M_jacobi = complete_graph_block_laplacian(jacobi_block_size, num_blocks);
+      const M_dense = complete_graph_block_laplacian(dense_block_size, num_blocks);
       const M_lanczos = complete_graph_block_laplacian(lanczos_block_size, num_blocks);
 
-      const r_jacobi = smallest_eigenvectors_with_values(M_jacobi, k);
+      const r_dense = smallest_eigenvectors_with_values(M_dense, k);
       const r_lanczos = smallest_eigenvectors_with_values(M_lanczos, k);
 
-      expect(r_jacobi.eigenvectors.shape[1]).toBe(expected_cols);
+      expect(r_dense.eigenvectors.shape[1]).toBe(expected_cols);
       expect(r_lanczos.eigenvectors.shape[1]).toBe(expected_cols);
 
-      r_jacobi.eigenvectors.dispose();
-      r_jacobi.eigenvalues.dispose();
+      r_dense.eigenvectors.dispose();
+      r_dense.eigenvalues.dispose();
       r_lanczos.eigenvectors.dispose();
       r_lanczos.eigenvalues.dispose();
-      M_jacobi.dispose();
+      M_dense.dispose();
       M_lanczos.dispose();
     },
   );
@@ -182,14 +213,14 @@ describe('smallest_eigenvectors_with_values – >5 near-zero eigenpairs', () =>
 
 /* =========================================================================
    SpectralClustering yields the same labelling on either side of the n=100
-   solver boundary: n=99 (Jacobi) vs n=101 (Lanczos).
+   solver boundary: n=99 (dense) vs n=101 (Lanczos).
    ========================================================================= */
 
 describe('SpectralClustering – n=99 vs n=101 path boundary equivalence', () => {
   it.each([99, 101])(
     'correctly identifies 2 clusters for n=%i regardless of solver path',
     async (n) => {
-      // n=99 → Jacobi path; n=101 → Lanczos path (n > 100 and k=2 < n/3)
+      // n=99 → dense path; n=101 → Lanczos path (n > 100 and k=2 < n/3)
       const data = two_cluster_data(n);
       const n1 = Math.ceil(n / 2);
 
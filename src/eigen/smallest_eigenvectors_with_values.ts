@@ -1,11 +1,16 @@
 import * as tf from '../backend/adapter';
 import { deterministic_eigenpair_processing } from './post';
-import { lanczos_smallest_eigenpairs, LanczosOperator } from './lanczos';
-import { improved_jacobi_eigen } from './improved';
+import type { LanczosOperator } from './lanczos';
+import { thick_restart_lanczos } from './thick_restart_lanczos';
+import {
+  count_tridiagonal_eigenvalues_below,
+  householder_tridiagonalize,
+  tridiagonal_eigen,
+} from './householder';
 
 /**
- * Size threshold for choosing Lanczos over Jacobi.
- * For n <= threshold, Jacobi is used (proven accurate, fast enough).
+ * Size threshold for choosing Lanczos over the dense solver.
+ * For n <= threshold, the dense Householder solver is used.
  * For n > threshold, Lanczos is used (O(n²·m) vs O(n³)).
  */
 const LANCZOS_THRESHOLD = 100;
@@ -13,7 +18,7 @@ const LANCZOS_THRESHOLD = 100;
 /**
  * Eigenvalues at or below this value are treated as numerically zero when
  * counting near-zero eigenvalues (connected-component detection). Used by
- * both the Lanczos and Jacobi paths so that path routing at n=100 cannot
+ * both the Lanczos and dense paths so that path routing at n=100 cannot
  * change the returned embedding dimension.
  *
  * Value is chosen above the Lanczos convergence tolerance (1e-6) so that
@@ -23,17 +28,29 @@ const LANCZOS_THRESHOLD = 100;
  */
 const NEAR_ZERO_TOL = 1e-5;
 
+/**
+ * Negative eigenvalues of a PSD matrix are clamped to zero; below this the
+ * clamp is reported, as the error exceeds the dense solver's backward error.
+ */
+const DENSE_NEGATIVE_TOL = 1e-12;
+
+export interface SmallestEigenvectorOptions {
+  /** Lanczos start vector; ignored by the dense solver. */
+  initial_vector?: Float64Array;
+}
+
 /**
  * Returns the `k` smallest eigenvectors AND eigenvalues of the provided symmetric matrix.
  * This is needed for spectral embedding normalization (dividing by D^{1/2}).
  *
  * Automatically selects the best eigensolver:
- * - n <= 100: Jacobi (full decomposition, proven accurate)
+ * - n <= 100: Householder tridiagonalization + bisection (dense)
  * - n > 100: Lanczos (iterative, O(n²·m) vs O(n³))
  */
 export function smallest_eigenvectors_with_values(
   matrix: tf.Tensor2D | LanczosOperator,
   k: number,
+  options?: SmallestEigenvectorOptions,
 ): { eigenvectors: tf.Tensor2D; eigenvalues: tf.Tensor1D } {
   if (!Number.isInteger(k) || k < 1) {
     throw new Error('k must be a positive integer.');
@@ -43,14 +60,14 @@ export function smallest_eigenvectors_with_values(
   const n = is_operator ? matrix.n : matrix.shape[0];
 
   if (is_operator) {
-    return lanczos_path(matrix, k, n, false);
+    return lanczos_path(matrix, k, n, false, options?.initial_vector);
   }
 
   if (n > LANCZOS_THRESHOLD && k < n / 3) {
-    return lanczos_path(matrix, k, n, true);
+    return lanczos_path(matrix, k, n, true, options?.initial_vector);
   }
 
-  return jacobi_path(matrix, k);
+  return dense_path(matrix, k);
 }
 
 function is_lanczos_operator(
@@ -62,7 +79,7 @@ function is_lanczos_operator(
   );
 }
 
-function count_near_zeros(eigenvalues: number[]): number {
+function count_near_zeros(eigenvalues: Iterable<number>): number {
   let c = 0;
   for (const v of eigenvalues) {
     if (v <= NEAR_ZERO_TOL) c += 1;
@@ -71,18 +88,19 @@ function count_near_zeros(eigenvalues: number[]): number {
   return c;
 }
 
-/** Falls back to Jacobi if Lanczos fails. */
+/** Falls back to the dense solver if Lanczos fails. */
 function lanczos_path(
   matrix: tf.Tensor2D | LanczosOperator,
   k: number,
   n: number,
-  allow_jacobi_fallback: boolean,
+  allow_dense_fallback: boolean,
+  initial_vector?: Float64Array,
 ): { eigenvectors: tf.Tensor2D; eigenvalues: tf.Tensor1D } {
-  const lanczos_opts = { is_psd: true, random_seed: 42 };
+  const lanczos_opts = { is_psd: true, random_seed: 42, initial_vector };
 
   try {
     let k_cur = Math.min(k + 5, n);
-    let result = lanczos_smallest_eigenpairs(matrix, k_cur, lanczos_opts);
+    let result = thick_restart_lanczos(matrix, k_cur, lanczos_opts);
     let c = count_near_zeros(result.eigenvalues);
     let prev_c = -1;
 
@@ -94,22 +112,21 @@ function lanczos_path(
     while (c > 0 && c > prev_c && k_cur < n) {
       prev_c = c;
       k_cur = Math.min(k_cur + c + 5, n);
-      result = lanczos_smallest_eigenpairs(matrix, k_cur, lanczos_opts);
+      result = thick_restart_lanczos(matrix, k_cur, lanczos_opts);
       c = count_near_zeros(result.eigenvalues);
     }
 
-    const slice_cols = Math.min(k + c, result.eigenvalues.length);
+    const result_cols = result.eigenvalues.length;
+    const slice_cols = Math.min(k + c, result_cols);
 
-    const selected_vecs: number[][] = Array.from(
-      { length: n },
-      () => new Array(slice_cols),
+    const selected_vecs = new Float32Array(n * slice_cols);
+    const selected_vals = new Float32Array(
+      result.eigenvalues.subarray(0, slice_cols),
     );
-    const selected_vals: number[] = new Array(slice_cols);
-
-    for (let col = 0; col < slice_cols; col++) {
-      selected_vals[col] = result.eigenvalues[col];
-      for (let row = 0; row < n; row++) {
-        selected_vecs[row][col] = result.eigenvectors[row][col];
+    for (let row = 0; row < n; row++) {
+      for (let col = 0; col < slice_cols; col++) {
+        selected_vecs[row * slice_cols + col] =
+          result.eigenvectors[row * result_cols + col];
       }
     }
 
@@ -118,54 +135,71 @@ function lanczos_path(
       eigenvalues: tf.tensor1d(selected_vals, 'float32'),
     };
   } catch (err) {
-    if (!allow_jacobi_fallback || is_lanczos_operator(matrix)) {
+    if (!allow_dense_fallback || is_lanczos_operator(matrix)) {
       throw err;
     }
 
     console.warn(
-      `[spectral] Lanczos solver failed, falling back to Jacobi: ${err instanceof Error ? err.message : String(err)}`,
+      `[spectral] Lanczos solver failed, falling back to the dense solver: ${err instanceof Error ? err.message : String(err)}`,
     );
-    return jacobi_path(matrix, k);
+    return dense_path(matrix, k);
   }
 }
 
-function jacobi_path(
+/**
+ * Householder reduction, then only the `k + c` smallest eigenpairs of the
+ * tridiagonal matrix, where the Sturm count `c` of near-zero eigenvalues is
+ * known before any eigenvector is computed.
+ */
+function dense_path(
   matrix: tf.Tensor2D,
   k: number,
 ): { eigenvectors: tf.Tensor2D; eigenvalues: tf.Tensor1D } {
-  return tf.tidy(() => {
-
-    const { eigenvalues, eigenvectors } = improved_jacobi_eigen(matrix, {
-      is_psd: true,
-      max_iterations: 3000,
-      tolerance: 1e-14,
-    });
-
-    const processed = deterministic_eigenpair_processing({
-      eigenvalues,
-      eigenvectors,
-    });
-
-    const c = count_near_zeros(processed.eigenvalues);
-    const n = processed.eigenvectors.length;
-    const slice_cols = Math.min(k + c, n);
-
-    const selected_vecs: number[][] = Array.from(
-      { length: n },
-      () => new Array(slice_cols),
-    );
-    const selected_vals: number[] = new Array(slice_cols);
+  if (matrix.shape.length !== 2 || matrix.shape[0] !== matrix.shape[1]) {
+    throw new Error('Input tensor must be square (n × n).');
+  }
+  const n = matrix.shape[0];
+  const tri = householder_tridiagonalize(
+    Float64Array.from(matrix.dataSync()),
+    n,
+  );
 
-    for (let col = 0; col < slice_cols; col++) {
-      selected_vals[col] = processed.eigenvalues[col];
-      for (let row = 0; row < n; row++) {
-        selected_vecs[row][col] = processed.eigenvectors[row][col];
+  const c = count_tridiagonal_eigenvalues_below(
+    tri.diagonal,
+    tri.off_diagonal,
+    NEAR_ZERO_TOL,
+  );
+  const slice_cols = Math.min(k + c, n);
+  const { values, vectors } = tridiagonal_eigen(tri, slice_cols);
+
+  const eigenvalues: number[] = new Array(slice_cols);
+  for (let col = 0; col < slice_cols; col++) {
+    let v = values[col];
+    if (v < 0) {
+      if (v < -DENSE_NEGATIVE_TOL) {
+        console.warn(
+          `[spectral] Large negative eigenvalue ${v} in PSD matrix (exceeds tolerance ${DENSE_NEGATIVE_TOL}). Clamping to 0.`,
+        );
       }
+      v = 0;
     }
+    eigenvalues[col] = v;
+  }
+  const eigenvectors: number[][] = Array.from({ length: n }, (_, row) =>
+    Array.from(vectors.subarray(row * slice_cols, (row + 1) * slice_cols)),
+  );
 
-    return {
-      eigenvectors: tf.tensor2d(selected_vecs, [n, slice_cols], 'float32'),
-      eigenvalues: tf.tensor1d(selected_vals, 'float32'),
-    };
+  const processed = deterministic_eigenpair_processing({
+    eigenvalues,
+    eigenvectors,
   });
+
+  return {
+    eigenvectors: tf.tensor2d(
+      processed.eigenvectors,
+      [n, slice_cols],
+      'float32',
+    ),
+    eigenvalues: tf.tensor1d(processed.eigenvalues, 'float32'),
+  };
 }
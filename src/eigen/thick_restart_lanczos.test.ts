@@ -0,0 +1,240 @@
+import * as tf from '../backend/adapter';
+import { lanczos_smallest_eigenpairs } from './lanczos';
+import type { LanczosOperator } from './lanczos';
+import { thick_restart_lanczos } from './thick_restart_lanczos';
+import { make_random_stream } from '../random';
+
+function diagonal_operator(diag: number[]): LanczosOperator {
+  return {
+    n: diag.length,
+    matvec(vector: Float64Array): Float64Array {
+      return vector.map((x, i) => x * diag[i]);
+    },
+  };
+}
+
+/**
+ * Normalized Laplacian of `C` dense random clusters joined in a ring by weak
+ * edges: `C` small, closely spaced eigenvalues that plain restarted Lanczos
+ * struggles to separate.
+ */
+function clustered_laplacian(n: number, C: number): LanczosOperator {
+  const rng = make_random_stream(7);
+  const size = n / C;
+  const neighbours: Array<Array<[number, number]>> = Array.from(
+    { length: n },
+    () => [],
+  );
+  const link = (i: number, j: number, w: number): void => {
+    neighbours[i].push([j, w]);
+    neighbours[j].push([i, w]);
+  };
+  for (let i = 0; i < n; i++) {
+    const c = Math.floor(i / size);
+    for (let t = 0; t < 6; t++) {
+      const j = c * size + rng.rand_int(size);
+      if (j !== i) link(i, j, 1);
+    }
+  }
+  for (let c = 0; c < C; c++) link(c * size, ((c + 1) % C) * size + 1, 0.05);
+  const deg = neighbours.map((l) => l.reduce((s, [, w]) => s + w, 0));
+
+  return {
+    n,
+    matvec(vector: Float64Array): Float64Array {
+      const out = new Float64Array(n);
+      for (let i = 0; i < n; i++) {
+        let sum = vector[i];
+        for (const [j, w] of neighbours[i]) {
+          sum -= (w * vector[j]) / Math.sqrt(deg[i] * deg[j]);
+        }
+        out[i] = sum;
+      }
+      return out;
+    },
+  };
+}
+
+function counting(op: LanczosOperator): {
+  op: LanczosOperator;
+  count: () => number;
+} {
+  let calls = 0;
+  return {
+    op: {
+      n: op.n,
+      matvec(vector: Float64Array): Float64Array {
+        calls++;
+        return op.matvec(vector);
+      },
+    },
+    count: () => calls,
+  };
+}
+
+function max_residual(
+  op: LanczosOperator,
+  eigenvalues: Float64Array,
+  eigenvectors: Float64Array,
+): number {
+  const n = op.n;
+  const k = eigenvalues.length;
+  let worst = 0;
+  for (let c = 0; c < k; c++) {
+    const v = new Float64Array(n);
+    for (let i = 0; i < n; i++) v[i] = eigenvectors[i * k + c];
+    const av = op.matvec(v);
+    let sq = 0;
+    for (let i = 0; i < n; i++) sq += (av[i] - eigenvalues[c] * v[i]) ** 2;
+    worst = Math.max(worst, Math.sqrt(sq));
+  }
+  return worst;
+}
+
+describe('Thick-restart Lanczos eigensolver', () => {
+  it('finds the smallest eigenvalues of a dense diagonal matrix', () => {
+    const diag = [3, 1, 4, 2, 5];
+    const n = diag.length;
+    const matrix = tf.tensor2d(
+      Array.from({ length: n }, (_, i) =>
+        Array.from({ length: n }, (_, j) => (i === j ? diag[i] : 0)),
+      ),
+    );
+
+    const result = thick_restart_lanczos(matrix, 3, { random_seed: 42 });
+    matrix.dispose();
+
+    expect(result.eigenvalues).toHaveLength(3);
+    expect(result.eigenvalues[0]).toBeCloseTo(1, 6);
+    expect(result.eigenvalues[1]).toBeCloseTo(2, 6);
+    expect(result.eigenvalues[2]).toBeCloseTo(3, 6);
+    expect(result.converged).toBe(true);
+  });
+
+  it('uses matmat for block expansion when provided', () => {
+    const diag = [3, 1, 4, 2, 5, 6, 7, 8];
+    const n = diag.length;
+    let block_calls = 0;
+    const operator: LanczosOperator = {
+      ...diagonal_operator(diag),
+      matmat(block: Float64Array, b: number): Float64Array {
+        block_calls++;
+        return block.map((x, idx) => x * diag[Math.floor(idx / b)]);
+      },
+    };
+
+    const result = thick_restart_lanczos(operator, 3, {
+      random_seed: 42,
+      block_size: 2,
+    });
+
+    expect(block_calls).toBeGreaterThan(0);
+    expect(Array.from(result.eigenvalues)).toEqual([
+      expect.closeTo(1, 6),
+      expect.closeTo(2, 6),
+      expect.closeTo(3, 6),
+    ]);
+    expect(result.eigenvectors).toHaveLength(n * 3);
+  });
+
+  it('returns orthonormal eigenvectors with the positive-max sign convention', () => {
+    const n = 60;
+    const k = 4;
+    const op = clustered_laplacian(n, 3);
+    const result = thick_restart_lanczos(op, k, { random_seed: 42 });
+
+    for (let a = 0; a < k; a++) {
+      let max_abs = 0;
+      let max_val = 0;
+      for (let i = 0; i < n; i++) {
+        const v = result.eigenvectors[i * k + a];
+        if (Math.abs(v) > max_abs) {
+          max_abs = Math.abs(v);
+          max_val = v;
+        }
+      }
+      expect(max_val).toBeGreaterThan(0);
+      for (let b = 0; b < k; b++) {
+        let dot = 0;
+        for (let i = 0; i < n; i++) {
+          dot +=
+            result.eigenvectors[i * k + a] * result.eigenvectors[i * k + b];
+        }
+        expect(dot).toBeCloseTo(a === b ? 1 : 0, 8);
+      }
+    }
+  });
+
+  it('handles the identity and indefinite operators', () => {
+    const identity = thick_restart_lanczos(
+      diagonal_operator(new Array(10).fill(1)),
+      3,
+    );
+    for (const v of identity.eigenvalues) expect(v).toBeCloseTo(1, 8);
+
+    const swap: LanczosOperator = {
+      n: 2,
+      matvec: (v) => Float64Array.from([v[1], v[0]]),
+    };
+    const indefinite = thick_restart_lanczos(swap, 1, { is_psd: false });
+    expect(indefinite.eigenvalues[0]).toBeCloseTo(-1, 8);
+  });
+
+  it('validates k and block_size', () => {
+    const op = diagonal_operator([1, 2]);
+    expect(() => thick_restart_lanczos(op, 0)).toThrow('positive integer');
+    expect(() => thick_restart_lanczos(op, 3)).toThrow('cannot exceed');
+    expect(() => thick_restart_lanczos(op, 1, { block_size: 0 })).toThrow(
+      'block_size',
+    );
+    expect(() =>
+      thick_restart_lanczos(op, 1, { initial_vector: new Float64Array(3) }),
+    ).toThrow('initial_vector');
+  });
+
+  it('converges faster from a warm-start vector in the wanted subspace', () => {
+    const n = 400;
+    const k = 5;
+    const base = clustered_laplacian(n, 4);
+
+    const cold = counting(base);
+    const first = thick_restart_lanczos(cold.op, k, { random_seed: 42 });
+
+    const initial_vector = new Float64Array(n);
+    for (let i = 0; i < n; i++) {
+      for (let c = 0; c < k; c++) {
+        initial_vector[i] += first.eigenvectors[i * k + c];
+      }
+    }
+    const warm = counting(base);
+    const second = thick_restart_lanczos(warm.op, k, {
+      random_seed: 42,
+      initial_vector,
+    });
+
+    expect(second.converged).toBe(true);
+    expect(warm.count()).toBeLessThan(cold.count());
+    for (let c = 0; c < k; c++) {
+      expect(second.eigenvalues[c]).toBeCloseTo(first.eigenvalues[c], 6);
+    }
+  });
+
+  it('converges on clustered spectra with fewer matvecs than restarted Lanczos', () => {
+    const n = 400;
+    const k = 5;
+    const base = clustered_laplacian(n, 4);
+
+    const plain = counting(base);
+    lanczos_smallest_eigenpairs(plain.op, k, { random_seed: 42 });
+
+    const thick = counting(base);
+    const result = thick_restart_lanczos(thick.op, k, { random_seed: 42 });
+
+    expect(result.converged).toBe(true);
+    expect(thick.count()).toBe(result.n_matvecs);
+    expect(thick.count()).toBeLessThan(plain.count());
+    expect(
+      max_residual(base, result.eigenvalues, result.eigenvectors),
+    ).toBeLessThan(1e-5);
+  });
+});
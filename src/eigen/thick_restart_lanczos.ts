@@ -0,0 +1,458 @@
+import * as tf from '../backend/adapter';
+import type { LanczosOperator, LanczosOptions } from './lanczos';
+import { symmetric_eigen } from './householder';
+import type { SymmetricEigenResult } from './householder';
+import { make_random_stream } from '../random';
+import type { RandomStream } from '../random';
+
+export interface ThickRestartLanczosOptions extends LanczosOptions {
+  /**
+   * Vectors added to the Krylov basis per expansion step. With `b > 1` the
+   * operator is applied to `n×b` blocks (via `matmat` when provided), which
+   * lets dense or GPU-backed operators batch their products. Default 1.
+   */
+  block_size?: number;
+  /**
+   * Length-`n` start vector for the first basis column instead of a random
+   * one (ARPACK's `v0`). A combination of eigenvectors from a nearby
+   * problem, such as the previous gamma of a sweep, shortens convergence.
+   */
+  initial_vector?: Float64Array;
+}
+
+export interface ThickRestartLanczosResult {
+  /** Ascending, length `k`. */
+  eigenvalues: Float64Array;
+  /** Row-major `n×k`; column `j` belongs to `eigenvalues[j]`. */
+  eigenvectors: Float64Array;
+  /** Operator applications, counting each block column as one. */
+  n_matvecs: number;
+  n_restarts: number;
+  converged: boolean;
+}
+
+const CONVERGENCE_TOL_DEFAULT = 1e-6;
+const MAX_RESTARTS_DEFAULT = 30;
+const BREAKDOWN_TOL = 1e-10;
+const PSD_CLAMP_TOL = 1e-5;
+const NORM_REDUCTION_TRIGGER = 0.7071; // 1/sqrt(2) — triggers second reorth pass
+/** Block steps between Rayleigh–Ritz convergence checks (≈ the old 5 vectors). */
+const CHECK_VECTORS = 5;
+
+/**
+ * Thick-restart Lanczos (Wu & Simon 2000; the symmetric case of Stewart's
+ * Krylov–Schur) for the `k` smallest eigenpairs of a symmetric operator.
+ *
+ * The basis `V` satisfies `A·V_p = V_p·H_p + N·B`, where `H_p = V_pᵀAV_p` is
+ * kept explicitly (its entries are the full-reorthogonalization
+ * coefficients), `N` is the pending, not yet expanded, residual block and `B`
+ * its coupling. At a restart the `l` smallest Ritz vectors replace `V_p`,
+ * `H_p` becomes `diag(θ)` and `B ← B·S`, so converged and nearly converged
+ * directions survive the restart instead of collapsing to a single vector.
+ * Because `H_p` is dense rather than tridiagonal the same loop handles block
+ * expansion.
+ *
+ * @param matrix  Symmetric n×n matrix or matrix-free operator
+ */
+export function thick_restart_lanczos(
+  matrix: tf.Tensor2D | LanczosOperator,
+  k: number,
+  options?: ThickRestartLanczosOptions,
+): ThickRestartLanczosResult {
+  const is_operator = is_lanczos_operator(matrix);
+  const n = is_operator ? matrix.n : matrix.shape[0];
+
+  if (!Number.isInteger(k) || k < 1) {
+    throw new Error('k must be a positive integer >= 1.');
+  }
+  if (k > n) {
+    throw new Error(`k (${k}) cannot exceed matrix size n (${n}).`);
+  }
+  if (!is_operator && matrix.shape[0] !== matrix.shape[1]) {
+    throw new Error('Input matrix must be square.');
+  }
+
+  const {
+    max_subspace_size: max_subspace_size_opt,
+    max_restarts = MAX_RESTARTS_DEFAULT,
+    convergence_tol = CONVERGENCE_TOL_DEFAULT,
+    random_seed = 42,
+    is_psd = true,
+    block_size = 1,
+    initial_vector,
+  } = options ?? {};
+
+  if (!Number.isInteger(block_size) || block_size < 1) {
+    throw new Error('block_size must be a positive integer >= 1.');
+  }
+  if (initial_vector !== undefined && initial_vector.length !== n) {
+    throw new Error(`initial_vector must have length n (${n}).`);
+  }
+  const b = Math.min(block_size, n);
+  // A restart keeps at least k + b vectors, so the subspace needs room for
+  // one more block beyond that to make progress.
+  const m_max = Math.min(
+    n,
+    Math.max(
+      max_subspace_size_opt ?? Math.min(Math.max(2 * k + 20, 4 * k), n, 200),
+      k + 2 * b,
+    ),
+  );
+
+  let n_matvecs = 0;
+  const apply_block = make_block_apply(matrix, n);
+  const apply = (vectors: Float64Array[]): Float64Array[] => {
+    n_matvecs += vectors.length;
+    return apply_block(vectors);
+  };
+
+  const rng = make_random_stream(random_seed);
+  const cap = m_max + b;
+  const H = new Float64Array(cap * cap);
+  let B = new Float64Array(b * cap);
+
+  // Basis: V[0..p) expanded, V[p..p+pending) the residual block N.
+  let V: Float64Array[] = [];
+  let p = 0;
+  let pending = 0;
+
+  for (let c = 0; c < b; c++) {
+    const v = new Float64Array(n);
+    if (c === 0 && initial_vector !== undefined) v.set(initial_vector);
+    else for (let i = 0; i < n; i++) v[i] = rng.rand() - 0.5;
+    orthogonalize_against(v, V, null, n);
+    orthogonalize_against(v, V, null, n);
+    const norm = vec_norm(v, n);
+    const q = norm > BREAKDOWN_TOL ? v : random_orthogonal_vector(V, n, rng);
+    if (q === null) break;
+    if (q === v) for (let i = 0; i < n; i++) v[i] /= norm;
+    V.push(q);
+    pending++;
+  }
+
+  let n_restarts = 0;
+  let ritz: SymmetricEigenResult | null = null;
+  const check_interval = Math.max(1, Math.round(CHECK_VECTORS / b));
+
+  for (;;) {
+    let steps = 0;
+    let converged = false;
+
+    while (p < m_max && pending > 0) {
+      const block = V.slice(p, p + pending);
+      const products = apply(block);
+      const p_block = p + pending;
+      const col_scale = new Float64Array(pending);
+
+      for (let c = 0; c < pending; c++) {
+        const w = products[c];
+        const j = p + c;
+        const h = new Float64Array(p_block);
+        const norm_before = vec_norm(w, n);
+        col_scale[c] = norm_before;
+        orthogonalize_against(w, V.slice(0, p_block), h, n);
+        if (vec_norm(w, n) < NORM_REDUCTION_TRIGGER * norm_before) {
+          orthogonalize_against(w, V.slice(0, p_block), h, n);
+        }
+        for (let i = 0; i < p_block; i++) {
+          H[i * cap + j] = h[i];
+          H[j * cap + i] = h[i];
+        }
+      }
+
+      // Orthonormalize the residual block into the next pending block N;
+      // C (rows: new vectors, cols: residual columns) is its coupling.
+      const next: Float64Array[] = [];
+      const C = new Float64Array(b * b);
+      for (let c = 0; c < pending; c++) {
+        const w = products[c];
+        const coeffs = new Float64Array(b);
+        orthogonalize_against(w, next, coeffs, n);
+        orthogonalize_against(w, next, coeffs, n);
+        for (let r = 0; r < next.length; r++) C[r * b + c] = coeffs[r];
+        const norm = vec_norm(w, n);
+        if (norm > BREAKDOWN_TOL * Math.max(1, col_scale[c])) {
+          for (let i = 0; i < n; i++) w[i] /= norm;
+          C[next.length * b + c] = norm;
+          next.push(w);
+        } else {
+          // Breakdown: an invariant subspace was found. Continue with a
+          // random direction (zero coupling) unless the space is exhausted.
+          const q = random_orthogonal_vector(
+            V.slice(0, p_block).concat(next),
+            n,
+            rng,
+          );
+          if (q !== null) next.push(q);
+        }
+      }
+
+      const p_old = p;
+      p = p_block;
+      V = V.slice(0, p).concat(next);
+      pending = next.length;
+      B = new Float64Array(b * cap);
+      for (let r = 0; r < pending; r++) {
+        for (let c = 0; c < p - p_old; c++) {
+          B[r * cap + p_old + c] = C[r * b + c];
+        }
+      }
+
+      steps++;
+      if (
+        p >= k &&
+        (steps % check_interval === 0 || p >= m_max || pending === 0)
+      ) {
+        ritz = rayleigh_ritz(H, cap, p);
+        if (ritz_converged(ritz, B, cap, p, pending, k, convergence_tol)) {
+          converged = true;
+          break;
+        }
+      }
+    }
+
+    if (converged || pending === 0 || n_restarts >= max_restarts) {
+      if (ritz === null || ritz.values.length !== p) {
+        ritz = rayleigh_ritz(H, cap, p);
+      }
+      if (!converged && pending > 0) {
+        console.warn(
+          `[lanczos] Thick restart did not fully converge after ${max_restarts} restarts. Returning best approximation.`,
+        );
+      }
+      const out = finalize(ritz, V, p, k, n, is_psd);
+      return {
+        ...out,
+        n_matvecs,
+        n_restarts,
+        converged: converged || pending === 0,
+      };
+    }
+
+    // Thick restart: keep the l smallest Ritz vectors and the pending block.
+    if (ritz === null || ritz.values.length !== p) {
+      ritz = rayleigh_ritz(H, cap, p);
+    }
+    const { values, vectors: S } = ritz;
+    const l = Math.min(p - 1, k + Math.floor((m_max - k) / 2));
+
+    const kept = combine(V, S, p, l, n);
+    const B_new = new Float64Array(b * cap);
+    for (let r = 0; r < pending; r++) {
+      for (let j = 0; j < l; j++) {
+        let sum = 0;
+        for (let i = 0; i < p; i++) sum += B[r * cap + i] * S[i * p + j];
+        B_new[r * cap + j] = sum;
+      }
+    }
+    H.fill(0);
+    for (let j = 0; j < l; j++) H[j * cap + j] = values[j];
+
+    V = kept.concat(V.slice(p, p + pending));
+    B = B_new;
+    p = l;
+    ritz = null;
+    n_restarts++;
+  }
+}
+
+function is_lanczos_operator(
+  matrix: tf.Tensor2D | LanczosOperator,
+): matrix is LanczosOperator {
+  return (
+    typeof (matrix as LanczosOperator).n === 'number' &&
+    typeof (matrix as LanczosOperator).matvec === 'function'
+  );
+}
+
+/**
+ * Dense tensors are read back once; their block product walks each row of A
+ * once per block, so `b` vectors cost one pass over the matrix.
+ */
+function make_block_apply(
+  matrix: tf.Tensor2D | LanczosOperator,
+  n: number,
+): (vectors: Float64Array[]) => Float64Array[] {
+  if (is_lanczos_operator(matrix)) {
+    const op = matrix;
+    return (vectors) => {
+      const b = vectors.length;
+      if (b === 1 || op.matmat === undefined) {
+        return vectors.map((v) => op.matvec(v));
+      }
+      const block = new Float64Array(n * b);
+      for (let c = 0; c < b; c++) {
+        const v = vectors[c];
+        for (let i = 0; i < n; i++) block[i * b + c] = v[i];
+      }
+      const out = op.matmat(block, b);
+      return vectors.map((_, c) => {
+        const col = new Float64Array(n);
+        for (let i = 0; i < n; i++) col[i] = out[i * b + c];
+        return col;
+      });
+    };
+  }
+
+  const A = Float64Array.from(matrix.dataSync());
+  return (vectors) => {
+    const b = vectors.length;
+    const out = vectors.map(() => new Float64Array(n));
+    for (let i = 0; i < n; i++) {
+      const row = i * n;
+      for (let c = 0; c < b; c++) {
+        const v = vectors[c];
+        let sum = 0;
+        for (let j = 0; j < n; j++) sum += A[row + j] * v[j];
+        out[c][i] = sum;
+      }
+    }
+    return out;
+  };
+}
+
+function vec_norm(v: Float64Array, n: number): number {
+  let sum = 0;
+  for (let i = 0; i < n; i++) sum += v[i] * v[i];
+  return Math.sqrt(sum);
+}
+
+/** One modified Gram–Schmidt pass; projection coefficients add to `coeffs`. */
+function orthogonalize_against(
+  w: Float64Array,
+  basis: Float64Array[],
+  coeffs: Float64Array | null,
+  n: number,
+): void {
+  for (let idx = 0; idx < basis.length; idx++) {
+    const q = basis[idx];
+    let dot = 0;
+    for (let i = 0; i < n; i++) dot += q[i] * w[i];
+    for (let i = 0; i < n; i++) w[i] -= dot * q[i];
+    if (coeffs !== null) coeffs[idx] += dot;
+  }
+}
+
+function random_orthogonal_vector(
+  basis: Float64Array[],
+  n: number,
+  rng: RandomStream,
+): Float64Array | null {
+  if (basis.length >= n) return null;
+  for (let attempt = 0; attempt < 5; attempt++) {
+    const v = new Float64Array(n);
+    for (let i = 0; i < n; i++) v[i] = rng.rand() - 0.5;
+    orthogonalize_against(v, basis, null, n);
+    orthogonalize_against(v, basis, null, n);
+    const norm = vec_norm(v, n);
+    if (norm > BREAKDOWN_TOL) {
+      for (let i = 0; i < n; i++) v[i] /= norm;
+      return v;
+    }
+  }
+  return null;
+}
+
+function rayleigh_ritz(
+  H: Float64Array,
+  cap: number,
+  p: number,
+): SymmetricEigenResult {
+  const Hp = new Float64Array(p * p);
+  for (let i = 0; i < p; i++) {
+    for (let j = 0; j < p; j++) Hp[i * p + j] = H[i * cap + j];
+  }
+  return symmetric_eigen(Hp, p);
+}
+
+/** Ritz pair `i` has residual `‖B·sᵢ‖`; the `k` smallest must be within tol. */
+function ritz_converged(
+  ritz: SymmetricEigenResult,
+  B: Float64Array,
+  cap: number,
+  p: number,
+  pending: number,
+  k: number,
+  tol: number,
+): boolean {
+  const S = ritz.vectors;
+  for (let col = 0; col < k; col++) {
+    let res_sq = 0;
+    for (let r = 0; r < pending; r++) {
+      let sum = 0;
+      for (let i = 0; i < p; i++) sum += B[r * cap + i] * S[i * p + col];
+      res_sq += sum * sum;
+    }
+    if (Math.sqrt(res_sq) > tol * Math.max(1, Math.abs(ritz.values[col]))) {
+      return false;
+    }
+  }
+  return true;
+}
+
+/** Columns `0..count)` of `V_p · S`, as separate vectors. */
+function combine(
+  V: Float64Array[],
+  S: Float64Array,
+  p: number,
+  count: number,
+  n: number,
+): Float64Array[] {
+  const out = Array.from({ length: count }, () => new Float64Array(n));
+  for (let i = 0; i < p; i++) {
+    const v = V[i];
+    for (let j = 0; j < count; j++) {
+      const s = S[i * p + j];
+      if (s === 0) continue;
+      const y = out[j];
+      for (let row = 0; row < n; row++) y[row] += s * v[row];
+    }
+  }
+  return out;
+}
+
+function finalize(
+  ritz: SymmetricEigenResult,
+  V: Float64Array[],
+  p: number,
+  k: number,
+  n: number,
+  is_psd: boolean,
+): { eigenvalues: Float64Array; eigenvectors: Float64Array } {
+  const use_k = Math.min(k, p);
+  const columns = combine(V, ritz.vectors, p, use_k, n);
+  const eigenvalues = new Float64Array(use_k);
+  const eigenvectors = new Float64Array(n * use_k);
+
+  for (let c = 0; c < use_k; c++) {
+    let lambda = ritz.values[c];
+    if (is_psd && lambda < 0) {
+      if (lambda < -PSD_CLAMP_TOL) {
+        console.warn(
+          `[lanczos] Large negative eigenvalue ${lambda} clamped to 0 (exceeds tolerance ${PSD_CLAMP_TOL}).`,
+        );
+      }
+      lambda = 0;
+    }
+    eigenvalues[c] = lambda;
+
+    // Same sign convention as lanczos_smallest_eigenpairs: the
+    // largest-magnitude component is positive.
+    const y = columns[c];
+    let max_abs = 0;
+    let max_row = 0;
+    for (let row = 0; row < n; row++) {
+      const abs_val = Math.abs(y[row]);
+      if (abs_val > max_abs) {
+        max_abs = abs_val;
+        max_row = row;
+      }
+    }
+    const sign = y[max_row] < 0 ? -1 : 1;
+    for (let row = 0; row < n; row++) {
+      eigenvectors[row * use_k + c] = sign * y[row];
+    }
+  }
+
+  return { eigenvalues, eigenvectors };
+}
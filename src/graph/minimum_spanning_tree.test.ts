@@ -1,7 +1,11 @@
 import fs from 'fs';
 import path from 'path';
 
-import { minimum_spanning_tree, MstEdge } from './minimum_spanning_tree';
+import {
+  minimum_spanning_tree,
+  minimum_spanning_tree_from_rows,
+  MstEdge,
+} from './minimum_spanning_tree';
 
 const FIXTURE_DIR = path.join(process.cwd(), '__fixtures__', 'density');
 
@@ -152,3 +156,25 @@ describe('minimum_spanning_tree', () => {
     }
   });
 });
+
+describe('minimum_spanning_tree_from_rows', () => {
+  it('matches the dense matrix, asking for each row once', () => {
+    const X = [
+      [0, 0],
+      [1, 0.2],
+      [0.3, 2],
+      [5, 5],
+      [5.5, 4.1],
+      [9, 0],
+    ];
+    const D = euclidean_matrix(X);
+    const requested: number[] = [];
+    const edges = minimum_spanning_tree_from_rows(X.length, (u) => {
+      requested.push(u);
+      return D[u];
+    });
+
+    expect(edges).toEqual(minimum_spanning_tree(D));
+    expect([...requested].sort()).toEqual([0, 1, 2, 3, 4, 5]);
+  });
+});
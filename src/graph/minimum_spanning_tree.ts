@@ -2,8 +2,9 @@
  * HDBSCAN derives its single-linkage hierarchy from the minimum spanning tree
  * of the mutual-reachability graph. TensorFlow.js has no sparse-graph
  * primitives, so the tree is built with Prim's algorithm in plain JavaScript
- * over a dense `(n, n)` matrix — O(n²) time, O(n) auxiliary memory — which is
- * the practical scalability ceiling the rest of the density pipeline shares.
+ * over a dense `(n, n)` matrix — O(n²) time, O(n) auxiliary memory — or over
+ * rows computed on demand, which HDBSCAN's blocked path uses to avoid the
+ * matrix altogether.
  */
 
 export interface MstEdge {
@@ -33,19 +34,34 @@ export function minimum_spanning_tree(
     throw new Error('Could not determine a valid node count for the matrix.');
   }
 
-  const at = is_flat
-    ? (i: number, j: number): number =>
-        (distance_matrix as Float32Array | Float64Array)[i * size + j]
-    : (i: number, j: number): number =>
-        (distance_matrix as number[][])[i][j];
+  const row = is_flat
+    ? (i: number): ArrayLike<number> =>
+        (distance_matrix as Float32Array | Float64Array).subarray(
+          i * size,
+          (i + 1) * size,
+        )
+    : (i: number): ArrayLike<number> => (distance_matrix as number[][])[i];
 
-  if (size <= 1) {
+  return minimum_spanning_tree_from_rows(size, row);
+}
+
+/**
+ * Prim's algorithm over a graph given one row at a time: `row(u)` returns
+ * the `n` edge weights out of `u` and is called once per node, when it joins
+ * the tree. Nothing but the current row and `O(n)` bookkeeping is held, so
+ * the rows may be computed on demand instead of read from a dense matrix.
+ */
+export function minimum_spanning_tree_from_rows(
+  n: number,
+  row: (u: number) => ArrayLike<number>,
+): MstEdge[] {
+  if (n <= 1) {
     return [];
   }
 
-  const in_tree = new Uint8Array(size);
-  const best_weight = new Float64Array(size);
-  const best_source = new Int32Array(size);
+  const in_tree = new Uint8Array(n);
+  const best_weight = new Float64Array(n);
+  const best_source = new Int32Array(n);
 
   best_weight.fill(Number.POSITIVE_INFINITY);
   best_source.fill(-1);
@@ -54,10 +70,10 @@ export function minimum_spanning_tree(
 
   const edges: MstEdge[] = [];
 
-  for (let iter = 0; iter < size; iter++) {
+  for (let iter = 0; iter < n; iter++) {
     let u = -1;
     let u_weight = Number.POSITIVE_INFINITY;
-    for (let v = 0; v < size; v++) {
+    for (let v = 0; v < n; v++) {
       if (!in_tree[v] && best_weight[v] < u_weight) {
         u_weight = best_weight[v];
         u = v;
@@ -79,9 +95,10 @@ export function minimum_spanning_tree(
       edges.push({ source, target, weight: best_weight[u] });
     }
 
-    for (let v = 0; v < size; v++) {
+    const weights = row(u);
+    for (let v = 0; v < n; v++) {
       if (in_tree[v]) continue;
-      const w = at(u, v);
+      const w = weights[v];
       if (w < best_weight[v]) {
         best_weight[v] = w;
         best_source[v] = u;
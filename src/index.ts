@@ -3,6 +3,20 @@ export * from './backend/platform_types';
 
 export { Clustering } from './clustering/init';
 export type { BackendConfig } from './backend/backend';
+export type {
+  MemoryBudget,
+  MemoryPath,
+  MemoryPlan,
+  MemoryPlannable,
+  StageFootprint,
+} from './clustering/memory_plan';
+export type {
+  ChromeTraceEvent,
+  ProfileStage,
+  ProfilerListener,
+  StageCost,
+  StageEvent,
+} from './clustering/profiler';
 
 export { AgglomerativeClustering } from './clustering/agglomerative';
 export {
@@ -13,6 +27,10 @@ export {
   type DebugInfo,
 } from './clustering/spectral';
 export { KMeans, type KMeansJSON } from './clustering/kmeans';
+export {
+  MiniBatchKMeans,
+  type MiniBatchKMeansJSON,
+} from './clustering/minibatch_kmeans';
 export { HDBSCAN } from './clustering/hdbscan';
 export { SOM } from './clustering/som';
 
@@ -37,6 +55,7 @@ export type {
   FindOptimalClustersOptions,
   OptimalClustersMethod,
 } from './model_selection/find_optimal_clusters';
+export type { KSearchStrategy } from './model_selection/k_search';
 export { compute_wss } from './model_selection/compute_wss';
 export { find_knee } from './model_selection/kneedle';
 export type { KneedleOptions, KneedleResult } from './model_selection/kneedle';
@@ -55,6 +74,10 @@ export {
   calinski_harabasz,
   calinski_harabasz_efficient,
 } from './validation/calinski_harabasz';
+export {
+  EvaluationContext,
+  type EvaluationContextOptions,
+} from './validation/evaluation_context';
 export { adjusted_rand_index } from './validation/adjusted_rand_index';
 export {
   normalized_mutual_info,
@@ -71,6 +71,21 @@ describe('Memory regression tests', () => {
       const after = tf.memory().numTensors;
       expect(after).toBe(before);
     });
+
+    it('empty-cluster relocation path should not leak tensors', async () => {
+      // Duplicate seeds tie in argMin, leaving a cluster empty on the first
+      // Lloyd step and routing through the relocation path.
+      const dupes: number[][] = [[0, 0], [0, 0], [0, 0], [5, 5]];
+      const before = tf.memory().numTensors;
+
+      const km = new KMeans({ n_clusters: 3, random_state: 0, n_init: 2 });
+      await km.fit(dupes);
+      expect(new Set(km.labels_).size).toBeGreaterThanOrEqual(2);
+      km.dispose();
+
+      const after = tf.memory().numTensors;
+      expect(after).toBe(before);
+    });
   });
 
   describe('SpectralClustering', () => {
@@ -227,6 +227,23 @@ describe("findOptimalClusters", () => {
     ).rejects.toThrow('Not enough samples (2) for minimum clusters (2)');
   });
 
+  it("disposes the converted input when the sweep throws", async () => {
+    const data = [[1, 2], [2, 3], [10, 11], [11, 12]];
+    const before = tf.memory().numTensors;
+
+    await expect(
+      find_optimal_clusters(data, {
+        algorithm: 'som',
+        algorithm_params: { grid_width: 0 },
+      })
+    ).rejects.toThrow('grid_width must be >= 1');
+    await expect(
+      find_optimal_clusters([[1, 2], [2, 3]], { min_clusters: 2 }),
+    ).rejects.toThrow('Not enough samples');
+
+    expect(tf.memory().numTensors).toBe(before);
+  });
+
   it("passes algorithm parameters", async () => {
     const data = [
       [1, 2], [1.5, 1.8], [5, 8], [8, 8], [1, 0.6], [9, 11]
@@ -1,13 +1,15 @@
-import * as tf from '../backend/adapter';
-import { KMeans } from '../clustering/kmeans';
 import { SpectralClustering } from '../clustering/spectral';
-import { AgglomerativeClustering } from '../clustering/agglomerative';
 import { SOM } from '../clustering/som';
-import { silhouette_score } from '../validation/silhouette';
-import { davies_bouldin_efficient } from '../validation/davies_bouldin';
-import { calinski_harabasz_efficient } from '../validation/calinski_harabasz';
 import { is_tensor } from '../tensor/tensor_guards';
-import { compute_wss } from './compute_wss';
+import { to_tensor2d } from '../tensor/data_matrix';
+import {
+  SequentialKSweep,
+  type KSweepEvaluator,
+  type KSweepPlan,
+  type KSweepTask,
+} from './k_sweep';
+import { can_run_parallel_sweep, ParallelKSweep } from './parallel_sweep';
+import { search_k, type KSearchOracle, type KSearchStrategy } from './k_search';
 import { find_knee } from './kneedle';
 import type { DataMatrix } from '../clustering/types';
 
@@ -62,6 +64,25 @@ export interface FindOptimalClustersOptions {
   scoring_function?: (evaluation: ClusterEvaluation) => number;
   /** Method for selecting optimal k (default: 'combined') */
   method?: OptimalClustersMethod;
+  /**
+   * Number of k values evaluated at once (default: 1, sequential). Above 1,
+   * in Node.js, each k is fitted and scored in a `worker_threads` pool that
+   * shares the data through a `SharedArrayBuffer`; every worker initializes
+   * the backend passed to `Clustering.init`. Elsewhere the sweep stays
+   * sequential. SOM training and the spectral embedding still run once on
+   * the main thread; only their per-k scoring is distributed.
+   */
+  concurrency?: number;
+  /**
+   * Which k values to evaluate (default: 'exhaustive', every k in range).
+   * `'coarse_to_fine'` and `'golden'` assume a roughly unimodal score curve
+   * and need O(log K) fits. With `method: 'elbow'` the Kneedle knee of the WSS
+   * values seen so far is not unimodal, so `'golden'` runs as
+   * `'coarse_to_fine'`, refining around that knee. Metrics are normalized over
+   * the evaluated k only. For `'spectral'` the embedding sweep still labels
+   * every k; the search saves the per-k scoring.
+   */
+  search?: KSearchStrategy;
 }
 
 function normalize_and_score_evaluations(
@@ -136,6 +157,47 @@ function normalize_and_score_evaluations(
   }
 }
 
+/**
+ * Sets `combined_score` on every evaluation (normalizing over exactly this
+ * set) and returns them in k order. With a custom scoring function the
+ * scores were already set per evaluation and are left alone.
+ */
+function score_evaluations(
+  evaluations: ClusterEvaluation[],
+  method: OptimalClustersMethod,
+  metrics: Array<'silhouette' | 'davies_bouldin' | 'calinski_harabasz'>,
+  custom_scores: boolean,
+): ClusterEvaluation[] {
+  evaluations.sort((a, b) => a.k - b.k);
+  if (custom_scores) return evaluations;
+
+  if (method === 'combined') {
+    normalize_and_score_evaluations(evaluations, metrics);
+  } else if (method === 'silhouette') {
+    for (const evaluation of evaluations) {
+      evaluation.combined_score = evaluation.silhouette;
+    }
+  } else if (method === 'elbow') {
+    const k_values = evaluations.map((e) => e.k);
+    const wss_values = evaluations.map((e) => e.wss!);
+    const result = find_knee(k_values, wss_values, { direction: 'concave' });
+
+    if (result.knee_x !== null) {
+      // For concave curves, differences are negative (curve below diagonal).
+      // Negate so the knee (most negative diff) gets the highest score.
+      for (let i = 0; i < evaluations.length; i++) {
+        evaluations[i].combined_score = -result.differences[i];
+      }
+    } else {
+      // Fallback: prefer smallest k (parsimony)
+      for (const evaluation of evaluations) {
+        evaluation.combined_score = -evaluation.k;
+      }
+    }
+  }
+  return evaluations;
+}
+
 /**
  * @example
  * ```typescript
@@ -153,7 +215,10 @@ export async function find_optimal_clusters(
   options: FindOptimalClustersOptions = {},
 ): Promise<{
   optimal: ClusterEvaluation;
+  /** Every evaluated k, sorted by `combined_score` (best first). */
   evaluations: ClusterEvaluation[];
+  /** The k values in the order they were evaluated. */
+  evaluated_k: number[];
 }> {
   const {
     min_clusters = 2,
@@ -163,6 +228,8 @@ export async function find_optimal_clusters(
     metrics = ['silhouette', 'davies_bouldin', 'calinski_harabasz'],
     scoring_function,
     method = 'combined',
+    concurrency = 1,
+    search = 'exhaustive',
   } = options;
 
   if (min_clusters < 2) {
@@ -171,6 +238,14 @@ export async function find_optimal_clusters(
   if (max_clusters < min_clusters) {
     throw new Error('max_clusters must be greater than or equal to min_clusters');
   }
+  if (!Number.isInteger(concurrency) || concurrency < 1) {
+    throw new Error('concurrency must be a positive integer');
+  }
+  if (!['exhaustive', 'coarse_to_fine', 'golden'].includes(search)) {
+    throw new Error(
+      `Invalid search '${search}'. Must be 'exhaustive', 'coarse_to_fine' or 'golden'.`,
+    );
+  }
   if (algorithm === 'agglomerative' && 'distance_threshold' in algorithm_params) {
     throw new Error(
       "algorithm_params must not include 'distance_threshold': find_optimal_clusters controls the stopping criterion via the k-sweep loop.",
@@ -178,198 +253,160 @@ export async function find_optimal_clusters(
   }
 
   const is_input_tensor = is_tensor(X);
-  const data_tensor = is_input_tensor ? X : tf.tensor2d(X as number[][]);
-  const n_samples = data_tensor.shape[0];
+  const data_tensor = to_tensor2d(X);
+  // Any throw below (bad k range, SOM or spectral fit, the search) must still
+  // dispose the converted input.
+  let shared_som: SOM | null = null;
+  try {
+    const n_samples = data_tensor.shape[0];
 
-  const effective_max_clusters = Math.min(max_clusters, n_samples - 1);
+    const effective_max_clusters = Math.min(max_clusters, n_samples - 1);
 
-  if (effective_max_clusters < min_clusters) {
-    if (!is_input_tensor) {
-      data_tensor.dispose();
+    if (effective_max_clusters < min_clusters) {
+      throw new Error(
+        `Not enough samples (${n_samples}) for minimum clusters (${min_clusters})`,
+      );
     }
-    throw new Error(
-      `Not enough samples (${n_samples}) for minimum clusters (${min_clusters})`,
-    );
-  }
-
-  const compute_silhouette =
-    method === 'silhouette' ||
-    (method === 'combined' && metrics.includes('silhouette')) ||
-    (!!scoring_function && metrics.includes('silhouette'));
-  const compute_db =
-    (method === 'combined' && metrics.includes('davies_bouldin')) ||
-    (!!scoring_function && metrics.includes('davies_bouldin'));
-  const compute_ch =
-    (method === 'combined' && metrics.includes('calinski_harabasz')) ||
-    (!!scoring_function && metrics.includes('calinski_harabasz'));
-  const should_compute_wss = method === 'elbow';
-
-  const evaluations: ClusterEvaluation[] = [];
-
-  // SOM training is independent of k: a single map is trained once, then each k
-  // is produced by two-phase clustering (agglomerative grouping of the trained
-  // neuron weight vectors into exactly k macro-clusters). This is the only
-  // correct way to sweep k for SOM — the grid size does not equal the cluster
-  // count. The grid is sized so the neuron count comfortably exceeds the
-  // largest k while following the common ~5·√n heuristic for total neurons.
-  let shared_som: SOM | null = null;
-  if (algorithm === 'som') {
-    const heuristic_grid = Math.ceil(Math.sqrt(5 * Math.sqrt(n_samples)));
-    const min_grid = Math.ceil(Math.sqrt(effective_max_clusters));
-    const grid_size = Math.max(2, heuristic_grid, min_grid);
-    shared_som = new SOM({
-      grid_width: grid_size,
-      grid_height: grid_size,
-      // algorithm_params may override grid dimensions and other SOM settings.
-      ...algorithm_params,
-    });
-    await shared_som.fit(data_tensor);
-  }
-
-  for (let k = min_clusters; k <= effective_max_clusters; k++) {
-    let labels: number[];
-    let kmeans_instance: KMeans | null = null;
-    let disposable:
-      | KMeans
-      | SpectralClustering
-      | AgglomerativeClustering
-      | null = null;
 
+    const compute_silhouette =
+      method === 'silhouette' ||
+      (method === 'combined' && metrics.includes('silhouette')) ||
+      (!!scoring_function && metrics.includes('silhouette'));
+    const compute_db =
+      (method === 'combined' && metrics.includes('davies_bouldin')) ||
+      (!!scoring_function && metrics.includes('davies_bouldin'));
+    const compute_ch =
+      (method === 'combined' && metrics.includes('calinski_harabasz')) ||
+      (!!scoring_function && metrics.includes('calinski_harabasz'));
+    const should_compute_wss = method === 'elbow';
+
+    // SOM training is independent of k: a single map is trained once, then
+    // each k is produced by two-phase clustering (agglomerative grouping of the
+    // trained neuron weight vectors into exactly k macro-clusters). This is the
+    // only correct way to sweep k for SOM — the grid size does not equal the
+    // cluster count. The grid is sized so the neuron count comfortably exceeds
+    // the largest k while following the common ~5·√n heuristic for total
+    // neurons.
     if (algorithm === 'som') {
-      // Phase 2: group trained neurons into exactly k macro-clusters and map
-      // each sample (via its BMU) to a macro-cluster label.
-      labels = await shared_som!.cluster(k);
-    } else {
-      let clusterer: KMeans | SpectralClustering | AgglomerativeClustering;
-      switch (algorithm) {
-        case 'kmeans':
-          kmeans_instance = new KMeans({ n_clusters: k, ...algorithm_params });
-          clusterer = kmeans_instance;
-          break;
-        case 'spectral':
-          clusterer = new SpectralClustering({
-            n_clusters: k,
-            ...algorithm_params,
-          });
-          break;
-        case 'agglomerative':
-          clusterer = new AgglomerativeClustering({
-            n_clusters: k,
-            ...algorithm_params,
-          });
-          break;
-        default:
-          throw new Error(`Unknown algorithm: ${algorithm}`);
-      }
-
-      labels = await clusterer.fit_predict(data_tensor);
-      disposable = clusterer;
+      const heuristic_grid = Math.ceil(Math.sqrt(5 * Math.sqrt(n_samples)));
+      const min_grid = Math.ceil(Math.sqrt(effective_max_clusters));
+      const grid_size = Math.max(2, heuristic_grid, min_grid);
+      shared_som = new SOM({
+        grid_width: grid_size,
+        grid_height: grid_size,
+        // algorithm_params may override grid dimensions and other SOM
+        // settings.
+        ...algorithm_params,
+      });
+      await shared_som.fit(data_tensor);
     }
 
-    let silhouette = 0;
-    let davies_bouldin = Infinity;
-    let calinski_harabasz = 0;
-    let wss: number | undefined;
-
-    // Validation metrics require at least 2 distinct clusters. The SOM
-    // two-phase path can collapse to fewer than k labels when all sample BMUs
-    // fall into a single neuron macro-cluster; in that degenerate case assign
-    // worst-case metric values (so this k ranks last) instead of crashing.
-    const has_enough_clusters = new Set(labels).size >= 2;
-
-    if (compute_silhouette) {
-      silhouette = has_enough_clusters
-        ? silhouette_score(data_tensor, labels, 'euclidean')
-        : -1;
-    }
-    if (compute_db) {
-      davies_bouldin = has_enough_clusters
-        ? davies_bouldin_efficient(data_tensor, labels, 'euclidean')
-        : Infinity;
-    }
-    if (compute_ch) {
-      calinski_harabasz = has_enough_clusters
-        ? calinski_harabasz_efficient(data_tensor, labels)
-        : 0;
-    }
-    if (should_compute_wss) {
-      // Optimize: read inertia directly from KMeans instead of recomputing
-      if (kmeans_instance && kmeans_instance.inertia_ !== null) {
-        wss = kmeans_instance.inertia_;
-      } else {
-        wss = compute_wss(data_tensor, labels);
+    // Spectral embeddings are nested in k: one affinity and one eigensolve for
+    // the largest k serve every k, which only re-runs label assignment.
+    let spectral_sweep_labels: number[][] | null = null;
+    if (algorithm === 'spectral') {
+      const k_values: number[] = [];
+      for (let k = min_clusters; k <= effective_max_clusters; k++) {
+        k_values.push(k);
+      }
+      const spectral = new SpectralClustering({
+        n_clusters: effective_max_clusters,
+        ...algorithm_params,
+      });
+      try {
+        spectral_sweep_labels = await spectral.fit_predict_sweep(
+          data_tensor,
+          k_values,
+        );
+      } finally {
+        spectral.dispose();
       }
     }
 
-    const evaluation: ClusterEvaluation = {
-      k,
-      silhouette,
-      davies_bouldin,
-      calinski_harabasz,
-      combined_score: 0,
-      labels: Array.from(labels),
+    const plan: KSweepPlan = {
+      algorithm,
+      algorithm_params,
+      compute_silhouette,
+      compute_db,
+      compute_ch,
+      compute_wss: should_compute_wss,
     };
-    if (wss !== undefined) {
-      evaluation.wss = wss;
-    }
-
-    // Apply custom scoring function immediately (gets raw values)
-    if (scoring_function) {
-      evaluation.combined_score = scoring_function(evaluation);
-    }
-
-    evaluations.push(evaluation);
-
-    // Dispose the per-k clustering instance to free held tensors. (SOM is
-    // trained once and disposed after the loop.)
-    if (
-      disposable &&
-      'dispose' in disposable &&
-      typeof disposable.dispose === 'function'
-    ) {
-      disposable.dispose();
-    }
-  }
-
-  shared_som?.dispose();
-
-  if (!scoring_function) {
-    if (method === 'combined') {
-      normalize_and_score_evaluations(evaluations, metrics);
-    } else if (method === 'silhouette') {
-      for (const evaluation of evaluations) {
-        evaluation.combined_score = evaluation.silhouette;
-      }
-    } else if (method === 'elbow') {
-      const k_values = evaluations.map((e) => e.k);
-      const wss_values = evaluations.map((e) => e.wss!);
-      const result = find_knee(k_values, wss_values, { direction: 'concave' });
-
-      if (result.knee_x !== null) {
-        // For concave curves, differences are negative (curve below diagonal).
-        // Negate so the knee (most negative diff) gets the highest score.
-        for (let i = 0; i < evaluations.length; i++) {
-          evaluations[i].combined_score = -result.differences[i];
+    const evaluator: KSweepEvaluator =
+      concurrency > 1 &&
+      effective_max_clusters > min_clusters &&
+      can_run_parallel_sweep()
+        ? new ParallelKSweep(data_tensor, plan, concurrency)
+        : new SequentialKSweep(data_tensor, plan);
+
+    const evaluated = new Map<number, ClusterEvaluation>();
+    const evaluated_k: number[] = [];
+    const oracle: KSearchOracle = {
+      evaluate: async (ks) => {
+        const fresh = [...new Set(ks)]
+          .filter((k) => !evaluated.has(k))
+          .sort((a, b) => a - b);
+        const tasks: KSweepTask[] = [];
+        for (const k of fresh) {
+          if (algorithm === 'som') {
+            // Phase 2: group trained neurons into exactly k macro-clusters and
+            // map each sample (via its BMU) to a macro-cluster label.
+            tasks.push({ k, labels: await shared_som!.cluster(k) });
+          } else if (algorithm === 'spectral') {
+            tasks.push({ k, labels: spectral_sweep_labels![k - min_clusters] });
+          } else {
+            tasks.push({ k });
+          }
         }
-      } else {
-        // Fallback: prefer smallest k (parsimony)
-        for (const evaluation of evaluations) {
-          evaluation.combined_score = -evaluation.k;
+        for (const evaluation of await evaluator.evaluate(tasks)) {
+          // Custom scoring gets the raw (un-normalized) metric values.
+          if (scoring_function) {
+            evaluation.combined_score = scoring_function(evaluation);
+          }
+          evaluated.set(evaluation.k, evaluation);
+          evaluated_k.push(evaluation.k);
         }
-      }
-    }
-  }
+      },
+      scores: () =>
+        new Map(
+          score_evaluations(
+            Array.from(evaluated.values()),
+            method,
+            metrics,
+            !!scoring_function,
+          ).map((e) => [e.k, e.combined_score]),
+        ),
+    };
 
-  evaluations.sort((a, b) => b.combined_score - a.combined_score);
+    try {
+      // Golden-section needs a unimodal score, so the elbow criterion runs
+      // coarse-to-fine around the current knee (documented on `search`).
+      await search_k(
+        method === 'elbow' && search === 'golden' ? 'coarse_to_fine' : search,
+        min_clusters,
+        effective_max_clusters,
+        oracle,
+      );
+    } finally {
+      await evaluator.dispose();
+    }
 
-  const final_result = {
-    optimal: evaluations[0],
-    evaluations,
-  };
+    const evaluations = score_evaluations(
+      Array.from(evaluated.values()),
+      method,
+      metrics,
+      !!scoring_function,
+    );
+    evaluations.sort((a, b) => b.combined_score - a.combined_score);
 
-  if (!is_input_tensor) {
-    data_tensor.dispose();
+    return {
+      optimal: evaluations[0],
+      evaluations,
+      evaluated_k,
+    };
+  } finally {
+    shared_som?.dispose();
+    if (!is_input_tensor) {
+      data_tensor.dispose();
+    }
   }
-
-  return final_result;
 }
@@ -0,0 +1,81 @@
+import { find_optimal_clusters } from './find_optimal_clusters';
+import { make_random_stream } from '../random';
+
+function blobs(n_per: number, centers: number[][], seed: number): number[][] {
+  const rng = make_random_stream(seed);
+  const out: number[][] = [];
+  for (let i = 0; i < n_per; i++) {
+    for (const c of centers) out.push(c.map((v) => v + rng.rand() - 0.5));
+  }
+  return out;
+}
+
+const X = blobs(
+  12,
+  [
+    [0, 0],
+    [6, 0],
+    [0, 6],
+    [6, 6],
+  ],
+  5,
+);
+
+// Each worker compiles the sources through ts-node on first use.
+const WORKER_TIMEOUT = 120000;
+
+describe('find_optimal_clusters concurrency', () => {
+  for (const algorithm of ['kmeans', 'agglomerative'] as const) {
+    it(
+      `matches the sequential sweep (${algorithm})`,
+      async () => {
+        const options = {
+          min_clusters: 2,
+          max_clusters: 6,
+          algorithm,
+          algorithm_params: algorithm === 'kmeans' ? { random_state: 0 } : {},
+        };
+        const sequential = await find_optimal_clusters(X, options);
+        const parallel = await find_optimal_clusters(X, {
+          ...options,
+          concurrency: 3,
+        });
+
+        expect(parallel.optimal.k).toBe(sequential.optimal.k);
+        expect(parallel.evaluations.map((e) => e.k)).toEqual(
+          sequential.evaluations.map((e) => e.k),
+        );
+        parallel.evaluations.forEach((e, i) => {
+          const s = sequential.evaluations[i];
+          expect(e.labels).toEqual(s.labels);
+          expect(e.silhouette).toBeCloseTo(s.silhouette, 5);
+          expect(e.davies_bouldin).toBeCloseTo(s.davies_bouldin, 5);
+          expect(e.combined_score).toBeCloseTo(s.combined_score, 5);
+        });
+      },
+      WORKER_TIMEOUT,
+    );
+  }
+
+  it(
+    'applies a custom scoring function to worker results',
+    async () => {
+      const result = await find_optimal_clusters(X, {
+        max_clusters: 5,
+        algorithm: 'agglomerative',
+        concurrency: 2,
+        metrics: ['silhouette'],
+        scoring_function: (e) => -Math.abs(e.k - 3),
+      });
+      expect(result.optimal.k).toBe(3);
+      expect(result.evaluations).toHaveLength(4);
+    },
+    WORKER_TIMEOUT,
+  );
+
+  it('rejects a non-positive concurrency', async () => {
+    await expect(find_optimal_clusters(X, { concurrency: 0 })).rejects.toThrow(
+      'concurrency must be a positive integer',
+    );
+  });
+});
@@ -0,0 +1,139 @@
+import { best_k, search_k, type KSearchStrategy } from './k_search';
+import { find_optimal_clusters } from './find_optimal_clusters';
+import { make_random_stream } from '../random';
+
+/** Runs a search against a fixed score curve and records what it asked for. */
+async function run_search(
+  strategy: KSearchStrategy,
+  lo: number,
+  hi: number,
+  score: (k: number) => number,
+): Promise<{ best: number; evaluated: number[] }> {
+  const scores = new Map<number, number>();
+  const evaluated: number[] = [];
+  await search_k(strategy, lo, hi, {
+    evaluate: async (ks) => {
+      for (const k of ks) {
+        expect(k).toBeGreaterThanOrEqual(lo);
+        expect(k).toBeLessThanOrEqual(hi);
+        if (!scores.has(k)) {
+          scores.set(k, score(k));
+          evaluated.push(k);
+        }
+      }
+    },
+    scores: () => scores,
+  });
+  return { best: best_k(scores), evaluated };
+}
+
+describe('search_k', () => {
+  const peaked = (optimum: number) => (k: number) =>
+    -Math.abs(k - optimum) - 0.01 * (k - optimum) ** 2;
+
+  for (const strategy of ['coarse_to_fine', 'golden'] as const) {
+    it(`${strategy} finds the peak of a unimodal curve in O(log K) fits`, async () => {
+      for (const [lo, hi] of [
+        [2, 100],
+        [2, 10],
+        [5, 37],
+        [2, 3],
+        [2, 2],
+      ]) {
+        for (let optimum = lo; optimum <= hi; optimum++) {
+          const { best, evaluated } = await run_search(
+            strategy,
+            lo,
+            hi,
+            peaked(optimum),
+          );
+          expect(best).toBe(optimum);
+          expect(evaluated.length).toBeLessThanOrEqual(
+            Math.min(hi - lo + 1, 5 * Math.ceil(Math.log2(hi - lo + 2))),
+          );
+        }
+      }
+    });
+  }
+
+  it('exhaustive evaluates every k in order', async () => {
+    const { evaluated } = await run_search('exhaustive', 3, 8, peaked(5));
+    expect(evaluated).toEqual([3, 4, 5, 6, 7, 8]);
+  });
+
+  it('breaks ties towards the smaller k', () => {
+    expect(
+      best_k(
+        new Map([
+          [4, 1],
+          [2, 1],
+          [3, 0],
+        ]),
+      ),
+    ).toBe(2);
+  });
+});
+
+describe('find_optimal_clusters search', () => {
+  const rng = make_random_stream(11);
+  const centers = Array.from({ length: 6 }, (_, c) => [10 * c, 10 * (c % 2)]);
+  const X: number[][] = [];
+  for (let i = 0; i < 10; i++) {
+    for (const c of centers) X.push(c.map((v) => v + rng.rand() - 0.5));
+  }
+
+  it('evaluates fewer k and reports which', async () => {
+    const options = {
+      min_clusters: 2,
+      max_clusters: 20,
+      algorithm: 'agglomerative' as const,
+      method: 'silhouette' as const,
+    };
+    const exhaustive = await find_optimal_clusters(X, options);
+    expect(exhaustive.evaluated_k).toHaveLength(19);
+
+    for (const search of ['coarse_to_fine', 'golden'] as const) {
+      const adaptive = await find_optimal_clusters(X, { ...options, search });
+      expect(adaptive.evaluated_k.length).toBeLessThan(19);
+      expect(adaptive.evaluations.map((e) => e.k).sort((a, b) => a - b)).toEqual(
+        [...adaptive.evaluated_k].sort((a, b) => a - b),
+      );
+      expect(adaptive.optimal.k).toBe(exhaustive.optimal.k);
+    }
+  });
+
+  it('refines around the knee for the elbow method', async () => {
+    const result = await find_optimal_clusters(X, {
+      max_clusters: 20,
+      algorithm: 'agglomerative',
+      method: 'elbow',
+      search: 'golden',
+    });
+    expect(result.evaluated_k.length).toBeLessThan(19);
+    expect(result.evaluations.every((e) => e.wss !== undefined)).toBe(true);
+  });
+
+  it('runs golden as coarse_to_fine for the elbow method', async () => {
+    const options = {
+      max_clusters: 20,
+      algorithm: 'agglomerative' as const,
+      method: 'elbow' as const,
+    };
+    const golden = await find_optimal_clusters(X, {
+      ...options,
+      search: 'golden',
+    });
+    const coarse = await find_optimal_clusters(X, {
+      ...options,
+      search: 'coarse_to_fine',
+    });
+    expect(golden.evaluated_k).toEqual(coarse.evaluated_k);
+    expect(golden.optimal.k).toBe(coarse.optimal.k);
+  });
+
+  it('rejects an unknown search', async () => {
+    await expect(
+      find_optimal_clusters(X, { search: 'random' as 'golden' }),
+    ).rejects.toThrow("Invalid search 'random'");
+  });
+});
@@ -0,0 +1,117 @@
+/**
+ * Which k values `find_optimal_clusters` evaluates.
+ *
+ * - `'exhaustive'`: every k in range.
+ * - `'coarse_to_fine'`: an evenly spaced grid, then grids of half the spacing
+ *   around the current best k until the spacing is 1.
+ * - `'golden'`: golden-section search on the (assumed unimodal) score curve,
+ *   finished with an exhaustive scan of the last few candidates.
+ *
+ * Both adaptive strategies need O(log K) evaluations for K candidates.
+ */
+export type KSearchStrategy = 'exhaustive' | 'coarse_to_fine' | 'golden';
+
+export interface KSearchOracle {
+  /** Evaluates the given k values; already evaluated ones are skipped. */
+  evaluate(ks: number[]): Promise<void>;
+  /** Current score of every evaluated k, higher is better. */
+  scores(): Map<number, number>;
+}
+
+/** Grid points per coarse-to-fine round. */
+const COARSE_GRID_POINTS = 5;
+
+const INV_PHI = (Math.sqrt(5) - 1) / 2;
+
+/** Highest-scoring evaluated k, ties going to the smaller k. */
+export function best_k(scores: Map<number, number>): number {
+  let best = -1;
+  let best_score = -Infinity;
+  for (const [k, score] of scores) {
+    if (
+      best === -1 ||
+      score > best_score ||
+      (score === best_score && k < best)
+    ) {
+      best = k;
+      best_score = score;
+    }
+  }
+  return best;
+}
+
+function grid(a: number, b: number, step: number): number[] {
+  const ks: number[] = [];
+  for (let k = a; k < b; k += step) ks.push(k);
+  ks.push(b);
+  return ks;
+}
+
+async function coarse_to_fine(
+  lo: number,
+  hi: number,
+  oracle: KSearchOracle,
+): Promise<void> {
+  let a = lo;
+  let b = hi;
+  let step = Math.max(1, Math.ceil((hi - lo) / (COARSE_GRID_POINTS - 1)));
+  for (;;) {
+    await oracle.evaluate(grid(a, b, step));
+    if (step === 1) return;
+    // The optimum lies strictly between the best grid point's neighbours.
+    const k = best_k(oracle.scores());
+    a = Math.max(lo, k - step + 1);
+    b = Math.min(hi, k + step - 1);
+    step = Math.ceil(step / 2);
+  }
+}
+
+async function golden_section(
+  lo: number,
+  hi: number,
+  oracle: KSearchOracle,
+): Promise<void> {
+  let a = lo;
+  let b = hi;
+  // floor/ceil keep a < c < d < b on integers while b - a > 3.
+  while (b - a > 3) {
+    const c = a + Math.floor((b - a) * (1 - INV_PHI));
+    const d = a + Math.ceil((b - a) * INV_PHI);
+    await oracle.evaluate([c, d]);
+    const scores = oracle.scores();
+    if (scores.get(c)! >= scores.get(d)!) {
+      b = d;
+    } else {
+      a = c;
+    }
+  }
+  await oracle.evaluate(grid(a, b, 1));
+}
+
+/**
+ * Runs `strategy` over `[lo, hi]`. `'golden'` needs a score that is
+ * unimodal in k; callers with an elbow criterion should use
+ * `'coarse_to_fine'`, whose refinement only needs the current best k.
+ */
+export async function search_k(
+  strategy: KSearchStrategy,
+  lo: number,
+  hi: number,
+  oracle: KSearchOracle,
+): Promise<void> {
+  switch (strategy) {
+    case 'exhaustive':
+      await oracle.evaluate(grid(lo, hi, 1));
+      return;
+    case 'coarse_to_fine':
+      await coarse_to_fine(lo, hi, oracle);
+      return;
+    case 'golden':
+      await golden_section(lo, hi, oracle);
+      return;
+    default:
+      throw new Error(
+        `Invalid search '${strategy}'. Must be 'exhaustive', 'coarse_to_fine' or 'golden'.`,
+      );
+  }
+}
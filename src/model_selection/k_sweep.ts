@@ -0,0 +1,161 @@
+import * as tf from '../backend/adapter';
+import { KMeans } from '../clustering/kmeans';
+import { AgglomerativeClustering } from '../clustering/agglomerative';
+import { EvaluationContext } from '../validation/evaluation_context';
+import type { ClusterEvaluation } from './find_optimal_clusters';
+
+/**
+ * One k of `find_optimal_clusters`: fit (unless the labels were produced up
+ * front by the shared SOM or spectral sweep) and score. Shared by the
+ * sequential evaluator and the `worker_threads` pool, so both paths compute
+ * the same evaluation for the same k.
+ */
+
+/** Everything a k evaluation needs besides the data; structured-cloneable. */
+export interface KSweepPlan {
+  algorithm: 'kmeans' | 'spectral' | 'agglomerative' | 'som';
+  algorithm_params: Record<string, unknown>;
+  compute_silhouette: boolean;
+  compute_db: boolean;
+  compute_ch: boolean;
+  compute_wss: boolean;
+}
+
+export interface KSweepTask {
+  k: number;
+  /** Precomputed labels (SOM and spectral); otherwise the k is fitted. */
+  labels?: number[];
+}
+
+/** `combined_score` is left at 0 for the caller to fill in. */
+export async function evaluate_k(
+  data: tf.Tensor2D,
+  context: EvaluationContext,
+  plan: KSweepPlan,
+  task: KSweepTask,
+): Promise<ClusterEvaluation> {
+  const { k } = task;
+  let labels: number[];
+  let kmeans_instance: KMeans | null = null;
+  let clusterer: KMeans | AgglomerativeClustering | null = null;
+
+  if (task.labels !== undefined) {
+    labels = task.labels;
+  } else {
+    switch (plan.algorithm) {
+      case 'kmeans':
+        kmeans_instance = new KMeans({
+          n_clusters: k,
+          ...plan.algorithm_params,
+        });
+        clusterer = kmeans_instance;
+        break;
+      case 'agglomerative':
+        clusterer = new AgglomerativeClustering({
+          n_clusters: k,
+          ...plan.algorithm_params,
+        });
+        break;
+      default:
+        throw new Error(`Unknown algorithm: ${plan.algorithm}`);
+    }
+    labels = await clusterer.fit_predict(data);
+  }
+
+  try {
+    let silhouette = 0;
+    let davies_bouldin = Infinity;
+    let calinski_harabasz = 0;
+    let wss: number | undefined;
+
+    // Validation metrics require at least 2 distinct clusters. The SOM
+    // two-phase path can collapse to fewer than k labels when all sample BMUs
+    // fall into a single neuron macro-cluster; in that degenerate case assign
+    // worst-case metric values (so this k ranks last) instead of crashing.
+    const has_enough_clusters = new Set(labels).size >= 2;
+
+    if (plan.compute_silhouette) {
+      silhouette = has_enough_clusters ? context.silhouette_score(labels) : -1;
+    }
+    if (plan.compute_db) {
+      davies_bouldin = has_enough_clusters
+        ? context.davies_bouldin(labels)
+        : Infinity;
+    }
+    if (plan.compute_ch) {
+      calinski_harabasz = has_enough_clusters
+        ? context.calinski_harabasz(labels)
+        : 0;
+    }
+    if (plan.compute_wss) {
+      // Optimize: read inertia directly from KMeans instead of recomputing
+      if (kmeans_instance && kmeans_instance.inertia_ !== null) {
+        wss = kmeans_instance.inertia_;
+      } else {
+        wss = context.wss(labels);
+      }
+    }
+
+    const evaluation: ClusterEvaluation = {
+      k,
+      silhouette,
+      davies_bouldin,
+      calinski_harabasz,
+      combined_score: 0,
+      labels: Array.from(labels),
+    };
+    if (wss !== undefined) {
+      evaluation.wss = wss;
+    }
+    return evaluation;
+  } finally {
+    // Free the per-k clustering instance's held tensors.
+    if (
+      clusterer &&
+      'dispose' in clusterer &&
+      typeof clusterer.dispose === 'function'
+    ) {
+      clusterer.dispose();
+    }
+  }
+}
+
+/**
+ * Evaluates batches of k for one search. A search may call `evaluate`
+ * several times (one round per call); results come back in task order.
+ */
+export interface KSweepEvaluator {
+  evaluate(tasks: KSweepTask[]): Promise<ClusterEvaluation[]>;
+  dispose(): Promise<void>;
+}
+
+/** In-thread evaluator; one `EvaluationContext` serves every round. */
+export class SequentialKSweep implements KSweepEvaluator {
+  private data_: tf.Tensor2D;
+
+  private plan_: KSweepPlan;
+
+  private context_: EvaluationContext;
+
+  constructor(data: tf.Tensor2D, plan: KSweepPlan) {
+    this.data_ = data;
+    this.plan_ = plan;
+    // Row norms, the distance matrix and per-labelling centroids are shared
+    // by every metric and every k instead of being rebuilt per metric call.
+    this.context_ = new EvaluationContext(data);
+  }
+
+  async evaluate(tasks: KSweepTask[]): Promise<ClusterEvaluation[]> {
+    const evaluations: ClusterEvaluation[] = [];
+    for (const task of tasks) {
+      evaluations.push(
+        await evaluate_k(this.data_, this.context_, this.plan_, task),
+      );
+    }
+    return evaluations;
+  }
+
+  async dispose(): Promise<void> {
+    this.context_.dispose();
+  }
+}
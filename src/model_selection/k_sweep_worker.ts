@@ -0,0 +1,44 @@
+import { parentPort, workerData } from 'worker_threads';
+import * as tf from '../backend/adapter';
+import { Clustering } from '../clustering/init';
+import { EvaluationContext } from '../validation/evaluation_context';
+import { evaluate_k } from './k_sweep';
+import type {
+  KSweepWorkerData,
+  KSweepWorkerRequest,
+  KSweepWorkerResponse,
+} from './parallel_sweep';
+
+/**
+ * Entry point of a `find_optimal_clusters` worker thread. Initializes its own
+ * backend, wraps the shared data buffer once, then evaluates one k per
+ * message until the pool terminates it.
+ */
+async function run(): Promise<void> {
+  const port = parentPort!;
+  const { buffer, shape, plan, backend_config, cache_distances } =
+    workerData as KSweepWorkerData;
+
+  await Clustering.init(backend_config);
+  const data = tf.tensor2d(new Float32Array(buffer), shape);
+  const context = new EvaluationContext(data, { cache_distances });
+
+  port.on('message', async (request: KSweepWorkerRequest) => {
+    let response: KSweepWorkerResponse;
+    try {
+      const { index, ...task } = request;
+      const evaluation = await evaluate_k(data, context, plan, task);
+      response = { index, evaluation };
+    } catch (err) {
+      response = {
+        index: request.index,
+        error: err instanceof Error ? err.message : String(err),
+      };
+    }
+    port.postMessage(response);
+  });
+}
+
+// A failed init is an unhandled rejection, which ends the thread and
+// surfaces as the worker's 'error' event in the parent.
+void run();
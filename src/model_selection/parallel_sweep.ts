@@ -0,0 +1,174 @@
+import type { Worker } from 'worker_threads';
+import * as tf from '../backend/adapter';
+import type { BackendConfig } from '../backend/backend';
+import { is_node } from '../backend/platform';
+import { current_init_config } from '../clustering/init';
+import type { ClusterEvaluation } from './find_optimal_clusters';
+import type { KSweepEvaluator, KSweepPlan, KSweepTask } from './k_sweep';
+
+/**
+ * `worker_threads` pool for `find_optimal_clusters({ concurrency })`.
+ *
+ * The data is copied once into a `SharedArrayBuffer` that every worker wraps
+ * without a further copy; tasks carry only a k (plus precomputed labels for
+ * SOM and spectral) and results carry only labels and scores. Workers pull
+ * the next k as soon as they finish one, so uneven fit times balance out,
+ * and stay alive across the rounds of an adaptive search.
+ */
+
+/** Same total budget as one context's cache (4096² float32, 64 MB). */
+const WORKER_DISTANCE_CACHE_MAX_ENTRIES = 4096 * 4096;
+
+export interface KSweepWorkerData {
+  buffer: SharedArrayBuffer;
+  shape: [number, number];
+  plan: KSweepPlan;
+  backend_config: BackendConfig;
+  cache_distances: boolean;
+}
+
+export interface KSweepWorkerRequest extends KSweepTask {
+  index: number;
+}
+
+export type KSweepWorkerResponse =
+  | { index: number; evaluation: ClusterEvaluation }
+  | { index: number; error: string };
+
+/**
+ * Workers need Node and a script path, which only the CommonJS build (or
+ * ts-node, for the `.ts` sources) provides.
+ */
+export function can_run_parallel_sweep(): boolean {
+  return is_node() && typeof __filename === 'string';
+}
+
+export class ParallelKSweep implements KSweepEvaluator {
+  private data_: tf.Tensor2D;
+
+  private plan_: KSweepPlan;
+
+  private concurrency_: number;
+
+  private worker_data_: KSweepWorkerData | null = null;
+
+  private workers_: Worker[] = [];
+
+  /** `concurrency` caps the pool; workers start on first use. */
+  constructor(data: tf.Tensor2D, plan: KSweepPlan, concurrency: number) {
+    this.data_ = data;
+    this.plan_ = plan;
+    this.concurrency_ = concurrency;
+  }
+
+  async evaluate(tasks: KSweepTask[]): Promise<ClusterEvaluation[]> {
+    if (tasks.length === 0) return [];
+    const workers = await this.workers(
+      Math.min(this.concurrency_, tasks.length),
+    );
+
+    const results = new Array<ClusterEvaluation>(tasks.length);
+    const detach: Array<() => void> = [];
+    try {
+      await new Promise<void>((resolve, reject) => {
+        let next = 0;
+        let done = 0;
+        const dispatch = (worker: Worker): void => {
+          if (next < tasks.length) {
+            const request: KSweepWorkerRequest = {
+              ...tasks[next],
+              index: next,
+            };
+            next++;
+            worker.postMessage(request);
+          }
+        };
+
+        for (const worker of workers) {
+          const on_message = (response: KSweepWorkerResponse): void => {
+            if ('error' in response) {
+              reject(new Error(response.error));
+              return;
+            }
+            results[response.index] = response.evaluation;
+            done++;
+            if (done === tasks.length) {
+              resolve();
+            }
+            dispatch(worker);
+          };
+          const on_exit = (code: number): void => {
+            reject(new Error(`k-sweep worker exited with code ${code}`));
+          };
+          worker.on('message', on_message);
+          worker.on('error', reject);
+          worker.on('exit', on_exit);
+          detach.push(() => {
+            worker.off('message', on_message);
+            worker.off('error', reject);
+            worker.off('exit', on_exit);
+          });
+          dispatch(worker);
+        }
+      });
+    } catch (err) {
+      // A failed round leaves workers mid-task; start fresh next time.
+      await this.dispose();
+      throw err;
+    } finally {
+      for (const off of detach) off();
+    }
+    return results;
+  }
+
+  async dispose(): Promise<void> {
+    const workers = this.workers_;
+    this.workers_ = [];
+    await Promise.all(workers.map((worker) => worker.terminate()));
+  }
+
+  /** The first `count` workers, spawning any that do not exist yet. */
+  private async workers(count: number): Promise<Worker[]> {
+    if (this.workers_.length >= count) {
+      return this.workers_.slice(0, count);
+    }
+    // `as string` keeps bundlers from resolving the Node-only builtin.
+    const worker_threads = (await import(
+      'worker_threads' as string
+    )) as typeof import('worker_threads');
+
+    if (this.worker_data_ === null) {
+      const [n, d] = this.data_.shape;
+      const buffer = new SharedArrayBuffer(
+        n * d * Float32Array.BYTES_PER_ELEMENT,
+      );
+      new Float32Array(buffer).set(this.data_.dataSync() as Float32Array);
+      this.worker_data_ = {
+        buffer,
+        shape: [n, d],
+        plan: this.plan_,
+        backend_config: current_init_config() ?? {},
+        cache_distances:
+          n * n * this.concurrency_ <= WORKER_DISTANCE_CACHE_MAX_ENTRIES,
+      };
+    }
+
+    const from_source = __filename.endsWith('.ts');
+    const extension = from_source ? '.ts' : '.js';
+    const script = `${__dirname}/k_sweep_worker${extension}`;
+    while (this.workers_.length < count) {
+      const worker = new worker_threads.Worker(script, {
+        workerData: this.worker_data_,
+        execArgv: from_source ? ['--require', 'ts-node/register'] : [],
+      });
+      // Failures during a round reject it through the round's listeners;
+      // an idle worker that dies is just dropped from the pool.
+      worker.on('error', () => {});
+      worker.once('exit', () => {
+        this.workers_ = this.workers_.filter((w) => w !== worker);
+      });
+      this.workers_.push(worker);
+    }
+    return this.workers_.slice(0, count);
+  }
+}
@@ -0,0 +1,121 @@
+import * as tf from '../../test_support/tensorflow_helper';
+import {
+  is_flat_matrix,
+  matrix_shape,
+  to_float64,
+  to_rows,
+  to_tensor2d,
+} from './data_matrix';
+import { KMeans } from '../clustering/kmeans';
+import { AgglomerativeClustering } from '../clustering/agglomerative';
+import { HDBSCAN } from '../clustering/hdbscan';
+import { PCA } from '../decomposition/pca';
+import { silhouette_score } from '../validation/silhouette';
+import type { DataMatrix, FlatMatrix } from '../clustering/types';
+
+const rows = [
+  [0, 0],
+  [0.2, 0.1],
+  [0.1, 0.3],
+  [5, 5],
+  [5.2, 4.9],
+  [4.8, 5.1],
+  [0, 6],
+  [0.3, 6.2],
+  [0.1, 5.8],
+];
+
+function flat(
+  array: Float32ArrayConstructor | Float64ArrayConstructor,
+): FlatMatrix {
+  return { data: array.from(rows.flat()), shape: [rows.length, 2] };
+}
+
+describe('data_matrix helpers', () => {
+  it('recognizes flat matrices only', () => {
+    const t = tf.tensor2d(rows);
+    expect(is_flat_matrix(flat(Float32Array))).toBe(true);
+    expect(is_flat_matrix(rows)).toBe(false);
+    expect(is_flat_matrix(t)).toBe(false);
+    t.dispose();
+  });
+
+  it('reads shape and values from every form', async () => {
+    const exact = rows.flat();
+    const rounded = Array.from(Float32Array.from(exact));
+    const cases: [DataMatrix, number[]][] = [
+      [rows, exact],
+      [flat(Float32Array), rounded],
+      [flat(Float64Array), exact],
+    ];
+    for (const [X, values] of cases) {
+      expect(matrix_shape(X)).toEqual([9, 2]);
+      expect(Array.from(await to_float64(X))).toEqual(values);
+      const t = to_tensor2d(X);
+      expect(t.shape).toEqual([9, 2]);
+      expect(Array.from(t.dataSync())).toEqual(rounded);
+      t.dispose();
+    }
+  });
+
+  it('hands float64 data over without copying', async () => {
+    const X = flat(Float64Array);
+    expect(await to_float64(X)).toBe(X.data);
+  });
+
+  it('expands flat data into rows', async () => {
+    expect(await to_rows(flat(Float64Array))).toEqual(rows);
+  });
+
+  it('rejects data that does not fill the shape', () => {
+    const X = { data: new Float32Array(5), shape: [3, 2] } as FlatMatrix;
+    expect(() => matrix_shape(X)).toThrow(
+      'Flat matrix data has 5 values but shape [3, 2].',
+    );
+  });
+});
+
+describe('flat matrix input', () => {
+  it('gives the same results as nested arrays', async () => {
+    const X = flat(Float64Array);
+
+    const km_rows = new KMeans({ n_clusters: 3, random_state: 0 });
+    const km_flat = new KMeans({ n_clusters: 3, random_state: 0 });
+    expect(await km_flat.fit_predict(X)).toEqual(
+      await km_rows.fit_predict(rows),
+    );
+    expect(await km_flat.predict(X)).toEqual(km_rows.labels_);
+    km_rows.dispose();
+    km_flat.dispose();
+
+    const agg = new AgglomerativeClustering({ n_clusters: 3 });
+    expect(await agg.fit_predict(X)).toEqual(
+      await new AgglomerativeClustering({ n_clusters: 3 }).fit_predict(rows),
+    );
+
+    const hdb = new HDBSCAN({ min_cluster_size: 3 });
+    expect(await hdb.fit_predict(X)).toEqual(
+      await new HDBSCAN({ min_cluster_size: 3 }).fit_predict(rows),
+    );
+
+    const pca = new PCA({ n_components: 1 }).fit(X);
+    const expected = new PCA({ n_components: 1 }).fit(rows);
+    expect(pca.components_).toEqual(expected.components_);
+
+    const labels = Int32Array.from([0, 0, 0, 1, 1, 1, 2, 2, 2]);
+    expect(silhouette_score(X, labels)).toBeCloseTo(
+      silhouette_score(rows, Array.from(labels)),
+      6,
+    );
+  });
+
+  it('returns Int32Array labels from fit_predict on request', async () => {
+    const km = new KMeans({ n_clusters: 3, random_state: 0 });
+    const labels = await km.fit_predict(flat(Float32Array), {
+      int32_labels: true,
+    });
+    expect(labels).toBeInstanceOf(Int32Array);
+    expect(Array.from(labels)).toEqual(km.labels_);
+    km.dispose();
+  });
+});
@@ -0,0 +1,113 @@
+import * as tf from '../backend/adapter';
+import type {
+  DataMatrix,
+  FitPredictOptions,
+  FlatMatrix,
+} from '../clustering/types';
+import { rows_to_float64 } from '../distance/float64_distance';
+import { is_tensor } from './tensor_guards';
+
+/**
+ * Readers for the three `DataMatrix` forms. Each returns the cheapest
+ * representation its consumer can use: flat input is never expanded into
+ * nested arrays, float32 flat data backs tensors directly and float64 flat
+ * data is handed to float64 code without a copy.
+ */
+
+export function is_flat_matrix(value: unknown): value is FlatMatrix {
+  if (!value || typeof value !== 'object' || Array.isArray(value)) {
+    return false;
+  }
+  const { data, shape } = value as Partial<FlatMatrix>;
+  return (
+    (data instanceof Float32Array || data instanceof Float64Array) &&
+    Array.isArray(shape) &&
+    shape.length === 2
+  );
+}
+
+function check_flat(X: FlatMatrix): void {
+  const [n, d] = X.shape;
+  if (
+    !Number.isInteger(n) ||
+    !Number.isInteger(d) ||
+    n < 0 ||
+    d < 0 ||
+    X.data.length !== n * d
+  ) {
+    throw new Error(
+      `Flat matrix data has ${X.data.length} values but shape [${n}, ${d}].`,
+    );
+  }
+}
+
+/** `[n_samples, n_features]`; `n_features` is 0 for an empty nested array. */
+export function matrix_shape(X: DataMatrix): [number, number] {
+  if (is_tensor(X)) {
+    return [X.shape[0], X.shape[1]];
+  }
+  if (is_flat_matrix(X)) {
+    check_flat(X);
+    return [X.shape[0], X.shape[1]];
+  }
+  return [X.length, X.length > 0 ? X[0].length : 0];
+}
+
+/**
+ * A tensor view of `X`: tensors are returned as is, anything else as a new
+ * float32 tensor the caller disposes (`!is_tensor(X)`).
+ */
+export function to_tensor2d(X: DataMatrix): tf.Tensor2D {
+  if (is_tensor(X)) {
+    return X;
+  }
+  if (is_flat_matrix(X)) {
+    check_flat(X);
+    const values =
+      X.data instanceof Float32Array ? X.data : Float32Array.from(X.data);
+    return tf.tensor2d(values, X.shape, 'float32');
+  }
+  return tf.tensor2d(X, undefined, 'float32');
+}
+
+/** Row-major float64 values; float64 flat data is returned without a copy. */
+export async function to_float64(X: DataMatrix): Promise<Float64Array> {
+  if (is_tensor(X)) {
+    return Float64Array.from(await X.data());
+  }
+  return to_float64_sync(X);
+}
+
+/** {@link to_float64} for synchronous callers (tensors use `dataSync`). */
+export function to_float64_sync(X: DataMatrix): Float64Array {
+  if (is_tensor(X)) {
+    return Float64Array.from(X.dataSync());
+  }
+  if (is_flat_matrix(X)) {
+    check_flat(X);
+    return X.data instanceof Float64Array ? X.data : Float64Array.from(X.data);
+  }
+  return rows_to_float64(X);
+}
+
+/** Nested rows, for the few row-oriented algorithms (e.g. spherical k-means). */
+export async function to_rows(X: DataMatrix): Promise<number[][]> {
+  if (is_tensor(X)) {
+    return (await X.array()) as number[][];
+  }
+  if (!is_flat_matrix(X)) {
+    return X;
+  }
+  const [n, d] = matrix_shape(X);
+  return Array.from({ length: n }, (_, i) =>
+    Array.from(X.data.subarray(i * d, (i + 1) * d)),
+  );
+}
+
+/** `fit_predict`'s return value under {@link FitPredictOptions}. */
+export function format_labels(
+  labels: number[],
+  options?: FitPredictOptions,
+): number[] | Int32Array {
+  return options?.int32_labels ? Int32Array.from(labels) : labels;
+}
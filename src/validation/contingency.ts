@@ -15,7 +15,7 @@ export function to_label_array(labels: LabelVector): number[] {
       Math.round(l),
     );
   }
-  return labels;
+  return Array.isArray(labels) ? labels : Array.from(labels);
 }
 
 export function build_contingency_table(
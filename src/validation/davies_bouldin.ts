@@ -45,6 +45,46 @@ function cluster_dispersion(
   });
 }
 
+/**
+ * DB from per-cluster dispersions and the k × k centroid distance matrix.
+ * Coincident centroids score Infinity unless both dispersions are zero, in
+ * which case the pair is skipped (sklearn's nanmax of 0/0 = NaN).
+ */
+export function davies_bouldin_from_dispersions(
+  centroid_distances: ArrayLike<number>[],
+  dispersions: ArrayLike<number>,
+): number {
+  const k = dispersions.length;
+  let db_sum = 0;
+
+  for (let i = 0; i < k; i++) {
+    let max_similarity = 0;
+
+    for (let j = 0; j < k; j++) {
+      if (i === j) continue;
+
+      const distance = centroid_distances[i][j];
+
+      if (distance === 0) {
+        if (dispersions[i] + dispersions[j] > 0) {
+          max_similarity = Infinity;
+          break;
+        }
+        continue;
+      }
+
+      const similarity = (dispersions[i] + dispersions[j]) / distance;
+      if (similarity > max_similarity) {
+        max_similarity = similarity;
+      }
+    }
+
+    db_sum += max_similarity;
+  }
+
+  return db_sum / k;
+}
+
 /**
  * Formula: DB = (1/k) * sum(max_{i≠j}(R_{ij}))
  * where R_{ij} = (s_i + s_j) / d_{ij},
@@ -107,40 +147,7 @@ export function davies_bouldin(
       metric,
     ).arraySync() as number[][];
 
-    const max_similarities: number[] = [];
-
-    for (let i = 0; i < k; i++) {
-      let max_similarity = 0;
-
-      for (let j = 0; j < k; j++) {
-        if (i === j) continue;
-
-        const distance = centroid_distances[i][j];
-
-        if (distance === 0) {
-          const numerator = dispersions[i] + dispersions[j];
-          if (numerator > 0) {
-            // Non-zero dispersion with coincident centroids -> Infinity.
-            max_similarity = Infinity;
-            break;
-          }
-          // Both dispersions zero with coincident centroids -> skip
-          // (matches sklearn nanmax of 0/0 = NaN).
-          continue;
-        }
-
-        const similarity = (dispersions[i] + dispersions[j]) / distance;
-        if (similarity > max_similarity) {
-          max_similarity = similarity;
-        }
-      }
-
-      max_similarities.push(max_similarity);
-    }
-
-    const db_score = max_similarities.reduce((sum, val) => sum + val, 0) / k;
-
-    return db_score;
+    return davies_bouldin_from_dispersions(centroid_distances, dispersions);
   });
 }
 
@@ -201,35 +208,5 @@ export function davies_bouldin_efficient(
 
   dispose_work();
 
-  let db_sum = 0;
-
-  for (let i = 0; i < k; i++) {
-    let max_similarity = 0;
-
-    for (let j = 0; j < k; j++) {
-      if (i === j) continue;
-
-      const distance = centroid_distances[i][j];
-
-      if (distance === 0) {
-        const numerator = dispersions[i] + dispersions[j];
-        if (numerator > 0) {
-          max_similarity = Infinity;
-          break;
-        }
-        // Both dispersions zero with coincident centroids -> skip
-        // (matches sklearn nanmax of 0/0 = NaN)
-        continue;
-      }
-
-      const similarity = (dispersions[i] + dispersions[j]) / distance;
-      if (similarity > max_similarity) {
-        max_similarity = similarity;
-      }
-    }
-
-    db_sum += max_similarity;
-  }
-
-  return db_sum / k;
+  return davies_bouldin_from_dispersions(centroid_distances, dispersions);
 }
@@ -0,0 +1,123 @@
+import * as tf from '../backend/adapter';
+import { EvaluationContext } from './evaluation_context';
+import { silhouette_score } from './silhouette';
+import { davies_bouldin_efficient } from './davies_bouldin';
+import { calinski_harabasz_efficient } from './calinski_harabasz';
+import { compute_wss } from '../model_selection/compute_wss';
+import { make_random_stream } from '../random';
+
+function blobs(n_per: number, centers: number[][], seed: number): number[][] {
+  const rng = make_random_stream(seed);
+  const out: number[][] = [];
+  for (let i = 0; i < n_per; i++) {
+    for (const c of centers) out.push(c.map((v) => v + rng.rand() - 0.5));
+  }
+  return out;
+}
+
+const CENTERS = [
+  [0, 0, 1],
+  [5, 0, 2],
+  [0, 5, 3],
+  [5, 5, 4],
+];
+const X = blobs(15, CENTERS, 3);
+
+/** Labelling into `k` groups by distance to the first k centres. */
+function nearest_center_labels(k: number): number[] {
+  return X.map((x) => {
+    let best = 0;
+    let best_d = Infinity;
+    for (let c = 0; c < k; c++) {
+      const d = x.reduce((s, v, f) => s + (v - CENTERS[c][f]) ** 2, 0);
+      if (d < best_d) {
+        best_d = d;
+        best = c;
+      }
+    }
+    return best;
+  });
+}
+
+describe('EvaluationContext', () => {
+  for (const metric of ['euclidean', 'cosine'] as const) {
+    for (const cache_distances of [true, false]) {
+      it(`matches the standalone metrics (${metric}, cache ${cache_distances})`, () => {
+        const context = new EvaluationContext(X, { metric, cache_distances });
+        for (const k of [2, 3, 4]) {
+          const labels = nearest_center_labels(k);
+          expect(context.silhouette_score(labels)).toBeCloseTo(
+            silhouette_score(X, labels, metric),
+            4,
+          );
+          expect(context.davies_bouldin(labels)).toBeCloseTo(
+            davies_bouldin_efficient(X, labels, metric),
+            4,
+          );
+          const ch = calinski_harabasz_efficient(X, labels);
+          expect(context.calinski_harabasz(labels) / ch).toBeCloseTo(1, 4);
+          const wss = compute_wss(X, labels);
+          expect(context.wss(labels) / wss).toBeCloseTo(1, 4);
+        }
+        context.dispose();
+      });
+    }
+  }
+
+  it('excludes noise like the standalone metrics', () => {
+    const labels = nearest_center_labels(3).map((l, i) =>
+      i % 7 === 0 ? -1 : l,
+    );
+    const context = new EvaluationContext(X);
+    expect(context.silhouette_score(labels)).toBeCloseTo(
+      silhouette_score(X, labels),
+      4,
+    );
+    expect(context.davies_bouldin(labels)).toBeCloseTo(
+      davies_bouldin_efficient(X, labels),
+      4,
+    );
+    expect(
+      context.calinski_harabasz(labels) /
+        calinski_harabasz_efficient(X, labels),
+    ).toBeCloseTo(1, 4);
+
+    // One cluster plus noise is defined; one cluster alone throws.
+    const single = X.map((_, i) => (i < 5 ? -1 : 0));
+    expect(context.silhouette_score(single)).toBe(0);
+    expect(context.davies_bouldin(single)).toBe(0);
+    expect(context.calinski_harabasz(single)).toBe(0);
+    expect(() => context.silhouette_score(X.map(() => 0))).toThrow(
+      'at least 2 clusters',
+    );
+    expect(() => context.silhouette_score(X.map(() => -1))).toThrow(
+      'all labels are noise',
+    );
+    context.dispose();
+  });
+
+  it('accepts tensor labels and does not leak', () => {
+    const data = tf.tensor2d(X);
+    const before = tf.memory().numTensors;
+    const context = new EvaluationContext(data);
+    const labels = nearest_center_labels(4);
+    const label_tensor = tf.tensor1d(labels);
+    expect(context.silhouette_score(label_tensor)).toBeCloseTo(
+      context.silhouette_score(labels),
+      6,
+    );
+    context.davies_bouldin(labels);
+    context.calinski_harabasz(labels);
+    label_tensor.dispose();
+    context.dispose();
+    expect(tf.memory().numTensors).toBe(before);
+    expect(data.isDisposed).toBe(false);
+    data.dispose();
+  });
+
+  it('validates the labels length', () => {
+    const context = new EvaluationContext(X);
+    expect(() => context.wss([0, 1])).toThrow('does not match data rows');
+    context.dispose();
+  });
+});
@@ -0,0 +1,375 @@
+import * as tf from '../backend/adapter';
+import { DataMatrix, LabelVector } from '../clustering/types';
+import { is_tensor } from '../tensor/tensor_guards';
+import { to_tensor2d } from '../tensor/data_matrix';
+import { to_label_array } from './contingency';
+import { validate_labels_length, noise_filtered_indices } from './validate';
+import {
+  blocked_silhouette,
+  dense_cluster_ids,
+  distance_row_norms,
+  distance_rows,
+  row_distance_block,
+  type DistanceBlockSource,
+  type ValidationMetric,
+} from './silhouette';
+import { davies_bouldin_from_dispersions } from './davies_bouldin';
+
+/**
+ * Shared state for scoring many labellings of the same `X`, e.g. a k-sweep.
+ *
+ * Everything that depends only on `X` is computed once: the row norms and,
+ * for moderate `n`, the full distance matrix that silhouette reads block by
+ * block. Everything that depends on one labelling (cluster sizes, centroids,
+ * within-cluster sums and dispersions) comes from a single set of segment
+ * sums and one readback, shared by silhouette, Davies-Bouldin,
+ * Calinski-Harabasz and WSS. Scores match the standalone functions.
+ */
+
+/** Largest `n` whose `n × n` distance matrix is cached by default (64 MB). */
+const EVALUATION_DISTANCE_CACHE_MAX_SAMPLES = 4096;
+
+export interface EvaluationContextOptions {
+  /** Distance for silhouette and Davies-Bouldin (default: 'euclidean'). */
+  metric?: ValidationMetric;
+  /**
+   * Keep the full distance matrix on-device between labellings. Defaults to
+   * true when `n ≤ 4096`; otherwise silhouette blocks are recomputed.
+   */
+  cache_distances?: boolean;
+}
+
+interface LabellingStats {
+  label_array: number[];
+  /** Non-noise rows of `X`, or `null` when there is no noise. */
+  keep: Int32Array | null;
+  had_noise: boolean;
+  /** Dense cluster id of each non-noise row. */
+  ids: Int32Array;
+  k: number;
+  /** Number of non-noise rows. */
+  n: number;
+  counts: Float64Array;
+  /** Cluster means, `k` rows of `n_features`. */
+  means: Float32Array[];
+  /** Davies-Bouldin centroids: the means, unit-normalised for cosine. */
+  db_centroids: Float32Array[];
+  /** Σ‖x − mean‖² per cluster. */
+  cluster_ss: Float64Array;
+  /** Mean distance to the Davies-Bouldin centroid per cluster. */
+  dispersions: Float64Array;
+}
+
+function same_labels(a: number[], b: number[]): boolean {
+  if (a.length !== b.length) return false;
+  for (let i = 0; i < a.length; i++) {
+    if (a[i] !== b[i]) return false;
+  }
+  return true;
+}
+
+function centroid_distance(
+  a: Float32Array,
+  b: Float32Array,
+  metric: ValidationMetric,
+): number {
+  let dot = 0;
+  let aa = 0;
+  let bb = 0;
+  let sq = 0;
+  for (let f = 0; f < a.length; f++) {
+    dot += a[f] * b[f];
+    aa += a[f] * a[f];
+    bb += b[f] * b[f];
+    sq += (a[f] - b[f]) ** 2;
+  }
+  return metric === 'cosine'
+    ? 1 - dot / (Math.sqrt(aa) * Math.sqrt(bb) + 1e-8)
+    : Math.sqrt(sq);
+}
+
+export class EvaluationContext {
+  private data_: tf.Tensor2D;
+
+  private owns_data_: boolean;
+
+  private metric_: ValidationMetric;
+
+  private cache_distances_: boolean;
+
+  /** `distance_rows` of the data; silhouette distances come from these. */
+  private points_: tf.Tensor2D;
+
+  private norms_: tf.Tensor1D;
+
+  private distances_: tf.Tensor2D | null = null;
+
+  private stats_: LabellingStats | null = null;
+
+  constructor(X: DataMatrix, options: EvaluationContextOptions = {}) {
+    this.owns_data_ = !is_tensor(X);
+    this.data_ = to_tensor2d(X);
+    this.metric_ = options.metric ?? 'euclidean';
+    this.cache_distances_ =
+      options.cache_distances ??
+      this.data_.shape[0] <= EVALUATION_DISTANCE_CACHE_MAX_SAMPLES;
+    this.points_ = distance_rows(this.data_, this.metric_);
+    this.norms_ = distance_row_norms(this.points_, this.metric_);
+  }
+
+  /** Same value as `silhouette_score(X, labels, metric)`. */
+  silhouette_score(labels: LabelVector): number {
+    const stats = this.stats(labels);
+    if (stats.k === 0) {
+      throw new Error(
+        'Silhouette score requires at least 2 clusters; all labels are noise',
+      );
+    }
+    if (stats.k === 1) {
+      if (stats.had_noise) {
+        return 0;
+      }
+      throw new Error('Silhouette score requires at least 2 clusters');
+    }
+
+    const rows = Int32Array.from({ length: stats.n }, (_, i) => i);
+    const keep =
+      stats.keep === null ? null : tf.tensor1d(stats.keep, 'int32');
+    const work_norms =
+      keep === null
+        ? this.norms_
+        : (tf.gather(this.norms_, keep) as tf.Tensor1D);
+    const work_data =
+      keep === null
+        ? this.points_
+        : (tf.gather(this.points_, keep) as tf.Tensor2D);
+
+    const values = blocked_silhouette(
+      this.distance_source(keep, work_data, work_norms),
+      stats.ids,
+      stats.k,
+      rows,
+    );
+
+    if (keep !== null) {
+      tf.dispose([keep, work_norms, work_data]);
+    }
+    let total = 0;
+    for (const value of values) total += value;
+    return total / values.length;
+  }
+
+  /** Same value as `davies_bouldin_efficient(X, labels, metric)`. */
+  davies_bouldin(labels: LabelVector): number {
+    const stats = this.stats(labels);
+    if (stats.k <= 1) {
+      if (stats.had_noise) {
+        return 0;
+      }
+      throw new Error('Davies-Bouldin score requires at least 2 clusters');
+    }
+
+    const centroid_distances = stats.db_centroids.map((a) =>
+      stats.db_centroids.map((b) =>
+        a === b ? 0 : centroid_distance(a, b, this.metric_),
+      ),
+    );
+    return davies_bouldin_from_dispersions(
+      centroid_distances,
+      stats.dispersions,
+    );
+  }
+
+  /** Same value as `calinski_harabasz_efficient(X, labels)`. */
+  calinski_harabasz(labels: LabelVector): number {
+    const stats = this.stats(labels);
+    const { k, n } = stats;
+    if (k <= 1) {
+      if (stats.had_noise) {
+        return 0;
+      }
+      throw new Error('Calinski-Harabasz score requires at least 2 clusters');
+    }
+    if (k >= n) {
+      if (stats.had_noise) {
+        return 0;
+      }
+      throw new Error('Number of clusters must be less than number of samples');
+    }
+
+    // The global mean is the count-weighted mean of the cluster means.
+    const n_features = stats.means[0].length;
+    const global = new Float64Array(n_features);
+    for (let c = 0; c < k; c++) {
+      for (let f = 0; f < n_features; f++) {
+        global[f] += (stats.counts[c] * stats.means[c][f]) / n;
+      }
+    }
+
+    let between_cluster_ss = 0;
+    let within_cluster_ss = 0;
+    for (let c = 0; c < k; c++) {
+      let sq = 0;
+      for (let f = 0; f < n_features; f++) {
+        sq += (stats.means[c][f] - global[f]) ** 2;
+      }
+      between_cluster_ss += stats.counts[c] * sq;
+      within_cluster_ss += stats.cluster_ss[c];
+    }
+    return between_cluster_ss / (k - 1) / (within_cluster_ss / (n - k));
+  }
+
+  /**
+   * Within-cluster sum of squares, as `compute_wss`. Noise (`-1`) samples
+   * are excluded here, like every other metric of the context.
+   */
+  wss(labels: LabelVector): number {
+    const { cluster_ss } = this.stats(labels);
+    let total = 0;
+    for (const value of cluster_ss) total += value;
+    return total;
+  }
+
+  dispose(): void {
+    this.points_.dispose();
+    this.norms_.dispose();
+    this.distances_?.dispose();
+    this.distances_ = null;
+    this.stats_ = null;
+    if (this.owns_data_) {
+      this.data_.dispose();
+    }
+  }
+
+  /**
+   * Silhouette distance blocks over the non-noise rows. With the cache, a
+   * block is a row (and, under noise, column) gather of the cached matrix.
+   */
+  private distance_source(
+    keep: tf.Tensor1D | null,
+    work_data: tf.Tensor2D,
+    work_norms: tf.Tensor1D,
+  ): DistanceBlockSource {
+    if (!this.cache_distances_) {
+      return row_distance_block(work_data, work_norms, this.metric_);
+    }
+    if (this.distances_ === null) {
+      const n = this.data_.shape[0];
+      const all_rows = tf.tensor1d(
+        Int32Array.from({ length: n }, (_, i) => i),
+        'int32',
+      );
+      this.distances_ = row_distance_block(
+        this.points_,
+        this.norms_,
+        this.metric_,
+      )(all_rows);
+      all_rows.dispose();
+    }
+    const distances = this.distances_;
+    if (keep === null) {
+      return (idx) => tf.gather(distances, idx) as tf.Tensor2D;
+    }
+    return (idx) =>
+      tf.tidy(
+        () =>
+          tf.gather(
+            tf.gather(distances, tf.gather(keep, idx)),
+            keep,
+            1,
+          ) as tf.Tensor2D,
+      );
+  }
+
+  /** Per-labelling statistics, recomputed only when the labels change. */
+  private stats(labels: LabelVector): LabellingStats {
+    validate_labels_length(this.data_, labels);
+    const label_array = Array.from(to_label_array(labels));
+    if (
+      this.stats_ !== null &&
+      same_labels(this.stats_.label_array, label_array)
+    ) {
+      return this.stats_;
+    }
+
+    const { keep: kept, had_noise } = noise_filtered_indices(label_array);
+    const keep = had_noise ? Int32Array.from(kept) : null;
+    const { ids, k } = dense_cluster_ids(
+      had_noise ? kept.map((i) => label_array[i]) : label_array,
+    );
+    const n = ids.length;
+    const n_features = this.data_.shape[1];
+
+    const counts = new Float64Array(k);
+    for (const id of ids) counts[id]++;
+
+    let flat = new Float32Array(0);
+    if (k > 0) {
+      flat = tf.tidy(() => {
+        const work = had_noise
+          ? (tf.gather(this.data_, keep!) as tf.Tensor2D)
+          : this.data_;
+        const ids_t = tf.tensor1d(ids, 'int32');
+        const sums = tf.unsorted_segment_sum(work, ids_t, k);
+        const means = sums.div(tf.tensor1d(counts).reshape([-1, 1]));
+        const sq = work.sub(tf.gather(means, ids_t)).square().sum(1);
+        const cluster_ss = tf.unsorted_segment_sum(sq, ids_t, k);
+
+        let db_centroids = means;
+        let distance = sq.sqrt();
+        if (this.metric_ === 'cosine') {
+          db_centroids = means.div(
+            means.square().sum(1, true).sqrt().add(1e-8),
+          );
+          const mine = tf.gather(db_centroids, ids_t);
+          const row_norms = had_noise
+            ? tf.gather(this.norms_, keep!)
+            : this.norms_;
+          const similarity = work
+            .mul(mine)
+            .sum(1)
+            .div(row_norms.mul(mine.square().sum(1).sqrt()).add(1e-8));
+          distance = tf.scalar(1).sub(similarity);
+        }
+        const dispersion_sums = tf.unsorted_segment_sum(distance, ids_t, k);
+
+        return tf
+          .concat([
+            means.reshape([-1]),
+            db_centroids.reshape([-1]),
+            cluster_ss,
+            dispersion_sums,
+          ])
+          .dataSync() as Float32Array;
+      });
+    }
+
+    const block = k * n_features;
+    const row = (offset: number, c: number) =>
+      flat.slice(offset + c * n_features, offset + (c + 1) * n_features);
+    const means = Array.from({ length: k }, (_, c) => row(0, c));
+    const db_centroids = Array.from({ length: k }, (_, c) => row(block, c));
+    const cluster_ss = Float64Array.from(
+      flat.subarray(2 * block, 2 * block + k),
+    );
+    // Singleton clusters have zero dispersion by definition.
+    const dispersions = Float64Array.from({ length: k }, (_, c) =>
+      counts[c] > 1 ? flat[2 * block + k + c] / counts[c] : 0,
+    );
+
+    this.stats_ = {
+      label_array,
+      keep,
+      had_noise,
+      ids,
+      k,
+      n,
+      counts,
+      means,
+      db_centroids,
+      cluster_ss,
+      dispersions,
+    };
+    return this.stats_;
+  }
+}
@@ -9,5 +9,9 @@ export {
   silhouette_score_subset,
   type ValidationMetric,
 } from './silhouette';
+export {
+  EvaluationContext,
+  type EvaluationContextOptions,
+} from './evaluation_context';
 export { adjusted_rand_index } from './adjusted_rand_index';
 export { normalized_mutual_info, type NMIAverage } from './normalized_mutual_info';
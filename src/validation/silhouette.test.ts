@@ -307,6 +307,21 @@ describe("silhouette_score", () => {
         "Labels length (2) does not match data rows (3)"
       );
     });
+
+    it("throws for silhouette_score_subset indices outside X", () => {
+      const X = [[0, 0], [0, 1], [5, 5], [5, 6]];
+      const labels = [0, 0, 1, 1];
+
+      expect(() => silhouette_score_subset(X, labels, [0, 4])).toThrow(
+        "Sample index 4 is outside the 4 samples of X."
+      );
+      expect(() => silhouette_score_subset(X, labels, [-1])).toThrow(
+        "Sample index -1"
+      );
+      expect(() => silhouette_score_subset(X, labels, [1.5])).toThrow(
+        "Sample index 1.5"
+      );
+    });
   });
 
   describe("silhouette_samples", () => {
@@ -450,6 +465,26 @@ describe("silhouette_score – noise (-1) awareness", () => {
     ).toThrow("all labels are noise");
   });
 
+  it("keeps euclidean precision for data far from the origin", () => {
+    const rng = make_random_stream(3);
+    const X = Array.from({ length: 60 }, (_, i) => [
+      (i % 2) * 3 + rng.rand(),
+      rng.rand(),
+    ]);
+    const labels = X.map((_, i) => i % 2);
+    const shifted = X.map(([a, b]) => [a + 1e4, b - 1e4]);
+    const indices = Array.from({ length: 20 }, (_, i) => i * 3);
+
+    expect(silhouette_score_subset(shifted, labels, indices)).toBeCloseTo(
+      silhouette_score_subset(X, labels, indices),
+      4,
+    );
+    expect(silhouette_score(shifted, labels)).toBeCloseTo(
+      silhouette_score(X, labels),
+      4,
+    );
+  });
+
   it("supports the cosine metric", () => {
     const s = silhouette_score(two_clusters, [0, 0, 1, 1], "cosine");
     expect(Number.isFinite(s)).toBe(true);
@@ -488,3 +523,77 @@ describe("silhouette_score – degenerate-input contract", () => {
     expect(silhouette_score([[0, 0], [1, 0], [2, 0]], [0, 0, -1])).toBe(0);
   });
 });
+
+describe("silhouette – blocked kernel", () => {
+  // More rows than one block, so results span several distance blocks.
+  const rng = make_random_stream(11);
+  const centers = [[0, 0, 0], [3, 1, 0], [0, 4, 2]];
+  const X: number[][] = [];
+  const labels: number[] = [];
+  for (let i = 0; i < 700; i++) {
+    const c = i % 3;
+    X.push(centers[c].map((v) => v + rng.rand() * 2 - 1));
+    // A few noise samples and a non-contiguous label set.
+    labels.push(i % 50 === 0 ? -1 : [4, 9, 2][c]);
+  }
+
+  function reference(metric: "euclidean" | "cosine"): number[] {
+    const dist = (p: number[], q: number[]) => {
+      if (metric === "cosine") {
+        const dot = p.reduce((s, v, f) => s + v * q[f], 0);
+        const np = Math.hypot(...p);
+        const nq = Math.hypot(...q);
+        return 1 - dot / (np * nq + 1e-8);
+      }
+      return Math.sqrt(p.reduce((s, v, f) => s + (v - q[f]) ** 2, 0));
+    };
+    const kept = X.map((_, i) => i).filter((i) => labels[i] !== -1);
+    return kept.map((i) => {
+      const sums = new Map<number, { sum: number; count: number }>();
+      for (const j of kept) {
+        if (j === i) continue;
+        const entry = sums.get(labels[j]) ?? { sum: 0, count: 0 };
+        entry.sum += dist(X[i], X[j]);
+        entry.count++;
+        sums.set(labels[j], entry);
+      }
+      const own = sums.get(labels[i])!;
+      const a = own.sum / own.count;
+      let b = Infinity;
+      for (const [label, { sum, count }] of sums) {
+        if (label !== labels[i]) b = Math.min(b, sum / count);
+      }
+      return (b - a) / Math.max(a, b);
+    });
+  }
+
+  it.each(["euclidean", "cosine"] as const)(
+    "matches a brute-force reference (%s)",
+    (metric) => {
+      const expected = reference(metric);
+      const samples = silhouette_samples(X, labels, metric);
+      expect(samples).toHaveLength(expected.length);
+      samples.forEach((s, i) => expect(s).toBeCloseTo(expected[i], 4));
+    },
+  );
+
+  it("shares the kernel with silhouette_score_subset", () => {
+    const samples = silhouette_samples(X, labels);
+    const kept = X.map((_, i) => i).filter((i) => labels[i] !== -1);
+    // 0 and 100 are noise and must be skipped.
+    const subset = [3, 100, 101, 649, 0];
+    const expected =
+      [3, 101, 649].reduce((s, i) => s + samples[kept.indexOf(i)], 0) / 3;
+    expect(silhouette_score_subset(X, labels, subset)).toBeCloseTo(
+      expected,
+      5,
+    );
+  });
+
+  it("does not leak tensors", () => {
+    const before = tf.memory().numTensors;
+    silhouette_samples(X, labels);
+    silhouette_score_subset(X, labels, [1, 2, 3]);
+    expect(tf.memory().numTensors).toBe(before);
+  });
+});
@@ -5,11 +5,153 @@ import {
   convert_validation_inputs,
   noise_filtered_indices,
 } from './validate';
-import { pairwise_distance_matrix } from '../distance/pairwise_distance';
 
 /** Distance metric accepted by the noise-aware internal validation metrics. */
 export type ValidationMetric = 'euclidean' | 'cosine';
 
+/** Query rows per block; each block holds a `block × n` distance matrix. */
+const SILHOUETTE_BLOCK_SIZE = 512;
+
+/** Dense cluster ids `0..k-1` in order of first appearance. */
+export function dense_cluster_ids(labels: number[]): {
+  ids: Int32Array;
+  k: number;
+} {
+  const id_of = new Map<number, number>();
+  const ids = new Int32Array(labels.length);
+  labels.forEach((label, i) => {
+    let id = id_of.get(label);
+    if (id === undefined) {
+      id = id_of.size;
+      id_of.set(label, id);
+    }
+    ids[i] = id;
+  });
+  return { ids, k: id_of.size };
+}
+
+/**
+ * Unmasked distances from the query rows `idx` to every sample, `|idx| × n`.
+ * `blocked_silhouette` only ever asks for one block at a time, so a source
+ * may recompute each block or slice it from a cached matrix.
+ */
+export type DistanceBlockSource = (idx: tf.Tensor1D) => tf.Tensor2D;
+
+/**
+ * Rows fed to `distance_row_norms` and `row_distance_block`. Euclidean rows
+ * are column-centred: distances are unchanged, but the norm identity no
+ * longer cancels catastrophically in float32 when the data sit far from the
+ * origin. Cosine rows are returned as a clone.
+ */
+export function distance_rows(
+  data: tf.Tensor2D,
+  metric: ValidationMetric,
+): tf.Tensor2D {
+  return tf.tidy(() =>
+    metric === 'cosine'
+      ? (tf.clone(data) as tf.Tensor2D)
+      : (data.sub(data.mean(0, true)) as tf.Tensor2D),
+  );
+}
+
+/**
+ * Per-row norms consumed by `row_distance_block`: squared L2 norms for
+ * euclidean (norm identity), plain L2 norms for cosine.
+ */
+export function distance_row_norms(
+  data: tf.Tensor2D,
+  metric: ValidationMetric,
+): tf.Tensor1D {
+  return tf.tidy(() => {
+    const squared_norms = data.square().sum(1) as tf.Tensor1D;
+    return metric === 'cosine' ? squared_norms.sqrt() : squared_norms;
+  });
+}
+
+/** Recomputes each block from `data` and its `distance_row_norms`. */
+export function row_distance_block(
+  data: tf.Tensor2D,
+  norms: tf.Tensor1D,
+  metric: ValidationMetric,
+): DistanceBlockSource {
+  return (idx) =>
+    tf.tidy(() => {
+      const dot = tf.mat_mul(tf.gather(data, idx), data, false, true);
+      const row_norms = tf.gather(norms, idx).reshape([-1, 1]);
+      const col_norms = norms.reshape([1, -1]);
+      return (
+        metric === 'cosine'
+          ? tf.scalar(1).sub(dot.div(row_norms.mul(col_norms).add(1e-8)))
+          : tf.maximum(row_norms.add(col_norms).sub(dot.mul(2)), 0).sqrt()
+      ) as tf.Tensor2D;
+    });
+}
+
+/**
+ * Silhouette of the given `rows`, exact and blocked: each block's distances
+ * to all `n` samples are reduced to per-cluster sums with one one-hot
+ * matMul, and a(i), b(i) and s(i) are formed on-device. Memory is
+ * O(n·block + n·k) and only the returned values are read back.
+ */
+export function blocked_silhouette(
+  distances_for: DistanceBlockSource,
+  cluster_ids: Int32Array,
+  k: number,
+  rows: Int32Array,
+): Float32Array {
+  const n = cluster_ids.length;
+  if (rows.length === 0) {
+    return new Float32Array(0);
+  }
+
+  const [one_hot, counts] = tf.tidy(() => {
+    const one_hot = tf.cast(
+      tf.one_hot(tf.tensor1d(cluster_ids, 'int32'), k),
+      'float32',
+    ) as tf.Tensor2D;
+    return [one_hot, one_hot.sum(0)];
+  });
+
+  const blocks: tf.Tensor1D[] = [];
+  for (let start = 0; start < rows.length; start += SILHOUETTE_BLOCK_SIZE) {
+    const block_rows = rows.subarray(
+      start,
+      Math.min(start + SILHOUETTE_BLOCK_SIZE, rows.length),
+    );
+    blocks.push(
+      tf.tidy(() => {
+        const idx = tf.tensor1d(block_rows, 'int32');
+        // A sample is not its own neighbour.
+        const self = tf.cast(tf.one_hot(idx, n), 'float32');
+        const distances = distances_for(idx).mul(tf.scalar(1).sub(self));
+
+        const sums = tf.mat_mul(distances, one_hot); // block × k
+        const own = tf.gather(one_hot, idx); // block × k
+        const own_count = own.mul(counts).sum(1).sub(1);
+
+        const a = sums.mul(own).sum(1).div(tf.maximum(own_count, 1));
+        const means = sums.div(counts.reshape([1, -1]));
+        const b = tf
+          .where(own.greater(0), tf.fill(means.shape, Infinity), means)
+          .min(1);
+
+        const s = b.sub(a).div(tf.maximum(a, b));
+        // Singleton clusters and all-zero distances (identical points) score
+        // 0, the sklearn convention.
+        const undefined_s = own_count
+          .lessEqual(0)
+          .logicalOr(a.equal(0).logicalAnd(b.equal(0)));
+        return tf.where(undefined_s, tf.zeros(s.shape), s) as tf.Tensor1D;
+      }),
+    );
+  }
+
+  const all = blocks.length === 1 ? blocks[0] : tf.concat(blocks);
+  const values = all.dataSync() as Float32Array;
+  tf.dispose([...blocks, all, one_hot, counts]);
+  return values;
+}
+
 /**
  * s(i) = (b - a) / max(a, b), where a = mean intra-cluster distance,
  * b = mean distance to the nearest other cluster.
@@ -53,61 +195,18 @@ export function silhouette_samples(
       throw new Error('Silhouette score requires at least 2 clusters');
     }
 
-    const distances = pairwise_distance_matrix(work_data, metric);
-
-    const silhouette_values: number[] = [];
-    const distances_flat = distances.dataSync() as Float32Array;
-
-    for (let i = 0; i < n; i++) {
-      const sample_label = work_labels[i];
-
-      const same_cluster_indices: number[] = [];
-      const other_cluster_indices: Map<number, number[]> = new Map();
-
-      for (let j = 0; j < n; j++) {
-        if (i === j) continue;
-
-        if (work_labels[j] === sample_label) {
-          same_cluster_indices.push(j);
-        } else {
-          const label = work_labels[j];
-          if (!other_cluster_indices.has(label)) {
-            other_cluster_indices.set(label, []);
-          }
-          other_cluster_indices.get(label)!.push(j);
-        }
-      }
-
-      let a = 0;
-      if (same_cluster_indices.length > 0) {
-        for (const j of same_cluster_indices) {
-          a += distances_flat[i * n + j];
-        }
-        a /= same_cluster_indices.length;
-      }
-
-      let b = Infinity;
-      for (const [_label, indices] of other_cluster_indices) {
-        let mean_dist = 0;
-        for (const j of indices) {
-          mean_dist += distances_flat[i * n + j];
-        }
-        mean_dist /= indices.length;
-        if (mean_dist < b) b = mean_dist;
-      }
-
-      if (same_cluster_indices.length === 0) {
-        silhouette_values.push(0);
-      } else if (a === 0 && b === 0) {
-        // All distances zero (identical points); sklearn convention: silhouette = 0.
-        silhouette_values.push(0);
-      } else {
-        const s = (b - a) / Math.max(a, b);
-        silhouette_values.push(s);
-      }
-    }
-
-    return silhouette_values;
+    const { ids } = dense_cluster_ids(work_labels);
+    const rows = Int32Array.from({ length: n }, (_, i) => i);
+    const points = distance_rows(work_data, metric);
+    const norms = distance_row_norms(points, metric);
+    return Array.from(
+      blocked_silhouette(
+        row_distance_block(points, norms, metric),
+        ids,
+        k,
+        rows,
+      ),
+    );
   });
 }
 
@@ -126,7 +225,8 @@ export function silhouette_score(
  * Degenerate contract mirrors silhouette_samples: all-noise throws; one valid
  * cluster after filtering → defined 0; single-cluster with no noise throws.
  *
- * @throws Error if all labels are noise, fewer than 2 clusters, or labels length mismatch
+ * @throws Error if all labels are noise, fewer than 2 clusters, labels length
+ *   mismatch, or a sample index is not an integer in `[0, n)`
  */
 export function silhouette_score_subset(
   X: DataMatrix,
@@ -138,9 +238,20 @@ export function silhouette_score_subset(
   const { data, label_array, owns_tensor } = convert_validation_inputs(X, labels);
 
   const n = data.shape[0];
+  const invalid = sample_indices.find(
+    (i) => !Number.isInteger(i) || i < 0 || i >= n,
+  );
+  if (invalid !== undefined) {
+    if (owns_tensor) {
+      data.dispose();
+    }
+    throw new Error(
+      `Sample index ${invalid} is outside the ${n} samples of X.`,
+    );
+  }
 
   // Noise samples participate in neither the subset scores nor the distance averages.
-  const { had_noise } = noise_filtered_indices(label_array);
+  const { keep, had_noise } = noise_filtered_indices(label_array);
   const unique_labels = Array.from(
     new Set(label_array.filter((l) => l !== -1)),
   );
@@ -164,77 +275,25 @@ export function silhouette_score_subset(
     throw new Error('Silhouette score requires at least 2 clusters');
   }
 
-  const silhouette_values: number[] = [];
-
-  for (const i of sample_indices) {
-    const sample_label = label_array[i];
-    if (sample_label === -1) continue;
-
-    const sample_point = tf.tidy(() => data.gather([i]));
-
-    const distances = tf.tidy(() => {
-      if (metric === 'cosine') {
-        const eps = tf.scalar(1e-8);
-        const dot = data.mul(sample_point).sum(1);
-        const data_norm = data.square().sum(1).sqrt();
-        const sample_norm = sample_point.square().sum().sqrt();
-        const denom = data_norm.mul(sample_norm).add(eps);
-        return tf.scalar(1).sub(dot.div(denom)) as tf.Tensor1D;
-      }
-      const diff = data.sub(sample_point);
-      return tf.sqrt(diff.square().sum(1)) as tf.Tensor1D;
-    });
-
-    const dist_array = distances.dataSync() as Float32Array;
-
-    let a = 0;
-    let a_count = 0;
-    const cluster_distances: Map<number, { sum: number; count: number }> =
-      new Map();
-
-    for (let j = 0; j < n; j++) {
-      if (i === j) continue;
-
-      const label = label_array[j];
-      // Exclude noise neighbours from both intra- and inter-cluster means.
-      if (label === -1) continue;
-
-      const dist = dist_array[j];
-
-      if (label === sample_label) {
-        a += dist;
-        a_count++;
-      } else {
-        if (!cluster_distances.has(label)) {
-          cluster_distances.set(label, { sum: 0, count: 0 });
-        }
-        const cluster = cluster_distances.get(label)!;
-        cluster.sum += dist;
-        cluster.count++;
-      }
-    }
-
-    if (a_count > 0) a /= a_count;
-
-    let b = Infinity;
-    for (const [_label, { sum, count }] of cluster_distances) {
-      const mean_dist = sum / count;
-      if (mean_dist < b) b = mean_dist;
-    }
-
-    if (a_count === 0) {
-      silhouette_values.push(0);
-    } else if (a === 0 && b === 0) {
-      // All distances zero (identical points); sklearn convention: silhouette = 0.
-      silhouette_values.push(0);
-    } else {
-      const s = (b - a) / Math.max(a, b);
-      silhouette_values.push(s);
-    }
+  const position = new Int32Array(n).fill(-1);
+  keep.forEach((i, p) => (position[i] = p));
+  const rows = Int32Array.from(
+    sample_indices.filter((i) => label_array[i] !== -1),
+    (i) => position[i],
+  );
 
-    sample_point.dispose();
-    distances.dispose();
-  }
+  const work_data = had_noise ? (tf.gather(data, keep) as tf.Tensor2D) : data;
+  const { ids } = dense_cluster_ids(keep.map((i) => label_array[i]));
+  const points = distance_rows(work_data, metric);
+  const norms = distance_row_norms(points, metric);
+  const silhouette_values = blocked_silhouette(
+    row_distance_block(points, norms, metric),
+    ids,
+    k,
+    rows,
+  );
+  tf.dispose([points, norms]);
+  if (had_noise) work_data.dispose();
 
   if (owns_tensor) data.dispose();
 
@@ -242,8 +301,7 @@ export function silhouette_score_subset(
   if (silhouette_values.length === 0) {
     return 0;
   }
-  return (
-    silhouette_values.reduce((sum, val) => sum + val, 0) /
-    silhouette_values.length
-  );
+  let total = 0;
+  for (const value of silhouette_values) total += value;
+  return total / silhouette_values.length;
 }
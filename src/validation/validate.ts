@@ -1,12 +1,14 @@
 import * as tf from '../backend/adapter';
 import { DataMatrix, LabelVector } from '../clustering/types';
 import { is_tensor } from '../tensor/tensor_guards';
+import { matrix_shape, to_tensor2d } from '../tensor/data_matrix';
+import { to_label_array } from './contingency';
 
 export function validate_labels_length(
   X: DataMatrix,
   labels: LabelVector,
 ): void {
-  const data_rows = is_tensor(X) ? X.shape[0] : X.length;
+  const [data_rows] = matrix_shape(X);
   const labels_len = is_tensor(labels) ? labels.shape[0] : labels.length;
 
   if (data_rows !== labels_len) {
@@ -16,18 +18,14 @@ export function validate_labels_length(
   }
 }
 
-/** `owns_tensor` is true when X was an array — the caller must then dispose the returned tensor. */
+/** `owns_tensor` is true when X was not a tensor — the caller must then dispose the returned tensor. */
 export function convert_validation_inputs(
   X: DataMatrix,
   labels: LabelVector,
 ): { data: tf.Tensor2D; label_array: number[]; owns_tensor: boolean } {
   const owns_tensor = !is_tensor(X);
-  const data = is_tensor(X)
-    ? (X as tf.Tensor2D)
-    : tf.tensor2d(X as number[][]);
-  const label_array = is_tensor(labels)
-    ? Array.from(labels.dataSync() as Float32Array).map((l) => Math.round(l))
-    : (labels as number[]);
+  const data = to_tensor2d(X);
+  const label_array = to_label_array(labels);
   return { data, label_array, owns_tensor };
 }
 
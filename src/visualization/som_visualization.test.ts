@@ -281,3 +281,115 @@ describe('som_visualization', () => {
     });
   });
 });
+
+describe('som_visualization with live_stats', () => {
+  const batches = [
+    [[0, 0], [0, 1], [1, 0]],
+    [[1, 1], [0.5, 0.5], [0.2, 0.8]],
+    [[0.9, 0.1], [0.1, 0.9], [0.4, 0.6]],
+  ];
+  const make_som = (live_stats_tol?: number) =>
+    new SOM({
+      grid_width: 3,
+      grid_height: 3,
+      online_mode: true,
+      random_state: 7,
+      live_stats: live_stats_tol !== undefined,
+      live_stats_tol,
+    });
+
+  it('keeps running hit counts and error sums from training', async () => {
+    const som = make_som(0);
+    for (const batch of batches) await som.partial_fit(batch);
+
+    const stats = som.get_live_stats();
+    const hits = stats.hit_counts.flat();
+    expect(stats.samples_seen).toBe(9);
+    expect(hits.reduce((a, b) => a + b, 0)).toBe(9);
+    stats.error_sums.flat().forEach((e, i) => {
+      expect(e).toBeGreaterThanOrEqual(0);
+      if (hits[i] === 0) expect(e).toBe(0);
+    });
+
+    const hit_map = await get_hit_map(som);
+    const quality = await get_quantization_quality_map(som);
+    expect(Array.from(hit_map.dataSync())).toEqual(hits);
+    expect(quality.shape).toEqual([3, 3]);
+    hit_map.dispose();
+    quality.dispose();
+
+    som.reset_live_stats();
+    expect(som.get_live_stats().samples_seen).toBe(0);
+    som.dispose();
+  });
+
+  it('matches the full U-matrix when every move is refreshed', async () => {
+    const live = make_som(0);
+    const plain = make_som();
+    for (const batch of batches) {
+      await live.partial_fit(batch);
+      await plain.partial_fit(batch);
+      const a = live.get_u_matrix();
+      const b = plain.get_u_matrix();
+      const av = Array.from(a.dataSync());
+      const bv = Array.from(b.dataSync());
+      av.forEach((v, i) => expect(v).toBeCloseTo(bv[i], 5));
+      a.dispose();
+      b.dispose();
+    }
+    live.dispose();
+    plain.dispose();
+  });
+
+  it('skips neurons that moved less than live_stats_tol', async () => {
+    const som = make_som(1e9);
+    await som.partial_fit(batches[0]);
+    const first = som.get_u_matrix();
+    await som.partial_fit(batches[1]);
+    const second = som.get_u_matrix();
+    expect(Array.from(second.dataSync())).toEqual(Array.from(first.dataSync()));
+    first.dispose();
+    second.dispose();
+    som.dispose();
+  });
+
+  it('resets live caches when a differently shaped state is loaded', async () => {
+    const live = make_som(0);
+    await live.fit(batches.flat());
+    live.get_u_matrix().dispose();
+    expect(live.get_live_stats().samples_seen).toBeGreaterThan(0);
+
+    // Same grid, three features instead of two.
+    const weights = [0, 1, 2].map((row) =>
+      [0, 1, 2].map((col) => [row, col, row * col]),
+    );
+    const state = {
+      weights,
+      total_samples: 0,
+      current_epoch: 0,
+      grid_width: 3,
+      grid_height: 3,
+      params: live.params,
+    };
+    const plain = make_som();
+    live.load_state(state);
+    plain.load_state(state);
+    expect(live.get_live_stats().samples_seen).toBe(0);
+
+    const a = live.get_u_matrix();
+    const b = plain.get_u_matrix();
+    const bv = Array.from(b.dataSync());
+    Array.from(a.dataSync()).forEach((v, i) => expect(v).toBeCloseTo(bv[i], 5));
+    a.dispose();
+    b.dispose();
+    live.dispose();
+    plain.dispose();
+  });
+
+  it('requires live_stats for data-free maps', async () => {
+    const som = make_som();
+    await som.partial_fit(batches[0]);
+    await expect(get_hit_map(som)).rejects.toThrow('live_stats');
+    som.dispose();
+  });
+});
@@ -11,10 +11,18 @@ export function get_component_planes(som: SOM): tf.Tensor3D {
   });
 }
 
+/**
+ * Without `X`, reads the running hit counts of a `live_stats` SOM instead of
+ * predicting every sample.
+ */
 export async function get_hit_map(
   som: SOM,
-  X: tf.Tensor2D
+  X?: tf.Tensor2D
 ): Promise<tf.Tensor2D> {
+  if (X === undefined) {
+    return tf.tensor2d(som.get_live_stats().hit_counts);
+  }
+
   const { grid_height, grid_width } = som.params;
 
   const labels = await som.predict(X);
@@ -75,10 +83,20 @@ export async function track_bmu_trajectory(
   return trajectory;
 }
 
+/** Without `X`, uses the running error sums of a `live_stats` SOM. */
 export async function get_quantization_quality_map(
   som: SOM,
-  X: tf.Tensor2D
+  X?: tf.Tensor2D
 ): Promise<tf.Tensor2D> {
+  if (X === undefined) {
+    const { hit_counts, error_sums } = som.get_live_stats();
+    return tf.tensor2d(
+      error_sums.map((row, i) =>
+        row.map((sum, j) => (hit_counts[i][j] > 0 ? sum / hit_counts[i][j] : 0))
+      )
+    );
+  }
+
   const { grid_height, grid_width } = som.params;
   const weights_array = som.get_weights();
 
@@ -238,7 +256,7 @@ export async function export_for_visualization(
 
 export async function get_density_map(
   som: SOM,
-  X: tf.Tensor2D,
+  X?: tf.Tensor2D,
   sigma: number = 1.0
 ): Promise<tf.Tensor2D> {
   const hit_map = await get_hit_map(som, X);
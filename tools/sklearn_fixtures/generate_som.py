@@ -5,6 +5,17 @@ These fixtures drive the rigorous SOM reference suite
 reference trainer (`src/clustering/som_reference_training.ts`) reproduces
 MiniSom's deterministic ``train_batch`` to floating-point precision.
 
+A second set (``--batch-out-dir``) pins the Kohonen batch-SOM update used by
+``SOM`` with ``training_mode: 'batch'`` (`src/clustering/som_batch.test.ts`).
+MiniSom has no batch algorithm (its ``train_batch`` is sequential), so these
+fixtures are built from MiniSom's ``winner`` and ``neighborhood`` primitives:
+each epoch sets every neuron to the neighbourhood-weighted mean of all
+samples. Only gaussian/rectangular configs are emitted, where MiniSom's
+neighbourhood equals the library's ``exp(-d^2 / 2 sigma^2)`` on the grid
+distance matrix. Their initial grids hold distinct data rows so no BMU search
+depends on tie-breaking order, and configs whose BMU assignments come within
+float32 rounding of a tie are skipped.
+
 Reproducibility hinges on two things:
 
 1. ``train_batch`` is deterministic given fixed initial weights — it iterates
@@ -28,7 +39,8 @@ Usage (developer-only; not run in CI)
     python -m venv .venv && source .venv/bin/activate
     pip install -r requirements.txt
 
-    python generate_som.py --out-dir ../../__fixtures__/som
+    python generate_som.py --out-dir ../../__fixtures__/som \
+        --batch-out-dir ../../__fixtures__/som_batch
 """
 
 from __future__ import annotations
@@ -97,6 +109,19 @@ PARAM_GRID: List[Dict[str, Any]] = [
 ]
 
 
+# Batch-SOM configs: gaussian/rectangular only (see module docstring).
+BATCH_PARAM_GRID: List[Dict[str, Any]] = [
+    {"grid_width": 5, "grid_height": 5, "sigma": 2.0, "num_epochs": 15},
+    {"grid_width": 8, "grid_height": 4, "sigma": 2.5, "num_epochs": 20},
+    {"grid_width": 4, "grid_height": 8, "sigma": 2.5, "num_epochs": 20},
+]
+
+# Smallest gap between the best and second-best squared BMU distance, relative
+# to the largest squared weight norm, that a batch fixture may contain. The
+# library's float32 ``||w||^2 - 2 x.w`` kernel flips BMUs below roughly this.
+MIN_RELATIVE_BMU_MARGIN = 2e-6
+
+
 def make_initial_weights(
     X: np.ndarray, grid_width: int, grid_height: int, seed: int
 ) -> np.ndarray:
@@ -111,6 +136,21 @@ def make_initial_weights(
     return X[idx].reshape(grid_width, grid_height, X.shape[1]).astype(float).copy()
 
 
+def make_distinct_initial_weights(
+    X: np.ndarray, grid_width: int, grid_height: int, seed: int
+) -> np.ndarray:
+    """Like ``make_initial_weights`` but draws distinct data rows.
+
+    Duplicated neurons tie exactly on every BMU search. MiniSom breaks ties in
+    ``[x][y]`` (column-major) order and the library in row-major order, so the
+    batch fixtures start from a grid with no repeated rows.
+    """
+    rng = np.random.RandomState(seed)
+    rows = np.unique(X, axis=0)
+    idx = rng.choice(rows.shape[0], size=grid_width * grid_height, replace=False)
+    return rows[idx].reshape(grid_width, grid_height, X.shape[1]).astype(float).copy()
+
+
 def dump_fixture(X: np.ndarray, params: Dict[str, Any], name: str, out_path: Path) -> None:
     """Train MiniSom from injected initial weights and write the fixture JSON."""
     grid_width = params["grid_width"]
@@ -177,12 +217,105 @@ def dump_fixture(X: np.ndarray, params: Dict[str, Any], name: str, out_path: Pat
     )
 
 
+def relative_bmu_margin(X: np.ndarray, weights_flat: np.ndarray) -> float:
+    """Smallest best vs second-best squared BMU distance gap over ``X``."""
+    d = ((X[:, None, :] - weights_flat[None, :, :]) ** 2).sum(axis=2)
+    d.sort(axis=1)
+    scale = (weights_flat**2).sum(axis=1).max() + 1.0
+    return float((d[:, 1] - d[:, 0]).min() / scale)
+
+
+def dump_batch_fixture(
+    X: np.ndarray, params: Dict[str, Any], name: str, out_path: Path
+) -> None:
+    """Run the Kohonen batch-SOM update from injected weights and write the fixture.
+
+    Nothing is written when some BMU assignment is closer to a tie than
+    ``MIN_RELATIVE_BMU_MARGIN``.
+    """
+    grid_width = params["grid_width"]
+    grid_height = params["grid_height"]
+    num_epochs = params["num_epochs"]
+    n_features = X.shape[1]
+
+    som = MiniSom(
+        x=grid_width,
+        y=grid_height,
+        input_len=n_features,
+        sigma=params["sigma"],
+        neighborhood_function="gaussian",
+        topology="rectangular",
+        random_seed=INIT_SEED,
+    )
+    initial_weights_native = make_distinct_initial_weights(
+        X, grid_width, grid_height, INIT_SEED
+    )
+    som._weights = initial_weights_native.copy()
+
+    # MiniSom's asymptotic decay, evaluated once per epoch.
+    radius_schedule = [
+        params["sigma"] / (1 + epoch / (num_epochs / 2)) for epoch in range(num_epochs)
+    ]
+    quantization_errors: List[float] = []
+    margin = np.inf
+    for sigma in radius_schedule:
+        # Influence rows in library [height][width] order, flattened row-major.
+        H = np.array(
+            [som.neighborhood(som.winner(x), sigma).T.ravel() for x in X]
+        )
+        quantization_errors.append(float(som.quantization_error(X)))
+        weights_flat = som._weights.transpose(1, 0, 2).reshape(-1, n_features)
+        margin = min(margin, relative_bmu_margin(X, weights_flat))
+        denominator = H.sum(axis=0)
+        numerator = H.T @ X
+        safe = np.abs(denominator) > 1e-8
+        weights_flat = np.where(
+            safe[:, None], numerator / np.where(safe, denominator, 1)[:, None], weights_flat
+        )
+        som._weights = weights_flat.reshape(grid_height, grid_width, n_features).transpose(1, 0, 2)
+
+    final_flat = som._weights.transpose(1, 0, 2).reshape(-1, n_features)
+    margin = min(margin, relative_bmu_margin(X, final_flat))
+    if margin < MIN_RELATIVE_BMU_MARGIN:
+        print(f"  Skipped {out_path.name} - BMU margin {margin:.1e} too close to a tie")
+        return
+
+    labels: List[int] = []
+    for x in X:
+        col, row = som.winner(x)
+        labels.append(int(row) * grid_width + int(col))
+
+    fixture = {
+        "name": name,
+        "X": X.astype(float).tolist(),
+        "params": {
+            "grid_width": grid_width,
+            "grid_height": grid_height,
+            "topology": "rectangular",
+            "neighborhood": "gaussian",
+            "num_epochs": num_epochs,
+            "random_state": INIT_SEED,
+        },
+        "radius_schedule": radius_schedule,
+        "initial_weights": initial_weights_native.transpose(1, 0, 2).astype(float).tolist(),
+        "weights": som.get_weights().transpose(1, 0, 2).astype(float).tolist(),
+        "labels": labels,
+        "quantization_errors": quantization_errors,
+    }
+
+    out_path.write_text(json.dumps(fixture, indent=2))
+    print(f"  Wrote {out_path.name} - final QE: {quantization_errors[-1]:.4f}")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--out-dir", type=Path, required=True)
+    parser.add_argument("--batch-out-dir", type=Path, default=None)
     args = parser.parse_args()
 
     args.out_dir.mkdir(parents=True, exist_ok=True)
+    if args.batch_out_dir is not None:
+        args.batch_out_dir.mkdir(parents=True, exist_ok=True)
 
     print("Generating SOM fixtures...")
     print("-" * 50)
@@ -198,6 +331,13 @@ def main() -> None:
                 f"{p['neighborhood_function']}_{p['topology']}"
             )
             dump_fixture(X, p, name, args.out_dir / f"{name}.json")
+        if args.batch_out_dir is None:
+            continue
+        for p in BATCH_PARAM_GRID:
+            if p["grid_width"] * p["grid_height"] > X.shape[0]:
+                continue
+            name = f"{ds_name}_{p['grid_width']}x{p['grid_height']}_batch"
+            dump_batch_fixture(X, p, name, args.batch_out_dir / f"{name}.json")
 
     print("\n" + "=" * 50)
     print(
@@ -6,10 +6,13 @@ Usage (from repo root)::
     python -m venv .venv && source .venv/bin/activate
     pip install -r requirements.txt
 
-    python generate_spectral.py --out-dir ../../test/fixtures/spectral
+    python generate_spectral.py --out-dir ../../__fixtures__/spectral \
+        --assign-labels cluster_qr discretize
 
 The produced JSON fixtures are consumed by Jest tests located at
-`test/clustering/spectral_reference.test.ts`.
+`src/clustering/spectral_reference.test.ts`. The committed kmeans fixtures
+predate this script's parameter grid, so regenerate only the strategies you
+need with `--assign-labels`.
 """
 
 from __future__ import annotations
@@ -53,14 +56,38 @@ PARAM_GRID: List[Dict[str, Any]] = [
 ]
 
 
-def dump_fixture(X: np.ndarray, params: Dict[str, Any], out_path: Path) -> None:
+# Label-assignment strategies; "kmeans" keeps the original fixture names.
+ASSIGN_LABELS: List[str] = ["kmeans", "cluster_qr", "discretize"]
+
+# (dataset, n_clusters, affinity) cases whose reference labels are not a
+# stable target. blobs_n2 splits three blobs into two, so the two-vector
+# eigenspace is degenerate. discretize starts from a random rotation, and in
+# the other excluded cases different seeds reach different partitions, so
+# numpy's stream would have to be reproduced exactly.
+UNSTABLE: Dict[str, List[Tuple[str, int, str]]] = {
+    "cluster_qr": [("blobs", 2, "rbf"), ("blobs", 2, "knn")],
+    "discretize": [
+        ("blobs", 2, "rbf"),
+        ("blobs", 2, "knn"),
+        ("circles", 2, "rbf"),
+        ("circles", 3, "rbf"),
+        ("circles", 3, "knn"),
+        ("moons", 2, "rbf"),
+        ("moons", 2, "knn"),
+    ],
+}
+
+
+def dump_fixture(
+    X: np.ndarray, params: Dict[str, Any], assign_labels: str, out_path: Path
+) -> None:
     # Build kwargs selectively to avoid passing None and violating sklearn's
     # param validation.
     kwargs: Dict[str, Any] = {
         "n_clusters": params["n_clusters"],
         "affinity": params["affinity"],
         "random_state": 42,
-        "assign_labels": "kmeans",
+        "assign_labels": assign_labels,
     }
     if "gamma" in params:
         kwargs["gamma"] = params["gamma"]
@@ -70,15 +97,18 @@ def dump_fixture(X: np.ndarray, params: Dict[str, Any], out_path: Path) -> None:
     model = SpectralClustering(**kwargs)
     labels = model.fit_predict(X)
 
+    # snake_case keys, as read by spectral_reference.test.ts.
     param_dict: Dict[str, Any] = {
-        "nClusters": params["n_clusters"],
+        "n_clusters": params["n_clusters"],
         "affinity": params["affinity"],
-        "randomState": 42,
+        "random_state": 42,
     }
     if "gamma" in params:
         param_dict["gamma"] = params["gamma"]
     if "n_neighbors" in params:
-        param_dict["nNeighbors"] = params["n_neighbors"]
+        param_dict["n_neighbors"] = params["n_neighbors"]
+    if assign_labels != "kmeans":
+        param_dict["assign_labels"] = assign_labels
 
     fixture = {
         "X": X.astype(float).tolist(),
@@ -92,6 +122,13 @@ def dump_fixture(X: np.ndarray, params: Dict[str, Any], out_path: Path) -> None:
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--out-dir", type=Path, required=True)
+    parser.add_argument(
+        "--assign-labels",
+        nargs="+",
+        choices=ASSIGN_LABELS,
+        default=ASSIGN_LABELS,
+        help="Only write fixtures for these strategies.",
+    )
     args = parser.parse_args()
 
     args.out_dir.mkdir(parents=True, exist_ok=True)
@@ -100,13 +137,16 @@ def main() -> None:
 
     for X, ds_name in datasets:
         for p in PARAM_GRID:
-            fname_parts = [ds_name, f"n{p['n_clusters']}"]
-            if p["affinity"] == "rbf":
-                fname_parts.append("rbf")
-            else:
-                fname_parts.append("knn")
-            fname = "_".join(fname_parts) + ".json"
-            dump_fixture(X, p, args.out_dir / fname)
+            for assign_labels in args.assign_labels:
+                affinity = "rbf" if p["affinity"] == "rbf" else "knn"
+                case = (ds_name, p["n_clusters"], affinity)
+                if case in UNSTABLE.get(assign_labels, []):
+                    continue
+                fname_parts = [ds_name, f"n{p['n_clusters']}", affinity]
+                if assign_labels != "kmeans":
+                    fname_parts.append(assign_labels)
+                fname = "_".join(fname_parts) + ".json"
+                dump_fixture(X, p, assign_labels, args.out_dir / fname)
 
     print(
         f"Fixtures written to {args.out_dir} "